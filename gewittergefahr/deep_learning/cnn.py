@@ -679,9 +679,9 @@ def apply_2d_or_3d_cnn(
             [i + num_examples_per_batch - 1, num_examples - 1]
         )
 
-        these_indices = numpy.linspace(
-            this_first_index, this_last_index,
-            num=this_last_index - this_first_index + 1, dtype=int)
+        # Slicing (rather than fancy indexing) creates views, not copies.
+        these_indices = slice(this_first_index, this_last_index + 1)
+        this_num_examples = this_last_index - this_first_index + 1
 
         if verbose:
             print (
@@ -691,20 +691,21 @@ def apply_2d_or_3d_cnn(
         if sounding_matrix is None:
             these_outputs = model_object_to_use.predict(
                 radar_image_matrix[these_indices, ...],
-                batch_size=len(these_indices)
+                batch_size=this_num_examples
             )
         else:
             these_outputs = model_object_to_use.predict(
                 [radar_image_matrix[these_indices, ...],
                  sounding_matrix[these_indices, ...]],
-                batch_size=len(these_indices)
+                batch_size=this_num_examples
             )
 
         if output_matrix is None:
-            output_matrix = these_outputs + 0.
-        else:
-            output_matrix = numpy.concatenate(
-                (output_matrix, these_outputs), axis=0)
+            output_matrix = numpy.full(
+                (num_examples,) + these_outputs.shape[1:], numpy.nan,
+                dtype=these_outputs.dtype)
+
+        output_matrix[these_indices, ...] = these_outputs
 
     if verbose:
         print 'Have applied model to all {0:d} examples!'.format(num_examples)
@@ -789,9 +790,9 @@ def apply_2d3d_cnn(
             [i + num_examples_per_batch - 1, num_examples - 1]
         )
 
-        these_indices = numpy.linspace(
-            this_first_index, this_last_index,
-            num=this_last_index - this_first_index + 1, dtype=int)
+        # Slicing (rather than fancy indexing) creates views, not copies.
+        these_indices = slice(this_first_index, this_last_index + 1)
+        this_num_examples = this_last_index - this_first_index + 1
 
         if verbose:
             print (
@@ -802,21 +803,22 @@ def apply_2d3d_cnn(
             these_outputs = model_object_to_use.predict(
                 [reflectivity_matrix_dbz[these_indices, ...],
                  azimuthal_shear_matrix_s01[these_indices, ...]],
-                batch_size=len(these_indices)
+                batch_size=this_num_examples
             )
         else:
             these_outputs = model_object_to_use.predict(
                 [reflectivity_matrix_dbz[these_indices, ...],
                  azimuthal_shear_matrix_s01[these_indices, ...],
                  sounding_matrix[these_indices, ...]],
-                batch_size=len(these_indices)
+                batch_size=this_num_examples
             )
 
         if output_matrix is None:
-            output_matrix = these_outputs + 0.
-        else:
-            output_matrix = numpy.concatenate(
-                (output_matrix, these_outputs), axis=0)
+            output_matrix = numpy.full(
+                (num_examples,) + these_outputs.shape[1:], numpy.nan,
+                dtype=these_outputs.dtype)
+
+        output_matrix[these_indices, ...] = these_outputs
 
     if verbose:
         print 'Have applied model to all {0:d} examples!'.format(num_examples)
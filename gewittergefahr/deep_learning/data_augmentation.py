@@ -1,7 +1,9 @@
 """Augments image dataset by shifting, rotating, or adding Gaussian noise."""
 
+import collections
+from multiprocessing.pool import ThreadPool
 import numpy
-from scipy.ndimage.interpolation import rotate as scipy_rotate
+from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 
@@ -11,6 +13,220 @@ MAX_ABSOLUTE_ROTATION_ANGLE_DEG = 90.
 MIN_NOISE_STANDARD_DEVIATION = 1e-9
 MAX_NOISE_STANDARD_DEVIATION = 0.25
 
+# Each key is a tuple with (num_grid_rows, num_grid_columns,
+# ccw_rotation_angle_deg), and each value is a dictionary created by
+# `_get_rotation_weights`.
+ROTATION_WEIGHT_CACHE = collections.OrderedDict()
+MAX_ROTATIONS_IN_CACHE = 1000
+TOLERANCE_FOR_GRID_EDGE = 1e-6
+
+FLAT_INDICES_KEY = 'flat_indices'
+CORNER_WEIGHTS_KEY = 'corner_weights'
+OUTSIDE_GRID_FLAGS_KEY = 'outside_grid_flags'
+
+
+def _get_output_dtype(radar_image_matrix):
+    """Returns data type for augmented images.
+
+    Floating-point images keep their precision (so that float32 images stay
+    float32).  Other images are converted to float64.
+
+    :param radar_image_matrix: numpy array of radar images.
+    :return: output_dtype: Data type for augmented images.
+    """
+
+    if numpy.issubdtype(radar_image_matrix.dtype, numpy.floating):
+        return radar_image_matrix.dtype
+
+    return numpy.dtype(float)
+
+
+def _get_rotation_weights(
+        num_grid_rows, num_grid_columns, ccw_rotation_angle_deg):
+    """Computes bilinear-interpolation weights for rotating images.
+
+    Each image is rotated about its center, and each pixel in the rotated image
+    is interpolated from the four surrounding pixels in the original image.
+    Pixels that come from outside the original image are set to
+    `PADDING_VALUE`.  This is equivalent to `scipy.ndimage.rotate` with
+    `order = 1`, `mode = "constant"` and `reshape = False`.
+
+    The weights depend only on grid size and angle, so they are computed once
+    and stored in `ROTATION_WEIGHT_CACHE`.
+
+    M = number of rows in grid
+    N = number of columns in grid
+
+    :param num_grid_rows: M in the above discussion.
+    :param num_grid_columns: N in the above discussion.
+    :param ccw_rotation_angle_deg: Counterclockwise rotation angle (degrees).
+    :return: weight_dict: Dictionary with the following keys.
+    weight_dict['flat_indices']: length-4 list, where each item is a length-MN
+        numpy array of flattened indices (into the original M-by-N grid) for one
+        of the four surrounding pixels.
+    weight_dict['corner_weights']: length-4 list, where each item is a length-MN
+        numpy array of weights, in the same order as `flat_indices`.  Weights
+        are zero for pixels that come from outside the original image.
+    weight_dict['outside_grid_flags']: length-MN numpy array of Boolean flags,
+        indicating which pixels come from outside the original image.
+    """
+
+    cache_key = (num_grid_rows, num_grid_columns, float(ccw_rotation_angle_deg))
+    weight_dict = general_utils.get_from_lru_cache(
+        cache_dict=ROTATION_WEIGHT_CACHE, cache_key=cache_key)
+    if weight_dict is not None:
+        return weight_dict
+
+    angle_radians = numpy.deg2rad(-ccw_rotation_angle_deg)
+    center_row = float(num_grid_rows - 1) / 2
+    center_column = float(num_grid_columns - 1) / 2
+
+    output_row_matrix, output_column_matrix = numpy.meshgrid(
+        numpy.linspace(0, num_grid_rows - 1, num=num_grid_rows) - center_row,
+        numpy.linspace(0, num_grid_columns - 1, num=num_grid_columns) -
+        center_column,
+        indexing='ij')
+
+    input_rows = numpy.ravel(
+        center_row + numpy.cos(angle_radians) * output_row_matrix +
+        numpy.sin(angle_radians) * output_column_matrix
+    )
+    input_columns = numpy.ravel(
+        center_column - numpy.sin(angle_radians) * output_row_matrix +
+        numpy.cos(angle_radians) * output_column_matrix
+    )
+
+    inside_grid_flags = numpy.logical_and(
+        numpy.logical_and(
+            input_rows >= -TOLERANCE_FOR_GRID_EDGE,
+            input_rows <= num_grid_rows - 1 + TOLERANCE_FOR_GRID_EDGE),
+        numpy.logical_and(
+            input_columns >= -TOLERANCE_FOR_GRID_EDGE,
+            input_columns <= num_grid_columns - 1 + TOLERANCE_FOR_GRID_EDGE)
+    )
+
+    input_rows = numpy.clip(input_rows, 0, num_grid_rows - 1)
+    input_columns = numpy.clip(input_columns, 0, num_grid_columns - 1)
+
+    lower_rows = numpy.minimum(
+        numpy.floor(input_rows).astype(int), max([num_grid_rows - 2, 0]))
+    lower_columns = numpy.minimum(
+        numpy.floor(input_columns).astype(int), max([num_grid_columns - 2, 0]))
+    upper_rows = numpy.minimum(lower_rows + 1, num_grid_rows - 1)
+    upper_columns = numpy.minimum(lower_columns + 1, num_grid_columns - 1)
+
+    row_weights = (input_rows - lower_rows) * inside_grid_flags
+    column_weights = input_columns - lower_columns
+    inverse_row_weights = (1. - input_rows + lower_rows) * inside_grid_flags
+
+    weight_dict = {
+        FLAT_INDICES_KEY: [
+            lower_rows * num_grid_columns + lower_columns,
+            lower_rows * num_grid_columns + upper_columns,
+            upper_rows * num_grid_columns + lower_columns,
+            upper_rows * num_grid_columns + upper_columns
+        ],
+        CORNER_WEIGHTS_KEY: [
+            inverse_row_weights * (1. - column_weights),
+            inverse_row_weights * column_weights,
+            row_weights * (1. - column_weights),
+            row_weights * column_weights
+        ],
+        OUTSIDE_GRID_FLAGS_KEY: numpy.invert(inside_grid_flags)
+    }
+
+    general_utils.add_to_lru_cache(
+        cache_dict=ROTATION_WEIGHT_CACHE, cache_key=cache_key,
+        value=weight_dict, max_num_entries=MAX_ROTATIONS_IN_CACHE)
+    return weight_dict
+
+
+def _rotate_into(radar_image_matrix, ccw_rotation_angle_deg, output_matrix):
+    """Rotates each radar image and writes the result to existing array.
+
+    :param radar_image_matrix: See doc for `rotate_radar_images`.
+    :param ccw_rotation_angle_deg: Same.
+    :param output_matrix: numpy array with the same shape as
+        `radar_image_matrix`, which will be overwritten with rotated images.
+    """
+
+    num_examples = radar_image_matrix.shape[0]
+    num_grid_rows = radar_image_matrix.shape[1]
+    num_grid_columns = radar_image_matrix.shape[2]
+    other_dimensions = radar_image_matrix.shape[3:]
+
+    weight_dict = _get_rotation_weights(
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        ccw_rotation_angle_deg=ccw_rotation_angle_deg)
+
+    flat_input_matrix = numpy.reshape(
+        radar_image_matrix,
+        (num_examples, num_grid_rows * num_grid_columns) + other_dimensions)
+
+    # Setting the shape of a view (rather than calling `numpy.reshape`) raises
+    # an error if the output matrix cannot be flattened without copying, so
+    # results can never be written to a temporary copy.
+    flat_output_matrix = output_matrix.view()
+    flat_output_matrix.shape = flat_input_matrix.shape
+    weight_dimensions = (
+        (1, num_grid_rows * num_grid_columns) + (1,) * len(other_dimensions)
+    )
+
+    flat_output_matrix[:] = 0.
+
+    for these_indices, these_weights in zip(
+            weight_dict[FLAT_INDICES_KEY], weight_dict[CORNER_WEIGHTS_KEY]):
+        flat_output_matrix += (
+            numpy.take(flat_input_matrix, these_indices, axis=1) *
+            numpy.reshape(these_weights, weight_dimensions).astype(
+                output_matrix.dtype)
+        )
+
+    flat_output_matrix[:, weight_dict[OUTSIDE_GRID_FLAGS_KEY], ...] = (
+        PADDING_VALUE)
+
+
+def _shift_into(
+        radar_image_matrix, x_offset_pixels, y_offset_pixels, output_matrix):
+    """Shifts each radar image and writes the result to existing array.
+
+    :param radar_image_matrix: See doc for `shift_radar_images`.
+    :param x_offset_pixels: Same.
+    :param y_offset_pixels: Same.
+    :param output_matrix: numpy array with the same shape as
+        `radar_image_matrix`, which will be overwritten with shifted images.
+    """
+
+    num_grid_rows = radar_image_matrix.shape[1]
+    num_grid_columns = radar_image_matrix.shape[2]
+
+    if y_offset_pixels >= 0:
+        output_rows = slice(y_offset_pixels, num_grid_rows)
+        input_rows = slice(0, num_grid_rows - y_offset_pixels)
+    else:
+        output_rows = slice(0, num_grid_rows + y_offset_pixels)
+        input_rows = slice(-y_offset_pixels, num_grid_rows)
+
+    if x_offset_pixels >= 0:
+        output_columns = slice(x_offset_pixels, num_grid_columns)
+        input_columns = slice(0, num_grid_columns - x_offset_pixels)
+    else:
+        output_columns = slice(0, num_grid_columns + x_offset_pixels)
+        input_columns = slice(-x_offset_pixels, num_grid_columns)
+
+    output_matrix[:] = PADDING_VALUE
+    output_matrix[:, output_rows, output_columns, ...] = radar_image_matrix[
+        :, input_rows, input_columns, ...]
+
+
+def _run_task(task):
+    """Runs one augmentation task (used by `augment_radar_images`).
+
+    :param task: Tuple with (function, dictionary of keyword arguments).
+    """
+
+    task[0](**task[1])
+
 
 def get_translations(
         num_translations, max_translation_pixels, num_grid_rows,
@@ -159,35 +375,10 @@ def shift_radar_images(radar_image_matrix, x_offset_pixels, y_offset_pixels):
     if x_offset_pixels == y_offset_pixels == 0:
         return radar_image_matrix + 0.
 
-    num_padding_columns_at_left = max([x_offset_pixels, 0])
-    num_padding_columns_at_right = max([-x_offset_pixels, 0])
-    num_padding_rows_at_top = max([y_offset_pixels, 0])
-    num_padding_rows_at_bottom = max([-y_offset_pixels, 0])
-
-    pad_width_input_arg = (
-        (0, 0),
-        (num_padding_rows_at_top, num_padding_rows_at_bottom),
-        (num_padding_columns_at_left, num_padding_columns_at_right)
-    )
-    num_dimensions = len(radar_image_matrix.shape)
-    for _ in range(3, num_dimensions):
-        pad_width_input_arg += ((0, 0),)
-
-    shifted_image_matrix = numpy.pad(
-        radar_image_matrix, pad_width=pad_width_input_arg, mode='constant',
-        constant_values=PADDING_VALUE)
-
-    if x_offset_pixels >= 0:
-        shifted_image_matrix = shifted_image_matrix[
-            :, :, :num_grid_columns, ...]
-    else:
-        shifted_image_matrix = shifted_image_matrix[
-            :, :, -num_grid_columns:, ...]
-
-    if y_offset_pixels >= 0:
-        shifted_image_matrix = shifted_image_matrix[:, :num_grid_rows, ...]
-    else:
-        shifted_image_matrix = shifted_image_matrix[:, -num_grid_rows:, ...]
+    shifted_image_matrix = numpy.empty_like(radar_image_matrix)
+    _shift_into(
+        radar_image_matrix=radar_image_matrix, x_offset_pixels=x_offset_pixels,
+        y_offset_pixels=y_offset_pixels, output_matrix=shifted_image_matrix)
 
     return shifted_image_matrix
 
@@ -209,9 +400,14 @@ def rotate_radar_images(radar_image_matrix, ccw_rotation_angle_deg):
     error_checking.assert_is_geq(ccw_rotation_angle_deg, -180.)
     error_checking.assert_is_leq(ccw_rotation_angle_deg, 180.)
 
-    return scipy_rotate(
-        input=radar_image_matrix, angle=-ccw_rotation_angle_deg, axes=(1, 2),
-        reshape=False, order=1, mode='constant', cval=PADDING_VALUE)
+    rotated_image_matrix = numpy.empty(
+        radar_image_matrix.shape, dtype=_get_output_dtype(radar_image_matrix))
+    _rotate_into(
+        radar_image_matrix=radar_image_matrix,
+        ccw_rotation_angle_deg=ccw_rotation_angle_deg,
+        output_matrix=rotated_image_matrix)
+
+    return rotated_image_matrix
 
 
 def noise_radar_images(radar_image_matrix, standard_deviation):
@@ -233,9 +429,12 @@ def noise_radar_images(radar_image_matrix, standard_deviation):
         max_num_dimensions=5)
     error_checking.assert_is_greater(standard_deviation, 0.)
 
-    noise_matrix = numpy.random.normal(
-        loc=0., scale=standard_deviation, size=radar_image_matrix.shape)
-    return radar_image_matrix + noise_matrix
+    noised_image_matrix = numpy.random.normal(
+        loc=0., scale=standard_deviation, size=radar_image_matrix.shape
+    ).astype(_get_output_dtype(radar_image_matrix))
+
+    noised_image_matrix += radar_image_matrix
+    return noised_image_matrix
 
 
 def flip_radar_images_x(radar_image_matrix):
@@ -266,3 +465,132 @@ def flip_radar_images_y(radar_image_matrix):
         max_num_dimensions=5)
 
     return numpy.flip(radar_image_matrix, axis=1)
+
+
+def augment_radar_images(
+        radar_image_matrix, x_offsets_pixels=None, y_offsets_pixels=None,
+        ccw_rotation_angles_deg=None, noise_standard_deviation=None,
+        num_noisings=0, flip_in_x=False, flip_in_y=False, num_threads=1):
+    """Creates all augmented versions of radar images at once.
+
+    Each augmentation is applied separately, so a given image can be translated
+    *or* rotated *or* noised *or* flipped.  All versions are written to one
+    preallocated matrix, rather than being concatenated one at a time.
+
+    E = number of examples
+    T = number of translations
+    R = number of rotations
+    V = 1 + T + R + num_noisings + flip_in_x + flip_in_y = number of versions
+
+    :param radar_image_matrix: numpy array of radar images, where the first axis
+        has length E.  See doc for `deep_learning_utils.check_radar_images`.
+    :param x_offsets_pixels: length-T numpy array of x-offsets (see doc for
+        `shift_radar_images`).  If you do not want translation, make this None.
+    :param y_offsets_pixels: Same but for y-offsets.
+    :param ccw_rotation_angles_deg: length-R numpy array of rotation angles
+        (see doc for `rotate_radar_images`).  If you do not want rotation, make
+        this None.
+    :param noise_standard_deviation: Standard deviation of Gaussian noise (see
+        doc for `noise_radar_images`).
+    :param num_noisings: Number of noised versions to create.
+    :param flip_in_x: Boolean flag.  If True, will create version flipped in x-
+        direction.
+    :param flip_in_y: Same but for y-direction.
+    :param num_threads: Number of threads used to create translated, rotated
+        and flipped versions.  Noised versions are always created in the
+        calling thread, so that random numbers are drawn in a reproducible
+        order.
+    :return: augmented_image_matrix: numpy array of radar images, where the
+        first axis has length V * E.  The first E images are the original
+        images, followed by all translated, rotated, noised, x-flipped, and
+        y-flipped images (in that order).
+    """
+
+    dl_utils.check_radar_images(
+        radar_image_matrix=radar_image_matrix, min_num_dimensions=3,
+        max_num_dimensions=5)
+
+    if x_offsets_pixels is None:
+        x_offsets_pixels = numpy.array([], dtype=int)
+        y_offsets_pixels = numpy.array([], dtype=int)
+    if ccw_rotation_angles_deg is None:
+        ccw_rotation_angles_deg = numpy.array([], dtype=float)
+
+    error_checking.assert_is_integer(num_noisings)
+    error_checking.assert_is_geq(num_noisings, 0)
+    if num_noisings > 0:
+        error_checking.assert_is_greater(noise_standard_deviation, 0.)
+
+    error_checking.assert_is_boolean(flip_in_x)
+    error_checking.assert_is_boolean(flip_in_y)
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
+
+    num_examples = radar_image_matrix.shape[0]
+    num_versions = (
+        1 + len(x_offsets_pixels) + len(ccw_rotation_angles_deg) +
+        num_noisings + int(flip_in_x) + int(flip_in_y)
+    )
+
+    augmented_image_matrix = numpy.empty(
+        (num_versions * num_examples,) + radar_image_matrix.shape[1:],
+        dtype=_get_output_dtype(radar_image_matrix))
+    list_of_blocks = [
+        augmented_image_matrix[(k * num_examples):((k + 1) * num_examples), ...]
+        for k in range(num_versions)
+    ]
+    list_of_blocks[0][:] = radar_image_matrix
+
+    list_of_tasks = []
+    version_index = 1
+
+    for i in range(len(x_offsets_pixels)):
+        list_of_tasks.append((
+            _shift_into, dict(
+                radar_image_matrix=radar_image_matrix,
+                x_offset_pixels=x_offsets_pixels[i],
+                y_offset_pixels=y_offsets_pixels[i],
+                output_matrix=list_of_blocks[version_index])
+        ))
+        version_index += 1
+
+    for i in range(len(ccw_rotation_angles_deg)):
+        list_of_tasks.append((
+            _rotate_into, dict(
+                radar_image_matrix=radar_image_matrix,
+                ccw_rotation_angle_deg=ccw_rotation_angles_deg[i],
+                output_matrix=list_of_blocks[version_index])
+        ))
+        version_index += 1
+
+    first_noised_index = version_index
+    version_index += num_noisings
+
+    if flip_in_x:
+        list_of_blocks[version_index][:] = flip_radar_images_x(
+            radar_image_matrix)
+        version_index += 1
+    if flip_in_y:
+        list_of_blocks[version_index][:] = flip_radar_images_y(
+            radar_image_matrix)
+
+    if num_threads == 1 or len(list_of_tasks) < 2:
+        for this_task in list_of_tasks:
+            _run_task(this_task)
+    else:
+        pool_object = ThreadPool(processes=num_threads)
+
+        try:
+            pool_object.map(_run_task, list_of_tasks)
+        finally:
+            pool_object.close()
+            pool_object.join()
+
+    for i in range(num_noisings):
+        this_block = list_of_blocks[first_noised_index + i]
+        this_block[:] = numpy.random.normal(
+            loc=0., scale=noise_standard_deviation,
+            size=radar_image_matrix.shape)
+        this_block += radar_image_matrix
+
+    return augmented_image_matrix
@@ -2,6 +2,7 @@
 
 import unittest
 import numpy
+from scipy.ndimage import rotate as scipy_rotate
 from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import data_augmentation
 
@@ -153,6 +154,35 @@ RADAR_MATRIX_3D_Y_FLIP = numpy.stack(
 RADAR_MATRIX_4D_Y_FLIP = numpy.stack((RADAR_MATRIX_3D_Y_FLIP,) * 6, axis=-1)
 RADAR_MATRIX_5D_Y_FLIP = numpy.stack((RADAR_MATRIX_4D_Y_FLIP,) * 5, axis=-2)
 
+# The following constants are used to test augment_radar_images.  Inputs are
+# `RADAR_MATRIX_4D_NO_FLIP`, which is the same as `RADAR_MATRIX_4D_NO_SHIFT`.
+THIS_FIRST_MATRIX = numpy.array([[0, 6.5, 2.5, 0],
+                                 [0, 7.5, 3.5, 0],
+                                 [0, 8.5, 4.5, 0]])
+THIS_SECOND_MATRIX = numpy.array([[0, 5, 4, 0],
+                                  [0, 8, 7, 0],
+                                  [0, 11, 10, 0]], dtype=float)
+
+THIS_MATRIX_3D = numpy.stack((THIS_FIRST_MATRIX, THIS_SECOND_MATRIX), axis=0)
+AUGMENTATION_MATRIX_4D_POS_ROTATION = numpy.stack(
+    (THIS_MATRIX_3D,) * 6, axis=-1)
+
+THIS_FIRST_MATRIX = numpy.array([[0, 4.5, 8.5, 0],
+                                 [0, 3.5, 7.5, 0],
+                                 [0, 2.5, 6.5, 0]])
+THIS_SECOND_MATRIX = numpy.array([[0, 10, 11, 0],
+                                  [0, 7, 8, 0],
+                                  [0, 4, 5, 0]], dtype=float)
+
+THIS_MATRIX_3D = numpy.stack((THIS_FIRST_MATRIX, THIS_SECOND_MATRIX), axis=0)
+AUGMENTATION_MATRIX_4D_NEG_ROTATION = numpy.stack(
+    (THIS_MATRIX_3D,) * 6, axis=-1)
+
+# The following constants are used to compare rotate_radar_images with
+# `scipy.ndimage.rotate`.  Latitude increases with row index, so a
+# counterclockwise rotation on the map is clockwise in array coordinates.
+ODD_CCW_ANGLES_DEG = numpy.array([30, -45, 135])
+
 
 class DataAugmentationTests(unittest.TestCase):
     """Each method is a unit test for data_augmentation.py."""
@@ -537,6 +567,84 @@ class DataAugmentationTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             this_radar_matrix, RADAR_MATRIX_5D_Y_FLIP, atol=TOLERANCE))
 
+    def test_noise_radar_images_float32(self):
+        """Ensures correct output from noise_radar_images.
+
+        In this case the input matrix is float32, so the output should be
+        float32 as well.
+        """
+
+        this_radar_matrix = data_augmentation.noise_radar_images(
+            radar_image_matrix=RADAR_MATRIX_4D_NO_FLIP.astype(numpy.float32),
+            standard_deviation=MAX_NOISE_STANDARD_DEVIATION)
+
+        self.assertTrue(this_radar_matrix.dtype == numpy.float32)
+        self.assertTrue(
+            this_radar_matrix.shape == RADAR_MATRIX_4D_NO_FLIP.shape)
+
+    def test_rotate_radar_images_odd_angles(self):
+        """Ensures correct output from rotate_radar_images.
+
+        In this case, angles are not multiples of 90 deg, so some pixels come
+        from outside the original image and must be set to the padding value.
+        """
+
+        for this_angle_deg in ODD_CCW_ANGLES_DEG:
+            this_radar_matrix = data_augmentation.rotate_radar_images(
+                radar_image_matrix=RADAR_MATRIX_4D_NO_FLIP,
+                ccw_rotation_angle_deg=this_angle_deg)
+
+            this_expected_matrix = scipy_rotate(
+                RADAR_MATRIX_4D_NO_FLIP, angle=-this_angle_deg, axes=(1, 2),
+                reshape=False, order=1, mode='constant',
+                cval=data_augmentation.PADDING_VALUE)
+
+            self.assertTrue(numpy.allclose(
+                this_radar_matrix, this_expected_matrix, atol=TOLERANCE))
+
+    def test_rotate_into_non_contiguous(self):
+        """Ensures that _rotate_into errors out.
+
+        In this case, the output matrix cannot be flattened without copying,
+        so rotated images would be written to a temporary copy.
+        """
+
+        these_dimensions = numpy.array(RADAR_MATRIX_4D_NO_FLIP.shape)
+        these_dimensions[2] += 1
+        this_output_matrix = numpy.full(these_dimensions, 0.)[:, :, :-1, :]
+
+        with self.assertRaises(AttributeError):
+            data_augmentation._rotate_into(
+                radar_image_matrix=RADAR_MATRIX_4D_NO_FLIP,
+                ccw_rotation_angle_deg=POSITIVE_CCW_ANGLE_DEG,
+                output_matrix=this_output_matrix)
+
+    def test_augment_radar_images(self):
+        """Ensures correct output from augment_radar_images."""
+
+        these_x_offsets_pixels = numpy.array(
+            [POSITIVE_X_OFFSET_PIXELS, NEGATIVE_X_OFFSET_PIXELS], dtype=int)
+        these_y_offsets_pixels = numpy.array(
+            [POSITIVE_Y_OFFSET_PIXELS, NEGATIVE_Y_OFFSET_PIXELS], dtype=int)
+        these_angles_deg = numpy.array(
+            [POSITIVE_CCW_ANGLE_DEG, NEGATIVE_CCW_ANGLE_DEG])
+
+        this_radar_matrix = data_augmentation.augment_radar_images(
+            radar_image_matrix=RADAR_MATRIX_4D_NO_FLIP,
+            x_offsets_pixels=these_x_offsets_pixels,
+            y_offsets_pixels=these_y_offsets_pixels,
+            ccw_rotation_angles_deg=these_angles_deg,
+            flip_in_x=True, flip_in_y=True, num_threads=2)
+
+        this_expected_matrix = numpy.concatenate((
+            RADAR_MATRIX_4D_NO_FLIP, RADAR_MATRIX_4D_POSITIVE_SHIFT,
+            RADAR_MATRIX_4D_NEGATIVE_SHIFT, AUGMENTATION_MATRIX_4D_POS_ROTATION,
+            AUGMENTATION_MATRIX_4D_NEG_ROTATION, RADAR_MATRIX_4D_X_FLIP,
+            RADAR_MATRIX_4D_Y_FLIP
+        ), axis=0)
+
+        self.assertTrue(numpy.allclose(
+            this_radar_matrix, this_expected_matrix, atol=TOLERANCE))
 
 if __name__ == '__main__':
     unittest.main()
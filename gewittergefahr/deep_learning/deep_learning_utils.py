@@ -16,8 +16,10 @@ K = number of classes for target variable
 T = number of file times (time steps or SPC dates)
 """
 
+import os
 import copy
 import pickle
+import collections
 import numpy
 from gewittergefahr.gg_utils import target_val_utils
 from gewittergefahr.gg_utils import radar_utils
@@ -25,6 +27,7 @@ from gewittergefahr.gg_utils import soundings
 from gewittergefahr.gg_utils import moisture_conversions
 from gewittergefahr.gg_utils import temperature_conversions
 from gewittergefahr.gg_utils import standard_atmosphere as standard_atmo
+from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -55,6 +58,16 @@ VALID_NORMALIZATION_TYPE_STRINGS = [
 DEFAULT_MIN_NORMALIZED_VALUE = -1.
 DEFAULT_MAX_NORMALIZED_VALUE = 1.
 
+# Each key is the absolute path to a normalization file, and each value is a
+# dictionary with the keys listed below.
+NORMALIZATION_PARAM_CACHE = collections.OrderedDict()
+MAX_FILES_IN_NORMALIZATION_CACHE = 100
+NORMALIZATION_TABLES_KEY = 'normalization_tables'
+COEFFICIENT_DICT_KEY = 'coefficient_dict'
+
+RADAR_TABLE_INDEX = 0
+SOUNDING_TABLE_INDEX = 2
+
 
 def _check_normalization_type(normalization_type_string):
     """Ensures that normalization type is valid.
@@ -74,6 +87,146 @@ def _check_normalization_type(normalization_type_string):
         raise ValueError(error_string)
 
 
+def _get_normalization_coeffs(
+        normalization_table, field_names, normalization_type_string,
+        min_normalized_value, max_normalized_value):
+    """Returns coefficients used to normalize each field.
+
+    Both z-score and min-max normalization are linear, so normalized values
+    can be computed as follows, where a and b are the coefficients returned by
+    this method.
+
+    x_normalized = a * x + b
+
+    F = number of fields
+
+    :param normalization_table: See doc for `normalize_radar_images`.
+    :param field_names: length-F list of field names.
+    :param normalization_type_string: See doc for `normalize_radar_images`.
+    :param min_normalized_value: Same.
+    :param max_normalized_value: Same.
+    :return: scale_values: length-F numpy array of multipliers (a in the above
+        equation).
+    :return: offset_values: length-F numpy array of offsets (b in the above
+        equation).
+    """
+
+    if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
+        min_values = normalization_table[MIN_VALUE_COLUMN].loc[
+            field_names].values.astype(float)
+        max_values = normalization_table[MAX_VALUE_COLUMN].loc[
+            field_names].values.astype(float)
+
+        scale_values = (
+            (max_normalized_value - min_normalized_value) /
+            (max_values - min_values)
+        )
+        offset_values = min_normalized_value - min_values * scale_values
+    else:
+        mean_values = normalization_table[MEAN_VALUE_COLUMN].loc[
+            field_names].values.astype(float)
+        standard_deviations = normalization_table[
+            STANDARD_DEVIATION_COLUMN].loc[field_names].values.astype(float)
+
+        scale_values = 1. / standard_deviations
+        offset_values = -mean_values * scale_values
+
+    return scale_values, offset_values
+
+
+def _read_normalization_coeffs(
+        normalization_param_file_name, table_index, field_names,
+        normalization_type_string, min_normalized_value, max_normalized_value):
+    """Reads normalization coefficients, using cache if possible.
+
+    The normalization file is read only once (unless it is modified), and
+    coefficients for each combination of input args are computed only once.
+    Both are stored in `NORMALIZATION_PARAM_CACHE`.
+
+    :param normalization_param_file_name: Path to normalization file.  Will be
+        read by `read_normalization_params_from_file`.
+    :param table_index: Index of table to use (in the list of tables returned
+        by `read_normalization_params_from_file`).
+    :param field_names: See doc for `_get_normalization_coeffs`.
+    :param normalization_type_string: Same.
+    :param min_normalized_value: Same.
+    :param max_normalized_value: Same.
+    :return: scale_values: Same.
+    :return: offset_values: Same.
+    """
+
+    modification_time_unix_sec = os.path.getmtime(
+        normalization_param_file_name)
+    cache_key = os.path.abspath(normalization_param_file_name)
+
+    cache_dict = general_utils.get_from_lru_cache(
+        cache_dict=NORMALIZATION_PARAM_CACHE, cache_key=cache_key,
+        modification_time_unix_sec=modification_time_unix_sec)
+
+    if cache_dict is None:
+        cache_dict = {
+            NORMALIZATION_TABLES_KEY: read_normalization_params_from_file(
+                normalization_param_file_name),
+            COEFFICIENT_DICT_KEY: {}
+        }
+
+        general_utils.add_to_lru_cache(
+            cache_dict=NORMALIZATION_PARAM_CACHE, cache_key=cache_key,
+            value=cache_dict, max_num_entries=MAX_FILES_IN_NORMALIZATION_CACHE,
+            modification_time_unix_sec=modification_time_unix_sec)
+
+    if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
+        coefficient_key = (
+            table_index, tuple(field_names), normalization_type_string,
+            min_normalized_value, max_normalized_value)
+    else:
+        coefficient_key = (
+            table_index, tuple(field_names), normalization_type_string)
+
+    if coefficient_key not in cache_dict[COEFFICIENT_DICT_KEY]:
+        cache_dict[COEFFICIENT_DICT_KEY][coefficient_key] = (
+            _get_normalization_coeffs(
+                normalization_table=
+                cache_dict[NORMALIZATION_TABLES_KEY][table_index],
+                field_names=field_names,
+                normalization_type_string=normalization_type_string,
+                min_normalized_value=min_normalized_value,
+                max_normalized_value=max_normalized_value)
+        )
+
+    return cache_dict[COEFFICIENT_DICT_KEY][coefficient_key]
+
+
+def _apply_normalization_coeffs(
+        data_matrix, scale_values, offset_values, invert=False):
+    """Applies normalization coefficients to data matrix.
+
+    Normalization is done in place (unless `data_matrix` is not floating-point,
+    in which case it is first converted to float32), with the coefficients for
+    each field broadcast along the last axis.
+
+    F = number of fields
+
+    :param data_matrix: numpy array, where the last axis has length F.
+    :param scale_values: See doc for `_get_normalization_coeffs`.
+    :param offset_values: Same.
+    :param invert: Boolean flag.  If True, will denormalize rather than
+        normalize.
+    :return: data_matrix: Same as input but (de)normalized.
+    """
+
+    if not numpy.issubdtype(data_matrix.dtype, numpy.floating):
+        data_matrix = data_matrix.astype(numpy.float32)
+
+    if invert:
+        offset_values = -offset_values / scale_values
+        scale_values = 1. / scale_values
+
+    data_matrix *= scale_values.astype(data_matrix.dtype)
+    data_matrix += offset_values.astype(data_matrix.dtype)
+    return data_matrix
+
+
 def check_class_fractions(sampling_fraction_by_class_dict, target_name):
     """Error-checks sampling fractions (one for each class of target variable).
 
@@ -397,9 +550,6 @@ def normalize_radar_images(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[0]
 
     check_radar_images(
         radar_image_matrix=radar_image_matrix, min_num_dimensions=4,
@@ -416,31 +566,23 @@ def normalize_radar_images(
         error_checking.assert_is_greater(
             max_normalized_value, min_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = (
-                (radar_image_matrix[..., j] - this_min_value) /
-                (this_max_value - this_min_value))
-
-            radar_image_matrix[..., j] = min_normalized_value + (
-                radar_image_matrix[..., j] *
-                (max_normalized_value - min_normalized_value))
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = (
-                (radar_image_matrix[..., j] - this_mean) /
-                this_standard_deviation)
+    if test_mode:
+        scale_values, offset_values = _get_normalization_coeffs(
+            normalization_table=normalization_table, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
+    else:
+        scale_values, offset_values = _read_normalization_coeffs(
+            normalization_param_file_name=normalization_param_file_name,
+            table_index=RADAR_TABLE_INDEX, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
 
-    return radar_image_matrix
+    return _apply_normalization_coeffs(
+        data_matrix=radar_image_matrix, scale_values=scale_values,
+        offset_values=offset_values)
 
 
 def denormalize_radar_images(
@@ -465,9 +607,6 @@ def denormalize_radar_images(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[0]
 
     check_radar_images(
         radar_image_matrix=radar_image_matrix, min_num_dimensions=4,
@@ -488,29 +627,23 @@ def denormalize_radar_images(
         # error_checking.assert_is_leq_numpy_array(
         #     radar_image_matrix, max_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = (
-                (radar_image_matrix[..., j] - min_normalized_value) /
-                (max_normalized_value - min_normalized_value))
-
-            radar_image_matrix[..., j] = this_min_value + (
-                radar_image_matrix[..., j] * (this_max_value - this_min_value))
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = this_mean + (
-                this_standard_deviation * radar_image_matrix[..., j])
+    if test_mode:
+        scale_values, offset_values = _get_normalization_coeffs(
+            normalization_table=normalization_table, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
+    else:
+        scale_values, offset_values = _read_normalization_coeffs(
+            normalization_param_file_name=normalization_param_file_name,
+            table_index=RADAR_TABLE_INDEX, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
 
-    return radar_image_matrix
+    return _apply_normalization_coeffs(
+        data_matrix=radar_image_matrix, scale_values=scale_values,
+        offset_values=offset_values, invert=True)
 
 
 def mask_low_reflectivity_pixels(
@@ -595,9 +728,6 @@ def normalize_soundings(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[2]
 
     error_checking.assert_is_string_list(field_names)
     error_checking.assert_is_numpy_array(
@@ -611,33 +741,23 @@ def normalize_soundings(
         error_checking.assert_is_greater(
             max_normalized_value, min_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            sounding_matrix[..., j] = (
-                (sounding_matrix[..., j] - this_min_value) /
-                (this_max_value - this_min_value)
-            )
-            sounding_matrix[..., j] = min_normalized_value + (
-                sounding_matrix[..., j] *
-                (max_normalized_value - min_normalized_value)
-            )
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN
-            ].loc[field_names[j]]
-
-            sounding_matrix[..., j] = (
-                (sounding_matrix[..., j] - this_mean) / this_standard_deviation
-            )
+    if test_mode:
+        scale_values, offset_values = _get_normalization_coeffs(
+            normalization_table=normalization_table, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
+    else:
+        scale_values, offset_values = _read_normalization_coeffs(
+            normalization_param_file_name=normalization_param_file_name,
+            table_index=SOUNDING_TABLE_INDEX, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
 
-    return sounding_matrix
+    return _apply_normalization_coeffs(
+        data_matrix=sounding_matrix, scale_values=scale_values,
+        offset_values=offset_values)
 
 
 def denormalize_soundings(
@@ -662,9 +782,6 @@ def denormalize_soundings(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[2]
 
     error_checking.assert_is_string_list(field_names)
     error_checking.assert_is_numpy_array(
@@ -682,32 +799,23 @@ def denormalize_soundings(
         # error_checking.assert_is_leq_numpy_array(
         #     sounding_matrix, max_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            sounding_matrix[..., j] = (
-                (sounding_matrix[..., j] - min_normalized_value) /
-                (max_normalized_value - min_normalized_value)
-            )
-            sounding_matrix[..., j] = this_min_value + (
-                sounding_matrix[..., j] * (this_max_value - this_min_value)
-            )
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN
-            ].loc[field_names[j]]
-
-            sounding_matrix[..., j] = this_mean + (
-                this_standard_deviation * sounding_matrix[..., j]
-            )
-
-    return sounding_matrix
+    if test_mode:
+        scale_values, offset_values = _get_normalization_coeffs(
+            normalization_table=normalization_table, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
+    else:
+        scale_values, offset_values = _read_normalization_coeffs(
+            normalization_param_file_name=normalization_param_file_name,
+            table_index=SOUNDING_TABLE_INDEX, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
+
+    return _apply_normalization_coeffs(
+        data_matrix=sounding_matrix, scale_values=scale_values,
+        offset_values=offset_values, invert=True)
 
 
 def soundings_to_metpy_dictionaries(
@@ -1,6 +1,7 @@
 """Unit tests for deep_learning_utils.py"""
 
 import copy
+import os.path
 import unittest
 import numpy
 import pandas
@@ -10,6 +11,7 @@ from gewittergefahr.gg_utils import soundings
 from gewittergefahr.gg_utils import temperature_conversions
 from gewittergefahr.gg_utils import moisture_conversions
 from gewittergefahr.gg_utils import standard_atmosphere as standard_atmo
+from gewittergefahr.gg_utils import unit_test_utils
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 
 TOLERANCE = 1e-6
@@ -470,6 +472,72 @@ WIND_INDICES_TO_KEEP = numpy.array(
     [4, 14, 15, 1, 2, 7, 11, 13, 17, 18, 23, 38, 43, 44, 45, 0, 3, 9, 10, 12,
      16, 24, 25, 26, 5, 6, 8, 21, 28, 32], dtype=int)
 
+# The following constants are used to test _get_normalization_coeffs,
+# _apply_normalization_coeffs, and _read_normalization_coeffs.
+NEW_RADAR_NORMALIZATION_TABLE = RADAR_NORMALIZATION_TABLE * 2
+
+
+def _normalize_one_field_at_a_time(
+        data_matrix, field_names, normalization_table,
+        normalization_type_string, min_normalized_value, max_normalized_value,
+        invert):
+    """(De)normalizes one field at a time.
+
+    This is the method used before normalization coefficients were introduced,
+    so it is used to check `_get_normalization_coeffs` and
+    `_apply_normalization_coeffs`.
+
+    :param data_matrix: numpy array, where the last axis is field.
+    :param field_names: 1-D list of field names.
+    :param normalization_table: See doc for `dl_utils.normalize_radar_images`.
+    :param normalization_type_string: Same.
+    :param min_normalized_value: Same.
+    :param max_normalized_value: Same.
+    :param invert: Boolean flag.  If True, will denormalize rather than
+        normalize.
+    :return: data_matrix: Same as input but (de)normalized.
+    """
+
+    data_matrix = data_matrix.astype(float)
+    use_minmax = (
+        normalization_type_string == dl_utils.MINMAX_NORMALIZATION_TYPE_STRING)
+
+    for j in range(len(field_names)):
+        if use_minmax:
+            this_min_value = normalization_table[
+                dl_utils.MIN_VALUE_COLUMN].loc[field_names[j]]
+            this_max_value = normalization_table[
+                dl_utils.MAX_VALUE_COLUMN].loc[field_names[j]]
+
+            if invert:
+                data_matrix[..., j] = (
+                    (data_matrix[..., j] - min_normalized_value) /
+                    (max_normalized_value - min_normalized_value))
+                data_matrix[..., j] = this_min_value + (
+                    data_matrix[..., j] * (this_max_value - this_min_value))
+            else:
+                data_matrix[..., j] = (
+                    (data_matrix[..., j] - this_min_value) /
+                    (this_max_value - this_min_value))
+                data_matrix[..., j] = min_normalized_value + (
+                    data_matrix[..., j] *
+                    (max_normalized_value - min_normalized_value))
+        else:
+            this_mean = normalization_table[
+                dl_utils.MEAN_VALUE_COLUMN].loc[field_names[j]]
+            this_standard_deviation = normalization_table[
+                dl_utils.STANDARD_DEVIATION_COLUMN].loc[field_names[j]]
+
+            if invert:
+                data_matrix[..., j] = this_mean + (
+                    this_standard_deviation * data_matrix[..., j])
+            else:
+                data_matrix[..., j] = (
+                    (data_matrix[..., j] - this_mean) /
+                    this_standard_deviation)
+
+    return data_matrix
+
 
 def _compare_lists_of_metpy_dicts(first_list_of_dicts, second_list_of_dicts):
     """Compares two lists of MetPy dictionaries.
@@ -501,9 +569,46 @@ def _compare_lists_of_metpy_dicts(first_list_of_dicts, second_list_of_dicts):
     return True
 
 
-class DeepLearningUtilsTests(unittest.TestCase):
+class DeepLearningUtilsTests(unit_test_utils.TestCaseWithTempDir):
     """Each method is a unit test for deep_learning_utils.py."""
 
+    def _check_normalization_coeffs(
+            self, data_matrix, field_names, normalization_table,
+            normalization_type_string, invert):
+        """Compares coefficient-based normalization to field-by-field method.
+
+        :param data_matrix: See doc for `_normalize_one_field_at_a_time`.
+        :param field_names: Same.
+        :param normalization_table: Same.
+        :param normalization_type_string: Same.
+        :param invert: Same.
+        """
+
+        these_scale_values, these_offset_values = (
+            dl_utils._get_normalization_coeffs(
+                normalization_table=normalization_table,
+                field_names=field_names,
+                normalization_type_string=normalization_type_string,
+                min_normalized_value=MIN_NORMALIZED_VALUE,
+                max_normalized_value=MAX_NORMALIZED_VALUE)
+        )
+
+        this_actual_matrix = dl_utils._apply_normalization_coeffs(
+            data_matrix=copy.deepcopy(data_matrix),
+            scale_values=these_scale_values, offset_values=these_offset_values,
+            invert=invert)
+
+        this_expected_matrix = _normalize_one_field_at_a_time(
+            data_matrix=data_matrix, field_names=field_names,
+            normalization_table=normalization_table,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=MIN_NORMALIZED_VALUE,
+            max_normalized_value=MAX_NORMALIZED_VALUE, invert=invert)
+
+        self.assertTrue(this_actual_matrix.dtype == data_matrix.dtype)
+        self.assertTrue(numpy.allclose(
+            this_actual_matrix, this_expected_matrix, atol=TOLERANCE))
+
     def test_class_fractions_to_num_examples_tornado_large(self):
         """Ensures correct output from class_fractions_to_num_examples.
 
@@ -1172,6 +1277,136 @@ class DeepLearningUtilsTests(unittest.TestCase):
 
         self.assertTrue(numpy.array_equal(these_indices, WIND_INDICES_TO_KEEP))
 
+    def test_normalization_coeffs_radar_z(self):
+        """Ensures correct output from _apply_normalization_coeffs.
+
+        In this case, radar images are normalized with z-scores.
+        """
+
+        self._check_normalization_coeffs(
+            data_matrix=RADAR_MATRIX_5D_UNNORMALIZED,
+            field_names=RADAR_FIELD_NAMES,
+            normalization_table=RADAR_NORMALIZATION_TABLE,
+            normalization_type_string=dl_utils.Z_NORMALIZATION_TYPE_STRING,
+            invert=False)
+
+    def test_normalization_coeffs_radar_z_invert(self):
+        """Ensures correct output from _apply_normalization_coeffs.
+
+        In this case, radar images are denormalized from z-scores.
+        """
+
+        self._check_normalization_coeffs(
+            data_matrix=RADAR_MATRIX_5D_Z_SCORES,
+            field_names=RADAR_FIELD_NAMES,
+            normalization_table=RADAR_NORMALIZATION_TABLE,
+            normalization_type_string=dl_utils.Z_NORMALIZATION_TYPE_STRING,
+            invert=True)
+
+    def test_normalization_coeffs_radar_minmax(self):
+        """Ensures correct output from _apply_normalization_coeffs.
+
+        In this case, radar images are normalized with min-max.
+        """
+
+        self._check_normalization_coeffs(
+            data_matrix=RADAR_MATRIX_5D_UNNORMALIZED,
+            field_names=RADAR_FIELD_NAMES,
+            normalization_table=RADAR_NORMALIZATION_TABLE,
+            normalization_type_string=dl_utils.MINMAX_NORMALIZATION_TYPE_STRING,
+            invert=False)
+
+    def test_normalization_coeffs_radar_minmax_invert(self):
+        """Ensures correct output from _apply_normalization_coeffs.
+
+        In this case, radar images are denormalized from min-max.
+        """
+
+        self._check_normalization_coeffs(
+            data_matrix=RADAR_MATRIX_5D_MINMAX,
+            field_names=RADAR_FIELD_NAMES,
+            normalization_table=RADAR_NORMALIZATION_TABLE,
+            normalization_type_string=dl_utils.MINMAX_NORMALIZATION_TYPE_STRING,
+            invert=True)
+
+    def test_normalization_coeffs_soundings_z(self):
+        """Ensures correct output from _apply_normalization_coeffs.
+
+        In this case, soundings are normalized with z-scores.
+        """
+
+        self._check_normalization_coeffs(
+            data_matrix=SOUNDING_MATRIX_UNNORMALIZED,
+            field_names=SOUNDING_FIELD_NAMES,
+            normalization_table=SOUNDING_NORMALIZATION_TABLE,
+            normalization_type_string=dl_utils.Z_NORMALIZATION_TYPE_STRING,
+            invert=False)
+
+    def test_normalization_coeffs_soundings_minmax_invert(self):
+        """Ensures correct output from _apply_normalization_coeffs.
+
+        In this case, soundings are denormalized from min-max.
+        """
+
+        self._check_normalization_coeffs(
+            data_matrix=SOUNDING_MATRIX_MINMAX,
+            field_names=SOUNDING_FIELD_NAMES,
+            normalization_table=SOUNDING_NORMALIZATION_TABLE,
+            normalization_type_string=dl_utils.MINMAX_NORMALIZATION_TYPE_STRING,
+            invert=True)
+
+    def test_read_normalization_coeffs_modified(self):
+        """Ensures that _read_normalization_coeffs notices modified file.
+
+        In this case, the file is rewritten with new parameters after
+        coefficients are cached, so coefficients should be recomputed.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'params.p')
+
+        for this_table in [RADAR_NORMALIZATION_TABLE,
+                           NEW_RADAR_NORMALIZATION_TABLE]:
+            dl_utils.write_normalization_params(
+                pickle_file_name=this_file_name,
+                radar_table_no_height=this_table,
+                radar_table_with_height=this_table,
+                sounding_table_no_height=SOUNDING_NORMALIZATION_TABLE,
+                sounding_table_with_height=SOUNDING_NORMALIZATION_TABLE)
+
+            # Filesystem timestamps may be coarser than the time between
+            # writes, so force the modification time to change.
+            this_time_unix_sec = (
+                0 if this_table is RADAR_NORMALIZATION_TABLE else 1000)
+            os.utime(this_file_name, (this_time_unix_sec, this_time_unix_sec))
+
+            these_scale_values, these_offset_values = (
+                dl_utils._read_normalization_coeffs(
+                    normalization_param_file_name=this_file_name,
+                    table_index=dl_utils.RADAR_TABLE_INDEX,
+                    field_names=RADAR_FIELD_NAMES,
+                    normalization_type_string=
+                    dl_utils.Z_NORMALIZATION_TYPE_STRING,
+                    min_normalized_value=MIN_NORMALIZED_VALUE,
+                    max_normalized_value=MAX_NORMALIZED_VALUE)
+            )
+
+            these_expected_scale_values, these_expected_offset_values = (
+                dl_utils._get_normalization_coeffs(
+                    normalization_table=this_table,
+                    field_names=RADAR_FIELD_NAMES,
+                    normalization_type_string=
+                    dl_utils.Z_NORMALIZATION_TYPE_STRING,
+                    min_normalized_value=MIN_NORMALIZED_VALUE,
+                    max_normalized_value=MAX_NORMALIZED_VALUE)
+            )
+
+            self.assertTrue(numpy.allclose(
+                these_scale_values, these_expected_scale_values,
+                atol=TOLERANCE))
+            self.assertTrue(numpy.allclose(
+                these_offset_values, these_expected_offset_values,
+                atol=TOLERANCE))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,452 @@
+"""Deals with example shards for deep learning.
+
+An "example shard" is a file with a fixed number of input examples (the last
+shard may have fewer), written by `input_examples.open_example_file_writer`.
+Examples are assigned to shards randomly, so each shard is a random sample from
+the whole dataset.
+
+Each set of shards comes with a manifest, which contains the shard and row for
+each example, as well as its storm ID, valid time and target value.  Thus,
+class-balanced batches can be drawn from the manifest and only the relevant
+rows need to be read from each shard.
+
+--- NOTATION ---
+
+The following letters will be used throughout this module.
+
+E = number of examples (storm objects)
+S = number of shards
+K = number of target classes
+"""
+
+import pickle
+import os.path
+import numpy
+from gewittergefahr.gg_utils import number_rounding
+from gewittergefahr.gg_utils import file_system_utils
+from gewittergefahr.gg_utils import error_checking
+from gewittergefahr.deep_learning import input_examples
+
+NUM_SHARDS_PER_DIRECTORY = 1000
+DEFAULT_NUM_EXAMPLES_PER_SHARD = 256
+DEFAULT_MAX_OPEN_SHARDS = 100
+MANIFEST_FILE_NAME = 'shard_manifest.p'
+
+TARGET_NAME_KEY = 'target_name'
+NUM_EXAMPLES_PER_SHARD_KEY = 'num_examples_per_shard'
+SHARD_INDICES_KEY = 'shard_indices'
+ROW_INDICES_KEY = 'row_indices'
+STORM_IDS_KEY = 'storm_ids'
+STORM_TIMES_KEY = 'storm_times_unix_sec'
+TARGET_VALUES_KEY = 'target_values'
+CLASS_LABELS_KEY = 'class_labels'
+CLASS_COUNT_MATRIX_KEY = 'class_count_matrix'
+
+MANIFEST_KEYS = [
+    TARGET_NAME_KEY, NUM_EXAMPLES_PER_SHARD_KEY, SHARD_INDICES_KEY,
+    ROW_INDICES_KEY, STORM_IDS_KEY, STORM_TIMES_KEY, TARGET_VALUES_KEY,
+    CLASS_LABELS_KEY, CLASS_COUNT_MATRIX_KEY
+]
+
+
+def _assign_examples_to_shards(num_examples_total, num_examples_per_shard):
+    """Randomly assigns examples to shards.
+
+    Each shard receives `num_examples_per_shard` examples, except the last
+    shard, which may receive fewer.
+
+    :param num_examples_total: Total number of examples (E in the above
+        discussion).
+    :param num_examples_per_shard: Number of examples per shard.
+    :return: shard_indices: length-E numpy array of shard indices (integers in
+        0...[S - 1]).
+    """
+
+    return (
+        numpy.random.permutation(num_examples_total) // num_examples_per_shard
+    )
+
+
+def _get_class_count_matrix(shard_indices, target_values, num_shards):
+    """Counts examples in each shard and class.
+
+    :param shard_indices: length-E numpy array of shard indices.
+    :param target_values: length-E numpy array of target values (integer class
+        labels).
+    :param num_shards: Number of shards (S in the above discussion).
+    :return: class_labels: length-K numpy array of class labels (sorted in
+        ascending order).
+    :return: class_count_matrix: S-by-K numpy array, where
+        class_count_matrix[i, k] is the number of examples in the [i]th shard
+        with label class_labels[k].
+    """
+
+    class_labels, class_indices = numpy.unique(
+        target_values, return_inverse=True)
+
+    class_count_matrix = numpy.full(
+        (num_shards, len(class_labels)), 0, dtype=int)
+    numpy.add.at(class_count_matrix, (shard_indices, class_indices), 1)
+
+    return class_labels, class_count_matrix
+
+
+def find_shard_file(top_directory_name, shard_index,
+                    raise_error_if_missing=True):
+    """Looks for file with one example shard.
+
+    :param top_directory_name: Name of top-level directory with shards.
+    :param shard_index: Shard index (non-negative integer).
+    :param raise_error_if_missing: Boolean flag.  If file is missing and
+        `raise_error_if_missing = True`, this method will error out.
+    :return: shard_file_name: Path to shard file.  If file is missing and
+        `raise_error_if_missing = False`, this is the *expected* path.
+    :raises: ValueError: if file is missing and `raise_error_if_missing = True`.
+    """
+
+    error_checking.assert_is_string(top_directory_name)
+    error_checking.assert_is_integer(shard_index)
+    error_checking.assert_is_geq(shard_index, 0)
+    error_checking.assert_is_boolean(raise_error_if_missing)
+
+    first_shard_index = int(number_rounding.floor_to_nearest(
+        shard_index, NUM_SHARDS_PER_DIRECTORY))
+    last_shard_index = first_shard_index + NUM_SHARDS_PER_DIRECTORY - 1
+
+    shard_file_name = (
+        '{0:s}/shards{1:07d}-{2:07d}/input_examples_shard{3:07d}.nc'
+    ).format(top_directory_name, first_shard_index, last_shard_index,
+             shard_index)
+
+    if raise_error_if_missing and not os.path.isfile(shard_file_name):
+        error_string = 'Cannot find file.  Expected at: "{0:s}"'.format(
+            shard_file_name)
+        raise ValueError(error_string)
+
+    return shard_file_name
+
+
+def find_manifest_file(top_directory_name, raise_error_if_missing=True):
+    """Looks for manifest file.
+
+    :param top_directory_name: Name of top-level directory with shards.
+    :param raise_error_if_missing: Boolean flag.  If file is missing and
+        `raise_error_if_missing = True`, this method will error out.
+    :return: manifest_file_name: Path to manifest file.  If file is missing and
+        `raise_error_if_missing = False`, this is the *expected* path.
+    :raises: ValueError: if file is missing and `raise_error_if_missing = True`.
+    """
+
+    error_checking.assert_is_string(top_directory_name)
+    error_checking.assert_is_boolean(raise_error_if_missing)
+
+    manifest_file_name = '{0:s}/{1:s}'.format(
+        top_directory_name, MANIFEST_FILE_NAME)
+
+    if raise_error_if_missing and not os.path.isfile(manifest_file_name):
+        error_string = 'Cannot find file.  Expected at: "{0:s}"'.format(
+            manifest_file_name)
+        raise ValueError(error_string)
+
+    return manifest_file_name
+
+
+def find_shard_files_for_manifest(manifest_file_name, manifest_dict):
+    """Finds all shard files listed in a manifest.
+
+    :param manifest_file_name: Path to manifest file.  Shards are assumed to be
+        in the same top-level directory.
+    :param manifest_dict: Dictionary read from the manifest file (see doc for
+        `read_manifest`).
+    :return: shard_file_names: length-S list of paths to shard files.
+    """
+
+    top_directory_name = os.path.dirname(manifest_file_name)
+    num_shards = manifest_dict[CLASS_COUNT_MATRIX_KEY].shape[0]
+
+    return [
+        find_shard_file(top_directory_name=top_directory_name, shard_index=i)
+        for i in range(num_shards)
+    ]
+
+
+def write_manifest(pickle_file_name, manifest_dict):
+    """Writes manifest to Pickle file.
+
+    :param pickle_file_name: Path to output file.
+    :param manifest_dict: Dictionary with the following keys.
+    manifest_dict['target_name']: Name of target variable.
+    manifest_dict['num_examples_per_shard']: Number of examples per shard (the
+        last shard may have fewer).
+    manifest_dict['shard_indices']: length-E numpy array of shard indices.
+    manifest_dict['row_indices']: length-E numpy array of rows (indices of
+        examples within the shard file).
+    manifest_dict['storm_ids']: length-E list of storm IDs (strings).
+    manifest_dict['storm_times_unix_sec']: length-E numpy array of valid times.
+    manifest_dict['target_values']: length-E numpy array of target values
+        (integer class labels).
+    manifest_dict['class_labels']: length-K numpy array of class labels.
+    manifest_dict['class_count_matrix']: S-by-K numpy array with number of
+        examples in each shard and class (see doc for
+        `_get_class_count_matrix`).
+    """
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=pickle_file_name)
+    pickle_file_handle = open(pickle_file_name, 'wb')
+    pickle.dump(manifest_dict, pickle_file_handle)
+    pickle_file_handle.close()
+
+
+def read_manifest(pickle_file_name):
+    """Reads manifest from Pickle file.
+
+    :param pickle_file_name: Path to input file.
+    :return: manifest_dict: See doc for `write_manifest`.
+    :raises: ValueError: if any expected key is missing.
+    """
+
+    pickle_file_handle = open(pickle_file_name, 'rb')
+    manifest_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    missing_keys = list(set(MANIFEST_KEYS) - set(manifest_dict.keys()))
+    if len(missing_keys) == 0:
+        return manifest_dict
+
+    error_string = (
+        '\n{0:s}\nKeys listed above were expected, but not found, in file '
+        '"{1:s}".'
+    ).format(str(missing_keys), pickle_file_name)
+
+    raise ValueError(error_string)
+
+
+def sample_examples(
+        manifest_dict, class_to_num_examples_dict, shard_indices_to_use=None,
+        first_time_unix_sec=None, last_time_unix_sec=None, test_mode=False):
+    """Draws examples from the manifest (without reading any shard).
+
+    N = number of examples drawn
+
+    :param manifest_dict: See doc for `write_manifest`.
+    :param class_to_num_examples_dict: See doc for
+        `input_examples.filter_examples_by_class`.
+    :param shard_indices_to_use: 1-D numpy array of shards from which to draw.
+        If None, examples will be drawn from all shards.
+    :param first_time_unix_sec: First valid time to draw.  If None, there is no
+        lower limit.
+    :param last_time_unix_sec: Last valid time to draw.  If None, there is no
+        upper limit.
+    :param test_mode: Never mind.  Just leave this alone.
+    :return: shard_indices: length-N numpy array of shard indices.
+    :return: row_indices: length-N numpy array of rows within said shards.
+        Examples are sorted by shard and then by row, to make reading faster.
+    """
+
+    all_shard_indices = manifest_dict[SHARD_INDICES_KEY]
+    storm_times_unix_sec = manifest_dict[STORM_TIMES_KEY]
+    good_flags = numpy.full(len(all_shard_indices), True, dtype=bool)
+
+    if shard_indices_to_use is not None:
+        error_checking.assert_is_integer_numpy_array(shard_indices_to_use)
+        good_flags = numpy.logical_and(
+            good_flags, numpy.in1d(all_shard_indices, shard_indices_to_use))
+
+    if first_time_unix_sec is not None:
+        good_flags = numpy.logical_and(
+            good_flags, storm_times_unix_sec >= first_time_unix_sec)
+
+    if last_time_unix_sec is not None:
+        good_flags = numpy.logical_and(
+            good_flags, storm_times_unix_sec <= last_time_unix_sec)
+
+    good_indices = numpy.where(good_flags)[0]
+    subindices = input_examples.filter_examples_by_class(
+        target_values=manifest_dict[TARGET_VALUES_KEY][good_indices],
+        class_to_num_examples_dict=class_to_num_examples_dict,
+        test_mode=test_mode)
+    good_indices = good_indices[subindices]
+
+    shard_indices = all_shard_indices[good_indices]
+    row_indices = manifest_dict[ROW_INDICES_KEY][good_indices]
+
+    sort_indices = numpy.lexsort((row_indices, shard_indices))
+    return shard_indices[sort_indices], row_indices[sort_indices]
+
+
+def convert_examples_to_shards(
+        input_example_file_names, top_output_dir_name,
+        num_examples_per_shard=DEFAULT_NUM_EXAMPLES_PER_SHARD,
+        radar_field_names=None, max_open_shards=DEFAULT_MAX_OPEN_SHARDS):
+    """Converts files with input examples to shards.
+
+    Shards are written in groups of `max_open_shards`.  All shards in the
+    group stay open (see `input_examples.open_example_file_writer`) while each
+    input file is read, and only the examples assigned to the group are read
+    from each input file.  Thus, if there are no more than `max_open_shards`
+    shards, each input file is read once and each shard is opened once.
+
+    :param input_example_file_names: 1-D list of paths to input files (will be
+        read by `input_examples.read_example_file`).
+    :param top_output_dir_name: Name of top-level output directory.  Shards will
+        be written to locations determined by `find_shard_file` and the manifest
+        to the location determined by `find_manifest_file`.
+    :param num_examples_per_shard: Number of examples per shard.
+    :param radar_field_names: 1-D list of radar fields to keep.  If None, all
+        radar fields will be kept.
+    :param max_open_shards: Max number of shards open at once.
+    :return: manifest_dict: See doc for `write_manifest`.
+    """
+
+    error_checking.assert_is_string_list(input_example_file_names)
+    error_checking.assert_is_integer(num_examples_per_shard)
+    error_checking.assert_is_geq(num_examples_per_shard, 2)
+    error_checking.assert_is_integer(max_open_shards)
+    error_checking.assert_is_greater(max_open_shards, 0)
+
+    num_examples_by_file = numpy.full(
+        len(input_example_file_names), 0, dtype=int)
+    max_storm_id_length = 0
+    target_name = None
+
+    for i in range(len(input_example_file_names)):
+        print 'Reading metadata from: "{0:s}"...'.format(
+            input_example_file_names[i])
+        this_example_dict = input_examples.read_example_file(
+            netcdf_file_name=input_example_file_names[i], metadata_only=True)
+
+        these_storm_ids = this_example_dict[input_examples.STORM_IDS_KEY]
+        num_examples_by_file[i] = len(these_storm_ids)
+        max_storm_id_length = max(
+            [max_storm_id_length] + [len(s) for s in these_storm_ids]
+        )
+        if target_name is None:
+            target_name = this_example_dict[input_examples.TARGET_NAME_KEY]
+
+    num_examples_total = numpy.sum(num_examples_by_file)
+    num_shards = int(numpy.ceil(
+        float(num_examples_total) / num_examples_per_shard
+    ))
+
+    print (
+        'Num input examples = {0:d} ... num examples per shard = {1:d} ... '
+        'num shards = {2:d}'
+    ).format(num_examples_total, num_examples_per_shard, num_shards)
+
+    example_to_shard_indices = _assign_examples_to_shards(
+        num_examples_total=num_examples_total,
+        num_examples_per_shard=num_examples_per_shard)
+    first_example_index_by_file = (
+        numpy.cumsum(num_examples_by_file) - num_examples_by_file
+    )
+
+    shard_file_names = [
+        find_shard_file(top_directory_name=top_output_dir_name, shard_index=j,
+                        raise_error_if_missing=False)
+        for j in range(num_shards)
+    ]
+
+    for this_file_name in shard_file_names:
+        if not os.path.isfile(this_file_name):
+            continue
+        print 'Deleting old shard: "{0:s}"...'.format(this_file_name)
+        os.remove(this_file_name)
+
+    num_rows_by_shard = numpy.full(num_shards, 0, dtype=int)
+    shard_indices = numpy.full(num_examples_total, -1, dtype=int)
+    row_indices = numpy.full(num_examples_total, -1, dtype=int)
+    storm_ids = [''] * num_examples_total
+    storm_times_unix_sec = numpy.full(num_examples_total, -1, dtype=int)
+    target_values = numpy.full(num_examples_total, -1, dtype=int)
+
+    for first_shard_index in range(0, num_shards, max_open_shards):
+        last_shard_index = min([first_shard_index + max_open_shards,
+                                num_shards])
+        shard_index_to_dataset = {}
+
+        try:
+            for i in range(len(input_example_file_names)):
+                these_shard_indices = example_to_shard_indices[
+                    first_example_index_by_file[i]:
+                    (first_example_index_by_file[i] + num_examples_by_file[i])
+                ]
+                these_indices = numpy.where(numpy.logical_and(
+                    these_shard_indices >= first_shard_index,
+                    these_shard_indices < last_shard_index
+                ))[0]
+
+                if len(these_indices) == 0:
+                    continue
+
+                print 'Reading data from: "{0:s}"...'.format(
+                    input_example_file_names[i])
+                example_dict = input_examples.read_example_file(
+                    netcdf_file_name=input_example_file_names[i],
+                    radar_field_names_to_keep=radar_field_names,
+                    indices_to_read=these_indices)
+
+                these_shard_indices = these_shard_indices[these_indices]
+                these_manifest_indices = (
+                    first_example_index_by_file[i] + these_indices
+                )
+
+                storm_times_unix_sec[these_manifest_indices] = example_dict[
+                    input_examples.STORM_TIMES_KEY]
+                target_values[these_manifest_indices] = example_dict[
+                    input_examples.TARGET_VALUES_KEY]
+                for k in range(len(these_manifest_indices)):
+                    storm_ids[these_manifest_indices[k]] = example_dict[
+                        input_examples.STORM_IDS_KEY][k]
+
+                for j in numpy.unique(these_shard_indices):
+                    these_subindices = numpy.where(these_shard_indices == j)[0]
+                    this_example_dict = input_examples.subset_examples(
+                        example_dict=example_dict,
+                        indices_to_keep=these_subindices, create_new_dict=True)
+
+                    if j in shard_index_to_dataset:
+                        input_examples.write_examples_to_open_file(
+                            netcdf_dataset=shard_index_to_dataset[j],
+                            example_dict=this_example_dict)
+                    else:
+                        shard_index_to_dataset[j] = (
+                            input_examples.open_example_file_writer(
+                                netcdf_file_name=shard_file_names[j],
+                                example_dict=this_example_dict,
+                                num_storm_id_chars=10 + max_storm_id_length)
+                        )
+
+                    this_num_examples = len(these_subindices)
+                    shard_indices[these_manifest_indices[these_subindices]] = j
+                    row_indices[these_manifest_indices[these_subindices]] = (
+                        num_rows_by_shard[j] + numpy.arange(this_num_examples)
+                    )
+                    num_rows_by_shard[j] += this_num_examples
+        finally:
+            for this_dataset in shard_index_to_dataset.values():
+                this_dataset.close()
+
+    class_labels, class_count_matrix = _get_class_count_matrix(
+        shard_indices=shard_indices, target_values=target_values,
+        num_shards=num_shards)
+
+    manifest_dict = {
+        TARGET_NAME_KEY: target_name,
+        NUM_EXAMPLES_PER_SHARD_KEY: num_examples_per_shard,
+        SHARD_INDICES_KEY: shard_indices,
+        ROW_INDICES_KEY: row_indices,
+        STORM_IDS_KEY: storm_ids,
+        STORM_TIMES_KEY: storm_times_unix_sec,
+        TARGET_VALUES_KEY: target_values,
+        CLASS_LABELS_KEY: class_labels,
+        CLASS_COUNT_MATRIX_KEY: class_count_matrix
+    }
+
+    manifest_file_name = find_manifest_file(
+        top_directory_name=top_output_dir_name, raise_error_if_missing=False)
+
+    print 'Writing manifest to: "{0:s}"...'.format(manifest_file_name)
+    write_manifest(pickle_file_name=manifest_file_name,
+                   manifest_dict=manifest_dict)
+
+    return manifest_dict
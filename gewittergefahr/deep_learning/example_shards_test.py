@@ -0,0 +1,294 @@
+"""Unit tests for example_shards.py."""
+
+import copy
+import os.path
+import unittest
+import numpy
+import netCDF4
+from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import unit_test_utils
+from gewittergefahr.deep_learning import input_examples
+from gewittergefahr.deep_learning import example_shards
+
+TOLERANCE = 1e-6
+
+# The following constants are used to test _assign_examples_to_shards.
+NUM_EXAMPLES_TOTAL = 1000
+NUM_EXAMPLES_PER_SHARD = 128
+NUM_EXAMPLES_BY_SHARD = numpy.array(
+    [128, 128, 128, 128, 128, 128, 128, 104], dtype=int)
+
+# The following constants are used to test _get_class_count_matrix and
+# sample_examples.
+SHARD_INDICES = numpy.array([0, 0, 0, 1, 1, 1, 2, 2], dtype=int)
+ROW_INDICES = numpy.array([0, 1, 2, 0, 1, 2, 0, 1], dtype=int)
+STORM_TIMES_UNIX_SEC = numpy.array([10, 20, 30, 40, 50, 60, 70, 80], dtype=int)
+TARGET_VALUES = numpy.array([0, 1, 0, 0, 1, 1, 0, 0], dtype=int)
+NUM_SHARDS = 3
+
+CLASS_LABELS = numpy.array([0, 1], dtype=int)
+CLASS_COUNT_MATRIX = numpy.array([[2, 1],
+                                  [1, 2],
+                                  [2, 0]], dtype=int)
+
+MANIFEST_DICT = {
+    example_shards.TARGET_NAME_KEY: 'foo',
+    example_shards.NUM_EXAMPLES_PER_SHARD_KEY: 3,
+    example_shards.SHARD_INDICES_KEY: SHARD_INDICES,
+    example_shards.ROW_INDICES_KEY: ROW_INDICES,
+    example_shards.STORM_IDS_KEY: ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'],
+    example_shards.STORM_TIMES_KEY: STORM_TIMES_UNIX_SEC,
+    example_shards.TARGET_VALUES_KEY: TARGET_VALUES,
+    example_shards.CLASS_LABELS_KEY: CLASS_LABELS,
+    example_shards.CLASS_COUNT_MATRIX_KEY: CLASS_COUNT_MATRIX
+}
+
+CLASS_TO_NUM_EXAMPLES_DICT = {0: 2, 1: 1}
+
+SHARD_INDICES_ALL_SHARDS = numpy.array([0, 0, 0], dtype=int)
+ROW_INDICES_ALL_SHARDS = numpy.array([0, 1, 2], dtype=int)
+
+SHARD_INDICES_TO_USE = numpy.array([2, 1], dtype=int)
+SHARD_INDICES_SOME_SHARDS = numpy.array([1, 1, 2], dtype=int)
+ROW_INDICES_SOME_SHARDS = numpy.array([0, 1, 0], dtype=int)
+
+FIRST_TIME_UNIX_SEC = 45
+LAST_TIME_UNIX_SEC = 75
+SHARD_INDICES_TIME_LIMITS = numpy.array([1, 2], dtype=int)
+ROW_INDICES_TIME_LIMITS = numpy.array([1, 0], dtype=int)
+
+# The following constants are used to test find_shard_file and
+# find_manifest_file.
+TOP_DIRECTORY_NAME = 'foo'
+SHARD_INDEX = 1967
+SHARD_FILE_NAME = 'foo/shards0001000-0001999/input_examples_shard0001967.nc'
+MANIFEST_FILE_NAME = 'foo/shard_manifest.p'
+
+# The following constants are used to test convert_examples_to_shards.
+NUM_INPUT_FILES = 3
+NUM_EXAMPLES_PER_INPUT_FILE = 7
+NUM_EXAMPLES_PER_SHARD_TO_CONVERT = 2
+MAX_OPEN_SHARDS = 3
+
+INPUT_EXAMPLE_DICT = {
+    input_examples.RADAR_FIELDS_KEY: [radar_utils.REFL_NAME],
+    input_examples.RADAR_HEIGHTS_KEY: numpy.array([1000, 2000], dtype=int),
+    input_examples.ROTATED_GRIDS_KEY: False,
+    input_examples.ROTATED_GRID_SPACING_KEY: None,
+    input_examples.TARGET_NAME_KEY:
+        'tornado_lead-time=0000-3600sec_distance=00000-10000m'
+}
+
+
+def _create_input_examples(file_index):
+    """Creates input examples for one file (used to test conversion to shards).
+
+    Each radar image is filled with a value unique to the example, so that the
+    example can be identified after conversion.
+
+    :param file_index: Index of file.
+    :return: example_dict: See doc for `input_examples.write_example_file`.
+    """
+
+    first_value = file_index * NUM_EXAMPLES_PER_INPUT_FILE
+    these_values = numpy.linspace(
+        first_value, first_value + NUM_EXAMPLES_PER_INPUT_FILE - 1,
+        num=NUM_EXAMPLES_PER_INPUT_FILE, dtype=int)
+
+    example_dict = copy.deepcopy(INPUT_EXAMPLE_DICT)
+    example_dict[input_examples.STORM_IDS_KEY] = [
+        'storm{0:d}'.format(v) for v in these_values
+    ]
+    example_dict[input_examples.STORM_TIMES_KEY] = 10 * these_values
+    example_dict[input_examples.TARGET_VALUES_KEY] = numpy.mod(these_values, 2)
+
+    radar_image_matrix = numpy.full(
+        (NUM_EXAMPLES_PER_INPUT_FILE, 3, 3, 2, 1), 0, dtype=numpy.float32)
+    for i in range(NUM_EXAMPLES_PER_INPUT_FILE):
+        radar_image_matrix[i, ...] = these_values[i]
+
+    example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY] = radar_image_matrix
+    return example_dict
+
+
+class ExampleShardsTests(unit_test_utils.TestCaseWithTempDir):
+    """Each method is a unit test for example_shards.py."""
+
+    def test_assign_examples_to_shards(self):
+        """Ensures correct output from _assign_examples_to_shards."""
+
+        these_shard_indices = example_shards._assign_examples_to_shards(
+            num_examples_total=NUM_EXAMPLES_TOTAL,
+            num_examples_per_shard=NUM_EXAMPLES_PER_SHARD)
+
+        self.assertTrue(numpy.array_equal(
+            numpy.bincount(these_shard_indices), NUM_EXAMPLES_BY_SHARD))
+
+    def test_get_class_count_matrix(self):
+        """Ensures correct output from _get_class_count_matrix."""
+
+        these_class_labels, this_class_count_matrix = (
+            example_shards._get_class_count_matrix(
+                shard_indices=SHARD_INDICES, target_values=TARGET_VALUES,
+                num_shards=NUM_SHARDS)
+        )
+
+        self.assertTrue(numpy.array_equal(these_class_labels, CLASS_LABELS))
+        self.assertTrue(numpy.array_equal(
+            this_class_count_matrix, CLASS_COUNT_MATRIX))
+
+    def test_sample_examples_all_shards(self):
+        """Ensures correct output from sample_examples.
+
+        In this case, examples may be drawn from all shards and times.
+        """
+
+        these_shard_indices, these_row_indices = example_shards.sample_examples(
+            manifest_dict=MANIFEST_DICT,
+            class_to_num_examples_dict=CLASS_TO_NUM_EXAMPLES_DICT,
+            test_mode=True)
+
+        self.assertTrue(numpy.array_equal(
+            these_shard_indices, SHARD_INDICES_ALL_SHARDS))
+        self.assertTrue(numpy.array_equal(
+            these_row_indices, ROW_INDICES_ALL_SHARDS))
+
+    def test_sample_examples_some_shards(self):
+        """Ensures correct output from sample_examples.
+
+        In this case, examples may be drawn only from some shards.
+        """
+
+        these_shard_indices, these_row_indices = example_shards.sample_examples(
+            manifest_dict=MANIFEST_DICT,
+            class_to_num_examples_dict=CLASS_TO_NUM_EXAMPLES_DICT,
+            shard_indices_to_use=SHARD_INDICES_TO_USE, test_mode=True)
+
+        self.assertTrue(numpy.array_equal(
+            these_shard_indices, SHARD_INDICES_SOME_SHARDS))
+        self.assertTrue(numpy.array_equal(
+            these_row_indices, ROW_INDICES_SOME_SHARDS))
+
+    def test_sample_examples_time_limits(self):
+        """Ensures correct output from sample_examples.
+
+        In this case, examples may be drawn only from some times.
+        """
+
+        these_shard_indices, these_row_indices = example_shards.sample_examples(
+            manifest_dict=MANIFEST_DICT,
+            class_to_num_examples_dict=CLASS_TO_NUM_EXAMPLES_DICT,
+            first_time_unix_sec=FIRST_TIME_UNIX_SEC,
+            last_time_unix_sec=LAST_TIME_UNIX_SEC, test_mode=True)
+
+        self.assertTrue(numpy.array_equal(
+            these_shard_indices, SHARD_INDICES_TIME_LIMITS))
+        self.assertTrue(numpy.array_equal(
+            these_row_indices, ROW_INDICES_TIME_LIMITS))
+
+    def test_convert_examples_to_shards(self):
+        """Ensures correct output from convert_examples_to_shards.
+
+        In this case there are more shards than `max_open_shards`, so shards
+        are written in several groups.
+        """
+
+        input_file_names = []
+
+        for k in range(NUM_INPUT_FILES):
+            this_file_name = os.path.join(
+                self.temp_dir_name, 'input_examples{0:d}.nc'.format(k))
+            input_examples.write_example_file(
+                netcdf_file_name=this_file_name,
+                example_dict=_create_input_examples(k))
+            input_file_names.append(this_file_name)
+
+        top_output_dir_name = os.path.join(self.temp_dir_name, 'shards')
+        this_manifest_dict = example_shards.convert_examples_to_shards(
+            input_example_file_names=input_file_names,
+            top_output_dir_name=top_output_dir_name,
+            num_examples_per_shard=NUM_EXAMPLES_PER_SHARD_TO_CONVERT,
+            max_open_shards=MAX_OPEN_SHARDS)
+
+        these_shard_indices = this_manifest_dict[
+            example_shards.SHARD_INDICES_KEY]
+        these_row_indices = this_manifest_dict[example_shards.ROW_INDICES_KEY]
+        these_storm_ids = this_manifest_dict[example_shards.STORM_IDS_KEY]
+
+        num_examples_total = NUM_INPUT_FILES * NUM_EXAMPLES_PER_INPUT_FILE
+        self.assertTrue(
+            these_storm_ids ==
+            ['storm{0:d}'.format(v) for v in range(num_examples_total)]
+        )
+
+        num_shards = numpy.max(these_shard_indices) + 1
+        self.assertTrue(num_shards > MAX_OPEN_SHARDS)
+
+        for j in range(num_shards):
+            this_shard_file_name = example_shards.find_shard_file(
+                top_directory_name=top_output_dir_name, shard_index=j)
+
+            this_dataset = netCDF4.Dataset(this_shard_file_name)
+            self.assertTrue(this_dataset.data_model == 'NETCDF4')
+            this_dataset.close()
+
+            this_example_dict = input_examples.read_example_file(
+                this_shard_file_name)
+            these_values = numpy.array([
+                int(s.replace('storm', ''))
+                for s in this_example_dict[input_examples.STORM_IDS_KEY]
+            ])
+
+            these_manifest_indices = numpy.where(these_shard_indices == j)[0]
+            self.assertTrue(numpy.array_equal(
+                numpy.sort(these_row_indices[these_manifest_indices]),
+                numpy.arange(len(these_values))
+            ))
+            self.assertTrue(numpy.array_equal(
+                these_values[these_row_indices[these_manifest_indices]],
+                these_manifest_indices
+            ))
+
+            self.assertTrue(numpy.array_equal(
+                this_example_dict[input_examples.STORM_TIMES_KEY],
+                10 * these_values
+            ))
+            self.assertTrue(numpy.array_equal(
+                this_example_dict[input_examples.TARGET_VALUES_KEY],
+                numpy.mod(these_values, 2)
+            ))
+            self.assertTrue(numpy.allclose(
+                this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY][
+                    :, 0, 0, 0, 0],
+                these_values, atol=TOLERANCE
+            ))
+
+        self.assertTrue(numpy.array_equal(
+            this_manifest_dict[example_shards.STORM_TIMES_KEY],
+            10 * numpy.arange(num_examples_total)
+        ))
+        self.assertTrue(numpy.array_equal(
+            this_manifest_dict[example_shards.TARGET_VALUES_KEY],
+            numpy.mod(numpy.arange(num_examples_total), 2)
+        ))
+
+    def test_find_shard_file(self):
+        """Ensures correct output from find_shard_file."""
+
+        this_file_name = example_shards.find_shard_file(
+            top_directory_name=TOP_DIRECTORY_NAME, shard_index=SHARD_INDEX,
+            raise_error_if_missing=False)
+
+        self.assertTrue(this_file_name == SHARD_FILE_NAME)
+
+    def test_find_manifest_file(self):
+        """Ensures correct output from find_manifest_file."""
+
+        this_file_name = example_shards.find_manifest_file(
+            top_directory_name=TOP_DIRECTORY_NAME, raise_error_if_missing=False)
+
+        self.assertTrue(this_file_name == MANIFEST_FILE_NAME)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -37,6 +37,7 @@ TIME_FORMAT_IN_FILE_NAMES = '%Y-%m-%d-%H%M%S'
 
 DEFAULT_NUM_EXAMPLES_PER_OUT_CHUNK = 8
 DEFAULT_NUM_EXAMPLES_PER_OUT_FILE = 128
+DEFAULT_MAX_EXAMPLES_PER_BLOCK = 1000
 NUM_BATCHES_PER_DIRECTORY = 1000
 
 AZIMUTHAL_SHEAR_FIELD_NAMES = [
@@ -585,6 +586,30 @@ def _read_metadata_from_example_file(netcdf_file_name, include_soundings):
     return example_dict, netcdf_dataset
 
 
+def _read_predictor_matrix(
+        netcdf_dataset, variable_name, example_indices_to_keep):
+    """Reads predictor matrix (radar images or soundings) from NetCDF file.
+
+    Predictors are stored as float32, and this method keeps them that way.  It
+    also returns a plain numpy array, rather than the masked array created by
+    netCDF4, which would make all subsequent operations slower.  Masked values
+    (e.g., equal to the variable's fill value) are replaced with NaN.
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, open for reading.
+    :param variable_name: Name of predictor variable.
+    :param example_indices_to_keep: 1-D numpy array with indices of examples to
+        read.
+    :return: predictor_matrix: numpy array of predictors, where the first axis
+        has the same length as `example_indices_to_keep`.
+    """
+
+    predictor_matrix = numpy.ma.filled(
+        netcdf_dataset.variables[variable_name][example_indices_to_keep, ...],
+        fill_value=numpy.nan)
+
+    return predictor_matrix.astype(numpy.float32, copy=False)
+
+
 def _compare_metadata(netcdf_dataset, example_dict):
     """Compares metadata between existing NetCDF file and new batch of examples.
 
@@ -642,49 +667,306 @@ def _compare_metadata(netcdf_dataset, example_dict):
         raise ValueError(error_string)
 
 
-def _filter_examples_by_class(
-        target_values, class_to_num_examples_dict, test_mode=False):
-    """Filters examples by target value.
+def _create_example_file(
+        netcdf_file_name, example_dict, netcdf_format,
+        chunk_by_example=False, num_storm_id_chars=None):
+    """Creates NetCDF file for input examples.
 
-    E = number of examples
+    This method writes metadata and creates all variables, but does not write
+    any examples.  Use `_append_examples_to_dataset` for the latter.
 
-    :param target_values: length-E numpy array of target values (integer class
-        labels).
-    :param class_to_num_examples_dict: Dictionary, where each key is the integer
-        ID for a target class (-2 for "dead storm") and the corresponding value
-        is the number of examples desired from said class.  If
-        `class_to_num_examples_dict is None`, `example_dict` will be returned
-        without modification.
-    :param test_mode: Never mind.  Just leave this alone.
-    :return: indices_to_keep: 1-D numpy array with indices of examples to keep.
-        These are all integers in [0, E - 1].
+    :param netcdf_file_name: Path to output file.
+    :param example_dict: See doc for `write_example_file`.  Only metadata and
+        array shapes are used.
+    :param netcdf_format: NetCDF format (see doc for `netCDF4.Dataset`).
+    :param chunk_by_example: Boolean flag.  If True, each predictor variable
+        will be chunked by example (one chunk per example).  This works only if
+        `netcdf_format = "NETCDF4"`.
+    :param num_storm_id_chars: Number of characters per storm ID in the file.
+        Storm IDs longer than this cannot be written.  If None, this will be
+        determined from the storm IDs in `example_dict`.
+    :return: netcdf_dataset: Instance of `netCDF4.Dataset`, open for writing.
     """
 
-    num_examples = len(target_values)
-    if class_to_num_examples_dict is None:
-        return numpy.linspace(0, num_examples - 1, num=num_examples, dtype=int)
+    error_checking.assert_is_boolean(chunk_by_example)
+    include_soundings = SOUNDING_MATRIX_KEY in example_dict
 
-    indices_to_keep = numpy.array([], dtype=int)
+    # Open file.
+    file_system_utils.mkdir_recursive_if_necessary(file_name=netcdf_file_name)
+    netcdf_dataset = netCDF4.Dataset(
+        netcdf_file_name, 'w', format=netcdf_format)
 
-    for this_class in class_to_num_examples_dict.keys():
-        this_num_storm_objects = class_to_num_examples_dict[this_class]
-        these_indices = numpy.where(target_values == this_class)[0]
+    # Set global attributes.
+    netcdf_dataset.setncattr(TARGET_NAME_KEY, example_dict[TARGET_NAME_KEY])
+    netcdf_dataset.setncattr(
+        ROTATED_GRIDS_KEY, int(example_dict[ROTATED_GRIDS_KEY])
+    )
+    if example_dict[ROTATED_GRIDS_KEY]:
+        netcdf_dataset.setncattr(
+            ROTATED_GRID_SPACING_KEY,
+            numpy.round(int(example_dict[ROTATED_GRID_SPACING_KEY]))
+        )
 
-        this_num_storm_objects = min(
-            [this_num_storm_objects, len(these_indices)]
+    # Set dimensions.
+    if num_storm_id_chars is None:
+        num_storm_id_chars = 10 + numpy.max(
+            numpy.array([len(s) for s in example_dict[STORM_IDS_KEY]])
         )
-        if this_num_storm_objects == 0:
-            continue
 
-        if test_mode:
-            these_indices = these_indices[:this_num_storm_objects]
+    error_checking.assert_is_integer(num_storm_id_chars)
+    error_checking.assert_is_greater(num_storm_id_chars, 0)
+
+    num_radar_field_chars = numpy.max(
+        numpy.array([len(f) for f in example_dict[RADAR_FIELDS_KEY]])
+    )
+
+    netcdf_dataset.createDimension(EXAMPLE_DIMENSION_KEY, None)
+    netcdf_dataset.createDimension(STORM_ID_CHAR_DIM_KEY, num_storm_id_chars)
+    netcdf_dataset.createDimension(
+        RADAR_FIELD_CHAR_DIM_KEY, num_radar_field_chars)
+
+    if RADAR_IMAGE_MATRIX_KEY in example_dict:
+        num_grid_rows = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[1]
+        num_grid_columns = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[2]
+        num_radar_dimensions = len(
+            example_dict[RADAR_IMAGE_MATRIX_KEY].shape) - 2
+
+        if num_radar_dimensions == 3:
+            num_radar_heights = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[3]
+            num_radar_fields = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[4]
+
+            netcdf_dataset.createDimension(
+                RADAR_FIELD_DIM_KEY, num_radar_fields)
+            netcdf_dataset.createDimension(
+                RADAR_HEIGHT_DIM_KEY, num_radar_heights)
         else:
-            these_indices = numpy.random.choice(
-                these_indices, size=this_num_storm_objects, replace=False)
+            num_radar_channels = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[3]
+            netcdf_dataset.createDimension(
+                RADAR_CHANNEL_DIM_KEY, num_radar_channels)
 
-        indices_to_keep = numpy.concatenate((indices_to_keep, these_indices))
+        netcdf_dataset.createDimension(ROW_DIMENSION_KEY, num_grid_rows)
+        netcdf_dataset.createDimension(COLUMN_DIMENSION_KEY, num_grid_columns)
 
-    return indices_to_keep
+    else:
+        num_reflectivity_rows = example_dict[REFL_IMAGE_MATRIX_KEY].shape[1]
+        num_reflectivity_columns = example_dict[REFL_IMAGE_MATRIX_KEY].shape[2]
+        num_reflectivity_heights = example_dict[REFL_IMAGE_MATRIX_KEY].shape[3]
+        num_az_shear_rows = example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY].shape[1]
+        num_az_shear_columns = example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY].shape[2]
+        num_az_shear_fields = example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY].shape[3]
+
+        netcdf_dataset.createDimension(
+            REFL_ROW_DIMENSION_KEY, num_reflectivity_rows)
+        netcdf_dataset.createDimension(
+            REFL_COLUMN_DIMENSION_KEY, num_reflectivity_columns)
+        netcdf_dataset.createDimension(
+            RADAR_HEIGHT_DIM_KEY, num_reflectivity_heights)
+
+        netcdf_dataset.createDimension(
+            AZ_SHEAR_ROW_DIMENSION_KEY, num_az_shear_rows)
+        netcdf_dataset.createDimension(
+            AZ_SHEAR_COLUMN_DIMENSION_KEY, num_az_shear_columns)
+        netcdf_dataset.createDimension(RADAR_FIELD_DIM_KEY, num_az_shear_fields)
+
+        num_radar_dimensions = -1
+
+    # Add storm IDs.
+    netcdf_dataset.createVariable(
+        STORM_IDS_KEY, datatype='S1',
+        dimensions=(EXAMPLE_DIMENSION_KEY, STORM_ID_CHAR_DIM_KEY))
+
+    # Add names of radar fields.
+    this_string_type = 'S{0:d}'.format(num_radar_field_chars)
+    radar_field_names_char_array = netCDF4.stringtochar(numpy.array(
+        example_dict[RADAR_FIELDS_KEY], dtype=this_string_type))
+
+    if num_radar_dimensions == 2:
+        this_first_dim_key = RADAR_CHANNEL_DIM_KEY + ''
+    else:
+        this_first_dim_key = RADAR_FIELD_DIM_KEY + ''
+
+    netcdf_dataset.createVariable(
+        RADAR_FIELDS_KEY, datatype='S1',
+        dimensions=(this_first_dim_key, RADAR_FIELD_CHAR_DIM_KEY))
+    netcdf_dataset.variables[RADAR_FIELDS_KEY][:] = numpy.array(
+        radar_field_names_char_array)
+
+    # Add storm times.
+    netcdf_dataset.createVariable(
+        STORM_TIMES_KEY, datatype=numpy.int32, dimensions=EXAMPLE_DIMENSION_KEY)
+
+    # Add target values.
+    netcdf_dataset.createVariable(
+        TARGET_VALUES_KEY, datatype=numpy.int32,
+        dimensions=EXAMPLE_DIMENSION_KEY)
+
+    # Add radar heights.
+    if num_radar_dimensions == 2:
+        this_dimension_key = RADAR_CHANNEL_DIM_KEY + ''
+    else:
+        this_dimension_key = RADAR_HEIGHT_DIM_KEY + ''
+
+    netcdf_dataset.createVariable(
+        RADAR_HEIGHTS_KEY, datatype=numpy.int32, dimensions=this_dimension_key)
+    netcdf_dataset.variables[RADAR_HEIGHTS_KEY][:] = example_dict[
+        RADAR_HEIGHTS_KEY]
+
+    # Add storm-centered radar images.
+    if RADAR_IMAGE_MATRIX_KEY in example_dict:
+        if num_radar_dimensions == 3:
+            these_dimensions = (
+                EXAMPLE_DIMENSION_KEY, ROW_DIMENSION_KEY, COLUMN_DIMENSION_KEY,
+                RADAR_HEIGHT_DIM_KEY, RADAR_FIELD_DIM_KEY
+            )
+        else:
+            these_dimensions = (
+                EXAMPLE_DIMENSION_KEY, ROW_DIMENSION_KEY, COLUMN_DIMENSION_KEY,
+                RADAR_CHANNEL_DIM_KEY
+            )
+
+        _create_predictor_variable(
+            netcdf_dataset=netcdf_dataset, variable_name=RADAR_IMAGE_MATRIX_KEY,
+            dimension_keys=these_dimensions, chunk_by_example=chunk_by_example)
+
+    else:
+        _create_predictor_variable(
+            netcdf_dataset=netcdf_dataset, variable_name=REFL_IMAGE_MATRIX_KEY,
+            dimension_keys=(
+                EXAMPLE_DIMENSION_KEY, REFL_ROW_DIMENSION_KEY,
+                REFL_COLUMN_DIMENSION_KEY, RADAR_HEIGHT_DIM_KEY
+            ),
+            chunk_by_example=chunk_by_example)
+
+        _create_predictor_variable(
+            netcdf_dataset=netcdf_dataset,
+            variable_name=AZ_SHEAR_IMAGE_MATRIX_KEY,
+            dimension_keys=(
+                EXAMPLE_DIMENSION_KEY, AZ_SHEAR_ROW_DIMENSION_KEY,
+                AZ_SHEAR_COLUMN_DIMENSION_KEY, RADAR_FIELD_DIM_KEY
+            ),
+            chunk_by_example=chunk_by_example)
+
+    if not include_soundings:
+        return netcdf_dataset
+
+    num_sounding_heights = example_dict[SOUNDING_MATRIX_KEY].shape[1]
+    num_sounding_fields = example_dict[SOUNDING_MATRIX_KEY].shape[2]
+
+    num_sounding_field_chars = 1
+    for j in range(num_sounding_fields):
+        num_sounding_field_chars = max([
+            num_sounding_field_chars,
+            len(example_dict[SOUNDING_FIELDS_KEY][j])
+        ])
+
+    netcdf_dataset.createDimension(
+        SOUNDING_FIELD_DIM_KEY, num_sounding_fields)
+    netcdf_dataset.createDimension(
+        SOUNDING_HEIGHT_DIM_KEY, num_sounding_heights)
+    netcdf_dataset.createDimension(
+        SOUNDING_FIELD_CHAR_DIM_KEY, num_sounding_field_chars)
+
+    this_string_type = 'S{0:d}'.format(num_sounding_field_chars)
+    sounding_field_names_char_array = netCDF4.stringtochar(numpy.array(
+        example_dict[SOUNDING_FIELDS_KEY], dtype=this_string_type))
+
+    netcdf_dataset.createVariable(
+        SOUNDING_FIELDS_KEY, datatype='S1',
+        dimensions=(SOUNDING_FIELD_DIM_KEY, SOUNDING_FIELD_CHAR_DIM_KEY))
+    netcdf_dataset.variables[SOUNDING_FIELDS_KEY][:] = numpy.array(
+        sounding_field_names_char_array)
+
+    netcdf_dataset.createVariable(
+        SOUNDING_HEIGHTS_KEY, datatype=numpy.int32,
+        dimensions=SOUNDING_HEIGHT_DIM_KEY)
+    netcdf_dataset.variables[SOUNDING_HEIGHTS_KEY][:] = example_dict[
+        SOUNDING_HEIGHTS_KEY]
+
+    _create_predictor_variable(
+        netcdf_dataset=netcdf_dataset, variable_name=SOUNDING_MATRIX_KEY,
+        dimension_keys=(
+            EXAMPLE_DIMENSION_KEY, SOUNDING_HEIGHT_DIM_KEY,
+            SOUNDING_FIELD_DIM_KEY
+        ),
+        chunk_by_example=chunk_by_example)
+
+    return netcdf_dataset
+
+
+def _create_predictor_variable(
+        netcdf_dataset, variable_name, dimension_keys, chunk_by_example):
+    """Creates predictor variable (radar images or soundings) in NetCDF file.
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, open for writing.
+    :param variable_name: Name of predictor variable.
+    :param dimension_keys: 1-D tuple of dimension names, where the first is the
+        example dimension.
+    :param chunk_by_example: See doc for `_create_example_file`.
+    """
+
+    if not chunk_by_example:
+        netcdf_dataset.createVariable(
+            variable_name, datatype=numpy.float32, dimensions=dimension_keys)
+        return
+
+    these_chunk_sizes = (1,) + tuple([
+        len(netcdf_dataset.dimensions[d]) for d in dimension_keys[1:]
+    ])
+
+    netcdf_dataset.createVariable(
+        variable_name, datatype=numpy.float32, dimensions=dimension_keys,
+        chunksizes=these_chunk_sizes)
+
+
+def _append_examples_to_dataset(netcdf_dataset, example_dict):
+    """Appends input examples to open NetCDF file.
+
+    The file must already contain all variables (see `_create_example_file`).
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, open for writing.
+    :param example_dict: See doc for `write_example_file`.
+    :raises: ValueError: if any storm ID is longer than the storm-ID dimension
+        in the file.
+    """
+
+    first_index = len(netcdf_dataset.dimensions[EXAMPLE_DIMENSION_KEY])
+    last_index = first_index + len(example_dict[STORM_TIMES_KEY])
+
+    num_storm_id_chars = len(netcdf_dataset.dimensions[STORM_ID_CHAR_DIM_KEY])
+    max_storm_id_length = numpy.max(
+        numpy.array([len(s) for s in example_dict[STORM_IDS_KEY]])
+    )
+
+    if max_storm_id_length > num_storm_id_chars:
+        error_string = (
+            'Longest storm ID in new batch of examples has {0:d} characters, '
+            'but existing NetCDF file allows only {1:d}.'
+        ).format(max_storm_id_length, num_storm_id_chars)
+
+        raise ValueError(error_string)
+
+    this_string_type = 'S{0:d}'.format(num_storm_id_chars)
+    storm_ids_char_array = netCDF4.stringtochar(numpy.array(
+        example_dict[STORM_IDS_KEY], dtype=this_string_type))
+
+    netcdf_dataset.variables[STORM_IDS_KEY][first_index:last_index, ...] = (
+        numpy.array(storm_ids_char_array)
+    )
+
+    for this_key in MAIN_KEYS:
+        if this_key == STORM_IDS_KEY:
+            continue
+        if this_key not in netcdf_dataset.variables:
+            continue
+
+        if this_key == REFL_IMAGE_MATRIX_KEY:
+            this_matrix = example_dict[this_key][..., 0]
+        else:
+            this_matrix = example_dict[this_key]
+
+        netcdf_dataset.variables[this_key][first_index:last_index, ...] = (
+            this_matrix
+        )
 
 
 def _file_name_to_batch_number(example_file_name):
@@ -809,6 +1091,55 @@ def _apply_layer_operation(example_dict, operation_dict):
     return operation_function(orig_matrix, axis=-1), operation_dict
 
 
+def _create_example_block(
+        file_time_index, storm_ids, storm_times_unix_sec, target_values,
+        radar_file_name_matrix=None, reflectivity_file_name_matrix=None,
+        az_shear_file_name_matrix=None, sounding_file_names=None):
+    """Creates one block of input examples (all from the same file time).
+
+    :param file_time_index: Index of file time (row in the file matrices).
+    :param storm_ids: See doc for `_create_2d_examples`.
+    :param storm_times_unix_sec: Same.
+    :param target_values: Same.
+    :param radar_file_name_matrix: See doc for `create_examples`.
+    :param reflectivity_file_name_matrix: Same.
+    :param az_shear_file_name_matrix: Same.
+    :param sounding_file_names: Same.
+    :return: example_dict: See doc for `_create_2d_examples`.
+    """
+
+    i = file_time_index
+    if sounding_file_names is None:
+        this_sounding_file_name = None
+    else:
+        this_sounding_file_name = sounding_file_names[i]
+
+    if radar_file_name_matrix is None:
+        return _create_2d3d_examples_myrorss(
+            azimuthal_shear_file_names=az_shear_file_name_matrix[
+                i, ...].tolist(),
+            reflectivity_file_names=reflectivity_file_name_matrix[
+                i, ...].tolist(),
+            storm_ids=storm_ids, storm_times_unix_sec=storm_times_unix_sec,
+            target_values=target_values,
+            sounding_file_name=this_sounding_file_name,
+            sounding_field_names=None)
+
+    if len(radar_file_name_matrix.shape) == 3:
+        return _create_3d_examples(
+            radar_file_name_matrix=radar_file_name_matrix[i, ...],
+            storm_ids=storm_ids, storm_times_unix_sec=storm_times_unix_sec,
+            target_values=target_values,
+            sounding_file_name=this_sounding_file_name,
+            sounding_field_names=None)
+
+    return _create_2d_examples(
+        radar_file_names=radar_file_name_matrix[i, ...].tolist(),
+        storm_ids=storm_ids, storm_times_unix_sec=storm_times_unix_sec,
+        target_values=target_values, sounding_file_name=this_sounding_file_name,
+        sounding_field_names=None)
+
+
 def remove_storms_with_undefined_target(radar_image_dict):
     """Removes storm objects with undefined target value.
 
@@ -1102,22 +1433,67 @@ def find_target_files(top_target_dir_name, radar_file_name_matrix, target_name):
     num_file_times = radar_file_name_matrix.shape[0]
     target_file_names = [''] * num_file_times
 
-    for i in range(num_file_times):
-        if num_file_dimensions == 2:
-            this_file_name = radar_file_name_matrix[i, 0]
+    for i in range(num_file_times):
+        if num_file_dimensions == 2:
+            this_file_name = radar_file_name_matrix[i, 0]
+        else:
+            this_file_name = radar_file_name_matrix[i, 0, 0]
+
+        _, this_spc_date_string = storm_images.image_file_name_to_time(
+            this_file_name)
+
+        target_file_names[i] = target_val_utils.find_target_file(
+            top_directory_name=top_target_dir_name,
+            event_type_string=target_param_dict[
+                target_val_utils.EVENT_TYPE_KEY],
+            spc_date_string=this_spc_date_string, raise_error_if_missing=True)
+
+    return target_file_names
+
+
+def filter_examples_by_class(
+        target_values, class_to_num_examples_dict, test_mode=False):
+    """Filters examples by target value.
+
+    E = number of examples
+
+    :param target_values: length-E numpy array of target values (integer class
+        labels).
+    :param class_to_num_examples_dict: Dictionary, where each key is the integer
+        ID for a target class (-2 for "dead storm") and the corresponding value
+        is the number of examples desired from said class.  If
+        `class_to_num_examples_dict is None`, `example_dict` will be returned
+        without modification.
+    :param test_mode: Never mind.  Just leave this alone.
+    :return: indices_to_keep: 1-D numpy array with indices of examples to keep.
+        These are all integers in [0, E - 1].
+    """
+
+    num_examples = len(target_values)
+    if class_to_num_examples_dict is None:
+        return numpy.linspace(0, num_examples - 1, num=num_examples, dtype=int)
+
+    indices_to_keep = numpy.array([], dtype=int)
+
+    for this_class in class_to_num_examples_dict.keys():
+        this_num_storm_objects = class_to_num_examples_dict[this_class]
+        these_indices = numpy.where(target_values == this_class)[0]
+
+        this_num_storm_objects = min(
+            [this_num_storm_objects, len(these_indices)]
+        )
+        if this_num_storm_objects == 0:
+            continue
+
+        if test_mode:
+            these_indices = these_indices[:this_num_storm_objects]
         else:
-            this_file_name = radar_file_name_matrix[i, 0, 0]
-
-        _, this_spc_date_string = storm_images.image_file_name_to_time(
-            this_file_name)
+            these_indices = numpy.random.choice(
+                these_indices, size=this_num_storm_objects, replace=False)
 
-        target_file_names[i] = target_val_utils.find_target_file(
-            top_directory_name=top_target_dir_name,
-            event_type_string=target_param_dict[
-                target_val_utils.EVENT_TYPE_KEY],
-            spc_date_string=this_spc_date_string, raise_error_if_missing=True)
+        indices_to_keep = numpy.concatenate((indices_to_keep, these_indices))
 
-    return target_file_names
+    return indices_to_keep
 
 
 def subset_examples(example_dict, indices_to_keep, create_new_dict=False):
@@ -1173,6 +1549,58 @@ def subset_examples(example_dict, indices_to_keep, create_new_dict=False):
     return new_example_dict
 
 
+def concat_examples(list_of_example_dicts):
+    """Concatenates examples from many dictionaries.
+
+    All dictionaries must contain the same radar and sounding fields, at the
+    same heights.  Metadata are taken from the first dictionary.
+
+    :param list_of_example_dicts: 1-D list of dictionaries, each in the format
+        returned by `read_example_file`.
+    :return: example_dict: Single dictionary in the same format.
+    :raises: ValueError: if the dictionaries do not contain the same fields and
+        heights.
+    """
+
+    error_checking.assert_is_list(list_of_example_dicts)
+    error_checking.assert_is_geq(len(list_of_example_dicts), 1)
+
+    first_example_dict = list_of_example_dicts[0]
+    example_dict = subset_examples(
+        example_dict=first_example_dict,
+        indices_to_keep=numpy.array([], dtype=int), create_new_dict=True)
+
+    for this_example_dict in list_of_example_dicts[1:]:
+        for this_key in [RADAR_FIELDS_KEY, RADAR_HEIGHTS_KEY,
+                         SOUNDING_FIELDS_KEY, SOUNDING_HEIGHTS_KEY]:
+            if this_key not in first_example_dict:
+                continue
+
+            if numpy.array_equal(numpy.array(first_example_dict[this_key]),
+                                 numpy.array(this_example_dict[this_key])):
+                continue
+
+            error_string = (
+                'Cannot concatenate examples with different values of "{0:s}".'
+            ).format(this_key)
+            raise ValueError(error_string)
+
+    for this_key in MAIN_KEYS:
+        if (this_key not in REQUIRED_MAIN_KEYS
+                and this_key not in first_example_dict):
+            continue
+
+        if this_key == STORM_IDS_KEY:
+            example_dict[this_key] = sum(
+                [d[this_key] for d in list_of_example_dicts], []
+            )
+        else:
+            example_dict[this_key] = numpy.concatenate(
+                [d[this_key] for d in list_of_example_dicts], axis=0)
+
+    return example_dict
+
+
 def find_example_file(
         top_directory_name, shuffled=True, spc_date_string=None,
         batch_number=None, raise_error_if_missing=True):
@@ -1383,249 +1811,70 @@ def write_example_file(netcdf_file_name, example_dict, append_to_file=False):
     """
 
     error_checking.assert_is_boolean(append_to_file)
-    include_soundings = SOUNDING_MATRIX_KEY in example_dict
 
     if append_to_file:
-        netcdf_dataset = netCDF4.Dataset(
-            netcdf_file_name, 'a', format='NETCDF3_64BIT_OFFSET')
+        netcdf_dataset = netCDF4.Dataset(netcdf_file_name, 'a')
         _compare_metadata(
             netcdf_dataset=netcdf_dataset, example_dict=example_dict)
-
-        num_examples_orig = len(
-            numpy.array(netcdf_dataset.variables[STORM_TIMES_KEY][:])
-        )
-        num_examples_to_add = len(example_dict[STORM_TIMES_KEY])
-
-        this_string_type = 'S{0:d}'.format(
-            netcdf_dataset.dimensions[STORM_ID_CHAR_DIM_KEY].size)
-        example_dict[STORM_IDS_KEY] = netCDF4.stringtochar(numpy.array(
-            example_dict[STORM_IDS_KEY], dtype=this_string_type))
-
-        for this_key in MAIN_KEYS:
-            if (this_key not in REQUIRED_MAIN_KEYS and
-                    this_key not in netcdf_dataset.variables):
-                continue
-
-            netcdf_dataset.variables[this_key][
-                num_examples_orig:(num_examples_orig + num_examples_to_add),
-                ...
-            ] = example_dict[this_key]
-
-        netcdf_dataset.close()
-        return
-
-    # Open file.
-    file_system_utils.mkdir_recursive_if_necessary(file_name=netcdf_file_name)
-    netcdf_dataset = netCDF4.Dataset(
-        netcdf_file_name, 'w', format='NETCDF3_64BIT_OFFSET')
-
-    # Set global attributes.
-    netcdf_dataset.setncattr(TARGET_NAME_KEY, example_dict[TARGET_NAME_KEY])
-    netcdf_dataset.setncattr(
-        ROTATED_GRIDS_KEY, int(example_dict[ROTATED_GRIDS_KEY])
-    )
-    if example_dict[ROTATED_GRIDS_KEY]:
-        netcdf_dataset.setncattr(
-            ROTATED_GRID_SPACING_KEY,
-            numpy.round(int(example_dict[ROTATED_GRID_SPACING_KEY]))
-        )
-
-    # Set dimensions.
-    num_storm_id_chars = 10 + numpy.max(
-        numpy.array([len(s) for s in example_dict[STORM_IDS_KEY]])
-    )
-    num_radar_field_chars = numpy.max(
-        numpy.array([len(f) for f in example_dict[RADAR_FIELDS_KEY]])
-    )
-
-    netcdf_dataset.createDimension(EXAMPLE_DIMENSION_KEY, None)
-    netcdf_dataset.createDimension(STORM_ID_CHAR_DIM_KEY, num_storm_id_chars)
-    netcdf_dataset.createDimension(
-        RADAR_FIELD_CHAR_DIM_KEY, num_radar_field_chars)
-
-    if RADAR_IMAGE_MATRIX_KEY in example_dict:
-        num_grid_rows = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[1]
-        num_grid_columns = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[2]
-        num_radar_dimensions = len(
-            example_dict[RADAR_IMAGE_MATRIX_KEY].shape) - 2
-
-        if num_radar_dimensions == 3:
-            num_radar_heights = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[3]
-            num_radar_fields = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[4]
-
-            netcdf_dataset.createDimension(
-                RADAR_FIELD_DIM_KEY, num_radar_fields)
-            netcdf_dataset.createDimension(
-                RADAR_HEIGHT_DIM_KEY, num_radar_heights)
-        else:
-            num_radar_channels = example_dict[RADAR_IMAGE_MATRIX_KEY].shape[3]
-            netcdf_dataset.createDimension(
-                RADAR_CHANNEL_DIM_KEY, num_radar_channels)
-
-        netcdf_dataset.createDimension(ROW_DIMENSION_KEY, num_grid_rows)
-        netcdf_dataset.createDimension(COLUMN_DIMENSION_KEY, num_grid_columns)
-
-    else:
-        num_reflectivity_rows = example_dict[REFL_IMAGE_MATRIX_KEY].shape[1]
-        num_reflectivity_columns = example_dict[REFL_IMAGE_MATRIX_KEY].shape[2]
-        num_reflectivity_heights = example_dict[REFL_IMAGE_MATRIX_KEY].shape[3]
-        num_az_shear_rows = example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY].shape[1]
-        num_az_shear_columns = example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY].shape[2]
-        num_az_shear_fields = example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY].shape[3]
-
-        netcdf_dataset.createDimension(
-            REFL_ROW_DIMENSION_KEY, num_reflectivity_rows)
-        netcdf_dataset.createDimension(
-            REFL_COLUMN_DIMENSION_KEY, num_reflectivity_columns)
-        netcdf_dataset.createDimension(
-            RADAR_HEIGHT_DIM_KEY, num_reflectivity_heights)
-
-        netcdf_dataset.createDimension(
-            AZ_SHEAR_ROW_DIMENSION_KEY, num_az_shear_rows)
-        netcdf_dataset.createDimension(
-            AZ_SHEAR_COLUMN_DIMENSION_KEY, num_az_shear_columns)
-        netcdf_dataset.createDimension(RADAR_FIELD_DIM_KEY, num_az_shear_fields)
-
-        num_radar_dimensions = -1
-
-    # Add storm IDs.
-    this_string_type = 'S{0:d}'.format(num_storm_id_chars)
-    storm_ids_char_array = netCDF4.stringtochar(numpy.array(
-        example_dict[STORM_IDS_KEY], dtype=this_string_type))
-
-    netcdf_dataset.createVariable(
-        STORM_IDS_KEY, datatype='S1',
-        dimensions=(EXAMPLE_DIMENSION_KEY, STORM_ID_CHAR_DIM_KEY))
-    netcdf_dataset.variables[STORM_IDS_KEY][:] = numpy.array(
-        storm_ids_char_array)
-
-    # Add names of radar fields.
-    this_string_type = 'S{0:d}'.format(num_radar_field_chars)
-    radar_field_names_char_array = netCDF4.stringtochar(numpy.array(
-        example_dict[RADAR_FIELDS_KEY], dtype=this_string_type))
-
-    if num_radar_dimensions == 2:
-        this_first_dim_key = RADAR_CHANNEL_DIM_KEY + ''
-    else:
-        this_first_dim_key = RADAR_FIELD_DIM_KEY + ''
-
-    netcdf_dataset.createVariable(
-        RADAR_FIELDS_KEY, datatype='S1',
-        dimensions=(this_first_dim_key, RADAR_FIELD_CHAR_DIM_KEY))
-    netcdf_dataset.variables[RADAR_FIELDS_KEY][:] = numpy.array(
-        radar_field_names_char_array)
-
-    # Add storm times.
-    netcdf_dataset.createVariable(
-        STORM_TIMES_KEY, datatype=numpy.int32, dimensions=EXAMPLE_DIMENSION_KEY)
-    netcdf_dataset.variables[STORM_TIMES_KEY][:] = example_dict[
-        STORM_TIMES_KEY]
-
-    # Add target values.
-    netcdf_dataset.createVariable(
-        TARGET_VALUES_KEY, datatype=numpy.int32,
-        dimensions=EXAMPLE_DIMENSION_KEY)
-    netcdf_dataset.variables[TARGET_VALUES_KEY][:] = example_dict[
-        TARGET_VALUES_KEY]
-
-    # Add radar heights.
-    if num_radar_dimensions == 2:
-        this_dimension_key = RADAR_CHANNEL_DIM_KEY + ''
     else:
-        this_dimension_key = RADAR_HEIGHT_DIM_KEY + ''
-
-    netcdf_dataset.createVariable(
-        RADAR_HEIGHTS_KEY, datatype=numpy.int32, dimensions=this_dimension_key)
-    netcdf_dataset.variables[RADAR_HEIGHTS_KEY][:] = example_dict[
-        RADAR_HEIGHTS_KEY]
+        netcdf_dataset = _create_example_file(
+            netcdf_file_name=netcdf_file_name, example_dict=example_dict,
+            netcdf_format='NETCDF3_64BIT_OFFSET')
 
-    # Add storm-centered radar images.
-    if RADAR_IMAGE_MATRIX_KEY in example_dict:
-        if num_radar_dimensions == 3:
-            these_dimensions = (
-                EXAMPLE_DIMENSION_KEY, ROW_DIMENSION_KEY, COLUMN_DIMENSION_KEY,
-                RADAR_HEIGHT_DIM_KEY, RADAR_FIELD_DIM_KEY
-            )
-        else:
-            these_dimensions = (
-                EXAMPLE_DIMENSION_KEY, ROW_DIMENSION_KEY, COLUMN_DIMENSION_KEY,
-                RADAR_CHANNEL_DIM_KEY
-            )
+    _append_examples_to_dataset(
+        netcdf_dataset=netcdf_dataset, example_dict=example_dict)
+    netcdf_dataset.close()
 
-        netcdf_dataset.createVariable(
-            RADAR_IMAGE_MATRIX_KEY, datatype=numpy.float32,
-            dimensions=these_dimensions)
-        netcdf_dataset.variables[RADAR_IMAGE_MATRIX_KEY][:] = example_dict[
-            RADAR_IMAGE_MATRIX_KEY]
 
-    else:
-        netcdf_dataset.createVariable(
-            REFL_IMAGE_MATRIX_KEY, datatype=numpy.float32,
-            dimensions=(
-                EXAMPLE_DIMENSION_KEY, REFL_ROW_DIMENSION_KEY,
-                REFL_COLUMN_DIMENSION_KEY, RADAR_HEIGHT_DIM_KEY
-            ))
-        netcdf_dataset.variables[REFL_IMAGE_MATRIX_KEY][:] = example_dict[
-            RADAR_IMAGE_MATRIX_KEY][..., 0]
+def open_example_file_writer(
+        netcdf_file_name, example_dict, num_storm_id_chars=None):
+    """Opens NetCDF file for streaming input examples.
 
-        netcdf_dataset.createVariable(
-            AZ_SHEAR_IMAGE_MATRIX_KEY, datatype=numpy.float32,
-            dimensions=(
-                EXAMPLE_DIMENSION_KEY, AZ_SHEAR_ROW_DIMENSION_KEY,
-                AZ_SHEAR_COLUMN_DIMENSION_KEY, RADAR_HEIGHT_DIM_KEY
-            ))
-        netcdf_dataset.variables[AZ_SHEAR_IMAGE_MATRIX_KEY][:] = example_dict[
-            AZ_SHEAR_IMAGE_MATRIX_KEY][..., 0]
+    The file is created (overwriting the existing file if necessary), with
+    metadata from `example_dict`, and the examples in `example_dict` are
+    written.  The file stays open, so further blocks of examples can be added
+    by `write_examples_to_open_file` without re-opening the file or comparing
+    metadata.  When done, close the file with `netcdf_dataset.close()`.
 
-    if not include_soundings:
-        netcdf_dataset.close()
-        return
+    Unlike `write_example_file`, this method writes a NetCDF4 file, where each
+    predictor variable is chunked by example.  Thus, appending a block costs
+    only the new examples, and reading a few examples does not decode the
+    others.
 
-    num_sounding_heights = example_dict[SOUNDING_MATRIX_KEY].shape[1]
-    num_sounding_fields = example_dict[SOUNDING_MATRIX_KEY].shape[2]
+    :param netcdf_file_name: Path to output file.
+    :param example_dict: First block of examples.  See doc for
+        `write_example_file`.
+    :param num_storm_id_chars: See doc for `_create_example_file`.  If later
+        blocks may contain longer storm IDs than the first block, this must be
+        specified.
+    :return: netcdf_dataset: Instance of `netCDF4.Dataset`, open for writing.
+    """
 
-    num_sounding_field_chars = 1
-    for j in range(num_sounding_fields):
-        num_sounding_field_chars = max([
-            num_sounding_field_chars,
-            len(example_dict[SOUNDING_FIELDS_KEY][j])
-        ])
+    netcdf_dataset = _create_example_file(
+        netcdf_file_name=netcdf_file_name, example_dict=example_dict,
+        netcdf_format='NETCDF4', chunk_by_example=True,
+        num_storm_id_chars=num_storm_id_chars)
 
-    netcdf_dataset.createDimension(
-        SOUNDING_FIELD_DIM_KEY, num_sounding_fields)
-    netcdf_dataset.createDimension(
-        SOUNDING_HEIGHT_DIM_KEY, num_sounding_heights)
-    netcdf_dataset.createDimension(
-        SOUNDING_FIELD_CHAR_DIM_KEY, num_sounding_field_chars)
+    _append_examples_to_dataset(
+        netcdf_dataset=netcdf_dataset, example_dict=example_dict)
+    return netcdf_dataset
 
-    this_string_type = 'S{0:d}'.format(num_sounding_field_chars)
-    sounding_field_names_char_array = netCDF4.stringtochar(numpy.array(
-        example_dict[SOUNDING_FIELDS_KEY], dtype=this_string_type))
 
-    netcdf_dataset.createVariable(
-        SOUNDING_FIELDS_KEY, datatype='S1',
-        dimensions=(SOUNDING_FIELD_DIM_KEY, SOUNDING_FIELD_CHAR_DIM_KEY))
-    netcdf_dataset.variables[SOUNDING_FIELDS_KEY][:] = numpy.array(
-        sounding_field_names_char_array)
+def write_examples_to_open_file(netcdf_dataset, example_dict):
+    """Appends block of input examples to open NetCDF file.
 
-    netcdf_dataset.createVariable(
-        SOUNDING_HEIGHTS_KEY, datatype=numpy.int32,
-        dimensions=SOUNDING_HEIGHT_DIM_KEY)
-    netcdf_dataset.variables[SOUNDING_HEIGHTS_KEY][:] = example_dict[
-        SOUNDING_HEIGHTS_KEY]
+    Metadata (fields, heights, grid sizes) are not compared with those already
+    in the file, so the caller must ensure that all blocks are consistent.
 
-    netcdf_dataset.createVariable(
-        SOUNDING_MATRIX_KEY, datatype=numpy.float32,
-        dimensions=(
-            EXAMPLE_DIMENSION_KEY, SOUNDING_HEIGHT_DIM_KEY,
-            SOUNDING_FIELD_DIM_KEY
-        )
-    )
-    netcdf_dataset.variables[SOUNDING_MATRIX_KEY][:] = example_dict[
-        SOUNDING_MATRIX_KEY]
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, created by
+        `open_example_file_writer`.
+    :param example_dict: Block of examples.  See doc for `write_example_file`.
+    :raises: ValueError: if any storm ID is too long for the file (see doc for
+        `_append_examples_to_dataset`).
+    """
 
-    netcdf_dataset.close()
-    return
+    _append_examples_to_dataset(
+        netcdf_dataset=netcdf_dataset, example_dict=example_dict)
 
 
 def read_example_file(
@@ -1634,7 +1883,7 @@ def read_example_file(
         sounding_field_names_to_keep=None, sounding_heights_to_keep_m_agl=None,
         first_time_to_keep_unix_sec=None, last_time_to_keep_unix_sec=None,
         num_rows_to_keep=None, num_columns_to_keep=None,
-        class_to_num_examples_dict=None):
+        class_to_num_examples_dict=None, indices_to_read=None):
     """Reads input examples from NetCDF file.
 
     If the file contains soundings:
@@ -1694,7 +1943,11 @@ def read_example_file(
         `num_rows_to_keep is not None`, radar images will be center-cropped, so
         the image center will always be the storm center.
     :param num_columns_to_keep: Same but for columns.
-    :param class_to_num_examples_dict: See doc for `_filter_examples_by_class`.
+    :param class_to_num_examples_dict: See doc for `filter_examples_by_class`.
+    :param indices_to_read: 1-D numpy array with indices of examples (rows in
+        the file) to read.  Only these rows of the predictor matrices will be
+        decoded.  Time and class filters are applied to the remaining examples.
+        If `indices_to_read is None`, all examples will be considered.
     :return: example_dict: See doc for `write_example_file`.
     """
 
@@ -1725,12 +1978,22 @@ def read_example_file(
     error_checking.assert_is_geq(
         last_time_to_keep_unix_sec, first_time_to_keep_unix_sec)
 
-    example_indices_to_keep = numpy.where(numpy.logical_and(
-        example_dict[STORM_TIMES_KEY] >= first_time_to_keep_unix_sec,
-        example_dict[STORM_TIMES_KEY] <= last_time_to_keep_unix_sec
-    ))[0]
+    if indices_to_read is None:
+        num_examples = len(example_dict[STORM_TIMES_KEY])
+        indices_to_read = numpy.linspace(
+            0, num_examples - 1, num=num_examples, dtype=int)
+
+    error_checking.assert_is_integer_numpy_array(indices_to_read)
+    error_checking.assert_is_numpy_array(indices_to_read, num_dimensions=1)
+
+    example_indices_to_keep = indices_to_read[numpy.logical_and(
+        example_dict[STORM_TIMES_KEY][indices_to_read] >=
+        first_time_to_keep_unix_sec,
+        example_dict[STORM_TIMES_KEY][indices_to_read] <=
+        last_time_to_keep_unix_sec
+    )]
 
-    subindices_to_keep = _filter_examples_by_class(
+    subindices_to_keep = filter_examples_by_class(
         target_values=example_dict[TARGET_VALUES_KEY][example_indices_to_keep],
         class_to_num_examples_dict=class_to_num_examples_dict)
     example_indices_to_keep = example_indices_to_keep[subindices_to_keep]
@@ -1759,14 +2022,15 @@ def read_example_file(
         radar_heights_to_keep_m_agl, num_dimensions=1)
 
     if RADAR_IMAGE_MATRIX_KEY in netcdf_dataset.variables:
-        radar_image_matrix = netcdf_dataset.variables[RADAR_IMAGE_MATRIX_KEY][
-            example_indices_to_keep, ...]
+        radar_image_matrix = _read_predictor_matrix(
+            netcdf_dataset=netcdf_dataset, variable_name=RADAR_IMAGE_MATRIX_KEY,
+            example_indices_to_keep=example_indices_to_keep)
         num_radar_dimensions = len(radar_image_matrix.shape) - 2
 
         if num_radar_dimensions == 2:
             these_indices = [
                 numpy.where(numpy.logical_and(
-                    example_dict[RADAR_FIELDS_KEY] == f,
+                    numpy.array(example_dict[RADAR_FIELDS_KEY]) == f,
                     example_dict[RADAR_HEIGHTS_KEY] == h
                 ))[0][0]
                 for f, h in
@@ -1798,12 +2062,15 @@ def read_example_file(
         example_dict.update({RADAR_IMAGE_MATRIX_KEY: radar_image_matrix})
 
     else:
-        reflectivity_image_matrix_dbz = netcdf_dataset.variables[
-            REFL_IMAGE_MATRIX_KEY][example_indices_to_keep, ...]
+        reflectivity_image_matrix_dbz = _read_predictor_matrix(
+            netcdf_dataset=netcdf_dataset, variable_name=REFL_IMAGE_MATRIX_KEY,
+            example_indices_to_keep=example_indices_to_keep)
         reflectivity_image_matrix_dbz = numpy.expand_dims(
             reflectivity_image_matrix_dbz, axis=-1)
-        az_shear_image_matrix_s01 = netcdf_dataset.variables[
-            AZ_SHEAR_IMAGE_MATRIX_KEY][example_indices_to_keep, ...]
+        az_shear_image_matrix_s01 = _read_predictor_matrix(
+            netcdf_dataset=netcdf_dataset,
+            variable_name=AZ_SHEAR_IMAGE_MATRIX_KEY,
+            example_indices_to_keep=example_indices_to_keep)
 
         these_height_indices = numpy.array([
             numpy.where(example_dict[RADAR_HEIGHTS_KEY] == h)[0][0]
@@ -1839,7 +2106,7 @@ def read_example_file(
     example_dict[RADAR_FIELDS_KEY] = radar_field_names_to_keep
     example_dict[RADAR_HEIGHTS_KEY] = radar_heights_to_keep_m_agl
 
-    if not include_soundings:
+    if not include_soundings or SOUNDING_FIELDS_KEY not in example_dict:
         netcdf_dataset.close()
         return example_dict
 
@@ -1856,8 +2123,9 @@ def read_example_file(
     error_checking.assert_is_numpy_array(
         sounding_heights_to_keep_m_agl, num_dimensions=1)
 
-    sounding_matrix = netcdf_dataset.variables[SOUNDING_MATRIX_KEY][
-        example_indices_to_keep, ...]
+    sounding_matrix = _read_predictor_matrix(
+        netcdf_dataset=netcdf_dataset, variable_name=SOUNDING_MATRIX_KEY,
+        example_indices_to_keep=example_indices_to_keep)
 
     these_field_indices = numpy.array([
         example_dict[SOUNDING_FIELDS_KEY].index(f)
@@ -1932,14 +2200,15 @@ def reduce_examples_3d_to_2d(example_dict, list_of_operation_dicts):
 
         assert num_radar_dimensions == 3
 
-    new_radar_image_matrix = None
+    list_of_new_radar_matrices = []
     new_field_names = []
     new_min_heights_m_agl = []
     new_max_heights_m_agl = []
     new_operation_names = []
 
     if AZ_SHEAR_IMAGE_MATRIX_KEY in example_dict:
-        new_radar_image_matrix = example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY] + 0.
+        list_of_new_radar_matrices.append(
+            example_dict[AZ_SHEAR_IMAGE_MATRIX_KEY])
 
         for this_field_name in example_dict[RADAR_FIELDS_KEY]:
             new_field_names.append(this_field_name)
@@ -1956,12 +2225,8 @@ def reduce_examples_3d_to_2d(example_dict, list_of_operation_dicts):
         this_new_matrix, this_operation_dict = _apply_layer_operation(
             example_dict=example_dict, operation_dict=this_operation_dict)
 
-        this_new_matrix = numpy.expand_dims(this_new_matrix, axis=-1)
-        if new_radar_image_matrix is None:
-            new_radar_image_matrix = this_new_matrix + 0.
-        else:
-            new_radar_image_matrix = numpy.concatenate(
-                (new_radar_image_matrix, this_new_matrix), axis=-1)
+        list_of_new_radar_matrices.append(
+            numpy.expand_dims(this_new_matrix, axis=-1))
 
         new_field_names.append(this_operation_dict[RADAR_FIELD_KEY])
         new_min_heights_m_agl.append(this_operation_dict[MIN_HEIGHT_KEY])
@@ -1972,7 +2237,8 @@ def reduce_examples_3d_to_2d(example_dict, list_of_operation_dicts):
     example_dict.pop(AZ_SHEAR_IMAGE_MATRIX_KEY, None)
     example_dict.pop(RADAR_HEIGHTS_KEY, None)
 
-    example_dict[RADAR_IMAGE_MATRIX_KEY] = new_radar_image_matrix
+    example_dict[RADAR_IMAGE_MATRIX_KEY] = numpy.concatenate(
+        list_of_new_radar_matrices, axis=-1)
     example_dict[RADAR_FIELDS_KEY] = new_field_names
     example_dict[MIN_RADAR_HEIGHTS_KEY] = numpy.array(
         new_min_heights_m_agl, dtype=int)
@@ -1987,7 +2253,8 @@ def create_examples(
         target_file_names, target_name, num_examples_per_in_file,
         top_output_dir_name, radar_file_name_matrix=None,
         reflectivity_file_name_matrix=None, az_shear_file_name_matrix=None,
-        class_to_sampling_fraction_dict=None, sounding_file_names=None):
+        class_to_sampling_fraction_dict=None, sounding_file_names=None,
+        max_examples_per_block=DEFAULT_MAX_EXAMPLES_PER_BLOCK):
     """Creates many input examples.
 
     If `radar_file_name_matrix is None`, both `reflectivity_file_name_matrix`
@@ -2018,6 +2285,11 @@ def create_examples(
     :param sounding_file_names: length-D list of paths to sounding files (will
         be read by `soundings.read_soundings`).  If
         `sounding_file_names is None`, examples will not include soundings.
+    :param max_examples_per_block: Max number of examples created at once.
+        Examples from each file time are created and written in blocks of this
+        size, and each output file stays open while being written (see
+        `open_example_file_writer`).  Thus, memory usage is bounded, regardless
+        of the number of storm objects in one SPC date.
     """
 
     if radar_file_name_matrix is None:
@@ -2049,6 +2321,8 @@ def create_examples(
 
     error_checking.assert_is_integer(num_examples_per_in_file)
     error_checking.assert_is_geq(num_examples_per_in_file, 1)
+    error_checking.assert_is_integer(max_examples_per_block)
+    error_checking.assert_is_geq(max_examples_per_block, 1)
 
     storm_ids = []
     storm_times_unix_sec = numpy.array([], dtype=int)
@@ -2106,6 +2380,10 @@ def create_examples(
             unique_counts[k], unique_target_values[k])
     print '\n'
 
+    num_storm_id_chars = 10 + numpy.max(
+        numpy.array([len(s) for s in storm_ids])
+    )
+
     first_spc_date_string = time_conversion.time_to_spc_date_string(
         numpy.min(storm_times_unix_sec))
     last_spc_date_string = time_conversion.time_to_spc_date_string(
@@ -2126,82 +2404,87 @@ def create_examples(
 
         spc_date_to_out_file_dict[this_spc_date_string] = this_file_name
 
-    for i in range(num_file_times):
-        if radar_file_name_matrix is None:
-            this_file_name = reflectivity_file_name_matrix[0, 0]
-        else:
-            this_file_name = numpy.ravel(radar_file_name_matrix[i, ...])[0]
+    netcdf_dataset = None
+    open_spc_date_string = None
 
-        this_time_unix_sec, this_spc_date_string = (
-            storm_images.image_file_name_to_time(this_file_name)
-        )
+    try:
+        for i in range(num_file_times):
+            if radar_file_name_matrix is None:
+                this_file_name = reflectivity_file_name_matrix[i, 0]
+            else:
+                this_file_name = numpy.ravel(radar_file_name_matrix[i, ...])[0]
 
-        if this_time_unix_sec is None:
-            this_first_time_unix_sec = (
-                time_conversion.get_start_of_spc_date(this_spc_date_string)
-            )
-            this_last_time_unix_sec = (
-                time_conversion.get_end_of_spc_date(this_spc_date_string)
+            this_time_unix_sec, this_spc_date_string = (
+                storm_images.image_file_name_to_time(this_file_name)
             )
-        else:
-            this_first_time_unix_sec = this_time_unix_sec + 0
-            this_last_time_unix_sec = this_time_unix_sec + 0
-
-        these_indices = numpy.where(
-            numpy.logical_and(
-                storm_times_unix_sec >= this_first_time_unix_sec,
-                storm_times_unix_sec <= this_last_time_unix_sec)
-        )[0]
-        if len(these_indices) == 0:
-            continue
 
-        these_storm_ids = [storm_ids[m] for m in these_indices]
-        these_storm_times_unix_sec = storm_times_unix_sec[these_indices]
-        these_target_values = target_values[these_indices]
-
-        if sounding_file_names is None:
-            this_sounding_file_name = None
-        else:
-            this_sounding_file_name = sounding_file_names[i]
-
-        if radar_file_name_matrix is None:
-            this_example_dict = _create_2d3d_examples_myrorss(
-                azimuthal_shear_file_names=az_shear_file_name_matrix[
-                    i, ...].tolist(),
-                reflectivity_file_names=reflectivity_file_name_matrix[
-                    i, ...].tolist(),
-                storm_ids=these_storm_ids,
-                storm_times_unix_sec=these_storm_times_unix_sec,
-                target_values=these_target_values,
-                sounding_file_name=this_sounding_file_name,
-                sounding_field_names=None)
-        elif num_file_dimensions == 3:
-            this_example_dict = _create_3d_examples(
-                radar_file_name_matrix=radar_file_name_matrix[i, ...],
-                storm_ids=these_storm_ids,
-                storm_times_unix_sec=these_storm_times_unix_sec,
-                target_values=these_target_values,
-                sounding_file_name=this_sounding_file_name,
-                sounding_field_names=None)
-        else:
-            this_example_dict = _create_2d_examples(
-                radar_file_names=radar_file_name_matrix[i, ...].tolist(),
-                storm_ids=these_storm_ids,
-                storm_times_unix_sec=these_storm_times_unix_sec,
-                target_values=these_target_values,
-                sounding_file_name=this_sounding_file_name,
-                sounding_field_names=None)
-
-        print '\n'
-        if this_example_dict is None:
-            continue
-
-        this_example_dict.update({TARGET_NAME_KEY: target_name})
-        this_output_file_name = spc_date_to_out_file_dict[this_spc_date_string]
-
-        print 'Writing examples to: "{0:s}"...'.format(this_output_file_name)
-        write_example_file(
-            netcdf_file_name=this_output_file_name,
-            example_dict=this_example_dict,
-            append_to_file=os.path.isfile(this_output_file_name)
-        )
+            if this_time_unix_sec is None:
+                this_first_time_unix_sec = (
+                    time_conversion.get_start_of_spc_date(this_spc_date_string)
+                )
+                this_last_time_unix_sec = (
+                    time_conversion.get_end_of_spc_date(this_spc_date_string)
+                )
+            else:
+                this_first_time_unix_sec = this_time_unix_sec + 0
+                this_last_time_unix_sec = this_time_unix_sec + 0
+
+            these_indices = numpy.where(
+                numpy.logical_and(
+                    storm_times_unix_sec >= this_first_time_unix_sec,
+                    storm_times_unix_sec <= this_last_time_unix_sec)
+            )[0]
+
+            for j in range(0, len(these_indices), max_examples_per_block):
+                these_block_indices = these_indices[
+                    j:(j + max_examples_per_block)]
+
+                this_example_dict = _create_example_block(
+                    file_time_index=i,
+                    storm_ids=[storm_ids[m] for m in these_block_indices],
+                    storm_times_unix_sec=storm_times_unix_sec[
+                        these_block_indices],
+                    target_values=target_values[these_block_indices],
+                    radar_file_name_matrix=radar_file_name_matrix,
+                    reflectivity_file_name_matrix=reflectivity_file_name_matrix,
+                    az_shear_file_name_matrix=az_shear_file_name_matrix,
+                    sounding_file_names=sounding_file_names)
+
+                print '\n'
+                if this_example_dict is None:
+                    continue
+
+                this_example_dict.update({TARGET_NAME_KEY: target_name})
+                this_output_file_name = spc_date_to_out_file_dict[
+                    this_spc_date_string]
+
+                if this_spc_date_string != open_spc_date_string:
+                    if netcdf_dataset is not None:
+                        netcdf_dataset.close()
+
+                    netcdf_dataset = None
+                    open_spc_date_string = this_spc_date_string + ''
+
+                print 'Writing examples to: "{0:s}"...'.format(
+                    this_output_file_name)
+
+                if netcdf_dataset is not None:
+                    write_examples_to_open_file(
+                        netcdf_dataset=netcdf_dataset,
+                        example_dict=this_example_dict)
+                elif os.path.isfile(this_output_file_name):
+                    netcdf_dataset = netCDF4.Dataset(this_output_file_name, 'a')
+                    _compare_metadata(
+                        netcdf_dataset=netcdf_dataset,
+                        example_dict=this_example_dict)
+                    write_examples_to_open_file(
+                        netcdf_dataset=netcdf_dataset,
+                        example_dict=this_example_dict)
+                else:
+                    netcdf_dataset = open_example_file_writer(
+                        netcdf_file_name=this_output_file_name,
+                        example_dict=this_example_dict,
+                        num_storm_id_chars=num_storm_id_chars)
+    finally:
+        if netcdf_dataset is not None:
+            netcdf_dataset.close()
@@ -1,15 +1,22 @@
 """Unit tests for input_examples.py."""
 
 import copy
+import os.path
 import unittest
 import numpy
+import pandas
+import netCDF4
 from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import target_val_utils
+from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
+from gewittergefahr.gg_utils import unit_test_utils
 from gewittergefahr.deep_learning import storm_images
 from gewittergefahr.deep_learning import input_examples
 
 TOLERANCE = 1e-6
 
-# The following constants are used to test _filter_examples_by_class.
+# The following constants are used to test filter_examples_by_class.
 TARGET_VALUES_TORNADO = numpy.array(
     [0, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0, 0], dtype=int)
 
@@ -54,8 +61,9 @@ RADAR_IMAGE_DICT_NO_UNDEF_TARGETS = {
 
 # The following constants are used to test subset_examples.
 EQUALS_SIGN_KEYS = [
-    input_examples.ROTATED_GRIDS_KEY, input_examples.TARGET_NAME_KEY,
-    input_examples.RADAR_FIELDS_KEY, input_examples.STORM_IDS_KEY
+    input_examples.ROTATED_GRIDS_KEY, input_examples.ROTATED_GRID_SPACING_KEY,
+    input_examples.TARGET_NAME_KEY, input_examples.RADAR_FIELDS_KEY,
+    input_examples.STORM_IDS_KEY
 ]
 ARRAY_EQUAL_KEYS = [
     input_examples.STORM_TIMES_KEY, input_examples.TARGET_VALUES_KEY
@@ -178,6 +186,51 @@ EXAMPLE_DICT_2D3D_SUBSET[
     input_examples.AZ_SHEAR_IMAGE_MATRIX_KEY
 ] = THIS_AZ_SHEAR_IMAGE_MATRIX_S01[INDICES_TO_KEEP, ...]
 
+# The following constants are used to test concat_examples.
+FIRST_EXAMPLE_DICT_TO_CONCAT = input_examples.subset_examples(
+    example_dict=EXAMPLE_DICT_2D_ORIG,
+    indices_to_keep=numpy.array([0, 1], dtype=int), create_new_dict=True)
+SECOND_EXAMPLE_DICT_TO_CONCAT = input_examples.subset_examples(
+    example_dict=EXAMPLE_DICT_2D_ORIG,
+    indices_to_keep=numpy.array([2, 3], dtype=int), create_new_dict=True)
+
+EXAMPLE_DICT_TO_CONCAT_BAD = copy.deepcopy(SECOND_EXAMPLE_DICT_TO_CONCAT)
+EXAMPLE_DICT_TO_CONCAT_BAD[input_examples.RADAR_HEIGHTS_KEY] = (
+    EXAMPLE_DICT_TO_CONCAT_BAD[input_examples.RADAR_HEIGHTS_KEY] + 1000
+)
+
+# The following constants are used to test _read_predictor_matrix.
+PREDICTOR_FILL_VALUE = -9999.
+PREDICTOR_MATRIX_IN_FILE = numpy.array([[0, 1, -9999],
+                                        [2, -9999, 3],
+                                        [4, 5, 6]], dtype=numpy.float32)
+PREDICTOR_INDICES_TO_KEEP = numpy.array([0, 1], dtype=int)
+PREDICTOR_MATRIX_READ = numpy.array([[0, 1, numpy.nan],
+                                     [2, numpy.nan, 3]], dtype=numpy.float32)
+
+# The following constants are used to test open_example_file_writer,
+# write_examples_to_open_file, and write_example_file.
+FIRST_BLOCK_INDICES = numpy.array([0], dtype=int)
+SECOND_BLOCK_INDICES = numpy.array([1, 2], dtype=int)
+THIRD_BLOCK_INDICES = numpy.array([3], dtype=int)
+
+EXAMPLE_DICT_LONG_IDS = copy.deepcopy(EXAMPLE_DICT_3D_ORIG)
+EXAMPLE_DICT_LONG_IDS[input_examples.STORM_IDS_KEY] = [
+    'Matthews', 'Tavares', 'Marner_Kapanen_Johnsson', 'Nylander'
+]
+NUM_STORM_ID_CHARS_LONG = 23
+
+# The following constants are used to test create_examples.
+TARGET_NAME_TO_CREATE = 'tornado_lead-time=0000-3600sec_distance=00000-10000m'
+SPC_DATE_STRINGS_TO_CREATE = ['20110427', '20110428']
+NUM_STORM_OBJECTS_PER_DATE = 5
+NUM_EXAMPLES_PER_BLOCK = 2
+
+RADAR_FIELD_NAMES_TO_CREATE = [
+    radar_utils.ECHO_TOP_40DBZ_NAME, radar_utils.VIL_NAME
+]
+RADAR_HEIGHT_TO_CREATE_M_AGL = radar_utils.DEFAULT_HEIGHT_MYRORSS_M_ASL
+
 # The following constants are used to test _check_layer_operation.
 OPERATION_DICT_3D_GOOD = {
     input_examples.RADAR_FIELD_KEY: radar_utils.DIFFERENTIAL_REFL_NAME,
@@ -356,17 +409,147 @@ def _compare_example_dicts(first_example_dict, second_example_dict):
     return True
 
 
-class InputExamplesTests(unittest.TestCase):
+class InputExamplesTests(unit_test_utils.TestCaseWithTempDir):
     """Each method is a unit test for input_examples.py."""
 
+    def _check_open_file_writer(self, example_dict):
+        """Writes examples in several blocks to one open file, then reads them.
+
+        :param example_dict: Dictionary with all examples to write.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'examples.nc')
+        this_dataset = input_examples.open_example_file_writer(
+            netcdf_file_name=this_file_name,
+            example_dict=input_examples.subset_examples(
+                example_dict=example_dict, indices_to_keep=FIRST_BLOCK_INDICES,
+                create_new_dict=True)
+        )
+
+        for these_indices in [SECOND_BLOCK_INDICES, THIRD_BLOCK_INDICES]:
+            input_examples.write_examples_to_open_file(
+                netcdf_dataset=this_dataset,
+                example_dict=input_examples.subset_examples(
+                    example_dict=example_dict, indices_to_keep=these_indices,
+                    create_new_dict=True)
+            )
+
+        this_dataset.close()
+
+        this_example_dict = input_examples.read_example_file(this_file_name)
+        self.assertTrue(_compare_example_dicts(this_example_dict, example_dict))
+
+    def _write_long_ids_to_open_file(self, num_storm_id_chars):
+        """Writes examples with long storm IDs in several blocks to open file.
+
+        The second block contains a storm ID longer than any in the first block.
+
+        :param num_storm_id_chars: See doc for
+            `input_examples.open_example_file_writer`.
+        :return: example_dict: Dictionary read from the file.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'examples.nc')
+        this_dataset = input_examples.open_example_file_writer(
+            netcdf_file_name=this_file_name,
+            example_dict=input_examples.subset_examples(
+                example_dict=EXAMPLE_DICT_LONG_IDS,
+                indices_to_keep=FIRST_BLOCK_INDICES, create_new_dict=True),
+            num_storm_id_chars=num_storm_id_chars)
+
+        try:
+            for these_indices in [SECOND_BLOCK_INDICES, THIRD_BLOCK_INDICES]:
+                input_examples.write_examples_to_open_file(
+                    netcdf_dataset=this_dataset,
+                    example_dict=input_examples.subset_examples(
+                        example_dict=EXAMPLE_DICT_LONG_IDS,
+                        indices_to_keep=these_indices, create_new_dict=True)
+                )
+        finally:
+            this_dataset.close()
+
+        return input_examples.read_example_file(this_file_name)
+
+    def _create_input_files(self):
+        """Creates input files for create_examples.
+
+        Each SPC date has one target file and one storm-image file for each
+        radar field.  Each image file contains 2-D images.
+
+        :return: target_file_names: See doc for
+            `input_examples.create_examples`.
+        :return: radar_file_name_matrix: Same.
+        """
+
+        num_dates = len(SPC_DATE_STRINGS_TO_CREATE)
+        num_fields = len(RADAR_FIELD_NAMES_TO_CREATE)
+
+        target_file_names = [''] * num_dates
+        radar_file_name_matrix = numpy.full(
+            (num_dates, num_fields), '', dtype=object)
+
+        for i in range(num_dates):
+            these_storm_ids = [
+                'storm{0:d}_{1:d}'.format(i, k)
+                for k in range(NUM_STORM_OBJECTS_PER_DATE)
+            ]
+            these_times_unix_sec = (
+                time_conversion.get_start_of_spc_date(
+                    SPC_DATE_STRINGS_TO_CREATE[i]) +
+                600 * numpy.linspace(
+                    0, NUM_STORM_OBJECTS_PER_DATE - 1,
+                    num=NUM_STORM_OBJECTS_PER_DATE, dtype=int)
+            )
+
+            for j in range(num_fields):
+                radar_file_name_matrix[i, j] = (
+                    storm_images.find_storm_image_file(
+                        top_directory_name=self.temp_dir_name,
+                        spc_date_string=SPC_DATE_STRINGS_TO_CREATE[i],
+                        radar_source=radar_utils.MYRORSS_SOURCE_ID,
+                        radar_field_name=RADAR_FIELD_NAMES_TO_CREATE[j],
+                        radar_height_m_agl=RADAR_HEIGHT_TO_CREATE_M_AGL,
+                        raise_error_if_missing=False)
+                )
+
+                storm_images.write_storm_images(
+                    netcdf_file_name=radar_file_name_matrix[i, j],
+                    storm_image_matrix=numpy.random.uniform(
+                        low=0., high=1.,
+                        size=(NUM_STORM_OBJECTS_PER_DATE, 8, 8)),
+                    storm_ids=these_storm_ids,
+                    valid_times_unix_sec=these_times_unix_sec,
+                    radar_field_name=RADAR_FIELD_NAMES_TO_CREATE[j],
+                    radar_height_m_agl=RADAR_HEIGHT_TO_CREATE_M_AGL)
+
+            this_target_table = pandas.DataFrame.from_dict({
+                tracking_utils.STORM_ID_COLUMN: these_storm_ids,
+                tracking_utils.TIME_COLUMN: these_times_unix_sec,
+                TARGET_NAME_TO_CREATE: numpy.mod(
+                    numpy.linspace(
+                        0, NUM_STORM_OBJECTS_PER_DATE - 1,
+                        num=NUM_STORM_OBJECTS_PER_DATE, dtype=int),
+                    2)
+            })
+
+            target_file_names[i] = os.path.join(
+                self.temp_dir_name,
+                'targets_{0:s}.nc'.format(SPC_DATE_STRINGS_TO_CREATE[i]))
+            target_val_utils.write_target_values(
+                storm_to_events_table=this_target_table,
+                target_names=[TARGET_NAME_TO_CREATE],
+                netcdf_file_name=target_file_names[i])
+
+        return target_file_names, radar_file_name_matrix.astype(str)
+
     def test_filter_examples_by_class_tornado_first(self):
-        """Ensures correct output from _filter_examples_by_class.
+        """Ensures correct output from filter_examples_by_class.
 
         In this case, the target phenomenon is tornadogenesis and the number of
         desired examples from all classes is non-zero.
         """
 
-        these_indices_to_keep = input_examples._filter_examples_by_class(
+        these_indices_to_keep = input_examples.filter_examples_by_class(
             target_values=TARGET_VALUES_TORNADO,
             class_to_num_examples_dict=FIRST_TORNADO_CLASS_TO_NUM_EX_DICT,
             test_mode=True)
@@ -375,13 +558,13 @@ class InputExamplesTests(unittest.TestCase):
             these_indices_to_keep, FIRST_TORNADO_INDICES_TO_KEEP))
 
     def test_filter_examples_by_class_tornado_second(self):
-        """Ensures correct output from _filter_examples_by_class.
+        """Ensures correct output from filter_examples_by_class.
 
         In this case, the target phenomenon is tornadogenesis and the number of
         desired examples from some classes is zero.
         """
 
-        these_indices_to_keep = input_examples._filter_examples_by_class(
+        these_indices_to_keep = input_examples.filter_examples_by_class(
             target_values=TARGET_VALUES_TORNADO,
             class_to_num_examples_dict=SECOND_TORNADO_CLASS_TO_NUM_EX_DICT,
             test_mode=True)
@@ -390,13 +573,13 @@ class InputExamplesTests(unittest.TestCase):
             these_indices_to_keep, SECOND_TORNADO_INDICES_TO_KEEP))
 
     def test_filter_examples_by_class_wind_first(self):
-        """Ensures correct output from _filter_examples_by_class.
+        """Ensures correct output from filter_examples_by_class.
 
         In this case, the target phenomenon is wind speed and the number of
         desired examples from all classes is non-zero.
         """
 
-        these_indices_to_keep = input_examples._filter_examples_by_class(
+        these_indices_to_keep = input_examples.filter_examples_by_class(
             target_values=TARGET_VALUES_WIND,
             class_to_num_examples_dict=FIRST_WIND_CLASS_TO_NUM_EX_DICT,
             test_mode=True)
@@ -405,13 +588,13 @@ class InputExamplesTests(unittest.TestCase):
             these_indices_to_keep, FIRST_WIND_INDICES_TO_KEEP))
 
     def test_filter_examples_by_class_wind_second(self):
-        """Ensures correct output from _filter_examples_by_class.
+        """Ensures correct output from filter_examples_by_class.
 
         In this case, the target phenomenon is wind speed and the number of
         desired examples from some classes is zero.
         """
 
-        these_indices_to_keep = input_examples._filter_examples_by_class(
+        these_indices_to_keep = input_examples.filter_examples_by_class(
             target_values=TARGET_VALUES_WIND,
             class_to_num_examples_dict=SECOND_WIND_CLASS_TO_NUM_EX_DICT,
             test_mode=True)
@@ -469,6 +652,180 @@ class InputExamplesTests(unittest.TestCase):
         self.assertTrue(_compare_example_dicts(
             this_example_dict, EXAMPLE_DICT_2D3D_SUBSET))
 
+    def test_concat_examples_good(self):
+        """Ensures correct output from concat_examples.
+
+        In this case all dictionaries have the same fields and heights.
+        """
+
+        this_example_dict = input_examples.concat_examples([
+            FIRST_EXAMPLE_DICT_TO_CONCAT, SECOND_EXAMPLE_DICT_TO_CONCAT
+        ])
+
+        self.assertTrue(_compare_example_dicts(
+            this_example_dict, EXAMPLE_DICT_2D_ORIG))
+
+    def test_concat_examples_bad(self):
+        """Ensures correct output from concat_examples.
+
+        In this case the dictionaries have different heights, so
+        concat_examples should error out.
+        """
+
+        with self.assertRaises(ValueError):
+            input_examples.concat_examples([
+                FIRST_EXAMPLE_DICT_TO_CONCAT, EXAMPLE_DICT_TO_CONCAT_BAD
+            ])
+
+    def test_read_predictor_matrix(self):
+        """Ensures correct output from _read_predictor_matrix.
+
+        In this case, some values are equal to the fill value, so netCDF4 masks
+        them.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'predictors.nc')
+        this_dataset = netCDF4.Dataset(
+            this_file_name, 'w', format='NETCDF3_64BIT_OFFSET')
+        this_dataset.createDimension('row', PREDICTOR_MATRIX_IN_FILE.shape[0])
+        this_dataset.createDimension(
+            'column', PREDICTOR_MATRIX_IN_FILE.shape[1])
+        this_dataset.createVariable(
+            'predictor', datatype=numpy.float32, dimensions=('row', 'column'),
+            fill_value=PREDICTOR_FILL_VALUE)
+        this_dataset.variables['predictor'][:] = PREDICTOR_MATRIX_IN_FILE
+        this_dataset.close()
+
+        this_dataset = netCDF4.Dataset(this_file_name)
+        this_predictor_matrix = input_examples._read_predictor_matrix(
+            netcdf_dataset=this_dataset, variable_name='predictor',
+            example_indices_to_keep=PREDICTOR_INDICES_TO_KEEP)
+        this_dataset.close()
+
+        self.assertFalse(
+            isinstance(this_predictor_matrix, numpy.ma.MaskedArray))
+        self.assertTrue(this_predictor_matrix.dtype == numpy.float32)
+        self.assertTrue(numpy.allclose(
+            this_predictor_matrix, PREDICTOR_MATRIX_READ, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_open_example_file_writer_2d(self):
+        """Ensures that open_example_file_writer et al write correct file.
+
+        In this case examples contain only 2-D radar images.
+        """
+
+        self._check_open_file_writer(EXAMPLE_DICT_2D_ORIG)
+
+    def test_open_example_file_writer_3d(self):
+        """Ensures that open_example_file_writer et al write correct file.
+
+        In this case examples contain only 3-D radar images.
+        """
+
+        self._check_open_file_writer(EXAMPLE_DICT_3D_ORIG)
+
+    def test_open_example_file_writer_2d3d(self):
+        """Ensures that open_example_file_writer et al write correct file.
+
+        In this case examples contain both 2-D and 3-D radar images.
+        """
+
+        self._check_open_file_writer(EXAMPLE_DICT_2D3D_ORIG)
+
+    def test_open_example_file_writer_long_ids(self):
+        """Ensures that open_example_file_writer et al write correct file.
+
+        In this case a later block contains longer storm IDs than the first, and
+        the storm-ID dimension is sized for them.
+        """
+
+        this_example_dict = self._write_long_ids_to_open_file(
+            NUM_STORM_ID_CHARS_LONG)
+        self.assertTrue(_compare_example_dicts(
+            this_example_dict, EXAMPLE_DICT_LONG_IDS))
+
+    def test_write_examples_to_open_file_long_ids(self):
+        """Ensures that write_examples_to_open_file fails on long storm IDs.
+
+        In this case the storm-ID dimension is sized from the first block, so
+        the longer storm ID in a later block does not fit.
+        """
+
+        with self.assertRaises(ValueError):
+            self._write_long_ids_to_open_file(None)
+
+    def test_write_example_file_append(self):
+        """Ensures that write_example_file appends correctly to existing file.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'examples.nc')
+
+        for these_indices in [FIRST_BLOCK_INDICES, SECOND_BLOCK_INDICES,
+                              THIRD_BLOCK_INDICES]:
+            input_examples.write_example_file(
+                netcdf_file_name=this_file_name,
+                example_dict=input_examples.subset_examples(
+                    example_dict=EXAMPLE_DICT_3D_ORIG,
+                    indices_to_keep=these_indices, create_new_dict=True),
+                append_to_file=os.path.isfile(this_file_name)
+            )
+
+        this_example_dict = input_examples.read_example_file(this_file_name)
+        self.assertTrue(_compare_example_dicts(
+            this_example_dict, EXAMPLE_DICT_3D_ORIG))
+
+    def test_create_examples_blocks(self):
+        """Ensures that create_examples is not affected by block size.
+
+        Examples are created once in blocks of `NUM_EXAMPLES_PER_BLOCK` and once
+        in one block per SPC date.  The output files should be the same.
+        """
+
+        target_file_names, radar_file_name_matrix = self._create_input_files()
+        num_examples_total = (
+            len(SPC_DATE_STRINGS_TO_CREATE) * NUM_STORM_OBJECTS_PER_DATE
+        )
+
+        top_multi_block_dir_name = os.path.join(
+            self.temp_dir_name, 'multi_block')
+        top_single_block_dir_name = os.path.join(
+            self.temp_dir_name, 'single_block')
+
+        for this_dir_name, this_block_size in zip(
+                [top_multi_block_dir_name, top_single_block_dir_name],
+                [NUM_EXAMPLES_PER_BLOCK, num_examples_total]):
+            input_examples.create_examples(
+                target_file_names=target_file_names,
+                target_name=TARGET_NAME_TO_CREATE,
+                num_examples_per_in_file=NUM_STORM_OBJECTS_PER_DATE,
+                top_output_dir_name=this_dir_name,
+                radar_file_name_matrix=radar_file_name_matrix,
+                max_examples_per_block=this_block_size)
+
+        for i in range(len(SPC_DATE_STRINGS_TO_CREATE)):
+            this_multi_block_dict = input_examples.read_example_file(
+                input_examples.find_example_file(
+                    top_directory_name=top_multi_block_dir_name,
+                    shuffled=False,
+                    spc_date_string=SPC_DATE_STRINGS_TO_CREATE[i])
+            )
+            this_single_block_dict = input_examples.read_example_file(
+                input_examples.find_example_file(
+                    top_directory_name=top_single_block_dir_name,
+                    shuffled=False,
+                    spc_date_string=SPC_DATE_STRINGS_TO_CREATE[i])
+            )
+
+            self.assertTrue(
+                this_multi_block_dict[input_examples.STORM_IDS_KEY] == [
+                    'storm{0:d}_{1:d}'.format(i, k)
+                    for k in range(NUM_STORM_OBJECTS_PER_DATE)
+                ]
+            )
+            self.assertTrue(_compare_example_dicts(
+                this_multi_block_dict, this_single_block_dict))
+
     def test_check_layer_operation_3d_good(self):
         """Ensures correct output from _check_layer_operation.
 
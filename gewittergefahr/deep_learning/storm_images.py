@@ -3,6 +3,8 @@
 import os
 import copy
 import glob
+import collections
+import multiprocessing
 import numpy
 from scipy.interpolate import interp1d as scipy_interp1d
 import netCDF4
@@ -18,8 +20,9 @@ from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import time_periods
 from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import interp
-from gewittergefahr.gg_utils import projections
 from gewittergefahr.gg_utils import geodetic_utils
+from gewittergefahr.gg_utils import general_utils
+from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -29,6 +32,11 @@ PADDING_VALUE = 0.
 GRID_SPACING_TOLERANCE_DEG = 1e-4
 AZ_SHEAR_GRID_SPACING_MULTIPLIER = 2
 
+DEFAULT_NUM_PROCESSES_FOR_EXTRACTION = 1
+FULL_GRID_COPIES_PER_PROCESS = 3
+BYTES_PER_GRID_POINT = 8
+BYTES_PER_GIGABYTE = 1e9
+
 LABEL_FILE_EXTENSION = '.nc'
 ELEVATION_COLUMN = 'elevation_m_asl'
 ELEVATION_DIR_NAME = '/condo/swatwork/ralager/elevation'
@@ -53,6 +61,7 @@ ROTATED_SHEAR_LATITUDES_COLUMN = 'rotated_lat_matrix_for_shear_deg'
 ROTATED_SHEAR_LONGITUDES_COLUMN = 'rotated_lng_matrix_for_shear_deg'
 
 STORM_IMAGE_MATRIX_KEY = 'storm_image_matrix'
+STORM_IMAGE_MATRICES_KEY = 'storm_image_matrices'
 STORM_IDS_KEY = 'storm_ids'
 VALID_TIMES_KEY = 'valid_times_unix_sec'
 RADAR_FIELD_NAME_KEY = 'radar_field_name'
@@ -67,10 +76,19 @@ IMAGE_FILE_NAMES_KEY = 'image_file_name_matrix'
 FIELD_NAME_BY_PAIR_KEY = 'field_name_by_pair'
 HEIGHT_BY_PAIR_KEY = 'height_by_pair_m_agl'
 
+SCALAR_DISPLACEMENTS_KEY = 'scalar_displacement_matrix_metres'
+GEODETIC_BEARINGS_KEY = 'geodetic_bearing_matrix_deg'
+
 ROW_DIMENSION_KEY = 'grid_row'
 COLUMN_DIMENSION_KEY = 'grid_column'
 CHARACTER_DIMENSION_KEY = 'storm_id_character'
 STORM_OBJECT_DIMENSION_KEY = 'storm_object'
+PAIR_DIMENSION_KEY = 'field_height_pair'
+FIELD_NAME_CHAR_DIMENSION_KEY = 'field_name_character'
+
+MULTI_FIELD_DIR_NAME = 'all_fields'
+MULTI_HEIGHT_DIR_NAME = 'all_heights'
+DEFAULT_COMPRESSION_LEVEL = 4
 
 STORM_COLUMNS_NEEDED = [
     tracking_utils.STORM_ID_COLUMN, tracking_utils.TIME_COLUMN,
@@ -104,6 +122,18 @@ AZIMUTHAL_SHEAR_FIELD_NAMES = [
     radar_utils.LOW_LEVEL_SHEAR_NAME, radar_utils.MID_LEVEL_SHEAR_NAME
 ]
 
+# Each key is the absolute path to a file with storm-centered images, and each
+# value is a dictionary created by `_get_storm_object_index`.
+STORM_OBJECT_INDEX_CACHE = collections.OrderedDict()
+MAX_FILES_IN_INDEX_CACHE = 10000
+STORM_OBJECT_TO_ROW_KEY = 'storm_object_to_row_dict'
+MIN_ROWS_PER_HYPERSLAB = 8
+
+# Each key is a tuple (num rows, num columns, grid spacing in metres).  Each
+# value is a dictionary created by `_get_rotated_grid_template`.
+ROTATED_GRID_TEMPLATE_CACHE = collections.OrderedDict()
+MAX_TEMPLATES_IN_CACHE = 100
+
 
 def _check_extraction_args(
         num_storm_image_rows, num_storm_image_columns, rotate_grids,
@@ -279,6 +309,381 @@ def _check_storm_images(
         error_checking.assert_is_greater(rotated_grid_spacing_metres, 0.)
 
 
+def _get_image_variable_name(radar_field_name, radar_height_m_agl):
+    """Returns name of NetCDF variable with images for one field/height pair.
+
+    This variable is used only in multi-field files (see
+    `write_storm_images_multi_field`).
+
+    :param radar_field_name: Name of radar field.
+    :param radar_height_m_agl: Radar height (metres above ground level).
+    :return: variable_name: Name of NetCDF variable.
+    """
+
+    return '{0:s}_{1:s}_{2:05d}_metres_agl'.format(
+        STORM_IMAGE_MATRIX_KEY, radar_field_name,
+        int(numpy.round(radar_height_m_agl)))
+
+
+def _get_storm_object_index(netcdf_dataset, netcdf_file_name):
+    """Returns index of storm objects in file with storm-centered images.
+
+    The index maps each storm object (ID/time pair) to its row in the file.
+    Decoding storm IDs is expensive, so the index is computed once per file and
+    stored in `STORM_OBJECT_INDEX_CACHE`.  If the file is modified after that,
+    the index is recomputed.
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, open for reading.
+    :param netcdf_file_name: Path to file (used as cache key).
+    :return: index_dict: Dictionary with the following keys.
+    index_dict['storm_ids']: See doc for `_check_storm_images`.
+    index_dict['valid_times_unix_sec']: Same.
+    index_dict['storm_object_to_row_dict']: Dictionary, where each key is a
+        storm object (tuple with storm ID and valid time) and each value is the
+        corresponding row in the file.
+    """
+
+    modification_time_unix_sec = os.path.getmtime(netcdf_file_name)
+    cache_key = os.path.abspath(netcdf_file_name)
+
+    index_dict = general_utils.get_from_lru_cache(
+        cache_dict=STORM_OBJECT_INDEX_CACHE, cache_key=cache_key,
+        modification_time_unix_sec=modification_time_unix_sec)
+    if index_dict is not None:
+        return index_dict
+
+    num_storm_objects = netcdf_dataset.variables[STORM_IDS_KEY].shape[0]
+    if num_storm_objects == 0:
+        storm_ids = []
+        valid_times_unix_sec = numpy.array([], dtype=int)
+    else:
+        storm_ids = netCDF4.chartostring(
+            netcdf_dataset.variables[STORM_IDS_KEY][:])
+        storm_ids = [str(s) for s in storm_ids]
+        valid_times_unix_sec = numpy.array(
+            netcdf_dataset.variables[VALID_TIMES_KEY][:], dtype=int)
+
+    storm_object_to_row_dict = dict(zip(
+        zip(storm_ids, valid_times_unix_sec.tolist()),
+        range(num_storm_objects)
+    ))
+
+    index_dict = {
+        STORM_IDS_KEY: storm_ids,
+        VALID_TIMES_KEY: valid_times_unix_sec,
+        STORM_OBJECT_TO_ROW_KEY: storm_object_to_row_dict
+    }
+
+    general_utils.add_to_lru_cache(
+        cache_dict=STORM_OBJECT_INDEX_CACHE, cache_key=cache_key,
+        value=index_dict, max_num_entries=MAX_FILES_IN_INDEX_CACHE,
+        modification_time_unix_sec=modification_time_unix_sec)
+    return index_dict
+
+
+def _find_storm_objects_in_index(
+        index_dict, storm_ids_to_keep, times_to_keep_unix_sec):
+    """Finds storm objects in index (created by `_get_storm_object_index`).
+
+    This method is equivalent to `storm_tracking_utils.find_storm_objects` with
+    `allow_missing = False`, but uses a hash table rather than sorting.
+
+    n = number of storm objects to keep
+
+    :param index_dict: Dictionary created by `_get_storm_object_index`.
+    :param storm_ids_to_keep: length-n list of storm IDs (strings).
+    :param times_to_keep_unix_sec: length-n numpy array of valid times.
+    :return: relevant_indices: length-n numpy array of rows in file.
+    :raises: ValueError: if storm objects in file are not unique.
+    :raises: ValueError: if any desired storm object is not found.
+    """
+
+    error_checking.assert_is_numpy_array(
+        numpy.array(storm_ids_to_keep), num_dimensions=1)
+    num_storm_objects_to_keep = len(storm_ids_to_keep)
+    error_checking.assert_is_numpy_array(
+        times_to_keep_unix_sec,
+        exact_dimensions=numpy.array([num_storm_objects_to_keep]))
+
+    storm_object_to_row_dict = index_dict[STORM_OBJECT_TO_ROW_KEY]
+    num_storm_objects_total = len(index_dict[STORM_IDS_KEY])
+
+    if len(storm_object_to_row_dict) != num_storm_objects_total:
+        error_string = (
+            'Only {0:d} of {1:d} original storm objects are unique.'
+        ).format(len(storm_object_to_row_dict), num_storm_objects_total)
+        raise ValueError(error_string)
+
+    relevant_indices = numpy.array([
+        storm_object_to_row_dict.get((s, t), -1) for s, t in
+        zip(storm_ids_to_keep, numpy.array(times_to_keep_unix_sec).tolist())
+    ], dtype=int)
+
+    if numpy.any(relevant_indices < 0):
+        missing_indices = numpy.where(relevant_indices < 0)[0]
+        missing_object_ids = [
+            '{0:s}_{1:d}'.format(storm_ids_to_keep[k],
+                                 int(times_to_keep_unix_sec[k]))
+            for k in missing_indices
+        ]
+
+        error_string = (
+            'Cannot find {0:d} of {1:d} desired storm objects (listed below).'
+            '\n{2:s}'
+        ).format(len(missing_indices), num_storm_objects_to_keep,
+                 str(missing_object_ids))
+        raise ValueError(error_string)
+
+    return relevant_indices
+
+
+def _indices_to_hyperslabs(indices):
+    """Coalesces array indices into contiguous hyperslabs.
+
+    S = number of hyperslabs
+
+    :param indices: 1-D numpy array of indices (non-negative integers).  May be
+        unsorted and contain duplicates.
+    :return: first_indices: length-S numpy array with first index in each
+        hyperslab (sorted in ascending order).
+    :return: last_indices: length-S numpy array with last index in each
+        hyperslab.
+    """
+
+    unique_indices = numpy.unique(indices).astype(int)
+    if len(unique_indices) == 0:
+        return numpy.array([], dtype=int), numpy.array([], dtype=int)
+
+    break_indices = 1 + numpy.where(numpy.diff(unique_indices) > 1)[0]
+    first_indices = unique_indices[
+        numpy.concatenate((numpy.array([0], dtype=int), break_indices))]
+    last_indices = unique_indices[
+        numpy.concatenate((break_indices - 1, numpy.array([-1], dtype=int)))]
+
+    return first_indices, last_indices
+
+
+def _read_storm_objects_from_variable(netcdf_variable, indices):
+    """Reads specific storm objects from NetCDF variable.
+
+    Indices are coalesced into contiguous hyperslabs (see
+    `_indices_to_hyperslabs`).  Each hyperslab with >= `MIN_ROWS_PER_HYPERSLAB`
+    storm objects is read with one slice.  All other storm objects are read
+    together, with sorted and unique indices, which is the fast path for
+    fancy-indexing in `netCDF4`.  Either way, the result is reordered in memory.
+
+    :param netcdf_variable: NetCDF variable, where the first dimension is storm
+        object.
+    :param indices: 1-D numpy array of storm-object indices.
+    :return: data_matrix: numpy array, where the first dimension has the same
+        length as `indices`.
+    """
+
+    unique_indices, inverse_indices = numpy.unique(
+        indices, return_inverse=True)
+    if len(unique_indices) == 0:
+        return numpy.full((0,) + netcdf_variable.shape[1:], 0.)
+
+    first_indices, last_indices = _indices_to_hyperslabs(unique_indices)
+    first_positions = numpy.searchsorted(unique_indices, first_indices)
+    slab_lengths = last_indices - first_indices + 1
+
+    data_matrix = numpy.full(
+        (len(unique_indices),) + netcdf_variable.shape[1:], 0,
+        dtype=netcdf_variable.dtype)
+    done_flags = numpy.full(len(unique_indices), False, dtype=bool)
+
+    for k in numpy.where(slab_lengths >= MIN_ROWS_PER_HYPERSLAB)[0]:
+        these_positions = first_positions[k] + numpy.linspace(
+            0, slab_lengths[k] - 1, num=slab_lengths[k], dtype=int)
+
+        data_matrix[these_positions, ...] = numpy.array(
+            netcdf_variable[first_indices[k]:(last_indices[k] + 1), ...])
+        done_flags[these_positions] = True
+
+    these_positions = numpy.where(numpy.invert(done_flags))[0]
+    if len(these_positions):
+        data_matrix[these_positions, ...] = numpy.array(
+            netcdf_variable[unique_indices[these_positions], ...])
+
+    return data_matrix[inverse_indices, ...]
+
+
+def _read_storm_images_one_format(
+        netcdf_file_name, multi_field, return_images, storm_ids_to_keep,
+        valid_times_to_keep_unix_sec, num_rows_to_keep, num_columns_to_keep,
+        field_name_by_pair_to_keep=None, height_by_pair_to_keep_m_agl=None):
+    """Reads storm-centered radar images from NetCDF file.
+
+    :param netcdf_file_name: See doc for `read_storm_images` or
+        `read_storm_images_multi_field`.
+    :param multi_field: Boolean flag.  If True, the file must have been written
+        by `write_storm_images_multi_field`.  If False, the file must have been
+        written by `write_storm_images`.
+    :param return_images: See doc for `read_storm_images` or
+        `read_storm_images_multi_field`.
+    :param storm_ids_to_keep: Same.
+    :param valid_times_to_keep_unix_sec: Same.
+    :param num_rows_to_keep: Same.
+    :param num_columns_to_keep: Same.
+    :param field_name_by_pair_to_keep: See doc for
+        `read_storm_images_multi_field`.
+    :param height_by_pair_to_keep_m_agl: Same.
+    :return: storm_image_dict: See doc for `read_storm_images` or
+        `read_storm_images_multi_field`.
+    :raises: ValueError: if the file was written by the other method.
+    """
+
+    error_checking.assert_is_boolean(return_images)
+    error_checking.assert_is_boolean(multi_field)
+    netcdf_dataset = netcdf_io.open_netcdf(
+        netcdf_file_name=netcdf_file_name, raise_error_if_fails=True)
+
+    if multi_field != (FIELD_NAME_BY_PAIR_KEY in netcdf_dataset.variables):
+        netcdf_dataset.close()
+
+        if multi_field:
+            error_string = (
+                'File "{0:s}" contains one field/height pair.  Use '
+                '`read_storm_images`.'
+            ).format(netcdf_file_name)
+        else:
+            error_string = (
+                'File "{0:s}" contains many field/height pairs.  Use '
+                '`read_storm_images_multi_field`.'
+            ).format(netcdf_file_name)
+
+        raise ValueError(error_string)
+
+    if multi_field:
+        radar_field_names = [
+            str(s) for s in netCDF4.chartostring(
+                netcdf_dataset.variables[FIELD_NAME_BY_PAIR_KEY][:])
+        ]
+        radar_heights_m_agl = numpy.array(
+            netcdf_dataset.variables[HEIGHT_BY_PAIR_KEY][:], dtype=int)
+    else:
+        radar_field_names = [
+            str(getattr(netcdf_dataset, RADAR_FIELD_NAME_KEY))
+        ]
+        radar_heights_m_agl = numpy.array(
+            [getattr(netcdf_dataset, RADAR_HEIGHT_KEY)])
+
+    rotated_grids = bool(getattr(netcdf_dataset, ROTATED_GRIDS_KEY))
+    if rotated_grids:
+        rotated_grid_spacing_metres = getattr(
+            netcdf_dataset, ROTATED_GRID_SPACING_KEY)
+    else:
+        rotated_grid_spacing_metres = None
+
+    index_dict = _get_storm_object_index(
+        netcdf_dataset=netcdf_dataset, netcdf_file_name=netcdf_file_name)
+    storm_ids = copy.deepcopy(index_dict[STORM_IDS_KEY])
+    valid_times_unix_sec = index_dict[VALID_TIMES_KEY] + 0
+
+    storm_image_dict = {
+        STORM_IDS_KEY: storm_ids,
+        VALID_TIMES_KEY: valid_times_unix_sec,
+        ROTATED_GRIDS_KEY: rotated_grids,
+        ROTATED_GRID_SPACING_KEY: rotated_grid_spacing_metres
+    }
+
+    if multi_field:
+        storm_image_dict.update({
+            FIELD_NAME_BY_PAIR_KEY: radar_field_names,
+            HEIGHT_BY_PAIR_KEY: radar_heights_m_agl
+        })
+    else:
+        storm_image_dict.update({
+            RADAR_FIELD_NAME_KEY: radar_field_names[0],
+            RADAR_HEIGHT_KEY: radar_heights_m_agl[0]
+        })
+
+    if not return_images:
+        netcdf_dataset.close()
+        return storm_image_dict
+
+    filter_storms = not(
+        storm_ids_to_keep is None or valid_times_to_keep_unix_sec is None
+    )
+
+    if filter_storms:
+        try:
+            indices_to_keep = _find_storm_objects_in_index(
+                index_dict=index_dict, storm_ids_to_keep=storm_ids_to_keep,
+                times_to_keep_unix_sec=valid_times_to_keep_unix_sec)
+        except ValueError:
+            netcdf_dataset.close()
+            raise
+
+        storm_ids = [storm_ids[i] for i in indices_to_keep]
+        valid_times_unix_sec = valid_times_unix_sec[indices_to_keep]
+
+    storm_image_dict.update({
+        STORM_IDS_KEY: storm_ids,
+        VALID_TIMES_KEY: valid_times_unix_sec
+    })
+
+    if multi_field:
+        if (field_name_by_pair_to_keep is not None and
+                height_by_pair_to_keep_m_agl is not None):
+            error_checking.assert_is_string_list(field_name_by_pair_to_keep)
+            error_checking.assert_is_numpy_array(
+                height_by_pair_to_keep_m_agl, exact_dimensions=numpy.array(
+                    [len(field_name_by_pair_to_keep)]))
+
+            radar_field_names = field_name_by_pair_to_keep
+            radar_heights_m_agl = numpy.round(
+                height_by_pair_to_keep_m_agl).astype(int)
+
+        image_variable_names = [
+            _get_image_variable_name(f, h)
+            for f, h in zip(radar_field_names, radar_heights_m_agl)
+        ]
+    else:
+        image_variable_names = [STORM_IMAGE_MATRIX_KEY]
+
+    storm_image_matrices = []
+
+    for j in range(len(image_variable_names)):
+        if image_variable_names[j] not in netcdf_dataset.variables:
+            netcdf_dataset.close()
+
+            error_string = (
+                'Cannot find field "{0:s}" at {1:d} metres AGL in file '
+                '"{2:s}".'
+            ).format(radar_field_names[j], radar_heights_m_agl[j],
+                     netcdf_file_name)
+            raise ValueError(error_string)
+
+        this_variable = netcdf_dataset.variables[image_variable_names[j]]
+
+        if filter_storms:
+            this_storm_image_matrix = _read_storm_objects_from_variable(
+                netcdf_variable=this_variable, indices=indices_to_keep)
+        else:
+            this_storm_image_matrix = numpy.array(this_variable[:])
+
+        storm_image_matrices.append(downsize_storm_images(
+            storm_image_matrix=this_storm_image_matrix,
+            radar_field_name=radar_field_names[j],
+            num_rows_to_keep=num_rows_to_keep,
+            num_columns_to_keep=num_columns_to_keep))
+
+    netcdf_dataset.close()
+
+    if multi_field:
+        storm_image_dict.update({
+            STORM_IMAGE_MATRICES_KEY: storm_image_matrices,
+            FIELD_NAME_BY_PAIR_KEY: radar_field_names,
+            HEIGHT_BY_PAIR_KEY: radar_heights_m_agl
+        })
+    else:
+        storm_image_dict[STORM_IMAGE_MATRIX_KEY] = storm_image_matrices[0]
+
+    return storm_image_dict
+
+
 def _find_input_heights_needed(
         storm_elevations_m_asl, desired_radar_heights_m_agl, radar_source):
     """Finds radar heights needed, in metres above sea level.
@@ -429,10 +834,52 @@ def _rotate_grid_one_storm_object(
         (deg E) of grid points.
     """
 
-    storm_bearing_deg = geodetic_utils.xy_to_scalar_displacements_and_bearings(
-        x_displacements_metres=numpy.array([eastward_motion_m_s01]),
-        y_displacements_metres=numpy.array([northward_motion_m_s01])
-    )[-1][0]
+    (grid_point_lat_matrix_deg, grid_point_lng_matrix_deg
+    ) = _rotate_grids_one_batch(
+        centroid_latitudes_deg=numpy.array([centroid_latitude_deg]),
+        centroid_longitudes_deg=numpy.array([centroid_longitude_deg]),
+        eastward_motions_m_s01=numpy.array([eastward_motion_m_s01]),
+        northward_motions_m_s01=numpy.array([northward_motion_m_s01]),
+        num_storm_image_rows=num_storm_image_rows,
+        num_storm_image_columns=num_storm_image_columns,
+        storm_grid_spacing_metres=storm_grid_spacing_metres)
+
+    return grid_point_lat_matrix_deg[0, ...], grid_point_lng_matrix_deg[0, ...]
+
+
+def _get_rotated_grid_template(
+        num_storm_image_rows, num_storm_image_columns,
+        storm_grid_spacing_metres):
+    """Returns displacements from storm centroid to each point in rotated grid.
+
+    The template is for a storm moving due east (bearing of 90 deg).  Rotating
+    the grid for a storm with bearing B deg does not change scalar
+    displacements, but adds (B - 90) deg to each geodetic bearing.  The template
+    depends only on grid dimensions and spacing, so it is computed once and
+    stored in `ROTATED_GRID_TEMPLATE_CACHE`.
+
+    m = number of rows in storm-centered grid (must be even)
+    n = number of columns in storm-centered grid (must be even)
+
+    :param num_storm_image_rows: m in the above discussion.
+    :param num_storm_image_columns: n in the above discussion.
+    :param storm_grid_spacing_metres: Spacing between grid points in adjacent
+        rows or columns.
+    :return: template_dict: Dictionary with the following keys.
+    template_dict['scalar_displacement_matrix_metres']: m-by-n numpy array of
+        distances from storm centroid.
+    template_dict['geodetic_bearing_matrix_deg']: m-by-n numpy array of
+        geodetic bearings from storm centroid.
+    """
+
+    cache_key = (
+        int(num_storm_image_rows), int(num_storm_image_columns),
+        float(storm_grid_spacing_metres)
+    )
+    template_dict = general_utils.get_from_lru_cache(
+        cache_dict=ROTATED_GRID_TEMPLATE_CACHE, cache_key=cache_key)
+    if template_dict is not None:
+        return template_dict
 
     this_max_displacement_metres = storm_grid_spacing_metres * (
         num_storm_image_columns / 2 - 0.5)
@@ -453,21 +900,83 @@ def _rotate_grid_one_storm_object(
         x_unique_metres=x_prime_displacements_metres,
         y_unique_metres=y_prime_displacements_metres)
 
-    (x_displacement_matrix_metres, y_displacement_matrix_metres
-    ) = geodetic_utils.rotate_displacement_vectors(
-        x_displacements_metres=x_prime_displ_matrix_metres,
-        y_displacements_metres=y_prime_displ_matrix_metres,
-        ccw_rotation_angle_deg=-(storm_bearing_deg - 90))
-
     (scalar_displacement_matrix_metres, bearing_matrix_deg
     ) = geodetic_utils.xy_to_scalar_displacements_and_bearings(
-        x_displacements_metres=x_displacement_matrix_metres,
-        y_displacements_metres=y_displacement_matrix_metres)
+        x_displacements_metres=x_prime_displ_matrix_metres,
+        y_displacements_metres=y_prime_displ_matrix_metres)
+
+    template_dict = {
+        SCALAR_DISPLACEMENTS_KEY: scalar_displacement_matrix_metres,
+        GEODETIC_BEARINGS_KEY: bearing_matrix_deg
+    }
+
+    general_utils.add_to_lru_cache(
+        cache_dict=ROTATED_GRID_TEMPLATE_CACHE, cache_key=cache_key,
+        value=template_dict, max_num_entries=MAX_TEMPLATES_IN_CACHE)
+
+    return template_dict
+
+
+def _rotate_grids_one_batch(
+        centroid_latitudes_deg, centroid_longitudes_deg, eastward_motions_m_s01,
+        northward_motions_m_s01, num_storm_image_rows, num_storm_image_columns,
+        storm_grid_spacing_metres):
+    """Generates lat-long coordinates for rotated grids of many storm objects.
+
+    This method does the same thing as `_rotate_grid_one_storm_object`, except
+    that all storm objects are handled by one call to
+    `geodetic_utils.start_points_and_displacements_to_endpoints`.
+
+    K = number of storm objects
+    m = number of rows in storm-centered grid (must be even)
+    n = number of columns in storm-centered grid (must be even)
+
+    :param centroid_latitudes_deg: length-K numpy array with latitudes (deg N)
+        of storm centroids.
+    :param centroid_longitudes_deg: length-K numpy array with longitudes
+        (deg E) of storm centroids.
+    :param eastward_motions_m_s01: length-K numpy array with eastward
+        components of storm motion (metres per second).
+    :param northward_motions_m_s01: length-K numpy array with northward
+        components of storm motion.
+    :param num_storm_image_rows: m in the above discussion.
+    :param num_storm_image_columns: n in the above discussion.
+    :param storm_grid_spacing_metres: Spacing between grid points in adjacent
+        rows or columns.
+    :return: grid_point_lat_matrix_deg: K-by-m-by-n numpy array with latitudes
+        (deg N) of grid points.
+    :return: grid_point_lng_matrix_deg: K-by-m-by-n numpy array with longitudes
+        (deg E) of grid points.
+    """
+
+    storm_bearings_deg = geodetic_utils.xy_to_scalar_displacements_and_bearings(
+        x_displacements_metres=eastward_motions_m_s01,
+        y_displacements_metres=northward_motions_m_s01
+    )[-1]
+
+    template_dict = _get_rotated_grid_template(
+        num_storm_image_rows=num_storm_image_rows,
+        num_storm_image_columns=num_storm_image_columns,
+        storm_grid_spacing_metres=storm_grid_spacing_metres)
+
+    num_storm_objects = len(storm_bearings_deg)
+    these_dimensions = (
+        num_storm_objects, num_storm_image_rows, num_storm_image_columns)
+
+    scalar_displacement_matrix_metres = numpy.broadcast_to(
+        template_dict[SCALAR_DISPLACEMENTS_KEY], these_dimensions)
+    bearing_matrix_deg = numpy.mod(
+        numpy.expand_dims(template_dict[GEODETIC_BEARINGS_KEY], axis=0) +
+        numpy.reshape(storm_bearings_deg - 90., (num_storm_objects, 1, 1)),
+        360.
+    )
 
-    start_latitude_matrix_deg = numpy.full(
-        (num_storm_image_rows, num_storm_image_columns), centroid_latitude_deg)
-    start_longitude_matrix_deg = numpy.full(
-        (num_storm_image_rows, num_storm_image_columns), centroid_longitude_deg)
+    start_latitude_matrix_deg = numpy.broadcast_to(
+        numpy.reshape(centroid_latitudes_deg, (num_storm_objects, 1, 1)),
+        these_dimensions)
+    start_longitude_matrix_deg = numpy.broadcast_to(
+        numpy.reshape(centroid_longitudes_deg, (num_storm_objects, 1, 1)),
+        these_dimensions)
 
     return geodetic_utils.start_points_and_displacements_to_endpoints(
         start_latitudes_deg=start_latitude_matrix_deg,
@@ -521,23 +1030,26 @@ def _rotate_grids_many_storm_objects(
             storm_object_table[tracking_utils.NORTH_VELOCITY_COLUMN].values)
     )))[0]
 
-    for i in range(len(good_indices)):
-        j = good_indices[i]
-
-        (list_of_latitude_matrices[j], list_of_longitude_matrices[j]
-        ) = _rotate_grid_one_storm_object(
-            centroid_latitude_deg=storm_object_table[
-                tracking_utils.CENTROID_LAT_COLUMN].values[j],
-            centroid_longitude_deg=storm_object_table[
-                tracking_utils.CENTROID_LNG_COLUMN].values[j],
-            eastward_motion_m_s01=storm_object_table[
-                tracking_utils.EAST_VELOCITY_COLUMN].values[j],
-            northward_motion_m_s01=storm_object_table[
-                tracking_utils.NORTH_VELOCITY_COLUMN].values[j],
+    if len(good_indices) > 0:
+        (grid_point_lat_matrix_deg, grid_point_lng_matrix_deg
+        ) = _rotate_grids_one_batch(
+            centroid_latitudes_deg=storm_object_table[
+                tracking_utils.CENTROID_LAT_COLUMN].values[good_indices],
+            centroid_longitudes_deg=storm_object_table[
+                tracking_utils.CENTROID_LNG_COLUMN].values[good_indices],
+            eastward_motions_m_s01=storm_object_table[
+                tracking_utils.EAST_VELOCITY_COLUMN].values[good_indices],
+            northward_motions_m_s01=storm_object_table[
+                tracking_utils.NORTH_VELOCITY_COLUMN].values[good_indices],
             num_storm_image_rows=num_storm_image_rows,
             num_storm_image_columns=num_storm_image_columns,
             storm_grid_spacing_metres=storm_grid_spacing_metres)
 
+        for i in range(len(good_indices)):
+            j = good_indices[i]
+            list_of_latitude_matrices[j] = grid_point_lat_matrix_deg[i, ...]
+            list_of_longitude_matrices[j] = grid_point_lng_matrix_deg[i, ...]
+
     if for_azimuthal_shear:
         argument_dict = {
             ROTATED_SHEAR_LATITUDES_COLUMN: list_of_latitude_matrices,
@@ -669,148 +1181,67 @@ def _get_unrotated_storm_image_coords(
     }
 
 
-def _subset_xy_grid_for_interp(
-        field_matrix, grid_point_x_coords_metres, grid_point_y_coords_metres,
-        query_x_coords_metres, query_y_coords_metres):
-    """Subsets x-y grid before interpolation.
-
-    Interpolation will be done from the x-y grid to the query points.
-
-    M = number of rows in original grid
-    N = number of columns in original grid
-    m = number of rows in subset grid
-    n = number of columns in subset grid
-
-    :param field_matrix: M-by-N numpy array of gridded values, which will be
-        interpolated to query points.
-    :param grid_point_x_coords_metres: length-N numpy array of x-coordinates at
-        grid points.  Assumed to be sorted in ascending order.
-    :param grid_point_y_coords_metres: length-M numpy array of y-coordinates at
-        grid points.  Assumed to be sorted in ascending order.
-    :param query_x_coords_metres: numpy array (any dimensions) with
-        x-coordinates of query points.
-    :param query_y_coords_metres: numpy array (equivalent shape to
-        `query_x_coords_metres`) with y-coordinates of query points.
-    :return: subset_field_matrix: m-by-n numpy array of gridded values.
-    :return: subset_gp_x_coords_metres: length-n numpy array of x-coordinates at
-        grid points.
-    :return: subset_gp_y_coords_metres: length-m numpy array of y-coordinates at
-        grid points.
+def _get_rotated_interp_weights(
+        full_grid_point_latitudes_deg, full_grid_point_longitudes_deg,
+        rotated_gp_lat_matrix_deg, rotated_gp_lng_matrix_deg):
+    """Computes interpolation weights from full radar grid to rotated grids.
+
+    Both the storm-centered grid and full grid are treated as equidistant
+    cylindrical (linear in latitude and longitude), so bilinear weights in
+    lat-long space are the same as in the x-y space of
+    `projections.init_cylindrical_equidistant_projection`.  The weights depend
+    only on grid geometry, so they can be reused for all fields and heights at
+    one time step.
+
+    M = number of rows in full grid
+    N = number of columns in full grid
+
+    :param full_grid_point_latitudes_deg: length-M numpy array with latitudes
+        (deg N) of grid points.  Must be sorted in ascending order.
+    :param full_grid_point_longitudes_deg: length-N numpy array with longitudes
+        (deg E) of grid points.  Must be sorted in ascending order.
+    :param rotated_gp_lat_matrix_deg: numpy array (any shape, but usually
+        K x m x n, where K = number of storm objects) with latitudes (deg N) of
+        storm-centered grid points.
+    :param rotated_gp_lng_matrix_deg: numpy array (same shape) with longitudes
+        (deg E) of storm-centered grid points.
+    :return: interp_weight_dict: Dictionary created by
+        `interp.get_bilinear_interp_weights`.
     """
 
-    valid_x_indices = numpy.where(numpy.logical_and(
-        grid_point_x_coords_metres >= numpy.min(query_x_coords_metres),
-        grid_point_x_coords_metres <= numpy.max(query_x_coords_metres)))[0]
-    first_valid_x_index = max([valid_x_indices[0] - 2, 0])
-    last_valid_x_index = min([
-        valid_x_indices[-1] + 2,
-        len(grid_point_x_coords_metres) - 1
-    ])
-
-    valid_y_indices = numpy.where(numpy.logical_and(
-        grid_point_y_coords_metres >= numpy.min(query_y_coords_metres),
-        grid_point_y_coords_metres <= numpy.max(query_y_coords_metres)))[0]
-    first_valid_y_index = max([valid_y_indices[0] - 2, 0])
-    last_valid_y_index = min([
-        valid_y_indices[-1] + 2,
-        len(grid_point_y_coords_metres) - 1
-    ])
-
-    subset_field_matrix = field_matrix[
-        first_valid_y_index:(last_valid_y_index + 1),
-        first_valid_x_index:(last_valid_x_index + 1)]
-
-    return (
-        subset_field_matrix,
-        grid_point_x_coords_metres[
-            first_valid_x_index:(last_valid_x_index + 1)],
-        grid_point_y_coords_metres[
-            first_valid_y_index:(last_valid_y_index + 1)]
-    )
+    return interp.get_bilinear_interp_weights(
+        sorted_grid_point_x_coords=lng_conversion.convert_lng_positive_in_west(
+            full_grid_point_longitudes_deg, allow_nan=False),
+        sorted_grid_point_y_coords=full_grid_point_latitudes_deg,
+        query_x_coords=lng_conversion.convert_lng_positive_in_west(
+            rotated_gp_lng_matrix_deg, allow_nan=False),
+        query_y_coords=rotated_gp_lat_matrix_deg)
 
 
-def _extract_rotated_storm_image(
-        full_radar_matrix, full_grid_point_latitudes_deg,
-        full_grid_point_longitudes_deg, rotated_gp_lat_matrix_deg,
-        rotated_gp_lng_matrix_deg):
-    """Extracts rotated, storm-centered image from full radar image.
+def _extract_rotated_storm_images(full_radar_matrix, interp_weight_dict):
+    """Extracts rotated, storm-centered images from full radar image.
 
     M = number of rows in full grid
     N = number of columns in full grid
-    m = number of rows in storm-centered grid
-    n = number of columns in storm-centered grid
 
     :param full_radar_matrix: M-by-N numpy array of radar values (one variable
         at one height and one time step).  Latitude should increase with row
         index, and longitude should increase with column index.
-    :param full_grid_point_latitudes_deg: length-M numpy array with latitudes
-        (deg N) of grid points.
-    :param full_grid_point_longitudes_deg: length-N numpy array with longitudes
-        (deg E) of grid points.
-    :param rotated_gp_lat_matrix_deg: m-by-n numpy array with latitudes (deg N)
-        of grid points.
-    :param rotated_gp_lng_matrix_deg: m-by-n numpy array with longitudes (deg E)
-        of grid points.
-    :return: storm_centered_radar_matrix: m-by-n numpy array of radar values
-        (same variable, height, and time step).
+    :param interp_weight_dict: Dictionary created by
+        `_get_rotated_interp_weights`.
+    :return: storm_centered_radar_matrix: numpy array of radar values (same
+        variable, height, and time step), with the same shape as the rotated
+        grids used to create `interp_weight_dict`.  Points outside the full
+        grid contain `PADDING_VALUE`.
     """
 
-    central_latitude_deg = numpy.mean(rotated_gp_lat_matrix_deg)
-    central_longitude_deg = numpy.mean(rotated_gp_lng_matrix_deg)
-
-    projection_object = projections.init_cylindrical_equidistant_projection(
-        central_latitude_deg=central_latitude_deg,
-        central_longitude_deg=central_longitude_deg,
-        true_scale_latitude_deg=central_latitude_deg)
-
-    (rotated_gp_x_matrix_metres, rotated_gp_y_matrix_metres
-    ) = projections.project_latlng_to_xy(
-        latitudes_deg=rotated_gp_lat_matrix_deg,
-        longitudes_deg=rotated_gp_lng_matrix_deg,
-        projection_object=projection_object)
-
-    full_grid_points_x_metres, _ = projections.project_latlng_to_xy(
-        latitudes_deg=numpy.full(
-            full_grid_point_longitudes_deg.shape, central_latitude_deg),
-        longitudes_deg=full_grid_point_longitudes_deg,
-        projection_object=projection_object)
-
-    _, full_grid_points_y_metres = projections.project_latlng_to_xy(
-        latitudes_deg=full_grid_point_latitudes_deg,
-        longitudes_deg=numpy.full(
-            full_grid_point_latitudes_deg.shape, central_longitude_deg),
-        projection_object=projection_object)
-
-    (full_radar_matrix, full_grid_points_x_metres, full_grid_points_y_metres
-    ) = _subset_xy_grid_for_interp(
-        field_matrix=full_radar_matrix,
-        grid_point_x_coords_metres=full_grid_points_x_metres,
-        grid_point_y_coords_metres=full_grid_points_y_metres,
-        query_x_coords_metres=rotated_gp_x_matrix_metres,
-        query_y_coords_metres=rotated_gp_y_matrix_metres)
-
-    storm_centered_radar_matrix = interp.interp_from_xy_grid_to_points(
-        input_matrix=full_radar_matrix,
-        sorted_grid_point_x_metres=full_grid_points_x_metres,
-        sorted_grid_point_y_metres=full_grid_points_y_metres,
-        query_x_coords_metres=rotated_gp_x_matrix_metres.ravel(),
-        query_y_coords_metres=rotated_gp_y_matrix_metres.ravel(),
-        method_string=interp.SPLINE_METHOD_STRING, spline_degree=1,
-        extrapolate=True)
-    storm_centered_radar_matrix = numpy.reshape(
-        storm_centered_radar_matrix, rotated_gp_lat_matrix_deg.shape)
-
-    invalid_x_flags = numpy.logical_or(
-        rotated_gp_x_matrix_metres < numpy.min(full_grid_points_x_metres),
-        rotated_gp_x_matrix_metres > numpy.max(full_grid_points_x_metres))
-    invalid_y_flags = numpy.logical_or(
-        rotated_gp_y_matrix_metres < numpy.min(full_grid_points_y_metres),
-        rotated_gp_y_matrix_metres > numpy.max(full_grid_points_y_metres))
-    invalid_indices = numpy.where(
-        numpy.logical_or(invalid_x_flags, invalid_y_flags))
-
-    storm_centered_radar_matrix[invalid_indices] = PADDING_VALUE
-    return numpy.flipud(storm_centered_radar_matrix)
+    storm_centered_radar_matrix = interp.interp_with_bilinear_weights(
+        input_matrix=full_radar_matrix, interp_weight_dict=interp_weight_dict)
+    storm_centered_radar_matrix[
+        interp_weight_dict[interp.BILINEAR_OUTSIDE_GRID_FLAGS_KEY]
+    ] = PADDING_VALUE
+
+    return numpy.flip(storm_centered_radar_matrix, axis=-2)
 
 
 def _extract_unrotated_storm_image(
@@ -1019,54 +1450,654 @@ def _find_many_files_one_spc_date(
     return image_file_name_matrix, valid_times_unix_sec
 
 
-def downsize_storm_images(
-        storm_image_matrix, radar_field_name, num_rows_to_keep=None,
-        num_columns_to_keep=None):
-    """Downsizes storm-centered radar images.
+def _get_num_processes_for_extraction(
+        num_processes, max_memory_gb, num_grid_points_per_process):
+    """Caps number of worker processes for storm-image extraction.
 
-    :param storm_image_matrix: See doc for `_check_storm_images`.
-    :param radar_field_name: Same.
-    :param num_rows_to_keep: Number of rows to keep.  If `storm_image_matrix`
-        contains azimuthal shear, this will be doubled.
-    :param num_columns_to_keep: Number of columns to keep.  If
-        `storm_image_matrix` contains azimuthal shear, this will be doubled.
-    :return: storm_image_matrix: Same as input, but maybe with fewer rows and
-        columns.
-    :raises: ValueError: if downsized image cannot be centered in full image.
+    :param num_processes: Desired number of worker processes.
+    :param max_memory_gb: Max memory (gigabytes) to be used by all worker
+        processes together.  If None, there is no cap.
+    :param num_grid_points_per_process: Number of grid points in the largest
+        full radar grid to be read by one worker process at once.
+    :return: num_processes: Number of worker processes (always >= 1).  Memory
+        per process is estimated as `FULL_GRID_COPIES_PER_PROCESS` 64-bit
+        copies of the full radar grid.
     """
 
-    error_checking.assert_is_numpy_array_without_nan(storm_image_matrix)
-    num_dimensions = len(storm_image_matrix.shape)
-    error_checking.assert_is_geq(num_dimensions, 3)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+    if max_memory_gb is None:
+        return num_processes
 
-    radar_utils.check_field_name(radar_field_name)
-    if radar_field_name in AZIMUTHAL_SHEAR_FIELD_NAMES:
-        if num_rows_to_keep is not None:
-            num_rows_to_keep *= 2
-        if num_columns_to_keep is not None:
-            num_columns_to_keep *= 2
+    error_checking.assert_is_greater(max_memory_gb, 0.)
+    error_checking.assert_is_integer(num_grid_points_per_process)
+    error_checking.assert_is_greater(num_grid_points_per_process, 0)
 
-    num_rows_total = storm_image_matrix.shape[1]
-    if num_rows_to_keep == num_rows_total:
-        num_rows_to_keep = None
+    memory_per_process_gb = (
+        num_grid_points_per_process * FULL_GRID_COPIES_PER_PROCESS *
+        BYTES_PER_GRID_POINT / BYTES_PER_GIGABYTE
+    )
+    max_num_processes = int(numpy.floor(max_memory_gb / memory_per_process_gb))
 
-    num_columns_total = storm_image_matrix.shape[2]
-    if num_columns_to_keep == num_columns_total:
-        num_columns_to_keep = None
+    return max([min([num_processes, max_num_processes]), 1])
 
-    if num_rows_to_keep is not None:
-        error_checking.assert_is_integer(num_rows_to_keep)
-        error_checking.assert_is_greater(num_rows_to_keep, 0)
 
-        num_rows_leftover = num_rows_total - num_rows_to_keep
-        if num_rows_leftover != rounder.round_to_nearest(num_rows_leftover, 2):
-            error_string = (
-                'Cannot downsize from {0:d} to {1:d} rows, because number of '
-                'rows left over ({2:d}) is odd.'
-            ).format(num_rows_total, num_rows_to_keep, num_rows_leftover)
-            raise ValueError(error_string)
+def _extract_images_one_time_myrorss(argument_tuple):
+    """Extracts storm-centered images from MYRORSS or MRMS data at one time.
 
-        first_row_to_keep = num_rows_leftover / 2
+    This method is the unit of work for `extract_storm_images_myrorss_or_mrms`,
+    so it takes one argument (a tuple, as required by
+    `general_utils.imap_bounded`).
+
+    P = number of field/height pairs
+
+    :param argument_tuple: Tuple with the following elements.
+    argument_tuple[0]: time_index: Index of time step.
+    argument_tuple[1]: valid_time_string: Valid time (used only in log
+        messages).
+    argument_tuple[2]: storm_object_table: pandas DataFrame with storm objects
+        at this time (columns listed in doc for
+        `extract_storm_images_myrorss_or_mrms`, plus "elevation_m_asl").
+    argument_tuple[3]: radar_file_names: length-P list of paths to radar files
+        (None if a field/height pair is missing).
+    argument_tuple[4]: field_name_by_pair: length-P list of field names.
+    argument_tuple[5]: height_by_pair_m_asl: length-P numpy array of heights
+        (metres above sea level).
+    argument_tuple[6]: radar_source: See doc for
+        `extract_storm_images_myrorss_or_mrms`.
+    argument_tuple[7]: num_storm_image_rows: Same.
+    argument_tuple[8]: num_storm_image_columns: Same.
+    argument_tuple[9]: rotate_grids: Same.
+    argument_tuple[10]: rotated_grid_spacing_metres: Same.
+    argument_tuple[11]: reflectivity_heights_m_agl: 1-D numpy array of
+        reflectivity heights to write (metres above ground level).
+    argument_tuple[12]: reflectivity_heights_m_asl: 1-D numpy array of
+        reflectivity heights in radar files (metres above sea level).
+    :return: time_index: Same as input.
+    :return: latitude_spacing_deg: Spacing (deg N) between meridionally adjacent
+        grid points, as returned by `_check_grid_spacing`.
+    :return: longitude_spacing_deg: Same but for zonally adjacent grid points.
+    :return: image_dicts: 1-D list of dictionaries, in the order that they
+        should be written.  Each has the following keys.
+    image_dict['storm_image_matrix']: numpy array of storm-centered images (one
+        per storm object).
+    image_dict['radar_field_name']: Name of radar field.
+    image_dict['radar_height_m_agl']: Radar height.
+    """
+
+    (time_index, valid_time_string, storm_object_table, radar_file_names,
+     field_name_by_pair, height_by_pair_m_asl, radar_source,
+     num_storm_image_rows, num_storm_image_columns, rotate_grids,
+     rotated_grid_spacing_metres, reflectivity_heights_m_agl,
+     reflectivity_heights_m_asl
+    ) = argument_tuple
+
+    num_refl_heights_agl = len(reflectivity_heights_m_agl)
+    num_refl_heights_asl = len(reflectivity_heights_m_asl)
+
+    any_azimuthal_shear = [
+        f in AZIMUTHAL_SHEAR_FIELD_NAMES for f in field_name_by_pair
+    ]
+    any_non_azimuthal_shear = [
+        f not in AZIMUTHAL_SHEAR_FIELD_NAMES for f in field_name_by_pair
+    ]
+
+    if rotate_grids:
+        if any_azimuthal_shear:
+            print (
+                'Creating rotated {0:.1f}-metre grids for storms at '
+                '{1:s}...'
+            ).format(rotated_grid_spacing_metres / 2, valid_time_string)
+
+            storm_object_table = _rotate_grids_many_storm_objects(
+                storm_object_table=storm_object_table,
+                num_storm_image_rows=num_storm_image_rows * 2,
+                num_storm_image_columns=num_storm_image_columns * 2,
+                storm_grid_spacing_metres=rotated_grid_spacing_metres / 2,
+                for_azimuthal_shear=True)
+
+        if any_non_azimuthal_shear:
+            print (
+                'Creating rotated {0:.1f}-metre grids for storms at '
+                '{1:s}...'
+            ).format(rotated_grid_spacing_metres, valid_time_string)
+
+            storm_object_table = _rotate_grids_many_storm_objects(
+                storm_object_table=storm_object_table,
+                num_storm_image_rows=num_storm_image_rows,
+                num_storm_image_columns=num_storm_image_columns,
+                storm_grid_spacing_metres=rotated_grid_spacing_metres,
+                for_azimuthal_shear=False)
+
+    num_storms = len(storm_object_table.index)
+    refl_matrix_sea_relative_dbz = numpy.full(
+        (num_storms, num_storm_image_rows, num_storm_image_columns,
+         num_refl_heights_asl),
+        numpy.nan)
+
+    latitude_spacing_deg = None
+    longitude_spacing_deg = None
+    interp_weight_dict_by_grid = {}
+    image_dicts = []
+
+    for j in range(len(field_name_by_pair)):
+        if radar_file_names[j] is None:
+            continue
+
+        print (
+            'Extracting storm-centered images for "{0:s}" at {1:d} metres ASL '
+            'and {2:s}...'
+        ).format(field_name_by_pair[j],
+                 int(numpy.round(height_by_pair_m_asl[j])), valid_time_string)
+
+        this_metadata_dict = myrorss_and_mrms_io.read_metadata_from_raw_file(
+            netcdf_file_name=radar_file_names[j], data_source=radar_source)
+
+        this_sparse_grid_table = (
+            myrorss_and_mrms_io.read_data_from_sparse_grid_file(
+                netcdf_file_name=radar_file_names[j],
+                field_name_orig=this_metadata_dict[
+                    myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
+                data_source=radar_source,
+                sentinel_values=this_metadata_dict[
+                    radar_utils.SENTINEL_VALUE_COLUMN])
+        )
+
+        (this_full_radar_matrix, these_full_latitudes_deg,
+         these_full_longitudes_deg
+        ) = radar_s2f.sparse_to_full_grid(
+            sparse_grid_table=this_sparse_grid_table,
+            metadata_dict=this_metadata_dict)
+
+        this_full_radar_matrix[
+            numpy.isnan(this_full_radar_matrix)] = PADDING_VALUE
+        if rotate_grids:
+            this_full_radar_matrix = numpy.flipud(this_full_radar_matrix)
+            these_full_latitudes_deg = these_full_latitudes_deg[::-1]
+
+        latitude_spacing_deg, longitude_spacing_deg = _check_grid_spacing(
+            new_metadata_dict=this_metadata_dict,
+            orig_lat_spacing_deg=latitude_spacing_deg,
+            orig_lng_spacing_deg=longitude_spacing_deg)
+
+        if field_name_by_pair[j] in AZIMUTHAL_SHEAR_FIELD_NAMES:
+            this_num_image_rows = (
+                num_storm_image_rows * AZ_SHEAR_GRID_SPACING_MULTIPLIER)
+            this_num_image_columns = (
+                num_storm_image_columns * AZ_SHEAR_GRID_SPACING_MULTIPLIER)
+        else:
+            this_num_image_rows = num_storm_image_rows + 0
+            this_num_image_columns = num_storm_image_columns + 0
+
+        this_storm_image_matrix = numpy.full(
+            (num_storms, this_num_image_rows, this_num_image_columns),
+            numpy.nan)
+
+        if rotate_grids and num_storms == 0:
+            pass
+        elif rotate_grids:
+            this_is_shear = field_name_by_pair[j] in AZIMUTHAL_SHEAR_FIELD_NAMES
+            this_weight_key = (
+                this_is_shear, these_full_latitudes_deg[0],
+                these_full_longitudes_deg[0], len(these_full_latitudes_deg),
+                len(these_full_longitudes_deg)
+            )
+
+            if this_weight_key not in interp_weight_dict_by_grid:
+                if this_is_shear:
+                    this_lat_column = ROTATED_SHEAR_LATITUDES_COLUMN
+                    this_lng_column = ROTATED_SHEAR_LONGITUDES_COLUMN
+                else:
+                    this_lat_column = ROTATED_NON_SHEAR_LATITUDES_COLUMN
+                    this_lng_column = ROTATED_NON_SHEAR_LONGITUDES_COLUMN
+
+                interp_weight_dict_by_grid[
+                    this_weight_key
+                ] = _get_rotated_interp_weights(
+                    full_grid_point_latitudes_deg=these_full_latitudes_deg,
+                    full_grid_point_longitudes_deg=these_full_longitudes_deg,
+                    rotated_gp_lat_matrix_deg=numpy.stack(
+                        storm_object_table[this_lat_column].values, axis=0),
+                    rotated_gp_lng_matrix_deg=numpy.stack(
+                        storm_object_table[this_lng_column].values, axis=0)
+                )
+
+            this_storm_image_matrix = _extract_rotated_storm_images(
+                full_radar_matrix=this_full_radar_matrix,
+                interp_weight_dict=interp_weight_dict_by_grid[this_weight_key])
+        else:
+            (these_center_rows, these_center_columns
+            ) = _centroids_latlng_to_rowcol(
+                centroid_latitudes_deg=storm_object_table[
+                    tracking_utils.CENTROID_LAT_COLUMN].values,
+                centroid_longitudes_deg=storm_object_table[
+                    tracking_utils.CENTROID_LNG_COLUMN].values,
+                nw_grid_point_lat_deg=this_metadata_dict[
+                    radar_utils.NW_GRID_POINT_LAT_COLUMN],
+                nw_grid_point_lng_deg=this_metadata_dict[
+                    radar_utils.NW_GRID_POINT_LNG_COLUMN],
+                lat_spacing_deg=this_metadata_dict[
+                    radar_utils.LAT_SPACING_COLUMN],
+                lng_spacing_deg=this_metadata_dict[
+                    radar_utils.LNG_SPACING_COLUMN])
+
+            for k in range(num_storms):
+                this_storm_image_matrix[k, :, :] = (
+                    _extract_unrotated_storm_image(
+                        full_radar_matrix=this_full_radar_matrix,
+                        center_row=these_center_rows[k],
+                        center_column=these_center_columns[k],
+                        num_storm_image_rows=this_num_image_rows,
+                        num_storm_image_columns=this_num_image_columns)
+                )
+
+        if field_name_by_pair[j] == radar_utils.REFL_NAME:
+            this_height_index = numpy.where(
+                height_by_pair_m_asl[j] == reflectivity_heights_m_asl
+            )[0][0]
+            refl_matrix_sea_relative_dbz[
+                ..., this_height_index] = this_storm_image_matrix
+            continue
+
+        image_dicts.append({
+            STORM_IMAGE_MATRIX_KEY: this_storm_image_matrix,
+            RADAR_FIELD_NAME_KEY: field_name_by_pair[j],
+            RADAR_HEIGHT_KEY: height_by_pair_m_asl[j]
+        })
+
+    if num_refl_heights_agl == 0:
+        return (time_index, latitude_spacing_deg, longitude_spacing_deg,
+                image_dicts)
+
+    print ('Interpolating reflectivity to desired heights above ground '
+           'level...')
+    refl_matrix_ground_relative_dbz = numpy.full(
+        (num_storms, num_storm_image_rows, num_storm_image_columns,
+         num_refl_heights_agl),
+        numpy.nan)
+
+    for k in range(num_storms):
+        these_heights_m_asl = (
+            storm_object_table[ELEVATION_COLUMN].values[k]
+            + reflectivity_heights_m_agl
+        )
+
+        refl_matrix_ground_relative_dbz[k, ...] = _interp_storm_image_in_height(
+            storm_image_matrix_3d=refl_matrix_sea_relative_dbz[k, ...],
+            orig_heights_m_asl=reflectivity_heights_m_asl,
+            new_heights_m_asl=these_heights_m_asl)
+
+    for j in range(num_refl_heights_agl):
+        image_dicts.append({
+            STORM_IMAGE_MATRIX_KEY: refl_matrix_ground_relative_dbz[..., j],
+            RADAR_FIELD_NAME_KEY: radar_utils.REFL_NAME,
+            RADAR_HEIGHT_KEY: reflectivity_heights_m_agl[j]
+        })
+
+    return time_index, latitude_spacing_deg, longitude_spacing_deg, image_dicts
+
+
+def _extract_images_one_time_gridrad(argument_tuple):
+    """Extracts storm-centered images from GridRad data at one time.
+
+    This method is the unit of work for `extract_storm_images_gridrad`, so it
+    takes one argument (a tuple, as required by `general_utils.imap_bounded`).
+
+    :param argument_tuple: Tuple with the following elements.
+    argument_tuple[0]: time_index: Index of time step.
+    argument_tuple[1]: valid_time_string: Valid time (used only in log
+        messages).
+    argument_tuple[2]: storm_object_table: pandas DataFrame with storm objects
+        at this time (columns listed in doc for
+        `extract_storm_images_myrorss_or_mrms`, plus "elevation_m_asl").
+    argument_tuple[3]: radar_file_name: Path to radar file (readable by
+        `gridrad_io.read_field_from_full_grid_file`).
+    argument_tuple[4]: radar_field_names: See doc for
+        `extract_storm_images_gridrad`.
+    argument_tuple[5]: radar_heights_m_agl: Same.
+    argument_tuple[6]: radar_heights_m_asl: 1-D numpy array of radar heights
+        needed from the file (metres above sea level).
+    argument_tuple[7]: num_storm_image_rows: See doc for
+        `extract_storm_images_gridrad`.
+    argument_tuple[8]: num_storm_image_columns: Same.
+    argument_tuple[9]: rotate_grids: Same.
+    argument_tuple[10]: rotated_grid_spacing_metres: Same.
+    :return: time_index: See doc for `_extract_images_one_time_myrorss`.
+    :return: latitude_spacing_deg: Same.
+    :return: longitude_spacing_deg: Same.
+    :return: image_dicts: Same.
+    """
+
+    (time_index, valid_time_string, storm_object_table, radar_file_name,
+     radar_field_names, radar_heights_m_agl, radar_heights_m_asl,
+     num_storm_image_rows, num_storm_image_columns, rotate_grids,
+     rotated_grid_spacing_metres
+    ) = argument_tuple
+
+    num_heights_agl = len(radar_heights_m_agl)
+    num_heights_asl = len(radar_heights_m_asl)
+
+    metadata_dict = gridrad_io.read_metadata_from_full_grid_file(
+        radar_file_name)
+    latitude_spacing_deg, longitude_spacing_deg = _check_grid_spacing(
+        new_metadata_dict=metadata_dict, orig_lat_spacing_deg=None,
+        orig_lng_spacing_deg=None)
+
+    if rotate_grids:
+        print (
+            'Creating rotated {0:.1f}-metre grids for storms at {1:s}...'
+        ).format(rotated_grid_spacing_metres, valid_time_string)
+
+        storm_object_table = _rotate_grids_many_storm_objects(
+            storm_object_table=storm_object_table,
+            num_storm_image_rows=num_storm_image_rows,
+            num_storm_image_columns=num_storm_image_columns,
+            storm_grid_spacing_metres=rotated_grid_spacing_metres,
+            for_azimuthal_shear=False)
+
+    num_storms = len(storm_object_table.index)
+    interp_weight_dict = None
+    image_dicts = []
+
+    for this_field_name in radar_field_names:
+        print 'Reading "{0:s}" from file: "{1:s}"...'.format(
+            this_field_name, radar_file_name)
+
+        (this_full_radar_matrix_3d, these_full_heights_m_asl,
+         these_full_latitudes_deg, these_full_longitudes_deg
+        ) = gridrad_io.read_field_from_full_grid_file(
+            netcdf_file_name=radar_file_name, field_name=this_field_name,
+            metadata_dict=metadata_dict)
+        this_full_radar_matrix_3d[
+            numpy.isnan(this_full_radar_matrix_3d)] = PADDING_VALUE
+
+        if not rotate_grids:
+            this_full_radar_matrix_3d = numpy.flip(
+                this_full_radar_matrix_3d, axis=1)
+            these_full_latitudes_deg = these_full_latitudes_deg[::-1]
+
+        this_storm_image_matrix_sea_relative = numpy.full(
+            (num_storms, num_storm_image_rows, num_storm_image_columns,
+             num_heights_asl),
+            numpy.nan)
+
+        for k in range(num_heights_asl):
+            this_height_index = numpy.where(
+                these_full_heights_m_asl == radar_heights_m_asl[k]
+            )[0][0]
+            this_full_radar_matrix_2d = this_full_radar_matrix_3d[
+                this_height_index, ...]
+
+            print (
+                'Extracting storm-centered images for "{0:s}" at {1:d} metres '
+                'ASL and {2:s}...'
+            ).format(this_field_name, int(numpy.round(radar_heights_m_asl[k])),
+                     valid_time_string)
+
+            if rotate_grids and num_storms == 0:
+                pass
+            elif rotate_grids:
+                if interp_weight_dict is None:
+                    interp_weight_dict = _get_rotated_interp_weights(
+                        full_grid_point_latitudes_deg=these_full_latitudes_deg,
+                        full_grid_point_longitudes_deg=
+                        these_full_longitudes_deg,
+                        rotated_gp_lat_matrix_deg=numpy.stack(
+                            storm_object_table[
+                                ROTATED_NON_SHEAR_LATITUDES_COLUMN].values,
+                            axis=0),
+                        rotated_gp_lng_matrix_deg=numpy.stack(
+                            storm_object_table[
+                                ROTATED_NON_SHEAR_LONGITUDES_COLUMN].values,
+                            axis=0)
+                    )
+
+                this_storm_image_matrix_sea_relative[
+                    ..., k
+                ] = _extract_rotated_storm_images(
+                    full_radar_matrix=this_full_radar_matrix_2d,
+                    interp_weight_dict=interp_weight_dict)
+            else:
+                (these_center_rows, these_center_columns
+                ) = _centroids_latlng_to_rowcol(
+                    centroid_latitudes_deg=storm_object_table[
+                        tracking_utils.CENTROID_LAT_COLUMN].values,
+                    centroid_longitudes_deg=storm_object_table[
+                        tracking_utils.CENTROID_LNG_COLUMN].values,
+                    nw_grid_point_lat_deg=metadata_dict[
+                        radar_utils.NW_GRID_POINT_LAT_COLUMN],
+                    nw_grid_point_lng_deg=metadata_dict[
+                        radar_utils.NW_GRID_POINT_LNG_COLUMN],
+                    lat_spacing_deg=metadata_dict[
+                        radar_utils.LAT_SPACING_COLUMN],
+                    lng_spacing_deg=metadata_dict[
+                        radar_utils.LNG_SPACING_COLUMN])
+
+                for m in range(num_storms):
+                    this_storm_image_matrix_sea_relative[
+                        m, ..., k
+                    ] = _extract_unrotated_storm_image(
+                        full_radar_matrix=this_full_radar_matrix_2d,
+                        center_row=these_center_rows[m],
+                        center_column=these_center_columns[m],
+                        num_storm_image_rows=num_storm_image_rows,
+                        num_storm_image_columns=num_storm_image_columns)
+
+        print (
+            'Interpolating "{0:s}" to desired heights above ground level...'
+        ).format(this_field_name)
+        this_storm_image_matrix_ground_relative = numpy.full(
+            (num_storms, num_storm_image_rows, num_storm_image_columns,
+             num_heights_agl),
+            numpy.nan)
+
+        for m in range(num_storms):
+            these_heights_m_asl = (
+                storm_object_table[ELEVATION_COLUMN].values[m]
+                + radar_heights_m_agl
+            )
+
+            this_storm_image_matrix_ground_relative[
+                m, ...
+            ] = _interp_storm_image_in_height(
+                storm_image_matrix_3d=this_storm_image_matrix_sea_relative[
+                    m, ...],
+                orig_heights_m_asl=radar_heights_m_asl,
+                new_heights_m_asl=these_heights_m_asl)
+
+        for k in range(num_heights_agl):
+            image_dicts.append({
+                STORM_IMAGE_MATRIX_KEY:
+                    this_storm_image_matrix_ground_relative[..., k],
+                RADAR_FIELD_NAME_KEY: this_field_name,
+                RADAR_HEIGHT_KEY: radar_heights_m_agl[k]
+            })
+
+    return time_index, latitude_spacing_deg, longitude_spacing_deg, image_dicts
+
+
+def _extract_and_write_many_times(
+        extraction_function, argument_tuples, storm_object_table_by_time,
+        valid_times_unix_sec, valid_spc_dates_unix_sec, radar_source,
+        top_output_dir_name, rotate_grids, rotated_grid_spacing_metres,
+        num_processes, multi_field_output=False):
+    """Extracts storm-centered images at many times and writes them to files.
+
+    Extraction is done independently for each time, so it may be farmed out to
+    worker processes.  However, results are written by the main process in
+    order of time (and, within each time, in the same order as serial
+    extraction), so output files do not depend on the number of processes.
+
+    T = number of time steps
+
+    :param extraction_function: Function that does the work for one time step
+        (either `_extract_images_one_time_myrorss` or
+        `_extract_images_one_time_gridrad`).
+    :param argument_tuples: length-T list of argument tuples for
+        `extraction_function`.
+    :param storm_object_table_by_time: length-T list of pandas DataFrames with
+        storm objects (used to write storm IDs and times).
+    :param valid_times_unix_sec: length-T numpy array of valid times.
+    :param valid_spc_dates_unix_sec: length-T numpy array of SPC dates.
+    :param radar_source: Data source.
+    :param top_output_dir_name: See doc for
+        `extract_storm_images_myrorss_or_mrms`.
+    :param rotate_grids: Same.
+    :param rotated_grid_spacing_metres: Same.
+    :param num_processes: Number of worker processes.  If `num_processes == 1`,
+        all times will be done serially in the main process.  Otherwise, at most
+        `num_processes + 1` times are extracted ahead of the main process, so
+        images waiting to be written are bounded.
+    :param multi_field_output: Boolean flag.  If True, will write one file per
+        time step (with all fields/heights) via
+        `write_storm_images_multi_field`.  If False, will write one file per
+        time step and field/height pair via `write_storm_images`.
+    """
+
+    error_checking.assert_is_boolean(multi_field_output)
+
+    if num_processes == 1:
+        pool_object = None
+        result_iterator = (extraction_function(t) for t in argument_tuples)
+    else:
+        pool_object = multiprocessing.Pool(processes=num_processes)
+        result_iterator = general_utils.imap_bounded(
+            pool_object=pool_object, worker_function=extraction_function,
+            argument_iterable=argument_tuples,
+            max_num_pending=num_processes + 1)
+
+    latitude_spacing_deg = None
+    longitude_spacing_deg = None
+
+    try:
+        for (i, this_lat_spacing_deg, this_lng_spacing_deg, these_image_dicts
+            ) in result_iterator:
+            if this_lat_spacing_deg is not None:
+                latitude_spacing_deg, longitude_spacing_deg = (
+                    _check_grid_spacing(
+                        new_metadata_dict={
+                            radar_utils.LAT_SPACING_COLUMN:
+                                this_lat_spacing_deg,
+                            radar_utils.LNG_SPACING_COLUMN: this_lng_spacing_deg
+                        },
+                        orig_lat_spacing_deg=latitude_spacing_deg,
+                        orig_lng_spacing_deg=longitude_spacing_deg)
+                )
+
+            this_storm_object_table = storm_object_table_by_time[i]
+            these_storm_ids = this_storm_object_table[
+                tracking_utils.STORM_ID_COLUMN].values.tolist()
+            these_storm_times_unix_sec = this_storm_object_table[
+                tracking_utils.TIME_COLUMN].values.astype(int)
+
+            if multi_field_output:
+                this_image_file_name = find_storm_image_file_multi_field(
+                    top_directory_name=top_output_dir_name,
+                    unix_time_sec=valid_times_unix_sec[i],
+                    spc_date_string=time_conversion.time_to_spc_date_string(
+                        valid_spc_dates_unix_sec[i]),
+                    radar_source=radar_source, raise_error_if_missing=False)
+
+                print (
+                    'Writing storm-centered images to: "{0:s}"...'
+                ).format(this_image_file_name)
+                write_storm_images_multi_field(
+                    netcdf_file_name=this_image_file_name,
+                    storm_image_matrices=[
+                        d[STORM_IMAGE_MATRIX_KEY] for d in these_image_dicts
+                    ],
+                    storm_ids=these_storm_ids,
+                    valid_times_unix_sec=these_storm_times_unix_sec,
+                    field_name_by_pair=[
+                        d[RADAR_FIELD_NAME_KEY] for d in these_image_dicts
+                    ],
+                    height_by_pair_m_agl=numpy.array(
+                        [d[RADAR_HEIGHT_KEY] for d in these_image_dicts]),
+                    rotated_grids=rotate_grids,
+                    rotated_grid_spacing_metres=rotated_grid_spacing_metres)
+
+                print '\n'
+                continue
+
+            for this_image_dict in these_image_dicts:
+                this_image_file_name = find_storm_image_file(
+                    top_directory_name=top_output_dir_name,
+                    unix_time_sec=valid_times_unix_sec[i],
+                    spc_date_string=time_conversion.time_to_spc_date_string(
+                        valid_spc_dates_unix_sec[i]),
+                    radar_source=radar_source,
+                    radar_field_name=this_image_dict[RADAR_FIELD_NAME_KEY],
+                    radar_height_m_agl=this_image_dict[RADAR_HEIGHT_KEY],
+                    raise_error_if_missing=False)
+
+                print (
+                    'Writing storm-centered images to: "{0:s}"...'
+                ).format(this_image_file_name)
+                write_storm_images(
+                    netcdf_file_name=this_image_file_name,
+                    storm_image_matrix=this_image_dict[STORM_IMAGE_MATRIX_KEY],
+                    storm_ids=these_storm_ids,
+                    valid_times_unix_sec=these_storm_times_unix_sec,
+                    radar_field_name=this_image_dict[RADAR_FIELD_NAME_KEY],
+                    radar_height_m_agl=this_image_dict[RADAR_HEIGHT_KEY],
+                    rotated_grids=rotate_grids,
+                    rotated_grid_spacing_metres=rotated_grid_spacing_metres)
+
+            print '\n'
+    finally:
+        if pool_object is not None:
+            pool_object.close()
+            pool_object.join()
+
+
+def downsize_storm_images(
+        storm_image_matrix, radar_field_name, num_rows_to_keep=None,
+        num_columns_to_keep=None):
+    """Downsizes storm-centered radar images.
+
+    :param storm_image_matrix: See doc for `_check_storm_images`.
+    :param radar_field_name: Same.
+    :param num_rows_to_keep: Number of rows to keep.  If `storm_image_matrix`
+        contains azimuthal shear, this will be doubled.
+    :param num_columns_to_keep: Number of columns to keep.  If
+        `storm_image_matrix` contains azimuthal shear, this will be doubled.
+    :return: storm_image_matrix: Same as input, but maybe with fewer rows and
+        columns.
+    :raises: ValueError: if downsized image cannot be centered in full image.
+    """
+
+    error_checking.assert_is_numpy_array_without_nan(storm_image_matrix)
+    num_dimensions = len(storm_image_matrix.shape)
+    error_checking.assert_is_geq(num_dimensions, 3)
+
+    radar_utils.check_field_name(radar_field_name)
+    if radar_field_name in AZIMUTHAL_SHEAR_FIELD_NAMES:
+        if num_rows_to_keep is not None:
+            num_rows_to_keep *= 2
+        if num_columns_to_keep is not None:
+            num_columns_to_keep *= 2
+
+    num_rows_total = storm_image_matrix.shape[1]
+    if num_rows_to_keep == num_rows_total:
+        num_rows_to_keep = None
+
+    num_columns_total = storm_image_matrix.shape[2]
+    if num_columns_to_keep == num_columns_total:
+        num_columns_to_keep = None
+
+    if num_rows_to_keep is not None:
+        error_checking.assert_is_integer(num_rows_to_keep)
+        error_checking.assert_is_greater(num_rows_to_keep, 0)
+
+        num_rows_leftover = num_rows_total - num_rows_to_keep
+        if num_rows_leftover != rounder.round_to_nearest(num_rows_leftover, 2):
+            error_string = (
+                'Cannot downsize from {0:d} to {1:d} rows, because number of '
+                'rows left over ({2:d}) is odd.'
+            ).format(num_rows_total, num_rows_to_keep, num_rows_leftover)
+            raise ValueError(error_string)
+
+        first_row_to_keep = num_rows_leftover / 2
         last_row_to_keep = first_row_to_keep + num_rows_to_keep - 1
         storm_image_matrix = storm_image_matrix[
             :, first_row_to_keep:(last_row_to_keep + 1), ...
@@ -1102,7 +2133,9 @@ def extract_storm_images_myrorss_or_mrms(
         num_storm_image_columns=DEFAULT_NUM_IMAGE_COLUMNS, rotate_grids=True,
         rotated_grid_spacing_metres=DEFAULT_ROTATED_GRID_SPACING_METRES,
         radar_field_names=DEFAULT_MYRORSS_MRMS_FIELD_NAMES,
-        reflectivity_heights_m_agl=DEFAULT_RADAR_HEIGHTS_M_AGL):
+        reflectivity_heights_m_agl=DEFAULT_RADAR_HEIGHTS_M_AGL,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_EXTRACTION,
+        max_memory_gb=None, multi_field_output=False):
     """Extracts storm-centered image for each field/height and storm object.
 
     L = number of storm objects
@@ -1134,6 +2167,18 @@ def extract_storm_images_myrorss_or_mrms(
     :param rotated_grid_spacing_metres: Same.
     :param radar_field_names: Same.
     :param reflectivity_heights_m_agl: Same.
+    :param num_processes: Number of worker processes.  Each process handles
+        one valid time at once.  Output files are the same for any number of
+        processes.
+    :param max_memory_gb: Max memory (gigabytes) to be used by worker
+        processes.  If this would be exceeded, `num_processes` is reduced (see
+        `_get_num_processes_for_extraction`).  If None, there is no cap.  This
+        does not include storm images waiting to be written by the main
+        process, which come from at most `num_processes + 1` times.
+    :param multi_field_output: Boolean flag.  If True, will write one file per
+        time step with all fields/heights (see
+        `write_storm_images_multi_field`).  If False, will write one file per
+        time step and field/height pair (see `write_storm_images`).
     """
 
     _check_extraction_args(
@@ -1159,9 +2204,6 @@ def extract_storm_images_myrorss_or_mrms(
         reflectivity_heights_m_agl = numpy.array([], dtype=int)
         reflectivity_heights_m_asl = numpy.array([], dtype=int)
 
-    num_refl_heights_agl = len(reflectivity_heights_m_agl)
-    num_refl_heights_asl = len(reflectivity_heights_m_asl)
-
     # Find input files.
     spc_date_strings = [
         time_conversion.time_to_spc_date_string(t)
@@ -1190,17 +2232,38 @@ def extract_storm_images_myrorss_or_mrms(
         for t in valid_times_unix_sec
     ]
 
-    any_azimuthal_shear = [
-        f in AZIMUTHAL_SHEAR_FIELD_NAMES for f in field_name_by_pair
-    ]
-    any_non_azimuthal_shear = [
-        f not in AZIMUTHAL_SHEAR_FIELD_NAMES for f in field_name_by_pair
-    ]
-
     num_times = len(valid_time_strings)
     num_field_height_pairs = len(field_name_by_pair)
-    latitude_spacing_deg = None
-    longitude_spacing_deg = None
+
+    if max_memory_gb is None or num_processes == 1:
+        max_num_grid_points = None
+    else:
+        max_num_grid_points = 0
+
+        for j in range(num_field_height_pairs):
+            these_file_names = [
+                f for f in radar_file_name_matrix[:, j] if f is not None
+            ]
+            if len(these_file_names) == 0:
+                continue
+
+            this_metadata_dict = (
+                myrorss_and_mrms_io.read_metadata_from_raw_file(
+                    netcdf_file_name=these_file_names[0],
+                    data_source=radar_source)
+            )
+            max_num_grid_points = max([
+                max_num_grid_points,
+                this_metadata_dict[radar_utils.NUM_LAT_COLUMN] *
+                this_metadata_dict[radar_utils.NUM_LNG_COLUMN]
+            ])
+
+    num_processes = _get_num_processes_for_extraction(
+        num_processes=num_processes, max_memory_gb=max_memory_gb,
+        num_grid_points_per_process=max_num_grid_points)
+
+    storm_object_table_by_time = [None] * num_times
+    argument_tuples = [None] * num_times
 
     for i in range(num_times):
         these_storm_indices = _get_relevant_storm_objects(
@@ -1219,230 +2282,29 @@ def extract_storm_images_myrorss_or_mrms(
                 tracking_utils.CENTROID_LNG_COLUMN].values,
             working_dir_name=ELEVATION_DIR_NAME)
 
-        this_storm_object_table = this_storm_object_table.assign(
+        storm_object_table_by_time[i] = this_storm_object_table.assign(
             **{ELEVATION_COLUMN: these_elevations_m_asl}
         )
 
-        if rotate_grids:
-            if any_azimuthal_shear:
-                print (
-                    'Creating rotated {0:.1f}-metre grids for storms at '
-                    '{1:s}...'
-                ).format(rotated_grid_spacing_metres / 2, valid_time_strings[i])
-
-                this_storm_object_table = _rotate_grids_many_storm_objects(
-                    storm_object_table=this_storm_object_table,
-                    num_storm_image_rows=num_storm_image_rows * 2,
-                    num_storm_image_columns=num_storm_image_columns * 2,
-                    storm_grid_spacing_metres=rotated_grid_spacing_metres / 2,
-                    for_azimuthal_shear=True)
-
-            if any_non_azimuthal_shear:
-                print (
-                    'Creating rotated {0:.1f}-metre grids for storms at '
-                    '{1:s}...'
-                ).format(rotated_grid_spacing_metres, valid_time_strings[i])
-
-                this_storm_object_table = _rotate_grids_many_storm_objects(
-                    storm_object_table=this_storm_object_table,
-                    num_storm_image_rows=num_storm_image_rows,
-                    num_storm_image_columns=num_storm_image_columns,
-                    storm_grid_spacing_metres=rotated_grid_spacing_metres,
-                    for_azimuthal_shear=False)
-
-        this_num_storms = len(this_storm_object_table.index)
-        this_refl_matrix_sea_relative_dbz = numpy.full(
-            (this_num_storms, num_storm_image_rows, num_storm_image_columns,
-             num_refl_heights_asl),
-            numpy.nan)
-
-        for j in range(num_field_height_pairs):
-            if radar_file_name_matrix[i, j] is None:
-                continue
-
-            print (
-                'Extracting storm-centered images for "{0:s}" at {1:d} '
-                'metres ASL and {2:s}...'
-            ).format(field_name_by_pair[j],
-                     int(numpy.round(height_by_pair_m_asl[j])),
-                     valid_time_strings[i])
-
-            this_metadata_dict = (
-                myrorss_and_mrms_io.read_metadata_from_raw_file(
-                    netcdf_file_name=radar_file_name_matrix[i, j],
-                    data_source=radar_source)
-            )
-
-            this_sparse_grid_table = (
-                myrorss_and_mrms_io.read_data_from_sparse_grid_file(
-                    netcdf_file_name=radar_file_name_matrix[i, j],
-                    field_name_orig=this_metadata_dict[
-                        myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
-                    data_source=radar_source,
-                    sentinel_values=this_metadata_dict[
-                        radar_utils.SENTINEL_VALUE_COLUMN])
-            )
-
-            (this_full_radar_matrix, these_full_latitudes_deg,
-             these_full_longitudes_deg
-            ) = radar_s2f.sparse_to_full_grid(
-                sparse_grid_table=this_sparse_grid_table,
-                metadata_dict=this_metadata_dict)
-
-            this_full_radar_matrix[
-                numpy.isnan(this_full_radar_matrix)] = PADDING_VALUE
-            if rotate_grids:
-                this_full_radar_matrix = numpy.flipud(this_full_radar_matrix)
-                these_full_latitudes_deg = these_full_latitudes_deg[::-1]
-
-            latitude_spacing_deg, longitude_spacing_deg = _check_grid_spacing(
-                new_metadata_dict=this_metadata_dict,
-                orig_lat_spacing_deg=latitude_spacing_deg,
-                orig_lng_spacing_deg=longitude_spacing_deg)
-
-            if field_name_by_pair[j] in AZIMUTHAL_SHEAR_FIELD_NAMES:
-                this_num_image_rows = (
-                    num_storm_image_rows * AZ_SHEAR_GRID_SPACING_MULTIPLIER)
-                this_num_image_columns = (
-                    num_storm_image_columns * AZ_SHEAR_GRID_SPACING_MULTIPLIER)
-            else:
-                this_num_image_rows = num_storm_image_rows + 0
-                this_num_image_columns = num_storm_image_columns + 0
-
-            this_storm_image_matrix = numpy.full(
-                (this_num_storms, this_num_image_rows,
-                 this_num_image_columns), numpy.nan)
-
-            if rotate_grids:
-                for k in range(this_num_storms):
-                    if field_name_by_pair[j] in AZIMUTHAL_SHEAR_FIELD_NAMES:
-                        this_rotated_lat_matrix_deg = this_storm_object_table[
-                            ROTATED_SHEAR_LATITUDES_COLUMN].values[k]
-                        this_rotated_lng_matrix_deg = this_storm_object_table[
-                            ROTATED_SHEAR_LONGITUDES_COLUMN].values[k]
-                    else:
-                        this_rotated_lat_matrix_deg = this_storm_object_table[
-                            ROTATED_NON_SHEAR_LATITUDES_COLUMN].values[k]
-                        this_rotated_lng_matrix_deg = this_storm_object_table[
-                            ROTATED_NON_SHEAR_LONGITUDES_COLUMN].values[k]
-
-                    this_storm_image_matrix[
-                        k, :, :
-                    ] = _extract_rotated_storm_image(
-                        full_radar_matrix=this_full_radar_matrix,
-                        full_grid_point_latitudes_deg=these_full_latitudes_deg,
-                        full_grid_point_longitudes_deg=
-                        these_full_longitudes_deg,
-                        rotated_gp_lat_matrix_deg=this_rotated_lat_matrix_deg,
-                        rotated_gp_lng_matrix_deg=this_rotated_lng_matrix_deg)
-            else:
-                (these_center_rows, these_center_columns
-                ) = _centroids_latlng_to_rowcol(
-                    centroid_latitudes_deg=this_storm_object_table[
-                        tracking_utils.CENTROID_LAT_COLUMN].values,
-                    centroid_longitudes_deg=this_storm_object_table[
-                        tracking_utils.CENTROID_LNG_COLUMN].values,
-                    nw_grid_point_lat_deg=this_metadata_dict[
-                        radar_utils.NW_GRID_POINT_LAT_COLUMN],
-                    nw_grid_point_lng_deg=this_metadata_dict[
-                        radar_utils.NW_GRID_POINT_LNG_COLUMN],
-                    lat_spacing_deg=this_metadata_dict[
-                        radar_utils.LAT_SPACING_COLUMN],
-                    lng_spacing_deg=this_metadata_dict[
-                        radar_utils.LNG_SPACING_COLUMN])
-
-                for k in range(this_num_storms):
-                    this_storm_image_matrix[
-                        k, :, :
-                    ] = _extract_unrotated_storm_image(
-                        full_radar_matrix=this_full_radar_matrix,
-                        center_row=these_center_rows[k],
-                        center_column=these_center_columns[k],
-                        num_storm_image_rows=this_num_image_rows,
-                        num_storm_image_columns=this_num_image_columns)
-
-            if field_name_by_pair[j] == radar_utils.REFL_NAME:
-                this_height_index = numpy.where(
-                    height_by_pair_m_asl[j] == reflectivity_heights_m_asl
-                )[0][0]
-                this_refl_matrix_sea_relative_dbz[
-                    ..., this_height_index] = this_storm_image_matrix
-                continue
-
-            this_image_file_name = find_storm_image_file(
-                top_directory_name=top_output_dir_name,
-                unix_time_sec=valid_times_unix_sec[i],
-                spc_date_string=time_conversion.time_to_spc_date_string(
-                    valid_spc_dates_unix_sec[i]),
-                radar_source=radar_source,
-                radar_field_name=field_name_by_pair[j],
-                radar_height_m_agl=height_by_pair_m_asl[j],
-                raise_error_if_missing=False)
-
-            print (
-                'Writing storm-centered images to: "{0:s}"...'
-            ).format(this_image_file_name)
-            write_storm_images(
-                netcdf_file_name=this_image_file_name,
-                storm_image_matrix=this_storm_image_matrix,
-                storm_ids=this_storm_object_table[
-                    tracking_utils.STORM_ID_COLUMN].values.tolist(),
-                valid_times_unix_sec=this_storm_object_table[
-                    tracking_utils.TIME_COLUMN].values.astype(int),
-                radar_field_name=field_name_by_pair[j],
-                radar_height_m_agl=height_by_pair_m_asl[j],
-                rotated_grids=rotate_grids,
-                rotated_grid_spacing_metres=rotated_grid_spacing_metres)
-
-        if radar_utils.REFL_NAME in radar_field_names:
-            print ('Interpolating reflectivity to desired heights above ground '
-                   'level...')
-            this_refl_matrix_ground_relative_dbz = numpy.full(
-                (this_num_storms, num_storm_image_rows, num_storm_image_columns,
-                 num_refl_heights_agl),
-                numpy.nan)
-
-            for k in range(this_num_storms):
-                these_heights_m_asl = (
-                    this_storm_object_table[ELEVATION_COLUMN].values[k]
-                    + reflectivity_heights_m_agl
-                )
-
-                this_refl_matrix_ground_relative_dbz[
-                    k, ...
-                ] = _interp_storm_image_in_height(
-                    storm_image_matrix_3d=this_refl_matrix_sea_relative_dbz[
-                        k, ...],
-                    orig_heights_m_asl=reflectivity_heights_m_asl,
-                    new_heights_m_asl=these_heights_m_asl)
-
-        for j in range(num_refl_heights_agl):
-            this_image_file_name = find_storm_image_file(
-                top_directory_name=top_output_dir_name,
-                unix_time_sec=valid_times_unix_sec[i],
-                spc_date_string=time_conversion.time_to_spc_date_string(
-                    valid_spc_dates_unix_sec[i]),
-                radar_source=radar_source,
-                radar_field_name=radar_utils.REFL_NAME,
-                radar_height_m_agl=reflectivity_heights_m_agl[j],
-                raise_error_if_missing=False)
+        argument_tuples[i] = (
+            i, valid_time_strings[i], storm_object_table_by_time[i],
+            radar_file_name_matrix[i, :].tolist(), field_name_by_pair,
+            height_by_pair_m_asl, radar_source, num_storm_image_rows,
+            num_storm_image_columns, rotate_grids, rotated_grid_spacing_metres,
+            reflectivity_heights_m_agl, reflectivity_heights_m_asl
+        )
 
-            print (
-                'Writing storm-centered images to: "{0:s}"...'
-            ).format(this_image_file_name)
-            write_storm_images(
-                netcdf_file_name=this_image_file_name,
-                storm_image_matrix=this_refl_matrix_ground_relative_dbz[..., j],
-                storm_ids=this_storm_object_table[
-                    tracking_utils.STORM_ID_COLUMN].values.tolist(),
-                valid_times_unix_sec=this_storm_object_table[
-                    tracking_utils.TIME_COLUMN].values.astype(int),
-                radar_field_name=radar_utils.REFL_NAME,
-                radar_height_m_agl=reflectivity_heights_m_agl[j],
-                rotated_grids=rotate_grids,
-                rotated_grid_spacing_metres=rotated_grid_spacing_metres)
-
-        print '\n'
+    print SEPARATOR_STRING
+    _extract_and_write_many_times(
+        extraction_function=_extract_images_one_time_myrorss,
+        argument_tuples=argument_tuples,
+        storm_object_table_by_time=storm_object_table_by_time,
+        valid_times_unix_sec=valid_times_unix_sec,
+        valid_spc_dates_unix_sec=valid_spc_dates_unix_sec,
+        radar_source=radar_source, top_output_dir_name=top_output_dir_name,
+        rotate_grids=rotate_grids,
+        rotated_grid_spacing_metres=rotated_grid_spacing_metres,
+        num_processes=num_processes, multi_field_output=multi_field_output)
 
 
 def extract_storm_images_gridrad(
@@ -1451,7 +2313,9 @@ def extract_storm_images_gridrad(
         num_storm_image_columns=DEFAULT_NUM_IMAGE_COLUMNS, rotate_grids=True,
         rotated_grid_spacing_metres=DEFAULT_ROTATED_GRID_SPACING_METRES,
         radar_field_names=DEFAULT_GRIDRAD_FIELD_NAMES,
-        radar_heights_m_agl=DEFAULT_RADAR_HEIGHTS_M_AGL):
+        radar_heights_m_agl=DEFAULT_RADAR_HEIGHTS_M_AGL,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_EXTRACTION,
+        max_memory_gb=None, multi_field_output=False):
     """Extracts storm-centered image for each field, height, and storm object.
 
     L = number of storm objects
@@ -1470,6 +2334,9 @@ def extract_storm_images_gridrad(
     :param radar_field_names: length-F list with names of radar fields.
     :param radar_heights_m_agl: length-H numpy array of radar heights (metres
         above ground level).
+    :param num_processes: See doc for `extract_storm_images_myrorss_or_mrms`.
+    :param max_memory_gb: Same.
+    :param multi_field_output: Same.
     """
 
     _check_extraction_args(
@@ -1490,9 +2357,6 @@ def extract_storm_images_gridrad(
         desired_radar_heights_m_agl=radar_heights_m_agl,
         radar_source=radar_utils.GRIDRAD_SOURCE_ID)
 
-    num_heights_agl = len(radar_heights_m_agl)
-    num_heights_asl = len(radar_heights_m_asl)
-
     valid_times_unix_sec = numpy.unique(
         storm_object_table[tracking_utils.TIME_COLUMN].values)
     valid_time_strings = [
@@ -1512,19 +2376,25 @@ def extract_storm_images_gridrad(
             unix_time_sec=valid_times_unix_sec[i],
             top_directory_name=top_radar_dir_name, raise_error_if_missing=True)
 
-    num_times = len(valid_times_unix_sec)
-    num_fields = len(radar_field_names)
-    latitude_spacing_deg = None
-    longitude_spacing_deg = None
-
-    for i in range(num_times):
+    if max_memory_gb is None or num_processes == 1 or num_times == 0:
+        max_num_grid_points = None
+    else:
         this_metadata_dict = gridrad_io.read_metadata_from_full_grid_file(
-            radar_file_names[i])
-        latitude_spacing_deg, longitude_spacing_deg = _check_grid_spacing(
-            new_metadata_dict=this_metadata_dict,
-            orig_lat_spacing_deg=latitude_spacing_deg,
-            orig_lng_spacing_deg=longitude_spacing_deg)
+            radar_file_names[0])
+        max_num_grid_points = (
+            this_metadata_dict[radar_utils.NUM_LAT_COLUMN] *
+            this_metadata_dict[radar_utils.NUM_LNG_COLUMN] *
+            len(radar_utils.get_valid_heights(radar_utils.GRIDRAD_SOURCE_ID))
+        )
 
+    num_processes = _get_num_processes_for_extraction(
+        num_processes=num_processes, max_memory_gb=max_memory_gb,
+        num_grid_points_per_process=max_num_grid_points)
+
+    storm_object_table_by_time = [None] * num_times
+    argument_tuples = [None] * num_times
+
+    for i in range(num_times):
         these_storm_indices = _get_relevant_storm_objects(
             storm_object_table=storm_object_table,
             valid_time_unix_sec=valid_times_unix_sec[i],
@@ -1541,154 +2411,28 @@ def extract_storm_images_gridrad(
                 tracking_utils.CENTROID_LNG_COLUMN].values,
             working_dir_name=ELEVATION_DIR_NAME)
 
-        this_storm_object_table = this_storm_object_table.assign(
+        storm_object_table_by_time[i] = this_storm_object_table.assign(
             **{ELEVATION_COLUMN: these_elevations_m_asl}
         )
 
-        if rotate_grids:
-            print (
-                'Creating rotated {0:.1f}-metre grids for storms at '
-                '{1:s}...'
-            ).format(rotated_grid_spacing_metres, valid_time_strings[i])
-
-            this_storm_object_table = _rotate_grids_many_storm_objects(
-                storm_object_table=this_storm_object_table,
-                num_storm_image_rows=num_storm_image_rows,
-                num_storm_image_columns=num_storm_image_columns,
-                storm_grid_spacing_metres=rotated_grid_spacing_metres,
-                for_azimuthal_shear=False)
-
-        this_num_storms = len(this_storm_object_table.index)
-
-        for j in range(num_fields):
-            print 'Reading "{0:s}" from file: "{1:s}"...'.format(
-                radar_field_names[j], radar_file_names[i])
-
-            (this_full_radar_matrix_3d, these_full_heights_m_asl,
-             these_full_latitudes_deg, these_full_longitudes_deg
-            ) = gridrad_io.read_field_from_full_grid_file(
-                netcdf_file_name=radar_file_names[i],
-                field_name=radar_field_names[j],
-                metadata_dict=this_metadata_dict)
-            this_full_radar_matrix_3d[
-                numpy.isnan(this_full_radar_matrix_3d)] = PADDING_VALUE
-
-            if not rotate_grids:
-                this_full_radar_matrix_3d = numpy.flip(
-                    this_full_radar_matrix_3d, axis=1)
-                these_full_latitudes_deg = these_full_latitudes_deg[::-1]
-
-            this_storm_image_matrix_sea_relative = numpy.full(
-                (this_num_storms, num_storm_image_rows, num_storm_image_columns,
-                 num_heights_asl),
-                numpy.nan)
-
-            for k in range(num_heights_asl):
-                this_height_index = numpy.where(
-                    these_full_heights_m_asl == radar_heights_m_asl[k]
-                )[0][0]
-                this_full_radar_matrix_2d = this_full_radar_matrix_3d[
-                    this_height_index, ...]
-
-                print (
-                    'Extracting storm-centered images for "{0:s}" at {1:d} '
-                    'metres ASL and {2:s}...'
-                ).format(radar_field_names[j],
-                         int(numpy.round(radar_heights_m_asl[k])),
-                         valid_time_strings[i])
-
-                if rotate_grids:
-                    for m in range(this_num_storms):
-                        this_storm_image_matrix_sea_relative[
-                            m, ..., k
-                        ] = _extract_rotated_storm_image(
-                            full_radar_matrix=this_full_radar_matrix_2d,
-                            full_grid_point_latitudes_deg=
-                            these_full_latitudes_deg,
-                            full_grid_point_longitudes_deg=
-                            these_full_longitudes_deg,
-                            rotated_gp_lat_matrix_deg=this_storm_object_table[
-                                ROTATED_NON_SHEAR_LATITUDES_COLUMN].values[m],
-                            rotated_gp_lng_matrix_deg=this_storm_object_table[
-                                ROTATED_NON_SHEAR_LONGITUDES_COLUMN].values[m]
-                        )
-                else:
-                    (these_center_rows, these_center_columns
-                    ) = _centroids_latlng_to_rowcol(
-                        centroid_latitudes_deg=this_storm_object_table[
-                            tracking_utils.CENTROID_LAT_COLUMN].values,
-                        centroid_longitudes_deg=this_storm_object_table[
-                            tracking_utils.CENTROID_LNG_COLUMN].values,
-                        nw_grid_point_lat_deg=this_metadata_dict[
-                            radar_utils.NW_GRID_POINT_LAT_COLUMN],
-                        nw_grid_point_lng_deg=this_metadata_dict[
-                            radar_utils.NW_GRID_POINT_LNG_COLUMN],
-                        lat_spacing_deg=this_metadata_dict[
-                            radar_utils.LAT_SPACING_COLUMN],
-                        lng_spacing_deg=this_metadata_dict[
-                            radar_utils.LNG_SPACING_COLUMN])
-
-                    for m in range(this_num_storms):
-                        this_storm_image_matrix_sea_relative[
-                            m, ..., k
-                        ] = _extract_unrotated_storm_image(
-                            full_radar_matrix=this_full_radar_matrix_2d,
-                            center_row=these_center_rows[m],
-                            center_column=these_center_columns[m],
-                            num_storm_image_rows=num_storm_image_rows,
-                            num_storm_image_columns=num_storm_image_columns)
-
-            print (
-                'Interpolating "{0:s}" to desired heights above ground level...'
-            ).format(radar_field_names[j])
-            this_storm_image_matrix_ground_relative = numpy.full(
-                (this_num_storms, num_storm_image_rows, num_storm_image_columns,
-                 num_heights_agl),
-                numpy.nan)
-
-            for m in range(this_num_storms):
-                these_heights_m_asl = (
-                    this_storm_object_table[ELEVATION_COLUMN].values[m]
-                    + radar_heights_m_agl
-                )
-
-                this_storm_image_matrix_ground_relative[
-                    m, ...
-                ] = _interp_storm_image_in_height(
-                    storm_image_matrix_3d=this_storm_image_matrix_sea_relative[
-                        m, ...],
-                    orig_heights_m_asl=radar_heights_m_asl,
-                    new_heights_m_asl=these_heights_m_asl)
-
-            for k in range(num_heights_agl):
-                this_image_file_name = find_storm_image_file(
-                    top_directory_name=top_output_dir_name,
-                    unix_time_sec=valid_times_unix_sec[i],
-                    spc_date_string=time_conversion.time_to_spc_date_string(
-                        valid_spc_dates_unix_sec[i]),
-                    radar_source=radar_utils.GRIDRAD_SOURCE_ID,
-                    radar_field_name=radar_field_names[j],
-                    radar_height_m_agl=radar_heights_m_agl[k],
-                    raise_error_if_missing=False)
-
-                print (
-                    'Writing storm-centered images to: "{0:s}"...'
-                ).format(this_image_file_name)
-                write_storm_images(
-                    netcdf_file_name=this_image_file_name,
-                    storm_image_matrix=this_storm_image_matrix_ground_relative[
-                        ..., k],
-                    storm_ids=this_storm_object_table[
-                        tracking_utils.STORM_ID_COLUMN].values.tolist(),
-                    valid_times_unix_sec=this_storm_object_table[
-                        tracking_utils.TIME_COLUMN].values.astype(int),
-                    radar_field_name=radar_field_names[j],
-                    radar_height_m_agl=radar_heights_m_agl[k],
-                    rotated_grids=rotate_grids,
-                    rotated_grid_spacing_metres=
-                    rotated_grid_spacing_metres)
+        argument_tuples[i] = (
+            i, valid_time_strings[i], storm_object_table_by_time[i],
+            radar_file_names[i], radar_field_names, radar_heights_m_agl,
+            radar_heights_m_asl, num_storm_image_rows, num_storm_image_columns,
+            rotate_grids, rotated_grid_spacing_metres
+        )
 
-            print '\n'
+    print SEPARATOR_STRING
+    _extract_and_write_many_times(
+        extraction_function=_extract_images_one_time_gridrad,
+        argument_tuples=argument_tuples,
+        storm_object_table_by_time=storm_object_table_by_time,
+        valid_times_unix_sec=valid_times_unix_sec,
+        valid_spc_dates_unix_sec=valid_spc_dates_unix_sec,
+        radar_source=radar_utils.GRIDRAD_SOURCE_ID,
+        top_output_dir_name=top_output_dir_name, rotate_grids=rotate_grids,
+        rotated_grid_spacing_metres=rotated_grid_spacing_metres,
+        num_processes=num_processes, multi_field_output=multi_field_output)
 
 
 def write_storm_images(
@@ -1777,13 +2521,170 @@ def write_storm_images(
     netcdf_dataset.close()
 
 
+def write_storm_images_multi_field(
+        netcdf_file_name, storm_image_matrices, storm_ids, valid_times_unix_sec,
+        field_name_by_pair, height_by_pair_m_agl, rotated_grids=False,
+        rotated_grid_spacing_metres=None, num_storm_objects_per_chunk=1,
+        compression_level=DEFAULT_COMPRESSION_LEVEL):
+    """Writes storm-centered radar images for many fields/heights to one file.
+
+    Unlike `write_storm_images`, which writes one field/height per file, this
+    method writes all field/height pairs to one NetCDF4 file.  Each pair is
+    stored in its own variable, chunked by storm object and compressed with
+    zlib (after byte-shuffling).  Thus, `read_storm_images_multi_field` can read
+    any subset of pairs and storm objects without touching the rest of the
+    file.
+
+    P = number of field/height pairs
+
+    :param netcdf_file_name: Path to output file.
+    :param storm_image_matrices: length-P list of numpy arrays, each formatted
+        as `storm_image_matrix` in `_check_storm_images`.  All arrays must have
+        the same number of storm objects (first axis), but the number of rows
+        and columns may differ (e.g., for azimuthal shear).
+    :param storm_ids: See doc for `_check_storm_images`.
+    :param valid_times_unix_sec: Same.
+    :param field_name_by_pair: length-P list with names of radar fields.
+    :param height_by_pair_m_agl: length-P numpy array of radar heights (metres
+        above ground level).
+    :param rotated_grids: See doc for `_check_storm_images`.
+    :param rotated_grid_spacing_metres: Same.
+    :param num_storm_objects_per_chunk: Number of storm objects per NetCDF
+        chunk.
+    :param compression_level: Compression level for zlib (integer from 1...9).
+    :raises: ValueError: if any field/height pair is repeated.
+    """
+
+    error_checking.assert_is_list(storm_image_matrices)
+    num_pairs = len(storm_image_matrices)
+    error_checking.assert_is_greater(num_pairs, 0)
+
+    error_checking.assert_is_string_list(field_name_by_pair)
+    error_checking.assert_is_numpy_array(
+        numpy.array(field_name_by_pair),
+        exact_dimensions=numpy.array([num_pairs]))
+    error_checking.assert_is_numpy_array(
+        height_by_pair_m_agl, exact_dimensions=numpy.array([num_pairs]))
+    height_by_pair_m_agl = numpy.round(height_by_pair_m_agl).astype(int)
+
+    for j in range(num_pairs):
+        _check_storm_images(
+            storm_image_matrix=storm_image_matrices[j], storm_ids=storm_ids,
+            valid_times_unix_sec=valid_times_unix_sec,
+            radar_field_name=field_name_by_pair[j],
+            radar_height_m_agl=height_by_pair_m_agl[j],
+            rotated_grids=rotated_grids,
+            rotated_grid_spacing_metres=rotated_grid_spacing_metres)
+
+    image_variable_names = [
+        _get_image_variable_name(f, h)
+        for f, h in zip(field_name_by_pair, height_by_pair_m_agl)
+    ]
+    if len(set(image_variable_names)) != num_pairs:
+        error_string = (
+            'Field/height pairs (listed below) are not unique.\n{0:s}'
+        ).format(str(image_variable_names))
+        raise ValueError(error_string)
+
+    error_checking.assert_is_integer(num_storm_objects_per_chunk)
+    error_checking.assert_is_geq(num_storm_objects_per_chunk, 1)
+    error_checking.assert_is_integer(compression_level)
+    error_checking.assert_is_geq(compression_level, 1)
+    error_checking.assert_is_leq(compression_level, 9)
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=netcdf_file_name)
+    netcdf_dataset = netCDF4.Dataset(
+        netcdf_file_name, 'w', format='NETCDF4')
+
+    netcdf_dataset.setncattr(ROTATED_GRIDS_KEY, int(rotated_grids))
+    if rotated_grids:
+        netcdf_dataset.setncattr(
+            ROTATED_GRID_SPACING_KEY, rotated_grid_spacing_metres)
+
+    num_storm_objects = len(storm_ids)
+    num_storm_id_chars = 1
+    for i in range(num_storm_objects):
+        num_storm_id_chars = max([num_storm_id_chars, len(storm_ids[i])])
+
+    num_field_name_chars = max([len(f) for f in field_name_by_pair])
+
+    netcdf_dataset.createDimension(
+        STORM_OBJECT_DIMENSION_KEY, num_storm_objects)
+    netcdf_dataset.createDimension(CHARACTER_DIMENSION_KEY, num_storm_id_chars)
+    netcdf_dataset.createDimension(PAIR_DIMENSION_KEY, num_pairs)
+    netcdf_dataset.createDimension(
+        FIELD_NAME_CHAR_DIMENSION_KEY, num_field_name_chars)
+
+    netcdf_dataset.createVariable(
+        STORM_IDS_KEY, datatype='S1',
+        dimensions=(STORM_OBJECT_DIMENSION_KEY, CHARACTER_DIMENSION_KEY))
+
+    string_type = 'S{0:d}'.format(num_storm_id_chars)
+    storm_ids_as_char_array = netCDF4.stringtochar(numpy.array(
+        storm_ids, dtype=string_type))
+    netcdf_dataset.variables[STORM_IDS_KEY][:] = numpy.array(
+        storm_ids_as_char_array)
+
+    netcdf_dataset.createVariable(
+        VALID_TIMES_KEY, datatype=numpy.int32,
+        dimensions=STORM_OBJECT_DIMENSION_KEY)
+    netcdf_dataset.variables[VALID_TIMES_KEY][:] = valid_times_unix_sec
+
+    netcdf_dataset.createVariable(
+        FIELD_NAME_BY_PAIR_KEY, datatype='S1',
+        dimensions=(PAIR_DIMENSION_KEY, FIELD_NAME_CHAR_DIMENSION_KEY))
+
+    string_type = 'S{0:d}'.format(num_field_name_chars)
+    netcdf_dataset.variables[FIELD_NAME_BY_PAIR_KEY][:] = numpy.array(
+        netCDF4.stringtochar(numpy.array(field_name_by_pair, dtype=string_type))
+    )
+
+    netcdf_dataset.createVariable(
+        HEIGHT_BY_PAIR_KEY, datatype=numpy.int32, dimensions=PAIR_DIMENSION_KEY)
+    netcdf_dataset.variables[HEIGHT_BY_PAIR_KEY][:] = height_by_pair_m_agl
+
+    # A chunk may not be larger than the storm-object dimension.  If there are
+    # no storm objects, the dimension is unlimited and any chunk size works.
+    if num_storm_objects > 0:
+        num_storm_objects_per_chunk = min(
+            [num_storm_objects_per_chunk, num_storm_objects])
+
+    for j in range(num_pairs):
+        these_dimensions = (STORM_OBJECT_DIMENSION_KEY,)
+
+        for this_key, this_size in zip(
+                [ROW_DIMENSION_KEY, COLUMN_DIMENSION_KEY],
+                storm_image_matrices[j].shape[1:]):
+            this_dimension_name = '{0:s}_{1:d}'.format(this_key, this_size)
+            if this_dimension_name not in netcdf_dataset.dimensions:
+                netcdf_dataset.createDimension(this_dimension_name, this_size)
+
+            these_dimensions += (this_dimension_name,)
+
+        netcdf_dataset.createVariable(
+            image_variable_names[j], datatype=numpy.float32,
+            dimensions=these_dimensions, zlib=True, shuffle=True,
+            complevel=compression_level,
+            chunksizes=(
+                (num_storm_objects_per_chunk,) +
+                storm_image_matrices[j].shape[1:]
+            ))
+
+        netcdf_dataset.variables[image_variable_names[j]][:] = (
+            storm_image_matrices[j])
+
+    netcdf_dataset.close()
+
+
 def read_storm_images(
         netcdf_file_name, return_images=True, storm_ids_to_keep=None,
         valid_times_to_keep_unix_sec=None, num_rows_to_keep=None,
         num_columns_to_keep=None):
     """Reads storm-centered radar images from NetCDF file.
 
-    This file should contain images for one radar field/height.
+    This file should contain images for one radar field/height (written by
+    `write_storm_images`).  To read a file with many fields/heights, use
+    `read_storm_images_multi_field`.
 
     If `storm_ids_to_keep is None or valid_times_to_keep_unix_sec is None`, this
     method will return all storm objects in the file.  Otherwise, will return
@@ -1813,83 +2714,63 @@ def read_storm_images(
     storm_image_dict['radar_height_m_agl']: Same.
     storm_image_dict['rotated_grids']: Same.
     storm_image_dict['rotated_grid_spacing_key']: Same.
+    :raises: ValueError: if file contains many fields/heights.
     """
 
-    error_checking.assert_is_boolean(return_images)
-    netcdf_dataset = netcdf_io.open_netcdf(
-        netcdf_file_name=netcdf_file_name, raise_error_if_fails=True)
-
-    radar_field_name = str(getattr(netcdf_dataset, RADAR_FIELD_NAME_KEY))
-    radar_height_m_agl = getattr(netcdf_dataset, RADAR_HEIGHT_KEY)
-    rotated_grids = bool(getattr(netcdf_dataset, ROTATED_GRIDS_KEY))
-    if rotated_grids:
-        rotated_grid_spacing_metres = getattr(
-            netcdf_dataset, ROTATED_GRID_SPACING_KEY)
-    else:
-        rotated_grid_spacing_metres = None
-
-    num_storm_objects = netcdf_dataset.variables[STORM_IDS_KEY].shape[0]
-    if num_storm_objects == 0:
-        storm_ids = []
-        valid_times_unix_sec = numpy.array([], dtype=int)
-    else:
-        storm_ids = netCDF4.chartostring(
-            netcdf_dataset.variables[STORM_IDS_KEY][:])
-        storm_ids = [str(s) for s in storm_ids]
-        valid_times_unix_sec = numpy.array(
-            netcdf_dataset.variables[VALID_TIMES_KEY][:], dtype=int)
-
-    if not return_images:
-        return {
-            STORM_IDS_KEY: storm_ids,
-            VALID_TIMES_KEY: valid_times_unix_sec,
-            RADAR_FIELD_NAME_KEY: radar_field_name,
-            RADAR_HEIGHT_KEY: radar_height_m_agl,
-            ROTATED_GRIDS_KEY: rotated_grids,
-            ROTATED_GRID_SPACING_KEY: rotated_grid_spacing_metres
-        }
+    return _read_storm_images_one_format(
+        netcdf_file_name=netcdf_file_name, multi_field=False,
+        return_images=return_images, storm_ids_to_keep=storm_ids_to_keep,
+        valid_times_to_keep_unix_sec=valid_times_to_keep_unix_sec,
+        num_rows_to_keep=num_rows_to_keep,
+        num_columns_to_keep=num_columns_to_keep)
 
-    filter_storms = not(
-        storm_ids_to_keep is None or valid_times_to_keep_unix_sec is None
-    )
 
-    if filter_storms:
-        indices_to_keep = tracking_utils.find_storm_objects(
-            all_storm_ids=storm_ids, all_times_unix_sec=valid_times_unix_sec,
-            storm_ids_to_keep=storm_ids_to_keep,
-            times_to_keep_unix_sec=valid_times_to_keep_unix_sec)
+def read_storm_images_multi_field(
+        netcdf_file_name, return_images=True, storm_ids_to_keep=None,
+        valid_times_to_keep_unix_sec=None, num_rows_to_keep=None,
+        num_columns_to_keep=None, field_name_by_pair_to_keep=None,
+        height_by_pair_to_keep_m_agl=None):
+    """Reads storm-centered radar images for many fields/heights from one file.
 
-        storm_ids = [storm_ids[i] for i in indices_to_keep]
-        valid_times_unix_sec = valid_times_unix_sec[indices_to_keep]
-    else:
-        indices_to_keep = numpy.linspace(
-            0, num_storm_objects - 1, num=num_storm_objects, dtype=int)
+    This file should be written by `write_storm_images_multi_field`.  Any subset
+    of field/height pairs and storm objects can be read.
 
-    if len(indices_to_keep):
-        storm_image_matrix = numpy.array(
-            netcdf_dataset.variables[STORM_IMAGE_MATRIX_KEY][
-                indices_to_keep, ...])
-    else:
-        num_rows = netcdf_dataset.dimensions[ROW_DIMENSION_KEY].size
-        num_columns = netcdf_dataset.dimensions[COLUMN_DIMENSION_KEY].size
-        storm_image_matrix = numpy.full((0, num_rows, num_columns), 0.)
+    P = number of field/height pairs to return
 
-    netcdf_dataset.close()
+    :param netcdf_file_name: See doc for `read_storm_images`.
+    :param return_images: Same.
+    :param storm_ids_to_keep: Same.
+    :param valid_times_to_keep_unix_sec: Same.
+    :param num_rows_to_keep: Same.
+    :param num_columns_to_keep: Same.
+    :param field_name_by_pair_to_keep: [used iff `return_images = True`]
+        length-P list with names of radar fields.  If None, will return all
+        field/height pairs in the file.
+    :param height_by_pair_to_keep_m_agl: [used iff `return_images = True`]
+        length-P numpy array of radar heights (metres above ground level).
+    :return: storm_image_dict: Dictionary with the following keys.
+    storm_image_dict['storm_image_matrices']: length-P list of numpy arrays,
+        each formatted as `storm_image_matrix` in `_check_storm_images`.  The
+        number of rows and columns may differ among pairs.
+    storm_image_dict['storm_ids']: See doc for `read_storm_images`.
+    storm_image_dict['valid_times_unix_sec']: Same.
+    storm_image_dict['field_name_by_pair']: length-P list with names of radar
+        fields.
+    storm_image_dict['height_by_pair_m_agl']: length-P numpy array of radar
+        heights (metres above ground level).
+    storm_image_dict['rotated_grids']: See doc for `read_storm_images`.
+    storm_image_dict['rotated_grid_spacing_key']: Same.
+    :raises: ValueError: if file contains only one field/height.
+    """
 
-    storm_image_matrix = downsize_storm_images(
-        storm_image_matrix=storm_image_matrix,
-        radar_field_name=radar_field_name, num_rows_to_keep=num_rows_to_keep,
-        num_columns_to_keep=num_columns_to_keep)
-
-    return {
-        STORM_IMAGE_MATRIX_KEY: storm_image_matrix,
-        STORM_IDS_KEY: storm_ids,
-        VALID_TIMES_KEY: valid_times_unix_sec,
-        RADAR_FIELD_NAME_KEY: radar_field_name,
-        RADAR_HEIGHT_KEY: radar_height_m_agl,
-        ROTATED_GRIDS_KEY: rotated_grids,
-        ROTATED_GRID_SPACING_KEY: rotated_grid_spacing_metres
-    }
+    return _read_storm_images_one_format(
+        netcdf_file_name=netcdf_file_name, multi_field=True,
+        return_images=return_images, storm_ids_to_keep=storm_ids_to_keep,
+        valid_times_to_keep_unix_sec=valid_times_to_keep_unix_sec,
+        num_rows_to_keep=num_rows_to_keep,
+        num_columns_to_keep=num_columns_to_keep,
+        field_name_by_pair_to_keep=field_name_by_pair_to_keep,
+        height_by_pair_to_keep_m_agl=height_by_pair_to_keep_m_agl)
 
 
 def find_storm_image_file(
@@ -1950,6 +2831,51 @@ def find_storm_image_file(
     return storm_image_file_name
 
 
+def find_storm_image_file_multi_field(
+        top_directory_name, spc_date_string, radar_source, unix_time_sec=None,
+        raise_error_if_missing=True):
+    """Finds file with storm-centered radar images for many fields/heights.
+
+    This file should be written by `write_storm_images_multi_field`.  If
+    `unix_time_sec is None`, this method finds a file with images for one SPC
+    date.  Otherwise, finds a file with images for one time step.
+
+    :param top_directory_name: See doc for `find_storm_image_file`.
+    :param spc_date_string: Same.
+    :param radar_source: Same.
+    :param unix_time_sec: Same.
+    :param raise_error_if_missing: Same.
+    :return: storm_image_file_name: Same.
+    :raises: ValueError: if file is missing and `raise_error_if_missing = True`.
+    """
+
+    error_checking.assert_is_string(top_directory_name)
+    time_conversion.spc_date_string_to_unix_sec(spc_date_string)
+    radar_utils.check_data_source(radar_source)
+    error_checking.assert_is_boolean(raise_error_if_missing)
+
+    if unix_time_sec is None:
+        storm_image_file_name = (
+            '{0:s}/{1:s}/{2:s}/{3:s}/{4:s}/storm_images_{5:s}.nc'
+        ).format(
+            top_directory_name, radar_source, spc_date_string[:4],
+            MULTI_FIELD_DIR_NAME, MULTI_HEIGHT_DIR_NAME, spc_date_string)
+    else:
+        storm_image_file_name = (
+            '{0:s}/{1:s}/{2:s}/{3:s}/{4:s}/{5:s}/storm_images_{6:s}.nc'
+        ).format(
+            top_directory_name, radar_source, spc_date_string[:4],
+            spc_date_string, MULTI_FIELD_DIR_NAME, MULTI_HEIGHT_DIR_NAME,
+            time_conversion.unix_sec_to_string(unix_time_sec, TIME_FORMAT))
+
+    if raise_error_if_missing and not os.path.isfile(storm_image_file_name):
+        error_string = 'Cannot find file.  Expected at: "{0:s}"'.format(
+            storm_image_file_name)
+        raise ValueError(error_string)
+
+    return storm_image_file_name
+
+
 def image_file_name_to_time(storm_image_file_name):
     """Parses time from name of storm-image file.
 
@@ -1,14 +1,73 @@
 """Unit tests for storm_images.py"""
 
+import os.path
 import unittest
 import numpy
 import pandas
+import netCDF4
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
+from gewittergefahr.gg_utils import unit_test_utils
 from gewittergefahr.deep_learning import storm_images
 
 TOLERANCE = 1e-6
 
+# The following constants are used to test _find_storm_objects_in_index.
+INDEXED_STORM_IDS = ['a', 'b', 'c', 'a', 'b']
+INDEXED_TIMES_UNIX_SEC = numpy.array([0, 0, 0, 300, 300], dtype=int)
+STORM_OBJECT_INDEX_DICT = {
+    storm_images.STORM_IDS_KEY: INDEXED_STORM_IDS,
+    storm_images.VALID_TIMES_KEY: INDEXED_TIMES_UNIX_SEC,
+    storm_images.STORM_OBJECT_TO_ROW_KEY: {
+        ('a', 0): 0, ('b', 0): 1, ('c', 0): 2, ('a', 300): 3, ('b', 300): 4
+    }
+}
+
+STORM_IDS_TO_FIND = ['b', 'a', 'c', 'b']
+TIMES_TO_FIND_UNIX_SEC = numpy.array([300, 0, 0, 300], dtype=int)
+INDICES_IN_STORM_OBJECT_INDEX = numpy.array([4, 0, 2, 4], dtype=int)
+
+# The following constants are used to test _indices_to_hyperslabs.
+INDICES_TO_COALESCE = numpy.array([9, 3, 4, 5, 20, 10, 3, 0], dtype=int)
+FIRST_INDICES_IN_HYPERSLABS = numpy.array([0, 3, 9, 20], dtype=int)
+LAST_INDICES_IN_HYPERSLABS = numpy.array([0, 5, 10, 20], dtype=int)
+
+ADJACENT_INDICES = numpy.array([4, 5, 6, 7], dtype=int)
+FIRST_INDICES_ADJACENT = numpy.array([4], dtype=int)
+LAST_INDICES_ADJACENT = numpy.array([7], dtype=int)
+
+GAPPED_INDICES = numpy.array([0, 2, 4], dtype=int)
+FIRST_INDICES_GAPPED = numpy.array([0, 2, 4], dtype=int)
+LAST_INDICES_GAPPED = numpy.array([0, 2, 4], dtype=int)
+
+DUPLICATE_INDICES = numpy.array([6, 6, 5, 5, 5], dtype=int)
+FIRST_INDICES_DUPLICATE = numpy.array([5], dtype=int)
+LAST_INDICES_DUPLICATE = numpy.array([6], dtype=int)
+
+# The following constants are used to test _read_storm_objects_from_variable.
+# The first run of indices is long enough to be read as one hyperslab, and the
+# second is one row too short.
+NUM_STORM_OBJECTS_IN_VARIABLE = 50
+VARIABLE_MATRIX = numpy.reshape(
+    numpy.arange(NUM_STORM_OBJECTS_IN_VARIABLE * 6, dtype=numpy.float32),
+    (NUM_STORM_OBJECTS_IN_VARIABLE, 3, 2))
+
+FIRST_LONG_RUN_INDEX = 30
+LONG_RUN_INDICES = FIRST_LONG_RUN_INDEX + numpy.linspace(
+    0, storm_images.MIN_ROWS_PER_HYPERSLAB - 1,
+    num=storm_images.MIN_ROWS_PER_HYPERSLAB, dtype=int)
+SHORT_RUN_INDICES = 10 + numpy.linspace(
+    0, storm_images.MIN_ROWS_PER_HYPERSLAB - 2,
+    num=storm_images.MIN_ROWS_PER_HYPERSLAB - 1, dtype=int)
+
+INDICES_TO_READ = numpy.concatenate((
+    LONG_RUN_INDICES[::-1], numpy.array([45, 0, 45], dtype=int),
+    SHORT_RUN_INDICES, LONG_RUN_INDICES[:2]
+))
+INDICES_READ_ONE_BY_ONE = numpy.unique(numpy.concatenate((
+    numpy.array([0, 45], dtype=int), SHORT_RUN_INDICES
+)))
+
 # The following constants are used to test _find_input_heights_needed.
 STORM_ELEVATIONS_M_ASL = numpy.array(
     [309, 3691, 4269, 4257, 883, 685, 4800], dtype=float)
@@ -72,6 +131,15 @@ SECOND_TIME_ROTATED_GRID_UNIX_SEC = 1
 SECOND_DATE_ROTATED_GRID_UNIX_SEC = 4
 SECOND_RELEVANT_INDICES_ROTATED_GRID = numpy.array([4], dtype=int)
 
+# The following constants are used to test _get_rotated_grid_template.
+NUM_TEMPLATE_ROWS = 2
+NUM_TEMPLATE_COLUMNS = 2
+TEMPLATE_GRID_SPACING_METRES = 2.
+
+TEMPLATE_DISPLACEMENT_MATRIX_METRES = numpy.full((2, 2), numpy.sqrt(2.))
+TEMPLATE_BEARING_MATRIX_DEG = numpy.array([[225., 135.],
+                                           [315., 45.]])
+
 # The following constants are used to test _rotate_grid_one_storm_object.
 ONE_CENTROID_LATITUDE_DEG = 53.5
 ONE_CENTROID_LONGITUDE_DEG = 246.5
@@ -182,31 +250,8 @@ STORM_IMAGE_COORD_DICT_BOTTOM_RIGHT = {
     storm_images.NUM_RIGHT_PADDING_COLS_KEY: 22
 }
 
-# The following constants are used to test _subset_xy_grid_for_interp.
-NON_SUBSET_X_COORDS_METRES = numpy.array([0, 1, 2, 3, 4, 5, 6, 7], dtype=float)
-NON_SUBSET_Y_COORDS_METRES = numpy.array([-10, -5, 0, 5, 10, 15], dtype=float)
-NON_SUBSET_FIELD_MATRIX = numpy.array(
-    [[1, 2, 3, 4, 5, 6, 7, 8],
-     [2, 3, 4, 5, 6, 7, 8, 9],
-     [3, 4, 5, 6, 7, 8, 9, 10],
-     [4, 5, 6, 7, 8, 9, 10, 11],
-     [5, 6, 7, 8, 9, 10, 11, 12],
-     [6, 7, 8, 9, 10, 11, 12, 13]], dtype=float)
-
-QUERY_X_COORDS_METRES = numpy.array(
-    [3.5, 4.4, 2.1, 3.3, 3.8, 4.7, 4.4, 4.7, 3.0, 4.1])
-QUERY_Y_COORDS_METRES = numpy.array(
-    [4.1, -1.1, -0.7, -0.8, -2.2, 2.6, 1.4, -3.5, -1.0, 1.0])
-
-SUBSET_X_COORDS_METRES = numpy.array([1, 2, 3, 4, 5, 6], dtype=float)
-SUBSET_Y_COORDS_METRES = numpy.array([-10, -5, 0, 5, 10], dtype=float)
-SUBSET_FIELD_MATRIX = numpy.array([[2, 3, 4, 5, 6, 7],
-                                   [3, 4, 5, 6, 7, 8],
-                                   [4, 5, 6, 7, 8, 9],
-                                   [5, 6, 7, 8, 9, 10],
-                                   [6, 7, 8, 9, 10, 11]], dtype=float)
-
-# The following constants are used to test _extract_rotated_storm_image.
+# The following constants are used to test _get_rotated_interp_weights and
+# _extract_rotated_storm_images.
 FULL_RADAR_MATRIX_ROTATED = numpy.array([[5, 5, 5, 5, 5, 5],
                                          [5, 5, 5, 5, 5, 5],
                                          [5, 5, 5, 5, 5, 5],
@@ -265,6 +310,11 @@ INTERP_IMAGE_MATRIX_3D = numpy.stack(
      THIS_MATRIX_HEIGHT1 + 56),
     axis=-1)
 
+# The following constants are used to test _get_num_processes_for_extraction.
+NUM_GRID_POINTS_PER_PROCESS = 3500 * 7000
+MAX_MEMORY_FOR_EXTRACTION_GB = 2.
+MAX_NUM_PROCESSES_FOR_MEMORY = 3
+
 # The following constants are used to test downsize_storm_images.
 THIS_FIRST_MATRIX = numpy.array([[0, 1, 2, 3, 4, 5],
                                  [2, 3, 4, 5, 6, 7],
@@ -304,10 +354,247 @@ STORM_IMAGE_FILE_NAME_ONE_SPC_DATE = (
     'storm_images/myrorss/2018/echo_top_40dbz_km/00250_metres_agl/'
     'storm_images_20180123.nc')
 
+# The following constants are used to test find_storm_image_file_multi_field.
+MULTI_FIELD_FILE_NAME_ONE_TIME = (
+    'storm_images/myrorss/2018/20180123/all_fields/all_heights/'
+    'storm_images_2018-01-23-232345.nc')
+MULTI_FIELD_FILE_NAME_ONE_SPC_DATE = (
+    'storm_images/myrorss/2018/all_fields/all_heights/'
+    'storm_images_20180123.nc')
+
+# The following constants are used to test read_storm_images and
+# read_storm_images_multi_field.
+STORM_IDS_IN_FILE = ['a', 'b', 'c']
+VALID_TIMES_IN_FILE_UNIX_SEC = numpy.array([0, 0, 300], dtype=int)
+
+FIELD_NAME_BY_PAIR_IN_FILE = [radar_utils.REFL_NAME, radar_utils.REFL_NAME]
+HEIGHT_BY_PAIR_IN_FILE_M_AGL = numpy.array([1000, 2000], dtype=int)
+STORM_IMAGE_MATRICES_IN_FILE = [
+    numpy.reshape(numpy.arange(48, dtype=numpy.float32), (3, 4, 4)),
+    numpy.reshape(numpy.arange(48, 96, dtype=numpy.float32), (3, 4, 4))
+]
+
+STORM_IDS_TO_READ = ['c', 'a']
+VALID_TIMES_TO_READ_UNIX_SEC = numpy.array([300, 0], dtype=int)
+FIELD_NAME_BY_PAIR_TO_READ = [radar_utils.REFL_NAME]
+HEIGHT_BY_PAIR_TO_READ_M_AGL = numpy.array([2000], dtype=int)
+STORM_IMAGE_MATRICES_READ = [STORM_IMAGE_MATRICES_IN_FILE[1][[2, 0], ...]]
+
+# The following constants are used to test _get_storm_object_index.
+NEW_STORM_IDS_IN_FILE = ['d', 'e', 'f']
+
+
+class _RecordingVariable(object):
+    """Mimics NetCDF variable and records each read."""
+
+    def __init__(self, data_matrix):
+        """Creates new instance.
+
+        :param data_matrix: numpy array.
+        """
+
+        self.data_matrix = data_matrix
+        self.shape = data_matrix.shape
+        self.dtype = data_matrix.dtype
+        self.keys_read = []
 
-class StormImagesTests(unittest.TestCase):
+    def __getitem__(self, key):
+        """Reads data.
+
+        :param key: Index (anything accepted by numpy).
+        :return: data_matrix: Subset of data.
+        """
+
+        self.keys_read.append(key)
+        return self.data_matrix[key]
+
+
+class StormImagesTests(unit_test_utils.TestCaseWithTempDir):
     """Each method is a unit test for storm_images.py."""
 
+    def test_find_storm_objects_in_index_all_found(self):
+        """Ensures correct output from _find_storm_objects_in_index.
+
+        In this case, all desired storm objects are in the index.
+        """
+
+        these_indices = storm_images._find_storm_objects_in_index(
+            index_dict=STORM_OBJECT_INDEX_DICT,
+            storm_ids_to_keep=STORM_IDS_TO_FIND,
+            times_to_keep_unix_sec=TIMES_TO_FIND_UNIX_SEC)
+
+        self.assertTrue(numpy.array_equal(
+            these_indices, INDICES_IN_STORM_OBJECT_INDEX))
+
+    def test_find_storm_objects_in_index_one_missing(self):
+        """Ensures that _find_storm_objects_in_index fails.
+
+        In this case, one desired storm object is missing from the index.
+        """
+
+        with self.assertRaises(ValueError):
+            storm_images._find_storm_objects_in_index(
+                index_dict=STORM_OBJECT_INDEX_DICT,
+                storm_ids_to_keep=STORM_IDS_TO_FIND + ['c'],
+                times_to_keep_unix_sec=numpy.concatenate((
+                    TIMES_TO_FIND_UNIX_SEC, numpy.array([300], dtype=int)
+                )))
+
+    def test_indices_to_hyperslabs(self):
+        """Ensures correct output from _indices_to_hyperslabs."""
+
+        these_first_indices, these_last_indices = (
+            storm_images._indices_to_hyperslabs(INDICES_TO_COALESCE)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_first_indices, FIRST_INDICES_IN_HYPERSLABS))
+        self.assertTrue(numpy.array_equal(
+            these_last_indices, LAST_INDICES_IN_HYPERSLABS))
+
+    def test_indices_to_hyperslabs_adjacent(self):
+        """Ensures correct output from _indices_to_hyperslabs.
+
+        In this case, all indices are adjacent.
+        """
+
+        these_first_indices, these_last_indices = (
+            storm_images._indices_to_hyperslabs(ADJACENT_INDICES)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_first_indices, FIRST_INDICES_ADJACENT))
+        self.assertTrue(numpy.array_equal(
+            these_last_indices, LAST_INDICES_ADJACENT))
+
+    def test_indices_to_hyperslabs_gapped(self):
+        """Ensures correct output from _indices_to_hyperslabs.
+
+        In this case, there is a gap between each pair of indices.
+        """
+
+        these_first_indices, these_last_indices = (
+            storm_images._indices_to_hyperslabs(GAPPED_INDICES)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_first_indices, FIRST_INDICES_GAPPED))
+        self.assertTrue(numpy.array_equal(
+            these_last_indices, LAST_INDICES_GAPPED))
+
+    def test_indices_to_hyperslabs_duplicate(self):
+        """Ensures correct output from _indices_to_hyperslabs.
+
+        In this case, indices are unsorted and contain duplicates.
+        """
+
+        these_first_indices, these_last_indices = (
+            storm_images._indices_to_hyperslabs(DUPLICATE_INDICES)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_first_indices, FIRST_INDICES_DUPLICATE))
+        self.assertTrue(numpy.array_equal(
+            these_last_indices, LAST_INDICES_DUPLICATE))
+
+    def test_indices_to_hyperslabs_empty(self):
+        """Ensures correct output from _indices_to_hyperslabs.
+
+        In this case, there are no indices.
+        """
+
+        these_first_indices, these_last_indices = (
+            storm_images._indices_to_hyperslabs(numpy.array([], dtype=int))
+        )
+
+        self.assertTrue(len(these_first_indices) == 0)
+        self.assertTrue(len(these_last_indices) == 0)
+
+    def test_read_storm_objects_from_variable_reads(self):
+        """Ensures correct reads by _read_storm_objects_from_variable.
+
+        The long run of indices should be read with one slice, and all other
+        indices (including the run that is one row too short) should be read
+        together, sorted and unique.
+        """
+
+        this_variable = _RecordingVariable(VARIABLE_MATRIX)
+        this_data_matrix = storm_images._read_storm_objects_from_variable(
+            netcdf_variable=this_variable, indices=INDICES_TO_READ)
+
+        self.assertTrue(numpy.array_equal(
+            this_data_matrix, VARIABLE_MATRIX[INDICES_TO_READ, ...]))
+        self.assertTrue(len(this_variable.keys_read) == 2)
+
+        this_slice_object = this_variable.keys_read[0][0]
+        self.assertTrue(this_slice_object.start == LONG_RUN_INDICES[0])
+        self.assertTrue(this_slice_object.stop == LONG_RUN_INDICES[-1] + 1)
+        self.assertTrue(numpy.array_equal(
+            this_variable.keys_read[1][0], INDICES_READ_ONE_BY_ONE))
+
+    def test_read_storm_objects_from_variable_netcdf(self):
+        """Ensures correct output from _read_storm_objects_from_variable.
+
+        In this case, the coalesced read from a real NetCDF variable should
+        match plain fancy-indexing.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'variable.nc')
+        this_dataset = netCDF4.Dataset(
+            this_file_name, 'w', format='NETCDF3_64BIT_OFFSET')
+        this_dataset.createDimension('storm_object', VARIABLE_MATRIX.shape[0])
+        this_dataset.createDimension('row', VARIABLE_MATRIX.shape[1])
+        this_dataset.createDimension('column', VARIABLE_MATRIX.shape[2])
+        this_dataset.createVariable(
+            'data_matrix', datatype=numpy.float32,
+            dimensions=('storm_object', 'row', 'column'))
+        this_dataset.variables['data_matrix'][:] = VARIABLE_MATRIX
+        this_dataset.close()
+
+        this_dataset = netCDF4.Dataset(this_file_name)
+        this_variable = this_dataset.variables['data_matrix']
+
+        this_data_matrix = storm_images._read_storm_objects_from_variable(
+            netcdf_variable=this_variable, indices=INDICES_TO_READ)
+        this_expected_matrix = numpy.array(this_variable[:])[
+            INDICES_TO_READ, ...]
+        this_dataset.close()
+
+        self.assertTrue(numpy.array_equal(
+            this_data_matrix, this_expected_matrix))
+
+    def test_get_storm_object_index_modified(self):
+        """Ensures that _get_storm_object_index notices modified file.
+
+        In this case, the file is rewritten with new storm IDs after the index
+        is cached, so the index should be recomputed.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'one_field.nc')
+
+        for these_storm_ids in [STORM_IDS_IN_FILE, NEW_STORM_IDS_IN_FILE]:
+            storm_images.write_storm_images(
+                netcdf_file_name=this_file_name,
+                storm_image_matrix=STORM_IMAGE_MATRICES_IN_FILE[0],
+                storm_ids=these_storm_ids,
+                valid_times_unix_sec=VALID_TIMES_IN_FILE_UNIX_SEC,
+                radar_field_name=FIELD_NAME_BY_PAIR_IN_FILE[0],
+                radar_height_m_agl=HEIGHT_BY_PAIR_IN_FILE_M_AGL[0])
+
+            # Filesystem timestamps may be coarser than the time between
+            # writes, so force the modification time to change.
+            this_time_unix_sec = (
+                0 if these_storm_ids == STORM_IDS_IN_FILE else 1000)
+            os.utime(this_file_name, (this_time_unix_sec, this_time_unix_sec))
+
+            this_dataset = netCDF4.Dataset(this_file_name)
+            this_index_dict = storm_images._get_storm_object_index(
+                netcdf_dataset=this_dataset, netcdf_file_name=this_file_name)
+            this_dataset.close()
+
+            self.assertTrue(
+                this_index_dict[storm_images.STORM_IDS_KEY] == these_storm_ids)
+
     def test_find_input_heights_needed_myrorss(self):
         """Ensures correct output from _find_input_heights_needed.
 
@@ -413,6 +700,27 @@ class StormImagesTests(unittest.TestCase):
         self.assertTrue(numpy.array_equal(
             these_indices, SECOND_RELEVANT_INDICES_ROTATED_GRID))
 
+    def test_get_rotated_grid_template(self):
+        """Ensures correct output from _get_rotated_grid_template."""
+
+        this_template_dict = storm_images._get_rotated_grid_template(
+            num_storm_image_rows=NUM_TEMPLATE_ROWS,
+            num_storm_image_columns=NUM_TEMPLATE_COLUMNS,
+            storm_grid_spacing_metres=TEMPLATE_GRID_SPACING_METRES)
+
+        self.assertTrue(numpy.allclose(
+            this_template_dict[storm_images.SCALAR_DISPLACEMENTS_KEY],
+            TEMPLATE_DISPLACEMENT_MATRIX_METRES, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_template_dict[storm_images.GEODETIC_BEARINGS_KEY],
+            TEMPLATE_BEARING_MATRIX_DEG, atol=TOLERANCE))
+
+        this_new_template_dict = storm_images._get_rotated_grid_template(
+            num_storm_image_rows=NUM_TEMPLATE_ROWS,
+            num_storm_image_columns=NUM_TEMPLATE_COLUMNS,
+            storm_grid_spacing_metres=TEMPLATE_GRID_SPACING_METRES)
+        self.assertTrue(this_new_template_dict is this_template_dict)
+
     def test_rotate_grid_one_storm_object_zero_motion(self):
         """Ensures correct output from _rotate_grid_one_storm_object.
 
@@ -616,38 +924,55 @@ class StormImagesTests(unittest.TestCase):
 
         self.assertTrue(this_coord_dict == STORM_IMAGE_COORD_DICT_BOTTOM_RIGHT)
 
-    def test_subset_xy_grid_for_interp(self):
-        """Ensures correct output from _subset_xy_grid_for_interp."""
+    def test_extract_rotated_storm_images_one(self):
+        """Ensures correct output from _extract_rotated_storm_images.
 
-        (this_field_matrix, these_x_coords_metres, these_y_coords_metres
-        ) = storm_images._subset_xy_grid_for_interp(
-            field_matrix=NON_SUBSET_FIELD_MATRIX,
-            grid_point_x_coords_metres=NON_SUBSET_X_COORDS_METRES,
-            grid_point_y_coords_metres=NON_SUBSET_Y_COORDS_METRES,
-            query_x_coords_metres=QUERY_X_COORDS_METRES,
-            query_y_coords_metres=QUERY_Y_COORDS_METRES)
-
-        self.assertTrue(numpy.allclose(
-            this_field_matrix, SUBSET_FIELD_MATRIX, atol=TOLERANCE))
-        self.assertTrue(numpy.allclose(
-            these_x_coords_metres, SUBSET_X_COORDS_METRES, atol=TOLERANCE))
-        self.assertTrue(numpy.allclose(
-            these_y_coords_metres, SUBSET_Y_COORDS_METRES, atol=TOLERANCE))
-
-    def test_extract_rotated_storm_image(self):
-        """Ensures correct output from _extract_rotated_storm_image."""
+        In this case, interpolation weights are computed for one storm object.
+        """
 
-        this_storm_image_matrix = storm_images._extract_rotated_storm_image(
-            full_radar_matrix=FULL_RADAR_MATRIX_ROTATED,
+        this_interp_weight_dict = storm_images._get_rotated_interp_weights(
             full_grid_point_latitudes_deg=FULL_GRID_POINT_LATITUDES_DEG,
             full_grid_point_longitudes_deg=FULL_GRID_POINT_LONGITUDES_DEG,
             rotated_gp_lat_matrix_deg=ROTATED_LAT_MATRIX_ARBITRARY_MOTION_DEG,
             rotated_gp_lng_matrix_deg=ROTATED_LNG_MATRIX_ARBITRARY_MOTION_DEG)
 
+        this_storm_image_matrix = storm_images._extract_rotated_storm_images(
+            full_radar_matrix=FULL_RADAR_MATRIX_ROTATED,
+            interp_weight_dict=this_interp_weight_dict)
+
         self.assertTrue(numpy.allclose(
             this_storm_image_matrix, STORM_IMAGE_MATRIX_ROTATED,
             atol=TOLERANCE))
 
+    def test_extract_rotated_storm_images_many(self):
+        """Ensures correct output from _extract_rotated_storm_images.
+
+        In this case, interpolation weights are computed for two storm objects
+        at once and reused for two radar fields.
+        """
+
+        this_interp_weight_dict = storm_images._get_rotated_interp_weights(
+            full_grid_point_latitudes_deg=FULL_GRID_POINT_LATITUDES_DEG,
+            full_grid_point_longitudes_deg=FULL_GRID_POINT_LONGITUDES_DEG,
+            rotated_gp_lat_matrix_deg=numpy.stack(
+                (ROTATED_LAT_MATRIX_ARBITRARY_MOTION_DEG,) * 2, axis=0),
+            rotated_gp_lng_matrix_deg=numpy.stack(
+                (ROTATED_LNG_MATRIX_ARBITRARY_MOTION_DEG,) * 2, axis=0)
+        )
+
+        for this_multiplier in [1., 2.]:
+            this_storm_image_matrix = (
+                storm_images._extract_rotated_storm_images(
+                    full_radar_matrix=
+                    this_multiplier * FULL_RADAR_MATRIX_ROTATED,
+                    interp_weight_dict=this_interp_weight_dict)
+            )
+
+            this_expected_matrix = numpy.stack(
+                (this_multiplier * STORM_IMAGE_MATRIX_ROTATED,) * 2, axis=0)
+            self.assertTrue(numpy.allclose(
+                this_storm_image_matrix, this_expected_matrix, atol=TOLERANCE))
+
     def test_extract_unrotated_storm_image_middle(self):
         """Ensures correct output from _extract_unrotated_storm_image.
 
@@ -684,6 +1009,43 @@ class StormImagesTests(unittest.TestCase):
             this_storm_image_matrix, STORM_IMAGE_MATRIX_UNROTATED_EDGE,
             atol=TOLERANCE))
 
+    def test_get_num_processes_for_extraction_no_cap(self):
+        """Ensures correct output from _get_num_processes_for_extraction.
+
+        In this case there is no memory cap.
+        """
+
+        this_num_processes = storm_images._get_num_processes_for_extraction(
+            num_processes=8, max_memory_gb=None,
+            num_grid_points_per_process=None)
+
+        self.assertTrue(this_num_processes == 8)
+
+    def test_get_num_processes_for_extraction_capped(self):
+        """Ensures correct output from _get_num_processes_for_extraction.
+
+        In this case the memory cap reduces the number of processes.
+        """
+
+        this_num_processes = storm_images._get_num_processes_for_extraction(
+            num_processes=8, max_memory_gb=MAX_MEMORY_FOR_EXTRACTION_GB,
+            num_grid_points_per_process=NUM_GRID_POINTS_PER_PROCESS)
+
+        self.assertTrue(this_num_processes == MAX_NUM_PROCESSES_FOR_MEMORY)
+
+    def test_get_num_processes_for_extraction_tiny_cap(self):
+        """Ensures correct output from _get_num_processes_for_extraction.
+
+        In this case the memory cap is too small for even one process, so one
+        process is used anyway.
+        """
+
+        this_num_processes = storm_images._get_num_processes_for_extraction(
+            num_processes=8, max_memory_gb=1e-3,
+            num_grid_points_per_process=NUM_GRID_POINTS_PER_PROCESS)
+
+        self.assertTrue(this_num_processes == 1)
+
     def test_downsize_storm_images_non_az_shear(self):
         """Ensures correct output from downsize_storm_images.
 
@@ -771,6 +1133,32 @@ class StormImagesTests(unittest.TestCase):
 
         self.assertTrue(this_file_name == STORM_IMAGE_FILE_NAME_ONE_SPC_DATE)
 
+    def test_find_storm_image_file_multi_field_one_time(self):
+        """Ensures correct output from find_storm_image_file_multi_field.
+
+        In this case, file name is for one time step.
+        """
+
+        this_file_name = storm_images.find_storm_image_file_multi_field(
+            top_directory_name=TOP_STORM_IMAGE_DIR_NAME,
+            unix_time_sec=VALID_TIME_UNIX_SEC, spc_date_string=SPC_DATE_STRING,
+            radar_source=RADAR_SOURCE_NAME, raise_error_if_missing=False)
+
+        self.assertTrue(this_file_name == MULTI_FIELD_FILE_NAME_ONE_TIME)
+
+    def test_find_storm_image_file_multi_field_one_spc_date(self):
+        """Ensures correct output from find_storm_image_file_multi_field.
+
+        In this case, file name is for one SPC date.
+        """
+
+        this_file_name = storm_images.find_storm_image_file_multi_field(
+            top_directory_name=TOP_STORM_IMAGE_DIR_NAME,
+            spc_date_string=SPC_DATE_STRING, radar_source=RADAR_SOURCE_NAME,
+            raise_error_if_missing=False)
+
+        self.assertTrue(this_file_name == MULTI_FIELD_FILE_NAME_ONE_SPC_DATE)
+
     def test_image_file_name_to_time_one_time(self):
         """Ensures correct output from image_file_name_to_time.
 
@@ -836,6 +1224,94 @@ class StormImagesTests(unittest.TestCase):
             STORM_IMAGE_FILE_NAME_ONE_SPC_DATE)
         self.assertTrue(this_height_m_agl == RADAR_HEIGHT_M_AGL)
 
+    def test_read_storm_images(self):
+        """Ensures that read_storm_images inverts write_storm_images."""
+
+        this_file_name = os.path.join(self.temp_dir_name, 'one_field.nc')
+        storm_images.write_storm_images(
+            netcdf_file_name=this_file_name,
+            storm_image_matrix=STORM_IMAGE_MATRICES_IN_FILE[0],
+            storm_ids=STORM_IDS_IN_FILE,
+            valid_times_unix_sec=VALID_TIMES_IN_FILE_UNIX_SEC,
+            radar_field_name=FIELD_NAME_BY_PAIR_IN_FILE[0],
+            radar_height_m_agl=HEIGHT_BY_PAIR_IN_FILE_M_AGL[0])
+
+        this_storm_image_dict = storm_images.read_storm_images(
+            netcdf_file_name=this_file_name,
+            storm_ids_to_keep=STORM_IDS_TO_READ,
+            valid_times_to_keep_unix_sec=VALID_TIMES_TO_READ_UNIX_SEC)
+
+        self.assertTrue(numpy.allclose(
+            this_storm_image_dict[storm_images.STORM_IMAGE_MATRIX_KEY],
+            STORM_IMAGE_MATRICES_IN_FILE[0][[2, 0], ...], atol=TOLERANCE))
+        self.assertTrue(
+            this_storm_image_dict[storm_images.STORM_IDS_KEY] ==
+            STORM_IDS_TO_READ)
+        self.assertTrue(
+            this_storm_image_dict[storm_images.RADAR_FIELD_NAME_KEY] ==
+            FIELD_NAME_BY_PAIR_IN_FILE[0])
+
+    def test_read_storm_images_multi_field(self):
+        """Ensures that read_storm_images_multi_field inverts the writer.
+
+        In this case, a subset of field/height pairs and storm objects is read.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'all_fields.nc')
+        storm_images.write_storm_images_multi_field(
+            netcdf_file_name=this_file_name,
+            storm_image_matrices=STORM_IMAGE_MATRICES_IN_FILE,
+            storm_ids=STORM_IDS_IN_FILE,
+            valid_times_unix_sec=VALID_TIMES_IN_FILE_UNIX_SEC,
+            field_name_by_pair=FIELD_NAME_BY_PAIR_IN_FILE,
+            height_by_pair_m_agl=HEIGHT_BY_PAIR_IN_FILE_M_AGL)
+
+        this_storm_image_dict = storm_images.read_storm_images_multi_field(
+            netcdf_file_name=this_file_name,
+            storm_ids_to_keep=STORM_IDS_TO_READ,
+            valid_times_to_keep_unix_sec=VALID_TIMES_TO_READ_UNIX_SEC,
+            field_name_by_pair_to_keep=FIELD_NAME_BY_PAIR_TO_READ,
+            height_by_pair_to_keep_m_agl=HEIGHT_BY_PAIR_TO_READ_M_AGL)
+
+        these_matrices = this_storm_image_dict[
+            storm_images.STORM_IMAGE_MATRICES_KEY]
+        self.assertTrue(len(these_matrices) == len(STORM_IMAGE_MATRICES_READ))
+        self.assertTrue(numpy.allclose(
+            these_matrices[0], STORM_IMAGE_MATRICES_READ[0], atol=TOLERANCE))
+        self.assertTrue(
+            this_storm_image_dict[storm_images.FIELD_NAME_BY_PAIR_KEY] ==
+            FIELD_NAME_BY_PAIR_TO_READ)
+        self.assertTrue(numpy.array_equal(
+            this_storm_image_dict[storm_images.HEIGHT_BY_PAIR_KEY],
+            HEIGHT_BY_PAIR_TO_READ_M_AGL))
+
+    def test_read_storm_images_wrong_format(self):
+        """Ensures that each reader errors out on the other file format."""
+
+        this_single_file_name = os.path.join(
+            self.temp_dir_name, 'one_field.nc')
+        storm_images.write_storm_images(
+            netcdf_file_name=this_single_file_name,
+            storm_image_matrix=STORM_IMAGE_MATRICES_IN_FILE[0],
+            storm_ids=STORM_IDS_IN_FILE,
+            valid_times_unix_sec=VALID_TIMES_IN_FILE_UNIX_SEC,
+            radar_field_name=FIELD_NAME_BY_PAIR_IN_FILE[0],
+            radar_height_m_agl=HEIGHT_BY_PAIR_IN_FILE_M_AGL[0])
+
+        this_multi_file_name = os.path.join(self.temp_dir_name, 'all_fields.nc')
+        storm_images.write_storm_images_multi_field(
+            netcdf_file_name=this_multi_file_name,
+            storm_image_matrices=STORM_IMAGE_MATRICES_IN_FILE,
+            storm_ids=STORM_IDS_IN_FILE,
+            valid_times_unix_sec=VALID_TIMES_IN_FILE_UNIX_SEC,
+            field_name_by_pair=FIELD_NAME_BY_PAIR_IN_FILE,
+            height_by_pair_m_agl=HEIGHT_BY_PAIR_IN_FILE_M_AGL)
+
+        with self.assertRaises(ValueError):
+            storm_images.read_storm_images(this_multi_file_name)
+        with self.assertRaises(ValueError):
+            storm_images.read_storm_images_multi_field(this_single_file_name)
+
 
 if __name__ == '__main__':
     unittest.main()
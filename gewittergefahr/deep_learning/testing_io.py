@@ -361,7 +361,8 @@ def generator_2d_or_3d(option_dict, num_examples_total):
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             if include_soundings:
                 sounding_matrix = dl_utils.normalize_soundings(
@@ -370,7 +371,8 @@ def generator_2d_or_3d(option_dict, num_examples_total):
                     normalization_type_string=normalization_type_string,
                     normalization_param_file_name=normalization_param_file_name,
                     min_normalized_value=min_normalized_value,
-                    max_normalized_value=max_normalized_value).astype('float32')
+                    max_normalized_value=max_normalized_value
+                ).astype('float32', copy=False)
 
         list_of_predictor_matrices = [radar_image_matrix]
         if include_soundings:
@@ -583,7 +585,8 @@ def myrorss_generator_2d3d(option_dict, num_examples_total):
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             az_shear_image_matrix_s01 = dl_utils.normalize_radar_images(
                 radar_image_matrix=az_shear_image_matrix_s01,
@@ -591,7 +594,8 @@ def myrorss_generator_2d3d(option_dict, num_examples_total):
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             if include_soundings:
                 sounding_matrix = dl_utils.normalize_soundings(
@@ -600,7 +604,8 @@ def myrorss_generator_2d3d(option_dict, num_examples_total):
                     normalization_type_string=normalization_type_string,
                     normalization_param_file_name=normalization_param_file_name,
                     min_normalized_value=min_normalized_value,
-                    max_normalized_value=max_normalized_value).astype('float32')
+                    max_normalized_value=max_normalized_value
+                ).astype('float32', copy=False)
 
         list_of_predictor_matrices = [
             reflectivity_image_matrix_dbz, az_shear_image_matrix_s01
@@ -836,7 +841,8 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts,
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             if include_soundings:
                 sounding_matrix = dl_utils.normalize_soundings(
@@ -845,7 +851,8 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts,
                     normalization_type_string=normalization_type_string,
                     normalization_param_file_name=normalization_param_file_name,
                     min_normalized_value=min_normalized_value,
-                    max_normalized_value=max_normalized_value).astype('float32')
+                    max_normalized_value=max_normalized_value
+                ).astype('float32', copy=False)
 
         list_of_predictor_matrices = [radar_image_matrix]
         if include_soundings:
@@ -14,13 +14,18 @@ F_s = number of sounding fields (or "variables" or "channels")
 C = number of radar field/height pairs
 """
 
+import collections
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import numpy
 import keras
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 from gewittergefahr.deep_learning import data_augmentation
 from gewittergefahr.deep_learning import input_examples
+from gewittergefahr.deep_learning import example_shards
 from gewittergefahr.gg_utils import target_val_utils
 from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import error_checking
 
 KM_TO_METRES = 1000
@@ -54,6 +59,13 @@ NOISE_STDEV_KEY = 'noise_standard_deviation'
 NUM_NOISINGS_KEY = 'num_noisings'
 FLIP_X_KEY = 'flip_in_x'
 FLIP_Y_KEY = 'flip_in_y'
+NUM_AUGMENTATION_THREADS_KEY = 'num_augmentation_threads'
+
+NUM_PREFETCH_WORKERS_KEY = 'num_prefetch_workers'
+PREFETCH_QUEUE_SIZE_KEY = 'prefetch_queue_size'
+PREFETCH_WITH_PROCESSES_KEY = 'prefetch_with_processes'
+SHARD_MANIFEST_FILE_KEY = 'shard_manifest_file_name'
+NUM_SHARDS_PER_BATCH_KEY = 'num_shards_per_batch'
 
 DEFAULT_OPTION_DICT = {
     NORMALIZATION_TYPE_KEY: dl_utils.Z_NORMALIZATION_TYPE_STRING,
@@ -69,7 +81,13 @@ DEFAULT_OPTION_DICT = {
     NOISE_STDEV_KEY: 0.05,
     NUM_NOISINGS_KEY: 0,
     FLIP_X_KEY: False,
-    FLIP_Y_KEY: False
+    FLIP_Y_KEY: False,
+    NUM_AUGMENTATION_THREADS_KEY: 1,
+    NUM_PREFETCH_WORKERS_KEY: 0,
+    PREFETCH_QUEUE_SIZE_KEY: 2,
+    PREFETCH_WITH_PROCESSES_KEY: False,
+    SHARD_MANIFEST_FILE_KEY: None,
+    NUM_SHARDS_PER_BATCH_KEY: 4
 }
 
 
@@ -221,7 +239,7 @@ def _select_batch(
             continue
 
         list_of_predictor_matrices[i] = list_of_predictor_matrices[
-            i][batch_indices, ...].astype('float32')
+            i][batch_indices, ...].astype('float32', copy=False)
 
     target_values[target_values == target_val_utils.DEAD_STORM_INTEGER] = 0
 
@@ -249,7 +267,8 @@ def _select_batch(
 def _augment_radar_images(
         list_of_predictor_matrices, target_array, x_translations_pixels,
         y_translations_pixels, ccw_rotation_angles_deg,
-        noise_standard_deviation, num_noisings, flip_in_x, flip_in_y):
+        noise_standard_deviation, num_noisings, flip_in_x, flip_in_y,
+        num_threads=1):
     """Applies one or more data augmentations to each radar image.
 
     P = number of predictor matrices
@@ -279,6 +298,8 @@ def _augment_radar_images(
         in the x-direction.
     :param flip_in_y: Boolean flag.  If True, each radar image will be flipped
         in the y-direction.
+    :param num_threads: Number of threads used for augmentation (see doc for
+        `data_augmentation.augment_radar_images`).
     :return: list_of_predictor_matrices: Same as input, except the first axis of
         each array now has length E.
     :return: target_array: Same as input, except dimensions are now either
@@ -320,11 +341,15 @@ def _augment_radar_images(
     error_checking.assert_is_boolean(flip_in_x)
     error_checking.assert_is_boolean(flip_in_y)
 
-    last_num_dimensions = len(list_of_predictor_matrices[-1].shape)
-    soundings_included = last_num_dimensions == 3
-    num_radar_matrices = (
-        len(list_of_predictor_matrices) - int(soundings_included)
-    )
+    if list_of_predictor_matrices[-1] is None:
+        soundings_included = False
+        num_radar_matrices = len(list_of_predictor_matrices) - 1
+    else:
+        last_num_dimensions = len(list_of_predictor_matrices[-1].shape)
+        soundings_included = last_num_dimensions == 3
+        num_radar_matrices = (
+            len(list_of_predictor_matrices) - int(soundings_included)
+        )
 
     print (
         'Augmenting radar images ({0:d} translations, {1:d} rotations, {2:d} '
@@ -334,105 +359,436 @@ def _augment_radar_images(
         int(flip_in_y)
     )
 
-    orig_num_examples = list_of_predictor_matrices[0].shape[0]
-
-    for i in range(num_translations):
-        for j in range(num_radar_matrices):
-            this_multiplier = j + 1  # Handles azimuthal shear.
-
-            this_image_matrix = data_augmentation.shift_radar_images(
-                radar_image_matrix=
-                list_of_predictor_matrices[j][:orig_num_examples, ...],
-                x_offset_pixels=this_multiplier * x_translations_pixels[i],
-                y_offset_pixels=this_multiplier * y_translations_pixels[i])
-
-            list_of_predictor_matrices[j] = numpy.concatenate(
-                (list_of_predictor_matrices[j], this_image_matrix), axis=0)
-
-        target_array = numpy.concatenate(
-            (target_array, target_array[:orig_num_examples, ...]), axis=0)
-
-        if soundings_included:
-            list_of_predictor_matrices[-1] = numpy.concatenate(
-                (list_of_predictor_matrices[-1],
-                 list_of_predictor_matrices[-1][:orig_num_examples, ...]),
-                axis=0)
-
-    for i in range(num_rotations):
-        for j in range(num_radar_matrices):
-            this_image_matrix = data_augmentation.rotate_radar_images(
-                radar_image_matrix=
-                list_of_predictor_matrices[j][:orig_num_examples, ...],
-                ccw_rotation_angle_deg=ccw_rotation_angles_deg[i])
-
-            list_of_predictor_matrices[j] = numpy.concatenate(
-                (list_of_predictor_matrices[j], this_image_matrix), axis=0)
-
-        target_array = numpy.concatenate(
-            (target_array, target_array[:orig_num_examples, ...]), axis=0)
-
-        if soundings_included:
-            list_of_predictor_matrices[-1] = numpy.concatenate(
-                (list_of_predictor_matrices[-1],
-                 list_of_predictor_matrices[-1][:orig_num_examples, ...]),
-                axis=0)
-
-    for i in range(num_noisings):
-        for j in range(num_radar_matrices):
-            this_image_matrix = data_augmentation.noise_radar_images(
-                radar_image_matrix=
-                list_of_predictor_matrices[j][:orig_num_examples, ...],
-                standard_deviation=noise_standard_deviation)
-
-            list_of_predictor_matrices[j] = numpy.concatenate(
-                (list_of_predictor_matrices[j], this_image_matrix), axis=0)
-
-        target_array = numpy.concatenate(
-            (target_array, target_array[:orig_num_examples, ...]), axis=0)
-
-        if soundings_included:
-            list_of_predictor_matrices[-1] = numpy.concatenate(
-                (list_of_predictor_matrices[-1],
-                 list_of_predictor_matrices[-1][:orig_num_examples, ...]),
-                axis=0)
-
-    if flip_in_x:
-        for j in range(num_radar_matrices):
-            this_image_matrix = data_augmentation.flip_radar_images_x(
-                list_of_predictor_matrices[j][:orig_num_examples, ...]
-            )
+    if num_translations == 0:
+        x_translations_pixels = numpy.array([], dtype=int)
+        y_translations_pixels = numpy.array([], dtype=int)
+
+    for j in range(num_radar_matrices):
+        this_multiplier = j + 1  # Handles azimuthal shear.
+
+        list_of_predictor_matrices[j] = data_augmentation.augment_radar_images(
+            radar_image_matrix=list_of_predictor_matrices[j],
+            x_offsets_pixels=this_multiplier * x_translations_pixels,
+            y_offsets_pixels=this_multiplier * y_translations_pixels,
+            ccw_rotation_angles_deg=ccw_rotation_angles_deg,
+            noise_standard_deviation=noise_standard_deviation,
+            num_noisings=num_noisings, flip_in_x=flip_in_x,
+            flip_in_y=flip_in_y, num_threads=num_threads)
+
+    num_versions = 1 + (
+        num_translations + num_rotations + num_noisings + int(flip_in_x) +
+        int(flip_in_y)
+    )
+
+    target_array = numpy.concatenate([target_array] * num_versions, axis=0)
+    if soundings_included:
+        list_of_predictor_matrices[-1] = numpy.concatenate(
+            [list_of_predictor_matrices[-1]] * num_versions, axis=0)
+
+    return list_of_predictor_matrices, target_array
+
+
+def _read_example_file(
+        example_file_name, option_dict, radar_field_names, radar_heights_m_agl,
+        class_to_num_examples_dict, list_of_operation_dicts=None,
+        indices_to_read=None):
+    """Reads examples from one file for a generator.
+
+    :param example_file_name: Path to input file (will be read by
+        `input_examples.read_example_file`).
+    :param option_dict: See doc for any generator in this file.
+    :param radar_field_names: 1-D list of radar fields to read.
+    :param radar_heights_m_agl: 1-D numpy array of radar heights to read
+        (metres above ground level).
+    :param class_to_num_examples_dict: See doc for
+        `input_examples.read_example_file`.
+    :param list_of_operation_dicts: See doc for
+        `input_examples.reduce_examples_3d_to_2d`.  If you do not want to
+        reduce radar images from 3-D to 2-D, leave this as None.
+    :param indices_to_read: See doc for `input_examples.read_example_file`.
+    :return: example_dict: See doc for `input_examples.read_example_file`.  If
+        the file contains no relevant examples, this is None.
+    """
+
+    print 'Reading data from: "{0:s}"...'.format(example_file_name)
+    example_dict = input_examples.read_example_file(
+        netcdf_file_name=example_file_name,
+        include_soundings=option_dict[SOUNDING_FIELDS_KEY] is not None,
+        radar_field_names_to_keep=radar_field_names,
+        radar_heights_to_keep_m_agl=radar_heights_m_agl,
+        sounding_field_names_to_keep=option_dict[SOUNDING_FIELDS_KEY],
+        sounding_heights_to_keep_m_agl=option_dict[SOUNDING_HEIGHTS_KEY],
+        first_time_to_keep_unix_sec=option_dict[FIRST_STORM_TIME_KEY],
+        last_time_to_keep_unix_sec=option_dict[LAST_STORM_TIME_KEY],
+        num_rows_to_keep=option_dict[NUM_ROWS_KEY],
+        num_columns_to_keep=option_dict[NUM_COLUMNS_KEY],
+        class_to_num_examples_dict=class_to_num_examples_dict,
+        indices_to_read=indices_to_read)
+
+    if example_dict is None or list_of_operation_dicts is None:
+        return example_dict
+
+    return input_examples.reduce_examples_3d_to_2d(
+        example_dict=example_dict,
+        list_of_operation_dicts=list_of_operation_dicts)
+
+
+def _create_prefetch_pool(option_dict):
+    """Creates pool of workers for reading examples in the background.
+
+    :param option_dict: See doc for any generator in this file.
+    :return: pool_object: Instance of `multiprocessing.Pool` (if
+        `option_dict['prefetch_with_processes']` is True) or
+        `multiprocessing.pool.ThreadPool`, with
+        `option_dict['num_prefetch_workers']` workers.
+    """
+
+    if option_dict[PREFETCH_WITH_PROCESSES_KEY]:
+        return multiprocessing.Pool(
+            processes=option_dict[NUM_PREFETCH_WORKERS_KEY])
+
+    return ThreadPool(processes=option_dict[NUM_PREFETCH_WORKERS_KEY])
+
+
+def _prefetch_example_files(
+        option_dict, radar_field_names, radar_heights_m_agl,
+        class_to_batch_size_dict, list_of_operation_dicts=None):
+    """Reads example files in the background.
+
+    Files are read by a pool of worker threads (or processes), in the same order
+    as the generators would read them, while the caller works on the current
+    batch.  At most `option_dict['prefetch_queue_size']` files are read ahead.
+
+    Since files are read ahead, the number of examples still needed from each
+    class is unknown.  Thus, each file is read with the number needed for a
+    full batch, and the caller should filter the result (see
+    `_get_next_example_dict`).
+
+    :param option_dict: See doc for any generator in this file.
+    :param radar_field_names: See doc for `_read_example_file`.
+    :param radar_heights_m_agl: Same.
+    :param class_to_batch_size_dict: Dictionary created by
+        `_get_batch_size_by_class`.
+    :param list_of_operation_dicts: See doc for `_read_example_file`.
+    :return: example_dict: See doc for `_read_example_file`.
+    """
+
+    example_file_names = option_dict[EXAMPLE_FILES_KEY]
+    num_files = len(example_file_names)
+    loop_thru_files_once = option_dict[LOOP_ONCE_KEY]
+    queue_size = option_dict[PREFETCH_QUEUE_SIZE_KEY]
+
+    pool_object = _create_prefetch_pool(option_dict)
+    pending_results = collections.deque()
+    num_files_submitted = 0
+
+    try:
+        while True:
+            while len(pending_results) < queue_size:
+                if loop_thru_files_once and num_files_submitted >= num_files:
+                    break
+
+                this_file_name = example_file_names[
+                    num_files_submitted % num_files]
+                pending_results.append(pool_object.apply_async(
+                    _read_example_file,
+                    args=(this_file_name, option_dict, radar_field_names,
+                          radar_heights_m_agl, class_to_batch_size_dict,
+                          list_of_operation_dicts)
+                ))
+
+                num_files_submitted += 1
+
+            if len(pending_results) == 0:
+                break
+
+            yield pending_results.popleft().get()
+    finally:
+        pool_object.terminate()
+
+
+def _read_shard_group(argument_tuple):
+    """Reads examples for one batch from a group of shards.
+
+    This method takes one argument (a tuple, as required by
+    `general_utils.imap_bounded`), so that it can be run by prefetch workers.
+
+    :param argument_tuple: Tuple with the following elements.
+    argument_tuple[0]: shard_file_names: 1-D list of paths to shards in the
+        group.
+    argument_tuple[1]: indices_to_read_by_shard: 1-D list, where the [k]th
+        element is a numpy array with indices of examples to read from the [k]th
+        shard.
+    argument_tuple[2]: option_dict: See doc for any generator in this file.
+    argument_tuple[3]: radar_field_names: See doc for `_read_example_file`.
+    argument_tuple[4]: radar_heights_m_agl: Same.
+    argument_tuple[5]: list_of_operation_dicts: Same.
+    :return: example_dict: See doc for `_read_example_file`.  If none of the
+        shards contain relevant examples, this is None.
+    """
+
+    (shard_file_names, indices_to_read_by_shard, option_dict, radar_field_names,
+     radar_heights_m_agl, list_of_operation_dicts
+    ) = argument_tuple
+
+    list_of_example_dicts = []
+
+    for k in range(len(shard_file_names)):
+        this_example_dict = _read_example_file(
+            example_file_name=shard_file_names[k], option_dict=option_dict,
+            radar_field_names=radar_field_names,
+            radar_heights_m_agl=radar_heights_m_agl,
+            class_to_num_examples_dict=None,
+            list_of_operation_dicts=list_of_operation_dicts,
+            indices_to_read=indices_to_read_by_shard[k])
+
+        if this_example_dict is not None:
+            list_of_example_dicts.append(this_example_dict)
+
+    if len(list_of_example_dicts) == 0:
+        return None
+
+    return input_examples.concat_examples(list_of_example_dicts)
+
+
+def _sample_shard_groups(
+        option_dict, radar_field_names, radar_heights_m_agl,
+        class_to_batch_size_dict, list_of_operation_dicts=None):
+    """Decides which examples to read from example shards.
+
+    On each pass through the shards, shards are randomly split into groups of
+    `option_dict['num_shards_per_batch']`.  For each group, the examples needed
+    for one batch are drawn from the manifest.  Sampling is done in the calling
+    process, so the sequence of batches depends only on the random seed.
+
+    :param option_dict: See doc for any generator in this file.
+    :param radar_field_names: See doc for `_read_example_file`.
+    :param radar_heights_m_agl: Same.
+    :param class_to_batch_size_dict: Dictionary created by
+        `_get_batch_size_by_class`.
+    :param list_of_operation_dicts: See doc for `_read_example_file`.
+    :return: argument_tuple: Argument for `_read_shard_group`.
+    """
 
-            list_of_predictor_matrices[j] = numpy.concatenate(
-                (list_of_predictor_matrices[j], this_image_matrix), axis=0)
+    manifest_dict = example_shards.read_manifest(
+        option_dict[SHARD_MANIFEST_FILE_KEY])
+    shard_file_names = option_dict[EXAMPLE_FILES_KEY]
+    num_shards = len(shard_file_names)
+    num_shards_per_batch = min([
+        option_dict[NUM_SHARDS_PER_BATCH_KEY], num_shards
+    ])
 
-        target_array = numpy.concatenate(
-            (target_array, target_array[:orig_num_examples, ...]), axis=0)
+    while True:
+        shard_indices_in_order = numpy.random.permutation(num_shards)
+
+        for i in range(0, num_shards, num_shards_per_batch):
+            these_shard_indices, these_row_indices = (
+                example_shards.sample_examples(
+                    manifest_dict=manifest_dict,
+                    class_to_num_examples_dict=class_to_batch_size_dict,
+                    shard_indices_to_use=shard_indices_in_order[
+                        i:(i + num_shards_per_batch)],
+                    first_time_unix_sec=option_dict[FIRST_STORM_TIME_KEY],
+                    last_time_unix_sec=option_dict[LAST_STORM_TIME_KEY])
+            )
 
-        if soundings_included:
-            list_of_predictor_matrices[-1] = numpy.concatenate(
-                (list_of_predictor_matrices[-1],
-                 list_of_predictor_matrices[-1][:orig_num_examples, ...]),
-                axis=0)
+            these_unique_shard_indices = numpy.unique(these_shard_indices)
 
-    if flip_in_y:
-        for j in range(num_radar_matrices):
-            this_image_matrix = data_augmentation.flip_radar_images_y(
-                list_of_predictor_matrices[j][:orig_num_examples, ...]
+            yield (
+                [shard_file_names[j] for j in these_unique_shard_indices],
+                [these_row_indices[these_shard_indices == j]
+                 for j in these_unique_shard_indices],
+                option_dict, radar_field_names, radar_heights_m_agl,
+                list_of_operation_dicts
             )
 
-            list_of_predictor_matrices[j] = numpy.concatenate(
-                (list_of_predictor_matrices[j], this_image_matrix), axis=0)
+        if option_dict[LOOP_ONCE_KEY]:
+            break
 
-        target_array = numpy.concatenate(
-            (target_array, target_array[:orig_num_examples, ...]), axis=0)
 
-        if soundings_included:
-            list_of_predictor_matrices[-1] = numpy.concatenate(
-                (list_of_predictor_matrices[-1],
-                 list_of_predictor_matrices[-1][:orig_num_examples, ...]),
-                axis=0)
+def _read_example_shards(
+        option_dict, radar_field_names, radar_heights_m_agl,
+        class_to_batch_size_dict, list_of_operation_dicts=None):
+    """Reads class-balanced batches from example shards.
+
+    Examples are chosen by `_sample_shard_groups` and read by
+    `_read_shard_group`.  If `option_dict['num_prefetch_workers'] > 0`, groups
+    are read in the background (as in `_prefetch_example_files`), with at most
+    `option_dict['prefetch_queue_size']` groups read ahead.
+
+    :param option_dict: See doc for any generator in this file.
+    :param radar_field_names: See doc for `_read_example_file`.
+    :param radar_heights_m_agl: Same.
+    :param class_to_batch_size_dict: Dictionary created by
+        `_get_batch_size_by_class`.
+    :param list_of_operation_dicts: See doc for `_read_example_file`.
+    :return: example_dict: See doc for `_read_shard_group`.
+    """
+
+    argument_iterator = _sample_shard_groups(
+        option_dict=option_dict, radar_field_names=radar_field_names,
+        radar_heights_m_agl=radar_heights_m_agl,
+        class_to_batch_size_dict=class_to_batch_size_dict,
+        list_of_operation_dicts=list_of_operation_dicts)
+
+    if option_dict[NUM_PREFETCH_WORKERS_KEY] > 0:
+        pool_object = _create_prefetch_pool(option_dict)
+        result_iterator = general_utils.imap_bounded(
+            pool_object=pool_object, worker_function=_read_shard_group,
+            argument_iterable=argument_iterator,
+            max_num_pending=option_dict[PREFETCH_QUEUE_SIZE_KEY])
+    else:
+        pool_object = None
+        result_iterator = (_read_shard_group(t) for t in argument_iterator)
+
+    try:
+        for this_example_dict in result_iterator:
+            yield this_example_dict
+    finally:
+        if pool_object is not None:
+            pool_object.terminate()
+
+
+def _create_example_source(
+        option_dict, radar_field_names, radar_heights_m_agl,
+        class_to_batch_size_dict, list_of_operation_dicts=None):
+    """Creates source of examples for a generator.
+
+    If `option_dict['shard_manifest_file_name']` is specified, examples are
+    read from shards by `_read_example_shards` (in the background if
+    `option_dict['num_prefetch_workers'] > 0`).  Otherwise, if
+    `option_dict['num_prefetch_workers'] > 0`, examples are read from files by
+    `_prefetch_example_files`.  Otherwise, files are read synchronously by the
+    generator.
+
+    :param option_dict: See doc for any generator in this file.
+    :param radar_field_names: See doc for `_read_example_file`.
+    :param radar_heights_m_agl: Same.
+    :param class_to_batch_size_dict: Dictionary created by
+        `_get_batch_size_by_class`.
+    :param list_of_operation_dicts: See doc for `_read_example_file`.
+    :return: prefetch_generator: Generator created by `_read_example_shards`
+        or `_prefetch_example_files`.  If files are to be read synchronously,
+        this is None.
+    :return: num_sources: Number of example dictionaries (files or groups of
+        shards) read on each pass through the data.
+    """
+
+    num_files = len(option_dict[EXAMPLE_FILES_KEY])
+
+    if option_dict[SHARD_MANIFEST_FILE_KEY] is not None:
+        prefetch_generator = _read_example_shards(
+            option_dict=option_dict, radar_field_names=radar_field_names,
+            radar_heights_m_agl=radar_heights_m_agl,
+            class_to_batch_size_dict=class_to_batch_size_dict,
+            list_of_operation_dicts=list_of_operation_dicts)
+
+        num_sources = int(numpy.ceil(
+            float(num_files) / option_dict[NUM_SHARDS_PER_BATCH_KEY]
+        ))
+
+        return prefetch_generator, num_sources
+
+    if option_dict[NUM_PREFETCH_WORKERS_KEY] > 0:
+        prefetch_generator = _prefetch_example_files(
+            option_dict=option_dict, radar_field_names=radar_field_names,
+            radar_heights_m_agl=radar_heights_m_agl,
+            class_to_batch_size_dict=class_to_batch_size_dict,
+            list_of_operation_dicts=list_of_operation_dicts)
+    else:
+        prefetch_generator = None
+
+    return prefetch_generator, num_files
 
-    return list_of_predictor_matrices, target_array
+
+def _get_next_example_dict(
+        example_file_name, option_dict, radar_field_names, radar_heights_m_agl,
+        class_to_rem_batch_size_dict, prefetch_generator=None,
+        list_of_operation_dicts=None):
+    """Returns examples from the next file for a generator.
+
+    :param example_file_name: Path to next file.
+    :param option_dict: See doc for any generator in this file.
+    :param radar_field_names: See doc for `_read_example_file`.
+    :param radar_heights_m_agl: Same.
+    :param class_to_rem_batch_size_dict: Dictionary created by
+        `_get_remaining_batch_size_by_class`.
+    :param prefetch_generator: Generator created by `_create_example_source`.
+        If None, the file will be read synchronously.
+    :param list_of_operation_dicts: See doc for `_read_example_file`.
+    :return: example_dict: Same.
+    """
+
+    if prefetch_generator is None:
+        return _read_example_file(
+            example_file_name=example_file_name, option_dict=option_dict,
+            radar_field_names=radar_field_names,
+            radar_heights_m_agl=radar_heights_m_agl,
+            class_to_num_examples_dict=class_to_rem_batch_size_dict,
+            list_of_operation_dicts=list_of_operation_dicts)
+
+    example_dict = next(prefetch_generator)
+    if example_dict is None:
+        return None
+
+    indices_to_keep = input_examples.filter_examples_by_class(
+        target_values=example_dict[input_examples.TARGET_VALUES_KEY],
+        class_to_num_examples_dict=class_to_rem_batch_size_dict)
+    if len(indices_to_keep) == 0:
+        return None
+
+    return input_examples.subset_examples(
+        example_dict=example_dict, indices_to_keep=indices_to_keep)
+
+
+def _add_examples_to_buffers(
+        buffer_matrices, new_matrices, num_examples_in_buffer, buffer_size):
+    """Adds examples to preallocated buffers.
+
+    Each buffer is allocated the first time that this method sees the
+    corresponding matrix, with room for `buffer_size` examples.  This avoids
+    growing matrices with repeated calls to `numpy.concatenate`.
+
+    :param buffer_matrices: 1-D list of buffers.  Each item is either None (not
+        yet allocated) or a numpy array where the first axis has length >=
+        `buffer_size`.
+    :param new_matrices: 1-D list of new matrices, in the same order as
+        `buffer_matrices`.  Each item is either None (nothing to add) or a numpy
+        array where the first axis is the example dimension.
+    :param num_examples_in_buffer: Number of examples already in each buffer.
+    :param buffer_size: Number of examples that each buffer can hold.  If
+        necessary, buffers will be enlarged.
+    :return: buffer_matrices: Same as input but with new examples.
+    :return: num_examples_in_buffer: Same as input but updated.
+    """
+
+    num_new_examples = [m for m in new_matrices if m is not None][0].shape[0]
+    last_index = num_examples_in_buffer + num_new_examples
+
+    for i in range(len(buffer_matrices)):
+        if new_matrices[i] is None:
+            continue
+
+        if buffer_matrices[i] is None:
+            buffer_matrices[i] = numpy.full(
+                (max([buffer_size, last_index]),) + new_matrices[i].shape[1:],
+                0, dtype=new_matrices[i].dtype)
+
+        if last_index > buffer_matrices[i].shape[0]:
+            these_dimensions = (
+                (last_index - buffer_matrices[i].shape[0],) +
+                buffer_matrices[i].shape[1:]
+            )
+
+            buffer_matrices[i] = numpy.concatenate((
+                buffer_matrices[i],
+                numpy.full(these_dimensions, 0, dtype=buffer_matrices[i].dtype)
+            ), axis=0)
+
+        buffer_matrices[i][num_examples_in_buffer:last_index, ...] = (
+            new_matrices[i])
+
+    return buffer_matrices, last_index
 
 
 def check_generator_args(option_dict):
@@ -446,6 +802,20 @@ def check_generator_args(option_dict):
     option_dict = DEFAULT_OPTION_DICT.copy()
     option_dict.update(orig_option_dict)
 
+    if option_dict[SHARD_MANIFEST_FILE_KEY] is not None:
+        error_checking.assert_file_exists(option_dict[SHARD_MANIFEST_FILE_KEY])
+        error_checking.assert_is_integer(option_dict[NUM_SHARDS_PER_BATCH_KEY])
+        error_checking.assert_is_greater(
+            option_dict[NUM_SHARDS_PER_BATCH_KEY], 0)
+
+        option_dict[EXAMPLE_FILES_KEY] = (
+            example_shards.find_shard_files_for_manifest(
+                manifest_file_name=option_dict[SHARD_MANIFEST_FILE_KEY],
+                manifest_dict=example_shards.read_manifest(
+                    option_dict[SHARD_MANIFEST_FILE_KEY])
+            )
+        )
+
     error_checking.assert_is_string_list(option_dict[EXAMPLE_FILES_KEY])
     error_checking.assert_is_numpy_array(
         numpy.array(option_dict[EXAMPLE_FILES_KEY]), num_dimensions=1)
@@ -455,6 +825,16 @@ def check_generator_args(option_dict):
     error_checking.assert_is_boolean(option_dict[BINARIZE_TARGET_KEY])
     error_checking.assert_is_boolean(option_dict[LOOP_ONCE_KEY])
 
+    error_checking.assert_is_integer(option_dict[NUM_AUGMENTATION_THREADS_KEY])
+    error_checking.assert_is_greater(
+        option_dict[NUM_AUGMENTATION_THREADS_KEY], 0)
+
+    error_checking.assert_is_integer(option_dict[NUM_PREFETCH_WORKERS_KEY])
+    error_checking.assert_is_geq(option_dict[NUM_PREFETCH_WORKERS_KEY], 0)
+    error_checking.assert_is_integer(option_dict[PREFETCH_QUEUE_SIZE_KEY])
+    error_checking.assert_is_geq(option_dict[PREFETCH_QUEUE_SIZE_KEY], 1)
+    error_checking.assert_is_boolean(option_dict[PREFETCH_WITH_PROCESSES_KEY])
+
     return option_dict
 
 
@@ -520,6 +900,23 @@ def generator_2d_or_3d(option_dict):
     option_dict['num_noisings']: Same.
     option_dict['flip_in_x']: Same.
     option_dict['flip_in_y']: Same.
+    option_dict['num_augmentation_threads']: Number of threads used for
+        augmentation (see doc for `data_augmentation.augment_radar_images`).
+    option_dict['num_prefetch_workers']: Number of worker threads (or
+        processes) used to read example files (or shards) in the background,
+        while the current batch is being used.  If 0, files will be read
+        synchronously.
+    option_dict['prefetch_queue_size']: Max number of files (or groups of
+        shards) to read ahead (used only if `num_prefetch_workers > 0`).
+    option_dict['prefetch_with_processes']: Boolean flag.  If True, background
+        reading will be done by processes.  If False, by threads.
+    option_dict['shard_manifest_file_name']: Path to manifest for example
+        shards (readable by `example_shards.read_manifest`).  If specified,
+        examples will be read from shards (see `_read_example_shards`) and
+        `example_file_names` will be replaced with the list of shards.  If None,
+        examples will be read from `example_file_names`.
+    option_dict['num_shards_per_batch']: Number of shards from which each batch
+        is drawn (used only if `shard_manifest_file_name` is specified).
 
     If `sounding_field_names is None`...
 
@@ -547,14 +944,9 @@ def generator_2d_or_3d(option_dict):
     example_file_names = option_dict[EXAMPLE_FILES_KEY]
     num_examples_per_batch = option_dict[NUM_EXAMPLES_PER_BATCH_KEY]
 
-    first_storm_time_unix_sec = option_dict[FIRST_STORM_TIME_KEY]
-    last_storm_time_unix_sec = option_dict[LAST_STORM_TIME_KEY]
-    num_grid_rows = option_dict[NUM_ROWS_KEY]
-    num_grid_columns = option_dict[NUM_COLUMNS_KEY]
     radar_field_names = option_dict[RADAR_FIELDS_KEY]
     radar_heights_m_agl = option_dict[RADAR_HEIGHTS_KEY]
     sounding_field_names = option_dict[SOUNDING_FIELDS_KEY]
-    sounding_heights_m_agl = option_dict[SOUNDING_HEIGHTS_KEY]
 
     normalization_type_string = option_dict[NORMALIZATION_TYPE_KEY]
     normalization_param_file_name = option_dict[NORMALIZATION_FILE_KEY]
@@ -585,8 +977,14 @@ def generator_2d_or_3d(option_dict):
     num_classes = target_val_utils.target_name_to_num_classes(
         target_name=target_name, include_dead_storms=False)
 
-    radar_image_matrix = None
-    sounding_matrix = None
+    prefetch_generator, num_sources = _create_example_source(
+        option_dict=option_dict, radar_field_names=radar_field_names,
+        radar_heights_m_agl=radar_heights_m_agl,
+        class_to_batch_size_dict=class_to_batch_size_dict)
+
+    buffer_size = sum(class_to_batch_size_dict.values())
+    buffer_matrices = [None, None, None]
+    num_examples_in_memory = 0
     target_values = None
 
     file_index = 0
@@ -594,12 +992,12 @@ def generator_2d_or_3d(option_dict):
     num_radar_dimensions = -1
 
     while True:
-        if loop_thru_files_once and file_index >= len(example_file_names):
+        if loop_thru_files_once and file_index >= num_sources:
             raise StopIteration
 
         stop_generator = False
         while not stop_generator:
-            if file_index == len(example_file_names):
+            if file_index == num_sources:
                 if loop_thru_files_once:
                     if target_values is None:
                         raise StopIteration
@@ -611,20 +1009,12 @@ def generator_2d_or_3d(option_dict):
                 class_to_batch_size_dict=class_to_batch_size_dict,
                 target_values_in_memory=target_values)
 
-            print 'Reading data from: "{0:s}"...'.format(
-                example_file_names[file_index])
-            this_example_dict = input_examples.read_example_file(
-                netcdf_file_name=example_file_names[file_index],
-                include_soundings=sounding_field_names is not None,
-                radar_field_names_to_keep=radar_field_names,
-                radar_heights_to_keep_m_agl=radar_heights_m_agl,
-                sounding_field_names_to_keep=sounding_field_names,
-                sounding_heights_to_keep_m_agl=sounding_heights_m_agl,
-                first_time_to_keep_unix_sec=first_storm_time_unix_sec,
-                last_time_to_keep_unix_sec=last_storm_time_unix_sec,
-                num_rows_to_keep=num_grid_rows,
-                num_columns_to_keep=num_grid_columns,
-                class_to_num_examples_dict=class_to_rem_batch_size_dict)
+            this_example_dict = _get_next_example_dict(
+                example_file_name=example_file_names[file_index],
+                option_dict=option_dict, radar_field_names=radar_field_names,
+                radar_heights_m_agl=radar_heights_m_agl,
+                class_to_rem_batch_size_dict=class_to_rem_batch_size_dict,
+                prefetch_generator=prefetch_generator)
 
             file_index += 1
             if this_example_dict is None:
@@ -636,34 +1026,23 @@ def generator_2d_or_3d(option_dict):
                 this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY].shape
             ) - 2
 
-            if target_values is None:
-                radar_image_matrix = (
-                    this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY]
-                    + 0.
-                )
-                target_values = (
-                    this_example_dict[input_examples.TARGET_VALUES_KEY] + 0)
-
-                if include_soundings:
-                    sounding_matrix = (
-                        this_example_dict[input_examples.SOUNDING_MATRIX_KEY]
-                        + 0.
-                    )
+            if include_soundings:
+                this_sounding_matrix = this_example_dict[
+                    input_examples.SOUNDING_MATRIX_KEY]
             else:
-                radar_image_matrix = numpy.concatenate(
-                    (radar_image_matrix,
-                     this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY]),
-                    axis=0)
-                target_values = numpy.concatenate((
-                    target_values,
+                this_sounding_matrix = None
+
+            buffer_matrices, num_examples_in_memory = _add_examples_to_buffers(
+                buffer_matrices=buffer_matrices,
+                new_matrices=[
+                    this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY],
+                    this_sounding_matrix,
                     this_example_dict[input_examples.TARGET_VALUES_KEY]
-                ))
+                ],
+                num_examples_in_buffer=num_examples_in_memory,
+                buffer_size=buffer_size)
 
-                if include_soundings:
-                    sounding_matrix = numpy.concatenate(
-                        (sounding_matrix,
-                         this_example_dict[input_examples.SOUNDING_MATRIX_KEY]),
-                        axis=0)
+            target_values = buffer_matrices[-1][:num_examples_in_memory]
 
             stop_generator = _check_stopping_criterion(
                 num_examples_per_batch=num_examples_per_batch,
@@ -671,6 +1050,15 @@ def generator_2d_or_3d(option_dict):
                 class_to_sampling_fraction_dict=class_to_sampling_fraction_dict,
                 target_values_in_memory=target_values)
 
+        # The buffers will be reused, so targets (which may be returned without
+        # copying) must be copied.
+        radar_image_matrix = buffer_matrices[0][:num_examples_in_memory, ...]
+        target_values = buffer_matrices[-1][:num_examples_in_memory] + 0
+        if include_soundings:
+            sounding_matrix = buffer_matrices[1][:num_examples_in_memory, ...]
+        else:
+            sounding_matrix = None
+
         if class_to_sampling_fraction_dict is not None:
             indices_to_keep = dl_utils.sample_by_class(
                 sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
@@ -695,7 +1083,8 @@ def generator_2d_or_3d(option_dict):
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             if include_soundings:
                 sounding_matrix = dl_utils.normalize_soundings(
@@ -704,7 +1093,8 @@ def generator_2d_or_3d(option_dict):
                     normalization_type_string=normalization_type_string,
                     normalization_param_file_name=normalization_param_file_name,
                     min_normalized_value=min_normalized_value,
-                    max_normalized_value=max_normalized_value).astype('float32')
+                    max_normalized_value=max_normalized_value
+                ).astype('float32', copy=False)
 
         list_of_predictor_matrices, target_array = _select_batch(
             list_of_predictor_matrices=[radar_image_matrix, sounding_matrix],
@@ -719,10 +1109,10 @@ def generator_2d_or_3d(option_dict):
             y_translations_pixels=y_translations_pixels,
             ccw_rotation_angles_deg=ccw_rotation_angles_deg,
             noise_standard_deviation=noise_standard_deviation,
-            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y)
+            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y,
+            num_threads=option_dict[NUM_AUGMENTATION_THREADS_KEY])
 
-        radar_image_matrix = None
-        sounding_matrix = None
+        num_examples_in_memory = 0
         target_values = None
 
         if include_soundings:
@@ -774,6 +1164,12 @@ def myrorss_generator_2d3d(option_dict):
     option_dict['num_noisings']: Same.
     option_dict['flip_in_x']: Same.
     option_dict['flip_in_y']: Same.
+    option_dict['num_augmentation_threads']: Same.
+    option_dict['num_prefetch_workers']: Same.
+    option_dict['prefetch_queue_size']: Same.
+    option_dict['prefetch_with_processes']: Same.
+    option_dict['shard_manifest_file_name']: Same.
+    option_dict['num_shards_per_batch']: Same.
 
     :return: predictor_list: List with the following items.
     predictor_list[0] = reflectivity_image_matrix_dbz: numpy array
@@ -795,11 +1191,6 @@ def myrorss_generator_2d3d(option_dict):
     azimuthal_shear_field_names = option_dict[RADAR_FIELDS_KEY]
     reflectivity_heights_m_agl = option_dict[RADAR_HEIGHTS_KEY]
     sounding_field_names = option_dict[SOUNDING_FIELDS_KEY]
-    sounding_heights_m_agl = option_dict[SOUNDING_HEIGHTS_KEY]
-    first_storm_time_unix_sec = option_dict[FIRST_STORM_TIME_KEY]
-    last_storm_time_unix_sec = option_dict[LAST_STORM_TIME_KEY]
-    num_grid_rows = option_dict[NUM_ROWS_KEY]
-    num_grid_columns = option_dict[NUM_COLUMNS_KEY]
 
     normalization_type_string = option_dict[NORMALIZATION_TYPE_KEY]
     normalization_param_file_name = option_dict[NORMALIZATION_FILE_KEY]
@@ -829,21 +1220,27 @@ def myrorss_generator_2d3d(option_dict):
     num_classes = target_val_utils.target_name_to_num_classes(
         target_name=target_name, include_dead_storms=False)
 
-    reflectivity_image_matrix_dbz = None
-    az_shear_image_matrix_s01 = None
-    sounding_matrix = None
+    prefetch_generator, num_sources = _create_example_source(
+        option_dict=option_dict,
+        radar_field_names=azimuthal_shear_field_names,
+        radar_heights_m_agl=reflectivity_heights_m_agl,
+        class_to_batch_size_dict=class_to_batch_size_dict)
+
+    buffer_size = sum(class_to_batch_size_dict.values())
+    buffer_matrices = [None, None, None, None]
+    num_examples_in_memory = 0
     target_values = None
 
     file_index = 0
     include_soundings = False
 
     while True:
-        if loop_thru_files_once and file_index >= len(example_file_names):
+        if loop_thru_files_once and file_index >= num_sources:
             raise StopIteration
 
         stop_generator = False
         while not stop_generator:
-            if file_index == len(example_file_names):
+            if file_index == num_sources:
                 if loop_thru_files_once:
                     if target_values is None:
                         raise StopIteration
@@ -855,20 +1252,13 @@ def myrorss_generator_2d3d(option_dict):
                 class_to_batch_size_dict=class_to_batch_size_dict,
                 target_values_in_memory=target_values)
 
-            print 'Reading data from: "{0:s}"...'.format(
-                example_file_names[file_index])
-            this_example_dict = input_examples.read_example_file(
-                netcdf_file_name=example_file_names[file_index],
-                include_soundings=sounding_field_names is not None,
-                radar_field_names_to_keep=azimuthal_shear_field_names,
-                radar_heights_to_keep_m_agl=reflectivity_heights_m_agl,
-                sounding_field_names_to_keep=sounding_field_names,
-                sounding_heights_to_keep_m_agl=sounding_heights_m_agl,
-                first_time_to_keep_unix_sec=first_storm_time_unix_sec,
-                last_time_to_keep_unix_sec=last_storm_time_unix_sec,
-                num_rows_to_keep=num_grid_rows,
-                num_columns_to_keep=num_grid_columns,
-                class_to_num_examples_dict=class_to_rem_batch_size_dict)
+            this_example_dict = _get_next_example_dict(
+                example_file_name=example_file_names[file_index],
+                option_dict=option_dict,
+                radar_field_names=azimuthal_shear_field_names,
+                radar_heights_m_agl=reflectivity_heights_m_agl,
+                class_to_rem_batch_size_dict=class_to_rem_batch_size_dict,
+                prefetch_generator=prefetch_generator)
 
             file_index += 1
             if this_example_dict is None:
@@ -877,41 +1267,24 @@ def myrorss_generator_2d3d(option_dict):
             include_soundings = (
                 input_examples.SOUNDING_MATRIX_KEY in this_example_dict)
 
-            if target_values is None:
-                reflectivity_image_matrix_dbz = (
-                    this_example_dict[input_examples.REFL_IMAGE_MATRIX_KEY] + 0.
-                )
-                az_shear_image_matrix_s01 = (
-                    this_example_dict[input_examples.AZ_SHEAR_IMAGE_MATRIX_KEY]
-                    + 0.
-                )
-                target_values = (
-                    this_example_dict[input_examples.TARGET_VALUES_KEY] + 0)
-
-                if include_soundings:
-                    sounding_matrix = (
-                        this_example_dict[input_examples.SOUNDING_MATRIX_KEY]
-                        + 0.
-                    )
+            if include_soundings:
+                this_sounding_matrix = this_example_dict[
+                    input_examples.SOUNDING_MATRIX_KEY]
             else:
-                reflectivity_image_matrix_dbz = numpy.concatenate(
-                    (reflectivity_image_matrix_dbz,
-                     this_example_dict[input_examples.REFL_IMAGE_MATRIX_KEY]),
-                    axis=0)
-                az_shear_image_matrix_s01 = numpy.concatenate((
-                    az_shear_image_matrix_s01,
-                    this_example_dict[input_examples.AZ_SHEAR_IMAGE_MATRIX_KEY]
-                ), axis=0)
-                target_values = numpy.concatenate((
-                    target_values,
+                this_sounding_matrix = None
+
+            buffer_matrices, num_examples_in_memory = _add_examples_to_buffers(
+                buffer_matrices=buffer_matrices,
+                new_matrices=[
+                    this_example_dict[input_examples.REFL_IMAGE_MATRIX_KEY],
+                    this_example_dict[input_examples.AZ_SHEAR_IMAGE_MATRIX_KEY],
+                    this_sounding_matrix,
                     this_example_dict[input_examples.TARGET_VALUES_KEY]
-                ))
+                ],
+                num_examples_in_buffer=num_examples_in_memory,
+                buffer_size=buffer_size)
 
-                if include_soundings:
-                    sounding_matrix = numpy.concatenate(
-                        (sounding_matrix,
-                         this_example_dict[input_examples.SOUNDING_MATRIX_KEY]),
-                        axis=0)
+            target_values = buffer_matrices[-1][:num_examples_in_memory]
 
             stop_generator = _check_stopping_criterion(
                 num_examples_per_batch=num_examples_per_batch,
@@ -919,6 +1292,18 @@ def myrorss_generator_2d3d(option_dict):
                 class_to_sampling_fraction_dict=class_to_sampling_fraction_dict,
                 target_values_in_memory=target_values)
 
+        # The buffers will be reused, so targets (which may be returned without
+        # copying) must be copied.
+        reflectivity_image_matrix_dbz = buffer_matrices[0][
+            :num_examples_in_memory, ...]
+        az_shear_image_matrix_s01 = buffer_matrices[1][
+            :num_examples_in_memory, ...]
+        target_values = buffer_matrices[-1][:num_examples_in_memory] + 0
+        if include_soundings:
+            sounding_matrix = buffer_matrices[2][:num_examples_in_memory, ...]
+        else:
+            sounding_matrix = None
+
         if class_to_sampling_fraction_dict is not None:
             indices_to_keep = dl_utils.sample_by_class(
                 sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
@@ -940,7 +1325,8 @@ def myrorss_generator_2d3d(option_dict):
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             az_shear_image_matrix_s01 = dl_utils.normalize_radar_images(
                 radar_image_matrix=az_shear_image_matrix_s01,
@@ -948,7 +1334,8 @@ def myrorss_generator_2d3d(option_dict):
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             if include_soundings:
                 sounding_matrix = dl_utils.normalize_soundings(
@@ -957,7 +1344,8 @@ def myrorss_generator_2d3d(option_dict):
                     normalization_type_string=normalization_type_string,
                     normalization_param_file_name=normalization_param_file_name,
                     min_normalized_value=min_normalized_value,
-                    max_normalized_value=max_normalized_value).astype('float32')
+                    max_normalized_value=max_normalized_value
+                ).astype('float32', copy=False)
 
         list_of_predictor_matrices, target_array = _select_batch(
             list_of_predictor_matrices=[
@@ -975,11 +1363,10 @@ def myrorss_generator_2d3d(option_dict):
             y_translations_pixels=y_translations_pixels,
             ccw_rotation_angles_deg=ccw_rotation_angles_deg,
             noise_standard_deviation=noise_standard_deviation,
-            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y)
+            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y,
+            num_threads=option_dict[NUM_AUGMENTATION_THREADS_KEY])
 
-        reflectivity_image_matrix_dbz = None
-        az_shear_image_matrix_s01 = None
-        sounding_matrix = None
+        num_examples_in_memory = 0
         target_values = None
 
         if include_soundings:
@@ -1062,6 +1449,12 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
     option_dict['num_noisings']: Same.
     option_dict['flip_in_x']: Same.
     option_dict['flip_in_y']: Same.
+    option_dict['num_augmentation_threads']: Same.
+    option_dict['num_prefetch_workers']: Same.
+    option_dict['prefetch_queue_size']: Same.
+    option_dict['prefetch_with_processes']: Same.
+    option_dict['shard_manifest_file_name']: Same.
+    option_dict['num_shards_per_batch']: Same.
 
     :param list_of_operation_dicts: See doc for
         `input_examples.reduce_examples_3d_to_2d`.
@@ -1083,11 +1476,6 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
     num_examples_per_batch = option_dict[NUM_EXAMPLES_PER_BATCH_KEY]
 
     sounding_field_names = option_dict[SOUNDING_FIELDS_KEY]
-    sounding_heights_m_agl = option_dict[SOUNDING_HEIGHTS_KEY]
-    first_storm_time_unix_sec = option_dict[FIRST_STORM_TIME_KEY]
-    last_storm_time_unix_sec = option_dict[LAST_STORM_TIME_KEY]
-    num_grid_rows = option_dict[NUM_ROWS_KEY]
-    num_grid_columns = option_dict[NUM_COLUMNS_KEY]
 
     normalization_type_string = option_dict[NORMALIZATION_TYPE_KEY]
     normalization_param_file_name = option_dict[NORMALIZATION_FILE_KEY]
@@ -1121,8 +1509,16 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
         layer_ops_to_field_height_pairs(list_of_operation_dicts)
     )
 
-    radar_image_matrix = None
-    sounding_matrix = None
+    prefetch_generator, num_sources = _create_example_source(
+        option_dict=option_dict,
+        radar_field_names=unique_radar_field_names,
+        radar_heights_m_agl=unique_radar_heights_m_agl,
+        class_to_batch_size_dict=class_to_batch_size_dict,
+        list_of_operation_dicts=list_of_operation_dicts)
+
+    buffer_size = sum(class_to_batch_size_dict.values())
+    buffer_matrices = [None, None, None]
+    num_examples_in_memory = 0
     target_values = None
 
     file_index = 0
@@ -1130,12 +1526,12 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
     radar_field_names_2d = []
 
     while True:
-        if loop_thru_files_once and file_index >= len(example_file_names):
+        if loop_thru_files_once and file_index >= num_sources:
             raise StopIteration
 
         stop_generator = False
         while not stop_generator:
-            if file_index == len(example_file_names):
+            if file_index == num_sources:
                 if loop_thru_files_once:
                     if target_values is None:
                         raise StopIteration
@@ -1147,62 +1543,41 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
                 class_to_batch_size_dict=class_to_batch_size_dict,
                 target_values_in_memory=target_values)
 
-            print 'Reading data from: "{0:s}"...'.format(
-                example_file_names[file_index])
-            this_example_dict = input_examples.read_example_file(
-                netcdf_file_name=example_file_names[file_index],
-                include_soundings=sounding_field_names is not None,
-                radar_field_names_to_keep=unique_radar_field_names,
-                radar_heights_to_keep_m_agl=unique_radar_heights_m_agl,
-                sounding_field_names_to_keep=sounding_field_names,
-                sounding_heights_to_keep_m_agl=sounding_heights_m_agl,
-                first_time_to_keep_unix_sec=first_storm_time_unix_sec,
-                last_time_to_keep_unix_sec=last_storm_time_unix_sec,
-                num_rows_to_keep=num_grid_rows,
-                num_columns_to_keep=num_grid_columns,
-                class_to_num_examples_dict=class_to_rem_batch_size_dict)
+            this_example_dict = _get_next_example_dict(
+                example_file_name=example_file_names[file_index],
+                option_dict=option_dict,
+                radar_field_names=unique_radar_field_names,
+                radar_heights_m_agl=unique_radar_heights_m_agl,
+                class_to_rem_batch_size_dict=class_to_rem_batch_size_dict,
+                prefetch_generator=prefetch_generator,
+                list_of_operation_dicts=list_of_operation_dicts)
 
             file_index += 1
             if this_example_dict is None:
                 continue
 
-            this_example_dict = input_examples.reduce_examples_3d_to_2d(
-                example_dict=this_example_dict,
-                list_of_operation_dicts=list_of_operation_dicts)
             radar_field_names_2d = this_example_dict[
                 input_examples.RADAR_FIELDS_KEY]
-
             include_soundings = (
                 input_examples.SOUNDING_MATRIX_KEY in this_example_dict)
 
-            if target_values is None:
-                radar_image_matrix = (
-                    this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY]
-                    + 0.
-                )
-                target_values = (
-                    this_example_dict[input_examples.TARGET_VALUES_KEY] + 0)
-
-                if include_soundings:
-                    sounding_matrix = (
-                        this_example_dict[input_examples.SOUNDING_MATRIX_KEY]
-                        + 0.
-                    )
+            if include_soundings:
+                this_sounding_matrix = this_example_dict[
+                    input_examples.SOUNDING_MATRIX_KEY]
             else:
-                radar_image_matrix = numpy.concatenate(
-                    (radar_image_matrix,
-                     this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY]),
-                    axis=0)
-                target_values = numpy.concatenate((
-                    target_values,
+                this_sounding_matrix = None
+
+            buffer_matrices, num_examples_in_memory = _add_examples_to_buffers(
+                buffer_matrices=buffer_matrices,
+                new_matrices=[
+                    this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY],
+                    this_sounding_matrix,
                     this_example_dict[input_examples.TARGET_VALUES_KEY]
-                ))
+                ],
+                num_examples_in_buffer=num_examples_in_memory,
+                buffer_size=buffer_size)
 
-                if include_soundings:
-                    sounding_matrix = numpy.concatenate(
-                        (sounding_matrix,
-                         this_example_dict[input_examples.SOUNDING_MATRIX_KEY]),
-                        axis=0)
+            target_values = buffer_matrices[-1][:num_examples_in_memory]
 
             stop_generator = _check_stopping_criterion(
                 num_examples_per_batch=num_examples_per_batch,
@@ -1210,6 +1585,15 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
                 class_to_sampling_fraction_dict=class_to_sampling_fraction_dict,
                 target_values_in_memory=target_values)
 
+        # The buffers will be reused, so targets (which may be returned without
+        # copying) must be copied.
+        radar_image_matrix = buffer_matrices[0][:num_examples_in_memory, ...]
+        target_values = buffer_matrices[-1][:num_examples_in_memory] + 0
+        if include_soundings:
+            sounding_matrix = buffer_matrices[1][:num_examples_in_memory, ...]
+        else:
+            sounding_matrix = None
+
         if class_to_sampling_fraction_dict is not None:
             indices_to_keep = dl_utils.sample_by_class(
                 sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
@@ -1228,7 +1612,8 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
                 normalization_type_string=normalization_type_string,
                 normalization_param_file_name=normalization_param_file_name,
                 min_normalized_value=min_normalized_value,
-                max_normalized_value=max_normalized_value).astype('float32')
+                max_normalized_value=max_normalized_value
+            ).astype('float32', copy=False)
 
             if include_soundings:
                 sounding_matrix = dl_utils.normalize_soundings(
@@ -1237,7 +1622,8 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
                     normalization_type_string=normalization_type_string,
                     normalization_param_file_name=normalization_param_file_name,
                     min_normalized_value=min_normalized_value,
-                    max_normalized_value=max_normalized_value).astype('float32')
+                    max_normalized_value=max_normalized_value
+                ).astype('float32', copy=False)
 
         list_of_predictor_matrices, target_array = _select_batch(
             list_of_predictor_matrices=[radar_image_matrix, sounding_matrix],
@@ -1252,10 +1638,10 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
             y_translations_pixels=y_translations_pixels,
             ccw_rotation_angles_deg=ccw_rotation_angles_deg,
             noise_standard_deviation=noise_standard_deviation,
-            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y)
+            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y,
+            num_threads=option_dict[NUM_AUGMENTATION_THREADS_KEY])
 
-        radar_image_matrix = None
-        sounding_matrix = None
+        num_examples_in_memory = 0
         target_values = None
 
         if include_soundings:
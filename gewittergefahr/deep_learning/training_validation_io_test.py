@@ -1,9 +1,13 @@
 """Unit tests for training_validation_io.py."""
 
+import copy
+import os.path
 import unittest
 import numpy
 from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import unit_test_utils
 from gewittergefahr.deep_learning import input_examples
+from gewittergefahr.deep_learning import example_shards
 from gewittergefahr.deep_learning import training_validation_io as trainval_io
 
 TOLERANCE = 1e-6
@@ -74,10 +78,219 @@ UNIQUE_RADAR_FIELD_NAMES = [
 UNIQUE_HEIGHTS_M_AGL = numpy.array(
     [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000], dtype=int)
 
+# The following constants are used to test _add_examples_to_buffers.
+BUFFER_SIZE = 5
+FIRST_RADAR_MATRIX = numpy.random.uniform(low=0., high=1., size=(3, 4, 4, 2))
+SECOND_RADAR_MATRIX = numpy.random.uniform(low=0., high=1., size=(4, 4, 4, 2))
+FIRST_TARGET_VALUES = numpy.array([0, 1, 0], dtype=int)
+SECOND_TARGET_VALUES = numpy.array([1, 1, 0, 0], dtype=int)
+
+RADAR_MATRIX_IN_BUFFER = numpy.concatenate(
+    (FIRST_RADAR_MATRIX, SECOND_RADAR_MATRIX), axis=0)
+TARGET_VALUES_IN_BUFFER = numpy.concatenate(
+    (FIRST_TARGET_VALUES, SECOND_TARGET_VALUES))
+
+# The following constants are used to test _prefetch_example_files.
+NUM_FILES_TO_PREFETCH = 4
+NUM_EXAMPLES_PER_FILE = 3
+PREFETCH_RADAR_FIELD_NAMES = [radar_utils.REFL_NAME]
+PREFETCH_RADAR_HEIGHTS_M_AGL = numpy.array([1000, 2000], dtype=int)
+
+PREFETCH_EXAMPLE_DICT = {
+    input_examples.STORM_TIMES_KEY:
+        numpy.full(NUM_EXAMPLES_PER_FILE, 0, dtype=int),
+    input_examples.RADAR_FIELDS_KEY: PREFETCH_RADAR_FIELD_NAMES,
+    input_examples.RADAR_HEIGHTS_KEY: PREFETCH_RADAR_HEIGHTS_M_AGL,
+    input_examples.ROTATED_GRIDS_KEY: False,
+    input_examples.ROTATED_GRID_SPACING_KEY: None,
+    input_examples.RADAR_IMAGE_MATRIX_KEY: numpy.full(
+        (NUM_EXAMPLES_PER_FILE, 3, 3, 2, 1), 0., dtype=numpy.float32),
+    input_examples.TARGET_NAME_KEY: TORNADO_TARGET_NAME,
+    input_examples.TARGET_VALUES_KEY: numpy.array([0, 1, 0], dtype=int)
+}
+
+PREFETCH_OPTION_DICT = {
+    trainval_io.SOUNDING_FIELDS_KEY: None,
+    trainval_io.SOUNDING_HEIGHTS_KEY: None,
+    trainval_io.FIRST_STORM_TIME_KEY: 0,
+    trainval_io.LAST_STORM_TIME_KEY: 0,
+    trainval_io.NUM_ROWS_KEY: None,
+    trainval_io.NUM_COLUMNS_KEY: None,
+    trainval_io.NUM_PREFETCH_WORKERS_KEY: 2,
+    trainval_io.PREFETCH_QUEUE_SIZE_KEY: 2
+}
+
+# The following constants are used to test _read_example_shards.
+NUM_EXAMPLES_PER_SHARD = 2
+NUM_SHARDS_PER_BATCH = 2
+SHARD_CLASS_TO_BATCH_SIZE_DICT = {0: 2, 1: 1}
+SHARD_RANDOM_SEED = 6695
+
+
+def _storm_ids_for_file(file_index):
+    """Returns storm IDs in one example file (used to test prefetching).
+
+    :param file_index: Index of file.
+    :return: storm_ids: 1-D list of storm IDs.
+    """
+
+    return ['file{0:d}_storm{1:d}'.format(file_index, i)
+            for i in range(NUM_EXAMPLES_PER_FILE)]
+
 
-class TrainingValidationIoTests(unittest.TestCase):
+class TrainingValidationIoTests(unit_test_utils.TestCaseWithTempDir):
     """Each method is a unit test for training_validation_io.py."""
 
+    def _write_files_to_prefetch(self):
+        """Writes example files to be read by _prefetch_example_files.
+
+        :return: example_file_names: 1-D list of paths to example files.  The
+            [k]th file contains storm IDs from `_storm_ids_for_file(k)`.
+        """
+
+        example_file_names = []
+
+        for k in range(NUM_FILES_TO_PREFETCH):
+            this_example_dict = copy.deepcopy(PREFETCH_EXAMPLE_DICT)
+            this_example_dict[input_examples.STORM_IDS_KEY] = (
+                _storm_ids_for_file(k)
+            )
+
+            this_file_name = os.path.join(
+                self.temp_dir_name, 'input_examples_{0:d}.nc'.format(k))
+            input_examples.write_example_file(
+                netcdf_file_name=this_file_name,
+                example_dict=this_example_dict)
+            example_file_names.append(this_file_name)
+
+        return example_file_names
+
+    def _check_prefetch_order(self, prefetch_with_processes,
+                              loop_thru_files_once):
+        """Ensures that _prefetch_example_files returns files in order.
+
+        :param prefetch_with_processes: Boolean flag.  If True, files will be
+            read by processes.  If False, by threads.
+        :param loop_thru_files_once: Boolean flag.  If False, the generator
+            should wrap around to the first file after the last.
+        """
+
+        this_option_dict = copy.deepcopy(PREFETCH_OPTION_DICT)
+        this_option_dict[trainval_io.EXAMPLE_FILES_KEY] = (
+            self._write_files_to_prefetch()
+        )
+        this_option_dict[trainval_io.PREFETCH_WITH_PROCESSES_KEY] = (
+            prefetch_with_processes
+        )
+        this_option_dict[trainval_io.LOOP_ONCE_KEY] = loop_thru_files_once
+
+        if loop_thru_files_once:
+            num_files_to_read = NUM_FILES_TO_PREFETCH
+        else:
+            num_files_to_read = 2 * NUM_FILES_TO_PREFETCH + 1
+
+        this_generator = trainval_io._prefetch_example_files(
+            option_dict=this_option_dict,
+            radar_field_names=PREFETCH_RADAR_FIELD_NAMES,
+            radar_heights_m_agl=PREFETCH_RADAR_HEIGHTS_M_AGL,
+            class_to_batch_size_dict=None)
+
+        these_storm_id_lists = []
+        for _ in range(num_files_to_read):
+            this_example_dict = next(this_generator)
+            these_storm_id_lists.append(
+                this_example_dict[input_examples.STORM_IDS_KEY])
+
+        if loop_thru_files_once:
+            with self.assertRaises(StopIteration):
+                next(this_generator)
+        else:
+            this_generator.close()
+
+        these_expected_lists = [
+            _storm_ids_for_file(k % NUM_FILES_TO_PREFETCH)
+            for k in range(num_files_to_read)
+        ]
+        self.assertTrue(these_storm_id_lists == these_expected_lists)
+
+    def _check_prefetch_error(self, prefetch_with_processes):
+        """Ensures that _prefetch_example_files re-raises error from worker.
+
+        :param prefetch_with_processes: See doc for `_check_prefetch_order`.
+        """
+
+        these_file_names = self._write_files_to_prefetch()
+        these_file_names.insert(
+            1, os.path.join(self.temp_dir_name, 'missing_file.nc'))
+
+        this_option_dict = copy.deepcopy(PREFETCH_OPTION_DICT)
+        this_option_dict[trainval_io.EXAMPLE_FILES_KEY] = these_file_names
+        this_option_dict[trainval_io.PREFETCH_WITH_PROCESSES_KEY] = (
+            prefetch_with_processes
+        )
+        this_option_dict[trainval_io.LOOP_ONCE_KEY] = True
+
+        this_generator = trainval_io._prefetch_example_files(
+            option_dict=this_option_dict,
+            radar_field_names=PREFETCH_RADAR_FIELD_NAMES,
+            radar_heights_m_agl=PREFETCH_RADAR_HEIGHTS_M_AGL,
+            class_to_batch_size_dict=None)
+
+        this_example_dict = next(this_generator)
+        self.assertTrue(
+            this_example_dict[input_examples.STORM_IDS_KEY] ==
+            _storm_ids_for_file(0))
+
+        with self.assertRaises(IOError):
+            next(this_generator)
+
+    def _read_shards(self, num_prefetch_workers, prefetch_with_processes):
+        """Reads all batches from example shards, with a fixed random seed.
+
+        :param num_prefetch_workers: Number of prefetch workers (0 for
+            synchronous reading).
+        :param prefetch_with_processes: See doc for `_check_prefetch_order`.
+        :return: storm_id_lists: 1-D list, where the [i]th element is a list of
+            storm IDs in the [i]th batch.
+        """
+
+        this_shard_dir_name = os.path.join(self.temp_dir_name, 'shards')
+
+        if not os.path.isdir(this_shard_dir_name):
+            example_shards.convert_examples_to_shards(
+                input_example_file_names=self._write_files_to_prefetch(),
+                top_output_dir_name=this_shard_dir_name,
+                num_examples_per_shard=NUM_EXAMPLES_PER_SHARD)
+
+        this_manifest_file_name = example_shards.find_manifest_file(
+            this_shard_dir_name)
+
+        this_option_dict = copy.deepcopy(PREFETCH_OPTION_DICT)
+        this_option_dict.update({
+            trainval_io.SHARD_MANIFEST_FILE_KEY: this_manifest_file_name,
+            trainval_io.EXAMPLE_FILES_KEY:
+                example_shards.find_shard_files_for_manifest(
+                    manifest_file_name=this_manifest_file_name,
+                    manifest_dict=example_shards.read_manifest(
+                        this_manifest_file_name)
+                ),
+            trainval_io.NUM_SHARDS_PER_BATCH_KEY: NUM_SHARDS_PER_BATCH,
+            trainval_io.NUM_PREFETCH_WORKERS_KEY: num_prefetch_workers,
+            trainval_io.PREFETCH_WITH_PROCESSES_KEY: prefetch_with_processes,
+            trainval_io.LOOP_ONCE_KEY: True
+        })
+
+        numpy.random.seed(SHARD_RANDOM_SEED)
+        this_generator = trainval_io._read_example_shards(
+            option_dict=this_option_dict,
+            radar_field_names=PREFETCH_RADAR_FIELD_NAMES,
+            radar_heights_m_agl=PREFETCH_RADAR_HEIGHTS_M_AGL,
+            class_to_batch_size_dict=SHARD_CLASS_TO_BATCH_SIZE_DICT)
+
+        return [
+            d[input_examples.STORM_IDS_KEY] for d in this_generator
+        ]
+
     def test_get_batch_size_by_class_tornado(self):
         """Ensures correct output from _get_batch_size_by_class.
 
@@ -302,6 +515,120 @@ class TrainingValidationIoTests(unittest.TestCase):
             these_heights_m_agl, UNIQUE_HEIGHTS_M_AGL
         ))
 
+    def test_add_examples_to_buffers(self):
+        """Ensures correct output from _add_examples_to_buffers.
+
+        In this case, the second set of examples overflows the buffers, so they
+        must be enlarged.
+        """
+
+        these_buffer_matrices, this_num_examples = (
+            trainval_io._add_examples_to_buffers(
+                buffer_matrices=[None, None, None],
+                new_matrices=[FIRST_RADAR_MATRIX, None, FIRST_TARGET_VALUES],
+                num_examples_in_buffer=0, buffer_size=BUFFER_SIZE)
+        )
+
+        self.assertTrue(this_num_examples == len(FIRST_TARGET_VALUES))
+        self.assertTrue(these_buffer_matrices[0].shape[0] == BUFFER_SIZE)
+        self.assertTrue(these_buffer_matrices[1] is None)
+
+        these_buffer_matrices, this_num_examples = (
+            trainval_io._add_examples_to_buffers(
+                buffer_matrices=these_buffer_matrices,
+                new_matrices=[SECOND_RADAR_MATRIX, None, SECOND_TARGET_VALUES],
+                num_examples_in_buffer=this_num_examples,
+                buffer_size=BUFFER_SIZE)
+        )
+
+        self.assertTrue(this_num_examples == len(TARGET_VALUES_IN_BUFFER))
+        self.assertTrue(numpy.allclose(
+            these_buffer_matrices[0][:this_num_examples, ...],
+            RADAR_MATRIX_IN_BUFFER, atol=TOLERANCE
+        ))
+        self.assertTrue(numpy.array_equal(
+            these_buffer_matrices[-1][:this_num_examples],
+            TARGET_VALUES_IN_BUFFER
+        ))
+
+    def test_prefetch_example_files_threads(self):
+        """Ensures correct output from _prefetch_example_files.
+
+        In this case, files are read once by threads.
+        """
+
+        self._check_prefetch_order(
+            prefetch_with_processes=False, loop_thru_files_once=True)
+
+    def test_prefetch_example_files_processes(self):
+        """Ensures correct output from _prefetch_example_files.
+
+        In this case, files are read once by processes.
+        """
+
+        self._check_prefetch_order(
+            prefetch_with_processes=True, loop_thru_files_once=True)
+
+    def test_prefetch_example_files_threads_loop(self):
+        """Ensures correct output from _prefetch_example_files.
+
+        In this case, files are read by threads and the generator loops through
+        files more than once.
+        """
+
+        self._check_prefetch_order(
+            prefetch_with_processes=False, loop_thru_files_once=False)
+
+    def test_prefetch_example_files_processes_loop(self):
+        """Ensures correct output from _prefetch_example_files.
+
+        In this case, files are read by processes and the generator loops
+        through files more than once.
+        """
+
+        self._check_prefetch_order(
+            prefetch_with_processes=True, loop_thru_files_once=False)
+
+    def test_prefetch_example_files_threads_error(self):
+        """Ensures that _prefetch_example_files re-raises error from thread."""
+
+        self._check_prefetch_error(prefetch_with_processes=False)
+
+    def test_prefetch_example_files_processes_error(self):
+        """Ensures that _prefetch_example_files re-raises error from process."""
+
+        self._check_prefetch_error(prefetch_with_processes=True)
+
+    def test_read_example_shards_threads(self):
+        """Ensures correct output from _read_example_shards.
+
+        In this case, shards read by threads should give the same batches as
+        shards read synchronously.
+        """
+
+        these_expected_lists = self._read_shards(
+            num_prefetch_workers=0, prefetch_with_processes=False)
+        these_storm_id_lists = self._read_shards(
+            num_prefetch_workers=2, prefetch_with_processes=False)
+
+        self.assertTrue(len(these_expected_lists) > 0)
+        self.assertTrue(these_storm_id_lists == these_expected_lists)
+
+    def test_read_example_shards_processes(self):
+        """Ensures correct output from _read_example_shards.
+
+        In this case, shards read by processes should give the same batches as
+        shards read synchronously.
+        """
+
+        these_expected_lists = self._read_shards(
+            num_prefetch_workers=0, prefetch_with_processes=False)
+        these_storm_id_lists = self._read_shards(
+            num_prefetch_workers=2, prefetch_with_processes=True)
+
+        self.assertTrue(len(these_expected_lists) > 0)
+        self.assertTrue(these_storm_id_lists == these_expected_lists)
+
 
 if __name__ == '__main__':
     unittest.main()
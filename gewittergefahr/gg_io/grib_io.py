@@ -6,6 +6,7 @@ instructions.
 """
 
 import os
+import re
 import subprocess
 import tempfile
 import warnings
@@ -93,44 +94,92 @@ def file_name_to_type(grib_file_name):
     raise ValueError(error_string)
 
 
-def read_field_from_grib_file(
-        grib_file_name, field_name_grib1, num_grid_rows, num_grid_columns,
+def _find_fields_in_inventory(inventory_lines, field_names):
+    """Finds fields in grib inventory.
+
+    Each field is matched the same way as `grep -w`, i.e., the field name must
+    not be preceded or followed by a word character.  If a field matches
+    several records, the first one is used.
+
+    F = number of fields
+
+    :param inventory_lines: 1-D list of lines in inventory (created by
+        `wgrib -s` or `wgrib2 -s`).
+    :param field_names: length-F list of field names (in the same format as
+        the inventory, i.e., grib1 for wgrib and grib2 for wgrib2).
+    :return: inventory_indices: length-F numpy array of indices into
+        `inventory_lines`.  If inventory_indices[j] = -1, the [j]th field was
+        not found.
+    """
+
+    num_fields = len(field_names)
+    inventory_indices = numpy.full(num_fields, -1, dtype=int)
+
+    for j in range(num_fields):
+        this_pattern_object = re.compile(
+            r'(?<!\w){0:s}(?!\w)'.format(re.escape(field_names[j])))
+
+        for i in range(len(inventory_lines)):
+            if this_pattern_object.search(inventory_lines[i]) is None:
+                continue
+
+            inventory_indices[j] = i
+            break
+
+    return inventory_indices
+
+
+def _extraction_failed(error_string, raise_error_if_fails):
+    """Handles failed extraction from grib file.
+
+    :param error_string: Error message.
+    :param raise_error_if_fails: Boolean flag.  If True, will raise error.  If
+        False, will only issue a warning.
+    :raises: ValueError: if `raise_error_if_fails = True`.
+    """
+
+    if raise_error_if_fails:
+        raise ValueError(error_string)
+    warnings.warn(error_string)
+
+
+def read_fields_from_grib_file(
+        grib_file_name, field_names_grib1, num_grid_rows, num_grid_columns,
         sentinel_value=None, temporary_dir_name=None,
         wgrib_exe_name=WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=WGRIB2_EXE_NAME_DEFAULT, raise_error_if_fails=True):
-    """Reads field from grib file.
+    """Reads many fields from grib file.
 
-    One field = one variable at one time step.
+    The file is inventoried once and all fields are extracted with a single call
+    to wgrib or wgrib2, in binary format (4-byte floats with no header).
 
     M = number of rows (unique y-coordinates or latitudes of grid points)
     N = number of columns (unique x-coordinates or longitudes of grid points)
 
     :param grib_file_name: Path to input file.
-    :param field_name_grib1: Field name in grib1 format (example: 500-mb height
-        is "HGT:500 mb").
-    :param num_grid_rows: Number of rows expected in grid.
-    :param num_grid_columns: Number of columns expected in grid.
-    :param sentinel_value: Sentinel value (all instances will be replaced with
-        NaN).
+    :param field_names_grib1: 1-D list of field names in grib1 format (example:
+        500-mb height is "HGT:500 mb").
+    :param num_grid_rows: See doc for `read_field_from_grib_file`.
+    :param num_grid_columns: Same.
+    :param sentinel_value: Same.
     :param temporary_dir_name: Name of temporary directory.  An intermediate
-        text file will be stored here.
-    :param wgrib_exe_name: Path to wgrib executable.
-    :param wgrib2_exe_name: Path to wgrib2 executable.
-    :param raise_error_if_fails: Boolean flag.  If the extraction fails and
-        raise_error_if_fails = True, this method will error out.  If the
-        extraction fails and raise_error_if_fails = False, this method will
-        return None.
-    :return: field_matrix: M-by-N numpy array with values of the given field.
-        If the grid is regular in x-y coordinates, x increases towards the right
-        (in the positive direction of the second axis), while y increases
-        downward (in the positive direction of the first axis).  If the grid is
-        regular in lat-long, replace "x" and "y" in the previous sentence with
-        "long" and "lat," respectively.
+        binary file will be stored here.
+    :param wgrib_exe_name: See doc for `read_field_from_grib_file`.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_fails: Boolean flag.  If any field cannot be extracted
+        and raise_error_if_fails = True, this method will error out.  If any
+        field cannot be extracted and raise_error_if_fails = False, the
+        corresponding value in `field_matrix_dict` will be None.
+    :return: field_matrix_dict: Dictionary, where each key is a field name from
+        `field_names_grib1` and each value is an M-by-N numpy array (see doc for
+        `read_field_from_grib_file`) or None.
     :raises: ValueError: if extraction fails and raise_error_if_fails = True.
     """
 
     # Error-checking.
-    error_checking.assert_is_string(field_name_grib1)
+    error_checking.assert_is_string_list(field_names_grib1)
+    error_checking.assert_is_numpy_array(
+        numpy.array(field_names_grib1), num_dimensions=1)
     error_checking.assert_is_integer(num_grid_rows)
     error_checking.assert_is_greater(num_grid_rows, 0)
     error_checking.assert_is_integer(num_grid_columns)
@@ -143,61 +192,178 @@ def read_field_from_grib_file(
 
     # Housekeeping.
     grib_file_type = file_name_to_type(grib_file_name)
+    field_matrix_dict = dict.fromkeys(field_names_grib1)
+
+    if grib_file_type == GRIB1_FILE_TYPE:
+        exe_name = wgrib_exe_name
+        field_names_in_file = field_names_grib1
+    else:
+        exe_name = wgrib2_exe_name
+        field_names_in_file = [
+            _field_name_grib1_to_grib2(f) for f in field_names_grib1
+        ]
+
+    # Find fields in inventory.
+    try:
+        inventory_lines = subprocess.check_output(
+            [exe_name, grib_file_name, '-s']
+        ).splitlines()
+    except (OSError, subprocess.CalledProcessError) as this_exception:
+        error_string = (
+            '\n\nInventory of file "{0:s}" failed (details shown below).'
+            '\n\n{1:s}'
+        ).format(grib_file_name, str(this_exception))
+
+        _extraction_failed(
+            error_string=error_string,
+            raise_error_if_fails=raise_error_if_fails)
+        return field_matrix_dict
+
+    inventory_indices = _find_fields_in_inventory(
+        inventory_lines=inventory_lines, field_names=field_names_in_file)
 
+    missing_field_names = [
+        field_names_grib1[j] for j in numpy.where(inventory_indices < 0)[0]
+    ]
+    if len(missing_field_names) > 0:
+        error_string = (
+            '\n\n{0:s}\nCannot find fields (listed above) in file "{1:s}".'
+        ).format(str(missing_field_names), grib_file_name)
+
+        _extraction_failed(
+            error_string=error_string,
+            raise_error_if_fails=raise_error_if_fails)
+
+    # Records are extracted in inventory order, and each record only once.
+    unique_inventory_indices, record_indices = numpy.unique(
+        inventory_indices[inventory_indices >= 0], return_inverse=True)
+    if len(unique_inventory_indices) == 0:
+        return field_matrix_dict
+
+    selected_inventory_string = ''.join(
+        [inventory_lines[i] + '\n' for i in unique_inventory_indices])
+
+    # Extract fields to temporary file.
     if temporary_dir_name is not None:
         file_system_utils.mkdir_recursive_if_necessary(
             directory_name=temporary_dir_name)
     temporary_file_name = tempfile.NamedTemporaryFile(
         dir=temporary_dir_name, delete=False).name
 
-    # Extract field to temporary file.
     if grib_file_type == GRIB1_FILE_TYPE:
-        command_string = (
-            '"{0:s}" "{1:s}" -s | grep -w "{2:s}" | "{0:s}" -i "{1:s}" '
-            '-text -nh -o "{3:s}"'
-        ).format(wgrib_exe_name, grib_file_name, field_name_grib1,
-                 temporary_file_name)
+        command_list = [
+            exe_name, '-i', grib_file_name, '-bin', '-nh', '-o',
+            temporary_file_name
+        ]
     else:
-        command_string = (
-            '"{0:s}" "{1:s}" -s | grep -w "{2:s}" | "{0:s}" -i "{1:s}" '
-            '-no_header -text "{3:s}"'
-        ).format(wgrib2_exe_name, grib_file_name,
-                 _field_name_grib1_to_grib2(field_name_grib1),
-                 temporary_file_name)
+        command_list = [
+            exe_name, '-i', grib_file_name, '-no_header', '-bin',
+            temporary_file_name
+        ]
 
     try:
-        subprocess.call(command_string, shell=True)
-    except OSError as this_exception:
+        process_object = subprocess.Popen(
+            command_list, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        process_object.communicate(input=selected_inventory_string)
+        if process_object.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process_object.returncode, ' '.join(command_list))
+    except (OSError, subprocess.CalledProcessError) as this_exception:
         os.remove(temporary_file_name)
-        if raise_error_if_fails:
-            raise
 
-        warning_string = (
-            '\n\n{0:s}\n\nCommand (shown above) failed (details shown below).'
+        error_string = (
+            '\n\nExtraction from file "{0:s}" failed (details shown below).'
             '\n\n{1:s}'
-        ).format(command_string, str(this_exception))
-        warnings.warn(warning_string)
-        return None
+        ).format(grib_file_name, str(this_exception))
 
-    # Read field from temporary file.
-    field_vector = numpy.loadtxt(temporary_file_name)
+        _extraction_failed(
+            error_string=error_string,
+            raise_error_if_fails=raise_error_if_fails)
+        return field_matrix_dict
+
+    # Read fields from temporary file.
+    data_vector = numpy.fromfile(temporary_file_name, dtype=numpy.float32)
     os.remove(temporary_file_name)
 
-    try:
-        field_matrix = numpy.reshape(
-            field_vector, (num_grid_rows, num_grid_columns))
-    except ValueError as this_exception:
-        if raise_error_if_fails:
-            raise
-
-        warning_string = (
-            '\n\nnumpy.reshape failed (details shown below).\n\n{0:s}'
-        ).format(str(this_exception))
-        warnings.warn(warning_string)
-        return None
-
-    return _sentinel_value_to_nan(
-        data_matrix=field_matrix, sentinel_value=sentinel_value)
+    num_records = len(unique_inventory_indices)
+    num_values_expected = num_records * num_grid_rows * num_grid_columns
+
+    if data_vector.size != num_values_expected:
+        error_string = (
+            'Expected {0:d} values ({1:d} records x {2:d} rows x {3:d} columns)'
+            ' in binary output from file "{4:s}".  Instead, got {5:d} values.'
+        ).format(num_values_expected, num_records, num_grid_rows,
+                 num_grid_columns, grib_file_name, data_vector.size)
+
+        _extraction_failed(
+            error_string=error_string,
+            raise_error_if_fails=raise_error_if_fails)
+        return field_matrix_dict
+
+    # Each record gets its own array (not a view into one big array), so that
+    # callers can keep some fields and free the others.
+    data_matrix = numpy.reshape(
+        data_vector, (num_records, num_grid_rows, num_grid_columns))
+    list_of_field_matrices = [
+        _sentinel_value_to_nan(
+            data_matrix=data_matrix[k, ...].astype(float),
+            sentinel_value=sentinel_value)
+        for k in range(num_records)
+    ]
+
+    found_field_indices = numpy.where(inventory_indices >= 0)[0]
+    for j, k in zip(found_field_indices, record_indices):
+        field_matrix_dict[field_names_grib1[j]] = list_of_field_matrices[k]
+
+    return field_matrix_dict
+
+
+def read_field_from_grib_file(
+        grib_file_name, field_name_grib1, num_grid_rows, num_grid_columns,
+        sentinel_value=None, temporary_dir_name=None,
+        wgrib_exe_name=WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=WGRIB2_EXE_NAME_DEFAULT, raise_error_if_fails=True):
+    """Reads field from grib file.
+
+    One field = one variable at one time step.  To read several fields from the
+    same file, `read_fields_from_grib_file` is much faster.
+
+    M = number of rows (unique y-coordinates or latitudes of grid points)
+    N = number of columns (unique x-coordinates or longitudes of grid points)
+
+    :param grib_file_name: Path to input file.
+    :param field_name_grib1: Field name in grib1 format (example: 500-mb height
+        is "HGT:500 mb").
+    :param num_grid_rows: Number of rows expected in grid.
+    :param num_grid_columns: Number of columns expected in grid.
+    :param sentinel_value: Sentinel value (all instances will be replaced with
+        NaN).
+    :param temporary_dir_name: Name of temporary directory.  An intermediate
+        binary file will be stored here.
+    :param wgrib_exe_name: Path to wgrib executable.
+    :param wgrib2_exe_name: Path to wgrib2 executable.
+    :param raise_error_if_fails: Boolean flag.  If the extraction fails and
+        raise_error_if_fails = True, this method will error out.  If the
+        extraction fails and raise_error_if_fails = False, this method will
+        return None.
+    :return: field_matrix: M-by-N numpy array with values of the given field.
+        If the grid is regular in x-y coordinates, x increases towards the right
+        (in the positive direction of the second axis), while y increases
+        downward (in the positive direction of the first axis).  If the grid is
+        regular in lat-long, replace "x" and "y" in the previous sentence with
+        "long" and "lat," respectively.
+    :raises: ValueError: if extraction fails and raise_error_if_fails = True.
+    """
+
+    error_checking.assert_is_string(field_name_grib1)
+
+    return read_fields_from_grib_file(
+        grib_file_name=grib_file_name, field_names_grib1=[field_name_grib1],
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        sentinel_value=sentinel_value, temporary_dir_name=temporary_dir_name,
+        wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+        raise_error_if_fails=raise_error_if_fails
+    )[field_name_grib1]
 
 
 def is_u_wind_field(field_name_grib1):
@@ -39,6 +39,23 @@ NON_WIND_NAME_GRIB1 = 'TMP:500 mb'
 
 NON_GRIB_FILE_TYPE = 'text'
 
+# The following constants are used to test _find_fields_in_inventory.
+INVENTORY_LINES = [
+    '1:0:d=2017050612:HGT:500 mb:anl:',
+    '2:161374:d=2017050612:TMP:500 mb:anl:',
+    '3:265694:d=2017050612:HGT:5000 mb:anl:',
+    '4:427068:d=2017050612:TMP:2 m above ground:anl:',
+    '5:531388:d=2017050612:UGRD:500 mb:anl:'
+]
+
+FIELD_NAMES_IN_INVENTORY = [
+    'TMP:2 m above ground', 'HGT:500 mb', 'UGRD:500 mb', 'TMP:500 mb'
+]
+INVENTORY_INDICES = numpy.array([3, 0, 4, 1], dtype=int)
+
+FIELD_NAMES_PARTLY_IN_INVENTORY = ['VGRD:500 mb', 'HGT:5000 mb', 'HGT:50 mb']
+INVENTORY_INDICES_SOME_MISSING = numpy.array([-1, 2, -1], dtype=int)
+
 
 class GribIoTests(unittest.TestCase):
     """Each method is a unit test for grib_io.py."""
@@ -100,6 +117,32 @@ class GribIoTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             this_data_matrix, DATA_MATRIX_WITH_SENTINELS, atol=TOLERANCE))
 
+    def test_find_fields_in_inventory_all_found(self):
+        """Ensures correct output from _find_fields_in_inventory.
+
+        In this case, all fields are in the inventory.
+        """
+
+        these_indices = grib_io._find_fields_in_inventory(
+            inventory_lines=INVENTORY_LINES,
+            field_names=FIELD_NAMES_IN_INVENTORY)
+
+        self.assertTrue(numpy.array_equal(these_indices, INVENTORY_INDICES))
+
+    def test_find_fields_in_inventory_some_missing(self):
+        """Ensures correct output from _find_fields_in_inventory.
+
+        In this case, some fields are not in the inventory (and "HGT:50 mb"
+        must not match "HGT:500 mb" or "HGT:5000 mb").
+        """
+
+        these_indices = grib_io._find_fields_in_inventory(
+            inventory_lines=INVENTORY_LINES,
+            field_names=FIELD_NAMES_PARTLY_IN_INVENTORY)
+
+        self.assertTrue(numpy.array_equal(
+            these_indices, INVENTORY_INDICES_SOME_MISSING))
+
     def test_check_file_type_grib1(self):
         """Ensures correct output from check_file_type.
 
@@ -2,6 +2,7 @@
 
 import os
 import copy
+import collections
 import numpy
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import downloads
@@ -14,6 +15,24 @@ TIME_FORMAT_DATE = '%Y%m%d'
 TIME_FORMAT_HOUR = '%Y%m%d_%H00'
 NARR_ID_FOR_FILE_NAMES = 'narr-a_221'
 
+# Each key is a tuple (grib file name, field name in grib1 format, model name,
+# grid ID).  Each value is a 2-D numpy array.  When the cache holds more than
+# `max_bytes`, the least recently used grids are dropped first.
+GRID_CACHE = collections.OrderedDict()
+DEFAULT_MAX_BYTES_IN_GRID_CACHE = int(2e9)
+
+NUM_HITS_KEY = 'num_hits'
+NUM_MISSES_KEY = 'num_misses'
+NUM_GRIDS_KEY = 'num_grids'
+NUM_BYTES_KEY = 'num_bytes'
+MAX_BYTES_KEY = 'max_bytes'
+GRID_CACHE_STATS = {
+    NUM_HITS_KEY: 0,
+    NUM_MISSES_KEY: 0,
+    NUM_BYTES_KEY: 0,
+    MAX_BYTES_KEY: DEFAULT_MAX_BYTES_IN_GRID_CACHE
+}
+
 
 def _lead_time_to_string(lead_time_hours):
     """Converts lead time from number to string.
@@ -26,6 +45,34 @@ def _lead_time_to_string(lead_time_hours):
     return '{0:03d}'.format(int(numpy.round(lead_time_hours)))
 
 
+def _trim_grid_cache():
+    """Drops least recently used grids until cache fits in `max_bytes`."""
+
+    while (GRID_CACHE_STATS[NUM_BYTES_KEY] > GRID_CACHE_STATS[MAX_BYTES_KEY]
+           and len(GRID_CACHE) > 0):
+        _, this_field_matrix = GRID_CACHE.popitem(last=False)
+        GRID_CACHE_STATS[NUM_BYTES_KEY] -= this_field_matrix.nbytes
+
+
+def _add_grid_to_cache(cache_key, field_matrix):
+    """Adds grid to cache.
+
+    The grid is made read-only, since the same object will be returned to every
+    caller that requests it.
+
+    :param cache_key: See doc for `GRID_CACHE`.
+    :param field_matrix: 2-D numpy array.
+    """
+
+    if field_matrix.nbytes > GRID_CACHE_STATS[MAX_BYTES_KEY]:
+        return
+
+    field_matrix.flags.writeable = False
+    GRID_CACHE[cache_key] = field_matrix
+    GRID_CACHE_STATS[NUM_BYTES_KEY] += field_matrix.nbytes
+    _trim_grid_cache()
+
+
 def _get_pathless_file_name_prefixes(model_name, grid_id=None):
     """Returns possible starts of pathless file names for the given model/grid.
 
@@ -352,3 +399,122 @@ def read_field_from_grib_file(
         temporary_dir_name=temporary_dir_name, wgrib_exe_name=wgrib_exe_name,
         wgrib2_exe_name=wgrib2_exe_name,
         raise_error_if_fails=raise_error_if_fails)
+
+
+def read_fields_from_grib_file(
+        grib_file_name, field_names_grib1, model_name, grid_id=None,
+        temporary_dir_name=None, wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        raise_error_if_fails=True, use_cache=False):
+    """Reads many fields from grib file.
+
+    :param grib_file_name: Path to input file.
+    :param field_names_grib1: See doc for `grib_io.read_fields_from_grib_file`.
+    :param model_name: See doc for `nwp_model_utils.check_grid_id`.
+    :param grid_id: Same.
+    :param temporary_dir_name: See doc for `grib_io.read_fields_from_grib_file`.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_fails: Same.
+    :param use_cache: Boolean flag.  If True, fields will be looked up in (and
+        added to) `GRID_CACHE`, which is shared by all callers in the process.
+        Only fields not yet in the cache will be read from the file.  Grids
+        returned from the cache are read-only.
+    :return: field_matrix_dict: See doc for
+        `grib_io.read_fields_from_grib_file`.
+    """
+
+    error_checking.assert_is_boolean(use_cache)
+    num_grid_rows, num_grid_columns = nwp_model_utils.get_grid_dimensions(
+        model_name=model_name, grid_id=grid_id)
+
+    field_matrix_dict = {}
+    field_names_to_read_grib1 = []
+
+    for this_field_name_grib1 in field_names_grib1:
+        this_cache_key = (
+            grib_file_name, this_field_name_grib1, model_name, grid_id)
+
+        if use_cache and this_cache_key in GRID_CACHE:
+            field_matrix_dict[this_field_name_grib1] = GRID_CACHE.pop(
+                this_cache_key)
+            GRID_CACHE[this_cache_key] = field_matrix_dict[
+                this_field_name_grib1]
+            GRID_CACHE_STATS[NUM_HITS_KEY] += 1
+            continue
+
+        if this_field_name_grib1 in field_names_to_read_grib1:
+            continue
+
+        field_names_to_read_grib1.append(this_field_name_grib1)
+        if use_cache:
+            GRID_CACHE_STATS[NUM_MISSES_KEY] += 1
+
+    if len(field_names_to_read_grib1) == 0:
+        return field_matrix_dict
+
+    new_field_matrix_dict = grib_io.read_fields_from_grib_file(
+        grib_file_name=grib_file_name,
+        field_names_grib1=field_names_to_read_grib1,
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        sentinel_value=nwp_model_utils.SENTINEL_VALUE,
+        temporary_dir_name=temporary_dir_name, wgrib_exe_name=wgrib_exe_name,
+        wgrib2_exe_name=wgrib2_exe_name,
+        raise_error_if_fails=raise_error_if_fails)
+
+    field_matrix_dict.update(new_field_matrix_dict)
+    if not use_cache:
+        return field_matrix_dict
+
+    for this_field_name_grib1 in field_names_to_read_grib1:
+        if field_matrix_dict[this_field_name_grib1] is None:
+            continue
+
+        _add_grid_to_cache(
+            cache_key=(
+                grib_file_name, this_field_name_grib1, model_name, grid_id),
+            field_matrix=field_matrix_dict[this_field_name_grib1])
+
+    return field_matrix_dict
+
+
+def set_max_bytes_in_grid_cache(max_bytes):
+    """Sets memory limit for `GRID_CACHE`.
+
+    If the cache already holds more than `max_bytes`, least recently used grids
+    are dropped right away.
+
+    :param max_bytes: Max number of bytes in cache.  If 0, nothing will be
+        cached.
+    """
+
+    error_checking.assert_is_integer(max_bytes)
+    error_checking.assert_is_geq(max_bytes, 0)
+
+    GRID_CACHE_STATS[MAX_BYTES_KEY] = max_bytes
+    _trim_grid_cache()
+
+
+def clear_grid_cache():
+    """Empties `GRID_CACHE` and resets hit/miss counters."""
+
+    GRID_CACHE.clear()
+    GRID_CACHE_STATS[NUM_HITS_KEY] = 0
+    GRID_CACHE_STATS[NUM_MISSES_KEY] = 0
+    GRID_CACHE_STATS[NUM_BYTES_KEY] = 0
+
+
+def get_grid_cache_stats():
+    """Returns statistics for `GRID_CACHE`.
+
+    :return: cache_stats_dict: Dictionary with the following keys.
+    cache_stats_dict['num_hits']: Number of fields found in cache.
+    cache_stats_dict['num_misses']: Number of fields read from grib file.
+    cache_stats_dict['num_grids']: Number of grids currently in cache.
+    cache_stats_dict['num_bytes']: Number of bytes currently in cache.
+    cache_stats_dict['max_bytes']: Max number of bytes in cache.
+    """
+
+    cache_stats_dict = copy.deepcopy(GRID_CACHE_STATS)
+    cache_stats_dict[NUM_GRIDS_KEY] = len(GRID_CACHE)
+    return cache_stats_dict
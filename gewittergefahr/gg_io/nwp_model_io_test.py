@@ -1,6 +1,7 @@
 """Unit tests for nwp_model_io.py."""
 
 import unittest
+import numpy
 from gewittergefahr.gg_io import nwp_model_io
 from gewittergefahr.gg_utils import nwp_model_utils
 
@@ -32,10 +33,98 @@ GRIB_FILE_NAME_NARR = 'grib_files/201709/narr-a_221_20170921_0300_000.grb'
 GRIB_FILE_NAME_RAP130 = 'grib_files/201709/rap_130_20170921_0300_007.grb2'
 GRIB_FILE_NAME_RUC252 = 'grib_files/201709/ruc2_252_20170921_0300_007.grb'
 
+# The following constants are used to test the grid cache.
+CACHE_KEYS = [
+    (GRIB_FILE_NAME_RAP130, 'HGT:500 mb', nwp_model_utils.RAP_MODEL_NAME,
+     nwp_model_utils.ID_FOR_130GRID),
+    (GRIB_FILE_NAME_RAP130, 'TMP:500 mb', nwp_model_utils.RAP_MODEL_NAME,
+     nwp_model_utils.ID_FOR_130GRID),
+    (GRIB_FILE_NAME_RAP130, 'UGRD:500 mb', nwp_model_utils.RAP_MODEL_NAME,
+     nwp_model_utils.ID_FOR_130GRID)
+]
+
+GRID_SIZE_BYTES = 4 * 5 * 8
+MAX_BYTES_IN_CACHE = 2 * GRID_SIZE_BYTES
+
 
 class NwpModelIoTests(unittest.TestCase):
     """Each method is a unit test for nwp_model_io.py."""
 
+    def tearDown(self):
+        """Resets grid cache after each test."""
+
+        nwp_model_io.clear_grid_cache()
+        nwp_model_io.set_max_bytes_in_grid_cache(
+            nwp_model_io.DEFAULT_MAX_BYTES_IN_GRID_CACHE)
+
+    def test_add_grid_to_cache_evict(self):
+        """Ensures correct output from _add_grid_to_cache.
+
+        In this case, the least recently used grid must be dropped to make room
+        for the new one.
+        """
+
+        nwp_model_io.set_max_bytes_in_grid_cache(MAX_BYTES_IN_CACHE)
+        for this_key in CACHE_KEYS:
+            nwp_model_io._add_grid_to_cache(
+                cache_key=this_key, field_matrix=numpy.zeros((4, 5)))
+
+        self.assertTrue(nwp_model_io.GRID_CACHE.keys() == CACHE_KEYS[1:])
+        self.assertTrue(
+            nwp_model_io.GRID_CACHE_STATS[nwp_model_io.NUM_BYTES_KEY] ==
+            MAX_BYTES_IN_CACHE)
+
+    def test_add_grid_to_cache_read_only(self):
+        """Ensures that _add_grid_to_cache makes grid read-only."""
+
+        this_field_matrix = numpy.zeros((4, 5))
+        nwp_model_io._add_grid_to_cache(
+            cache_key=CACHE_KEYS[0], field_matrix=this_field_matrix)
+
+        with self.assertRaises(ValueError):
+            this_field_matrix[0, 0] = 1.
+
+    def test_set_max_bytes_in_grid_cache(self):
+        """Ensures correct output from set_max_bytes_in_grid_cache.
+
+        In this case, lowering the limit must drop the oldest grids.
+        """
+
+        for this_key in CACHE_KEYS:
+            nwp_model_io._add_grid_to_cache(
+                cache_key=this_key, field_matrix=numpy.zeros((4, 5)))
+
+        nwp_model_io.set_max_bytes_in_grid_cache(GRID_SIZE_BYTES)
+        self.assertTrue(nwp_model_io.GRID_CACHE.keys() == CACHE_KEYS[2:])
+
+    def test_read_fields_from_grib_file_cache_hits(self):
+        """Ensures correct output from read_fields_from_grib_file.
+
+        In this case, all fields are in the cache, so the grib file is never
+        read.
+        """
+
+        for this_key in CACHE_KEYS:
+            nwp_model_io._add_grid_to_cache(
+                cache_key=this_key, field_matrix=numpy.zeros((4, 5)))
+
+        these_field_names_grib1 = [CACHE_KEYS[0][1], CACHE_KEYS[2][1]]
+        this_field_matrix_dict = nwp_model_io.read_fields_from_grib_file(
+            grib_file_name=GRIB_FILE_NAME_RAP130,
+            field_names_grib1=these_field_names_grib1,
+            model_name=nwp_model_utils.RAP_MODEL_NAME,
+            grid_id=nwp_model_utils.ID_FOR_130GRID, use_cache=True)
+
+        self.assertTrue(
+            set(this_field_matrix_dict.keys()) == set(these_field_names_grib1))
+
+        this_stats_dict = nwp_model_io.get_grid_cache_stats()
+        self.assertTrue(this_stats_dict[nwp_model_io.NUM_HITS_KEY] == 2)
+        self.assertTrue(this_stats_dict[nwp_model_io.NUM_MISSES_KEY] == 0)
+
+        expected_keys = [CACHE_KEYS[1], CACHE_KEYS[0], CACHE_KEYS[2]]
+        self.assertTrue(nwp_model_io.GRID_CACHE.keys() == expected_keys)
+
     def test_lead_time_to_string_1digit(self):
         """Ensures correct output from _lead_time_to_string.
 
@@ -25,9 +25,14 @@ Lakshmanan, V., and T. Smith, 2010: "Evaluating a storm tracking algorithm".
 
 import copy
 import os.path
+import multiprocessing
 import warnings
 import numpy
 import pandas
+import scipy.optimize
+import scipy.sparse
+import scipy.sparse.csgraph
+import scipy.spatial
 from scipy.ndimage.filters import gaussian_filter
 from geopy.distance import vincenty
 from gewittergefahr.gg_io import myrorss_and_mrms_io
@@ -42,6 +47,7 @@ from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
 from gewittergefahr.gg_utils import best_tracks
 from gewittergefahr.gg_utils import echo_classification as echo_classifn
+from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import error_checking
 
 TOLERANCE = 1e-6
@@ -73,6 +79,8 @@ DEFAULT_MAX_LINK_TIME_SECONDS = 305
 DEFAULT_MAX_LINK_DISTANCE_M_S01 = (
     0.125 * DEGREES_LAT_TO_METRES / DEFAULT_MAX_LINK_TIME_SECONDS)
 
+KD_TREE_DISTANCE_PADDING_METRES = 1.
+
 DEFAULT_MAX_REANAL_JOIN_TIME_SEC = 600
 DEFAULT_MAX_REANAL_EXTRAP_ERROR_M_S01 = 20.
 
@@ -256,13 +264,26 @@ def _remove_redundant_local_maxima(
     num_maxima = len(max_x_coords_metres)
     keep_max_flags = numpy.full(num_maxima, True, dtype=bool)
 
-    for i in range(num_maxima):
-        these_distances_metres = numpy.sqrt(
-            (max_x_coords_metres - max_x_coords_metres[i]) ** 2 +
-            (max_y_coords_metres - max_y_coords_metres[i]) ** 2)
-        these_distances_metres[i] = numpy.inf
-        keep_max_flags[
-            these_distances_metres < min_distance_between_maxima_metres] = False
+    if num_maxima > 1:
+        max_coord_matrix_metres = numpy.transpose(numpy.vstack((
+            max_x_coords_metres, max_y_coords_metres)))
+        kd_tree_object = scipy.spatial.cKDTree(max_coord_matrix_metres)
+
+        # The pair query includes pairs exactly at the search radius, so the
+        # strict criterion is applied afterwards.  Both members of a close pair
+        # are removed.
+        close_pair_matrix = kd_tree_object.query_pairs(
+            r=min_distance_between_maxima_metres, output_type='ndarray')
+
+        if close_pair_matrix.size > 0:
+            these_distances_metres = numpy.sqrt(numpy.sum(
+                (max_coord_matrix_metres[close_pair_matrix[:, 0], :] -
+                 max_coord_matrix_metres[close_pair_matrix[:, 1], :]) ** 2,
+                axis=1))
+
+            close_pair_matrix = close_pair_matrix[
+                these_distances_metres < min_distance_between_maxima_metres, :]
+            keep_max_flags[numpy.ravel(close_pair_matrix)] = False
 
     keep_max_indices = numpy.where(keep_max_flags)[0]
 
@@ -277,7 +298,8 @@ def _remove_redundant_local_maxima(
 def _link_local_maxima_in_time(
         current_local_max_dict, previous_local_max_dict,
         max_link_time_seconds=DEFAULT_MAX_LINK_TIME_SECONDS,
-        max_link_distance_m_s01=DEFAULT_MAX_LINK_DISTANCE_M_S01):
+        max_link_distance_m_s01=DEFAULT_MAX_LINK_DISTANCE_M_S01,
+        use_global_assignment=False):
     """Links local maxima between current and previous time steps.
 
     N_c = number of local maxima at current time
@@ -298,12 +320,20 @@ def _link_local_maxima_in_time(
         steps respectively), if distance is >
         `max_link_distance_m_s01 * max_link_time_seconds`, they cannot be
         linked.
+    :param use_global_assignment: Boolean flag.  If False, each current local
+        max will be linked to the nearest previous local max, and when several
+        current maxima are linked to the same previous max, only the nearest
+        one will keep its link.  If True, links will be found by
+        `_link_local_maxima_globally`, which maximizes the number of links and
+        then minimizes the total distance.
     :return: current_to_previous_indices: numpy array (length N_c) with indices
         of previous local maxima to which current local maxima are linked.  In
         other words, if current_to_previous_indices[i] = j, the [i]th current
         local max is linked to the [j]th previous local max.
     """
 
+    error_checking.assert_is_boolean(use_global_assignment)
+
     num_current_maxima = len(current_local_max_dict[X_COORDS_KEY])
     current_to_previous_indices = numpy.full(num_current_maxima, -1, dtype=int)
     if previous_local_max_dict is None:
@@ -318,39 +348,182 @@ def _link_local_maxima_in_time(
             time_diff_seconds > max_link_time_seconds):
         return current_to_previous_indices
 
-    current_to_previous_distances_m_s01 = numpy.full(
-        num_current_maxima, numpy.nan)
+    current_coord_matrix_metres = numpy.transpose(numpy.vstack((
+        current_local_max_dict[X_COORDS_KEY],
+        current_local_max_dict[Y_COORDS_KEY]
+    )))
+    previous_coord_matrix_metres = numpy.transpose(numpy.vstack((
+        previous_local_max_dict[X_COORDS_KEY],
+        previous_local_max_dict[Y_COORDS_KEY]
+    )))
+
+    if use_global_assignment:
+        return _link_local_maxima_globally(
+            current_coord_matrix_metres=current_coord_matrix_metres,
+            previous_coord_matrix_metres=previous_coord_matrix_metres,
+            time_diff_seconds=time_diff_seconds,
+            max_link_distance_m_s01=max_link_distance_m_s01)
+
+    # The KD-tree excludes neighbours exactly at the upper bound, so the bound
+    # is padded here and the exact criterion is applied afterwards.
+    kd_tree_object = scipy.spatial.cKDTree(previous_coord_matrix_metres)
+    min_distances_metres, nearest_previous_indices = kd_tree_object.query(
+        current_coord_matrix_metres, k=1,
+        distance_upper_bound=
+        max_link_distance_m_s01 * time_diff_seconds +
+        KD_TREE_DISTANCE_PADDING_METRES)
+
+    min_distances_m_s01 = min_distances_metres / time_diff_seconds
+    linked_current_indices = numpy.where(
+        min_distances_m_s01 <= max_link_distance_m_s01
+    )[0]
+    if len(linked_current_indices) == 0:
+        return current_to_previous_indices
 
-    for i in range(num_current_maxima):
-        these_distances_metres = numpy.sqrt(
-            (current_local_max_dict[X_COORDS_KEY][i] -
-             previous_local_max_dict[X_COORDS_KEY]) ** 2 +
-            (current_local_max_dict[Y_COORDS_KEY][i] -
-             previous_local_max_dict[Y_COORDS_KEY]) ** 2)
+    # If several current maxima are linked to the same previous max, only the
+    # nearest keeps its link (ties are broken by lower index).
+    linked_previous_indices = nearest_previous_indices[linked_current_indices]
+    sort_indices = numpy.lexsort((
+        linked_current_indices, min_distances_m_s01[linked_current_indices],
+        linked_previous_indices
+    ))
 
-        these_distances_m_s01 = these_distances_metres / time_diff_seconds
-        this_min_distance_m_s01 = numpy.min(these_distances_m_s01)
-        if this_min_distance_m_s01 > max_link_distance_m_s01:
-            continue
+    linked_current_indices = linked_current_indices[sort_indices]
+    linked_previous_indices = linked_previous_indices[sort_indices]
+    _, first_unique_indices = numpy.unique(
+        linked_previous_indices, return_index=True)
 
-        current_to_previous_distances_m_s01[i] = this_min_distance_m_s01
-        this_best_prev_index = numpy.argmin(these_distances_m_s01)
-        current_to_previous_indices[i] = this_best_prev_index
+    current_to_previous_indices[
+        linked_current_indices[first_unique_indices]
+    ] = linked_previous_indices[first_unique_indices]
 
-    for j in range(num_previous_maxima):
-        these_current_indices = numpy.where(current_to_previous_indices == j)[0]
-        if len(these_current_indices) < 2:
-            continue
+    return current_to_previous_indices
 
-        this_best_current_index = numpy.argmin(
-            current_to_previous_distances_m_s01[these_current_indices])
-        this_best_current_index = these_current_indices[this_best_current_index]
 
-        for i in these_current_indices:
-            if i == this_best_current_index:
-                continue
+def _link_local_maxima_globally(
+        current_coord_matrix_metres, previous_coord_matrix_metres,
+        time_diff_seconds, max_link_distance_m_s01):
+    """Links local maxima between time steps via global optimal assignment.
+
+    Allowed links (pairs no farther apart than
+    `max_link_distance_m_s01 * time_diff_seconds`) form a bipartite graph.  Each
+    connected component of this graph is solved separately by the Hungarian
+    algorithm, where disallowed pairs are given a cost larger than the sum of
+    all allowed costs.  Thus, the assignment maximizes the number of links and
+    then minimizes the total distance.
+
+    N_c = number of local maxima at current time
+    N_p = number of local maxima at previous time
 
-            current_to_previous_indices[i] = -1
+    :param current_coord_matrix_metres: N_c-by-2 numpy array of x-y coordinates
+        at current time.
+    :param previous_coord_matrix_metres: N_p-by-2 numpy array of x-y
+        coordinates at previous time.
+    :param time_diff_seconds: Time difference between current and previous
+        steps.
+    :param max_link_distance_m_s01: See doc for `_link_local_maxima_in_time`.
+    :return: current_to_previous_indices: See doc for
+        `_link_local_maxima_in_time`.
+    """
+
+    num_current_maxima = current_coord_matrix_metres.shape[0]
+    num_previous_maxima = previous_coord_matrix_metres.shape[0]
+    current_to_previous_indices = numpy.full(num_current_maxima, -1, dtype=int)
+
+    # The KD-tree search radius is padded here, and the exact criterion is
+    # applied afterwards.
+    kd_tree_object = scipy.spatial.cKDTree(previous_coord_matrix_metres)
+    candidate_index_arrays = kd_tree_object.query_ball_point(
+        current_coord_matrix_metres,
+        r=max_link_distance_m_s01 * time_diff_seconds +
+        KD_TREE_DISTANCE_PADDING_METRES)
+
+    num_candidates_by_current_max = numpy.array(
+        [len(a) for a in candidate_index_arrays], dtype=int)
+    if numpy.sum(num_candidates_by_current_max) == 0:
+        return current_to_previous_indices
+
+    edge_current_indices = numpy.repeat(
+        numpy.linspace(0, num_current_maxima - 1, num=num_current_maxima,
+                       dtype=int),
+        num_candidates_by_current_max)
+    edge_previous_indices = numpy.concatenate([
+        numpy.array(a, dtype=int) for a in candidate_index_arrays
+    ])
+
+    edge_distances_m_s01 = numpy.sqrt(numpy.sum(
+        (current_coord_matrix_metres[edge_current_indices, :] -
+         previous_coord_matrix_metres[edge_previous_indices, :]) ** 2,
+        axis=1
+    )) / time_diff_seconds
+
+    good_edge_indices = numpy.where(
+        edge_distances_m_s01 <= max_link_distance_m_s01
+    )[0]
+    if len(good_edge_indices) == 0:
+        return current_to_previous_indices
+
+    edge_current_indices = edge_current_indices[good_edge_indices]
+    edge_previous_indices = edge_previous_indices[good_edge_indices]
+    edge_distances_m_s01 = edge_distances_m_s01[good_edge_indices]
+
+    # In the graph, nodes 0...(N_c - 1) are current maxima and the rest are
+    # previous maxima.
+    num_nodes = num_current_maxima + num_previous_maxima
+    adjacency_matrix = scipy.sparse.coo_matrix(
+        (numpy.full(len(edge_current_indices), True, dtype=bool),
+         (edge_current_indices, edge_previous_indices + num_current_maxima)),
+        shape=(num_nodes, num_nodes)
+    )
+
+    node_to_component_indices = scipy.sparse.csgraph.connected_components(
+        adjacency_matrix, directed=False
+    )[1]
+    edge_component_indices = node_to_component_indices[edge_current_indices]
+
+    # Components with only one allowed link (the most common case) do not need
+    # the Hungarian algorithm.
+    num_edges_by_component = numpy.bincount(edge_component_indices)
+    single_edge_indices = numpy.where(
+        num_edges_by_component[edge_component_indices] == 1
+    )[0]
+    current_to_previous_indices[edge_current_indices[single_edge_indices]] = (
+        edge_previous_indices[single_edge_indices])
+
+    multi_edge_component_indices = numpy.where(num_edges_by_component > 1)[0]
+
+    for this_component_index in multi_edge_component_indices:
+        these_edge_indices = numpy.where(
+            edge_component_indices == this_component_index
+        )[0]
+
+        these_current_indices, these_edge_rows = numpy.unique(
+            edge_current_indices[these_edge_indices], return_inverse=True)
+        these_previous_indices, these_edge_columns = numpy.unique(
+            edge_previous_indices[these_edge_indices], return_inverse=True)
+
+        this_max_num_links = min(
+            len(these_current_indices), len(these_previous_indices))
+        this_cost_matrix_m_s01 = numpy.full(
+            (len(these_current_indices), len(these_previous_indices)),
+            (this_max_num_links + 1) * (max_link_distance_m_s01 + 1.)
+        )
+        this_allowed_flag_matrix = numpy.full(
+            this_cost_matrix_m_s01.shape, False, dtype=bool)
+
+        this_cost_matrix_m_s01[these_edge_rows, these_edge_columns] = (
+            edge_distances_m_s01[these_edge_indices])
+        this_allowed_flag_matrix[these_edge_rows, these_edge_columns] = True
+
+        these_rows, these_columns = scipy.optimize.linear_sum_assignment(
+            this_cost_matrix_m_s01)
+        these_good_indices = numpy.where(
+            this_allowed_flag_matrix[these_rows, these_columns]
+        )[0]
+
+        current_to_previous_indices[
+            these_current_indices[these_rows[these_good_indices]]
+        ] = these_previous_indices[these_columns[these_good_indices]]
 
     return current_to_previous_indices
 
@@ -1592,6 +1765,109 @@ def _reanalyze_tracks(
     return storm_object_table
 
 
+def _find_local_maxima_one_time(argument_tuple):
+    """Finds local maxima, with polygons, at one time step.
+
+    This method is the unit of work for `run_tracking`, so it takes one argument
+    (a tuple, as required by `general_utils.imap_bounded`).
+
+    :param argument_tuple: Tuple with the following elements.
+    argument_tuple[0]: time_index: Index of time step.
+    argument_tuple[1]: radar_file_name: Path to radar file (will be read by
+        `myrorss_and_mrms_io.read_data_from_sparse_grid_file`).
+    argument_tuple[2]: echo_classifn_file_name: Path to echo-classification
+        file (will be read by `echo_classification.read_classifications`).  If
+        None, echo classifications will not be used.
+    argument_tuple[3]: valid_time_unix_sec: Valid time.
+    argument_tuple[4]: echo_top_field_name: See doc for `run_tracking`.
+    argument_tuple[5]: radar_source_name: Same.
+    argument_tuple[6]: min_echo_top_height_km_asl: Same.
+    argument_tuple[7]: e_fold_radius_for_smoothing_deg_lat: Same.
+    argument_tuple[8]: half_width_for_max_filter_deg_lat: Same.
+    argument_tuple[9]: min_distance_between_maxima_metres: Same.
+    argument_tuple[10]: min_grid_cells_in_polygon: Same.
+    :return: time_index: Same as input.
+    :return: local_max_dict: Dictionary created by `_remove_small_polygons`,
+        plus the key "valid_time_unix_sec".
+    """
+
+    (time_index, radar_file_name, echo_classifn_file_name, valid_time_unix_sec,
+     echo_top_field_name, radar_source_name, min_echo_top_height_km_asl,
+     e_fold_radius_for_smoothing_deg_lat, half_width_for_max_filter_deg_lat,
+     min_distance_between_maxima_metres, min_grid_cells_in_polygon
+    ) = argument_tuple
+
+    print 'Reading data from: "{0:s}"...'.format(radar_file_name)
+    metadata_dict = myrorss_and_mrms_io.read_metadata_from_raw_file(
+        netcdf_file_name=radar_file_name, data_source=radar_source_name)
+
+    sparse_grid_table = myrorss_and_mrms_io.read_data_from_sparse_grid_file(
+        netcdf_file_name=radar_file_name,
+        field_name_orig=metadata_dict[
+            myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
+        data_source=radar_source_name,
+        sentinel_values=metadata_dict[radar_utils.SENTINEL_VALUE_COLUMN]
+    )
+
+    echo_top_matrix_km_asl = radar_s2f.sparse_to_full_grid(
+        sparse_grid_table=sparse_grid_table, metadata_dict=metadata_dict,
+        ignore_if_below=min_echo_top_height_km_asl
+    )[0]
+
+    print 'Finding local maxima in "{0:s}" at {1:s}...'.format(
+        echo_top_field_name,
+        time_conversion.unix_sec_to_string(valid_time_unix_sec, TIME_FORMAT)
+    )
+
+    latitude_spacing_deg = metadata_dict[radar_utils.LAT_SPACING_COLUMN]
+
+    echo_top_matrix_km_asl = _gaussian_smooth_radar_field(
+        radar_matrix=echo_top_matrix_km_asl,
+        e_folding_radius_pixels=
+        e_fold_radius_for_smoothing_deg_lat / latitude_spacing_deg)
+
+    if echo_classifn_file_name is not None:
+        print 'Reading data from: "{0:s}"...'.format(echo_classifn_file_name)
+        convective_flag_matrix = echo_classifn.read_classifications(
+            echo_classifn_file_name
+        )[0]
+        convective_flag_matrix = numpy.flip(convective_flag_matrix, axis=0)
+
+        echo_top_matrix_km_asl[convective_flag_matrix == False] = 0.
+
+    half_width_in_pixels = int(numpy.round(
+        half_width_for_max_filter_deg_lat / latitude_spacing_deg))
+
+    local_max_dict = _find_local_maxima(
+        radar_matrix=echo_top_matrix_km_asl,
+        radar_metadata_dict=metadata_dict,
+        neigh_half_width_in_pixels=half_width_in_pixels)
+
+    projection_object = projections.init_azimuthal_equidistant_projection(
+        central_latitude_deg=CENTRAL_PROJ_LATITUDE_DEG,
+        central_longitude_deg=CENTRAL_PROJ_LONGITUDE_DEG)
+
+    local_max_dict = _remove_redundant_local_maxima(
+        local_max_dict_latlng=local_max_dict,
+        projection_object=projection_object,
+        min_distance_between_maxima_metres=min_distance_between_maxima_metres)
+
+    local_max_dict.update({VALID_TIME_KEY: valid_time_unix_sec})
+
+    local_max_dict = _local_maxima_to_polygons(
+        local_max_dict=local_max_dict,
+        echo_top_matrix_km_asl=echo_top_matrix_km_asl,
+        min_echo_top_height_km_asl=min_echo_top_height_km_asl,
+        radar_metadata_dict=metadata_dict,
+        min_distance_between_maxima_metres=min_distance_between_maxima_metres)
+
+    local_max_dict = _remove_small_polygons(
+        local_max_dict=local_max_dict,
+        min_grid_cells_in_polygon=min_grid_cells_in_polygon)
+
+    return time_index, local_max_dict
+
+
 def run_tracking(
         top_radar_dir_name, top_output_dir_name,
         first_spc_date_string, last_spc_date_string,
@@ -1610,7 +1886,8 @@ def run_tracking(
         max_link_time_seconds=DEFAULT_MAX_LINK_TIME_SECONDS,
         max_link_distance_m_s01=DEFAULT_MAX_LINK_DISTANCE_M_S01,
         min_track_duration_seconds=0,
-        num_points_back_for_velocity=DEFAULT_NUM_POINTS_BACK_FOR_VELOCITY):
+        num_points_back_for_velocity=DEFAULT_NUM_POINTS_BACK_FOR_VELOCITY,
+        use_global_assignment=False, num_processes=1):
     """This is effectively the main method for echo-top-tracking.
 
     :param top_radar_dir_name: See doc for `_find_input_radar_files`.
@@ -1645,9 +1922,18 @@ def run_tracking(
         storms will be removed.
     :param num_points_back_for_velocity: See doc for
         `_get_velocities_one_storm_track`.
+    :param use_global_assignment: See doc for `_link_local_maxima_in_time`.
+    :param num_processes: Number of worker processes used to find local maxima
+        and polygons (see `_find_local_maxima_one_time`).  While the main
+        process links maxima at one time, workers read and process radar files
+        for the following times (at most `num_processes + 1` times ahead).  If
+        `num_processes == 1`, all times will be done serially in the main
+        process.
     """
 
     error_checking.assert_is_greater(min_echo_top_height_km_asl, 0.)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
 
     if min_grid_cells_in_polygon is None:
         min_grid_cells_in_polygon = 0
@@ -1669,12 +1955,9 @@ def run_tracking(
         for t in valid_times_unix_sec
     ]
 
-    projection_object = projections.init_azimuthal_equidistant_projection(
-        central_latitude_deg=CENTRAL_PROJ_LATITUDE_DEG,
-        central_longitude_deg=CENTRAL_PROJ_LONGITUDE_DEG)
-
     local_max_dict_by_time = [{}] * num_times
     keep_time_indices = []
+    argument_tuples = []
 
     for i in range(num_times):
         if top_echo_classifn_dir_name is None:
@@ -1701,101 +1984,60 @@ def run_tracking(
 
             keep_time_indices.append(i)
 
-        print 'Reading data from: "{0:s}"...'.format(radar_file_names[i])
-        this_metadata_dict = myrorss_and_mrms_io.read_metadata_from_raw_file(
-            netcdf_file_name=radar_file_names[i], data_source=radar_source_name)
-
-        this_sparse_grid_table = (
-            myrorss_and_mrms_io.read_data_from_sparse_grid_file(
-                netcdf_file_name=radar_file_names[i],
-                field_name_orig=this_metadata_dict[
-                    myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
-                data_source=radar_source_name,
-                sentinel_values=this_metadata_dict[
-                    radar_utils.SENTINEL_VALUE_COLUMN]
-            )
-        )
-
-        this_echo_top_matrix_km_asl = radar_s2f.sparse_to_full_grid(
-            sparse_grid_table=this_sparse_grid_table,
-            metadata_dict=this_metadata_dict,
-            ignore_if_below=min_echo_top_height_km_asl
-        )[0]
-
-        print 'Finding local maxima in "{0:s}" at {1:s}...'.format(
-            echo_top_field_name, valid_time_strings[i])
-
-        this_latitude_spacing_deg = this_metadata_dict[
-            radar_utils.LAT_SPACING_COLUMN]
-
-        this_echo_top_matrix_km_asl = _gaussian_smooth_radar_field(
-            radar_matrix=this_echo_top_matrix_km_asl,
-            e_folding_radius_pixels=
-            e_fold_radius_for_smoothing_deg_lat / this_latitude_spacing_deg)
-
-        if this_echo_classifn_file_name is not None:
-            print 'Reading data from: "{0:s}"...'.format(
-                this_echo_classifn_file_name)
-            this_convective_flag_matrix = echo_classifn.read_classifications(
-                this_echo_classifn_file_name
-            )[0]
-            this_convective_flag_matrix = numpy.flip(
-                this_convective_flag_matrix, axis=0)
-
-            print numpy.sum(this_echo_top_matrix_km_asl > 0.)
-            this_echo_top_matrix_km_asl[
-                this_convective_flag_matrix == False] = 0.
-            print numpy.sum(this_echo_top_matrix_km_asl > 0.)
-
-        this_half_width_in_pixels = int(numpy.round(
-            half_width_for_max_filter_deg_lat / this_latitude_spacing_deg))
-
-        local_max_dict_by_time[i] = _find_local_maxima(
-            radar_matrix=this_echo_top_matrix_km_asl,
-            radar_metadata_dict=this_metadata_dict,
-            neigh_half_width_in_pixels=this_half_width_in_pixels)
-
-        local_max_dict_by_time[i] = _remove_redundant_local_maxima(
-            local_max_dict_latlng=local_max_dict_by_time[i],
-            projection_object=projection_object,
-            min_distance_between_maxima_metres=
-            min_distance_between_maxima_metres
+        argument_tuples.append((
+            i, radar_file_names[i], this_echo_classifn_file_name,
+            valid_times_unix_sec[i], echo_top_field_name, radar_source_name,
+            min_echo_top_height_km_asl, e_fold_radius_for_smoothing_deg_lat,
+            half_width_for_max_filter_deg_lat,
+            min_distance_between_maxima_metres, min_grid_cells_in_polygon
+        ))
+
+    # Local maxima and polygons are found independently at each time, so this
+    # work is farmed out to worker processes, which read and decode radar files
+    # ahead of the main process.  Only linkage (which depends on the previous
+    # time) is done serially, in the main process, as results arrive in order.
+    if num_processes == 1:
+        pool_object = None
+        result_iterator = (
+            _find_local_maxima_one_time(t) for t in argument_tuples
         )
-
-        local_max_dict_by_time[i].update(
-            {VALID_TIME_KEY: valid_times_unix_sec[i]})
-
-        local_max_dict_by_time[i] = _local_maxima_to_polygons(
-            local_max_dict=local_max_dict_by_time[i],
-            echo_top_matrix_km_asl=this_echo_top_matrix_km_asl,
-            min_echo_top_height_km_asl=min_echo_top_height_km_asl,
-            radar_metadata_dict=this_metadata_dict,
-            min_distance_between_maxima_metres=
-            min_distance_between_maxima_metres)
-
-        local_max_dict_by_time[i] = _remove_small_polygons(
-            local_max_dict=local_max_dict_by_time[i],
-            min_grid_cells_in_polygon=min_grid_cells_in_polygon)
-
-        if i == 0:
-            these_current_to_prev_indices = _link_local_maxima_in_time(
-                current_local_max_dict=local_max_dict_by_time[i],
-                previous_local_max_dict=None,
-                max_link_time_seconds=max_link_time_seconds,
-                max_link_distance_m_s01=max_link_distance_m_s01)
-        else:
-            print (
-                'Linking local maxima at {0:s} with those at {1:s}...\n'
-            ).format(valid_time_strings[i], valid_time_strings[i - 1])
-
-            these_current_to_prev_indices = _link_local_maxima_in_time(
-                current_local_max_dict=local_max_dict_by_time[i],
-                previous_local_max_dict=local_max_dict_by_time[i - 1],
-                max_link_time_seconds=max_link_time_seconds,
-                max_link_distance_m_s01=max_link_distance_m_s01)
-
-        local_max_dict_by_time[i].update(
-            {CURRENT_TO_PREV_INDICES_KEY: these_current_to_prev_indices})
+    else:
+        pool_object = multiprocessing.Pool(processes=num_processes)
+        result_iterator = general_utils.imap_bounded(
+            pool_object=pool_object,
+            worker_function=_find_local_maxima_one_time,
+            argument_iterable=argument_tuples,
+            max_num_pending=num_processes + 1)
+
+    try:
+        for i, this_local_max_dict in result_iterator:
+            local_max_dict_by_time[i] = this_local_max_dict
+
+            if i == 0:
+                these_current_to_prev_indices = _link_local_maxima_in_time(
+                    current_local_max_dict=local_max_dict_by_time[i],
+                    previous_local_max_dict=None,
+                    max_link_time_seconds=max_link_time_seconds,
+                    max_link_distance_m_s01=max_link_distance_m_s01,
+                    use_global_assignment=use_global_assignment)
+            else:
+                print (
+                    'Linking local maxima at {0:s} with those at {1:s}...\n'
+                ).format(valid_time_strings[i], valid_time_strings[i - 1])
+
+                these_current_to_prev_indices = _link_local_maxima_in_time(
+                    current_local_max_dict=local_max_dict_by_time[i],
+                    previous_local_max_dict=local_max_dict_by_time[i - 1],
+                    max_link_time_seconds=max_link_time_seconds,
+                    max_link_distance_m_s01=max_link_distance_m_s01,
+                    use_global_assignment=use_global_assignment)
+
+            local_max_dict_by_time[i].update(
+                {CURRENT_TO_PREV_INDICES_KEY: these_current_to_prev_indices})
+    finally:
+        if pool_object is not None:
+            pool_object.close()
+            pool_object.join()
 
     keep_time_indices = numpy.array(keep_time_indices, dtype=int)
     valid_times_unix_sec = valid_times_unix_sec[keep_time_indices]
@@ -1,15 +1,19 @@
 """Unit tests for echo_top_tracking.py."""
 
 import copy
+import os.path
 import unittest
 import numpy
 import pandas
 from geopy.distance import vincenty
+from gewittergefahr.gg_io import myrorss_and_mrms_io
+from gewittergefahr.gg_io import storm_tracking_io as tracking_io
 from gewittergefahr.gg_utils import echo_top_tracking
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import projections
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
 from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import unit_test_utils
 
 TOLERANCE = 1e-6
 RELATIVE_DISTANCE_TOLERANCE = 0.015
@@ -125,6 +129,19 @@ CURRENT_LOCAL_MAX_DICT_OVERLAP = {
 }
 CURRENT_TO_PREV_INDICES_OVERLAP = numpy.array([-1, 0], dtype=int)
 
+PREVIOUS_LOCAL_MAX_DICT_CONFLICT = {
+    echo_top_tracking.X_COORDS_KEY: numpy.array([0., 2000.]),
+    echo_top_tracking.Y_COORDS_KEY: numpy.array([0., 0.]),
+    echo_top_tracking.VALID_TIME_KEY: PREVIOUS_TIME_UNIX_SEC
+}
+CURRENT_LOCAL_MAX_DICT_CONFLICT = {
+    echo_top_tracking.X_COORDS_KEY: numpy.array([1200., 2300.]),
+    echo_top_tracking.Y_COORDS_KEY: numpy.array([0., 0.]),
+    echo_top_tracking.VALID_TIME_KEY: CURRENT_TIME_UNIX_SEC
+}
+CURRENT_TO_PREV_INDICES_CONFLICT_GREEDY = numpy.array([-1, 1], dtype=int)
+CURRENT_TO_PREV_INDICES_CONFLICT_GLOBAL = numpy.array([0, 1], dtype=int)
+
 PREVIOUS_LOCAL_MAX_DICT_EMPTY = {
     echo_top_tracking.X_COORDS_KEY: numpy.array([]),
     echo_top_tracking.Y_COORDS_KEY: numpy.array([]),
@@ -419,7 +436,131 @@ def _compare_maxima_with_sans_small_polygons(
     return True
 
 
-class EchoTopTrackingTests(unittest.TestCase):
+# The following constants are used to test run_tracking.
+TRACKING_SPC_DATE_STRING = '20110427'
+TRACKING_TIMES_UNIX_SEC = (
+    time_conversion.get_start_of_spc_date(TRACKING_SPC_DATE_STRING) +
+    numpy.array([43200, 43500, 43800, 44100], dtype=int)
+)
+
+NUM_TRACKING_GRID_ROWS = 60
+NUM_TRACKING_GRID_COLUMNS = 80
+TRACKING_METADATA_DICT = {
+    radar_utils.NW_GRID_POINT_LAT_COLUMN: 36.,
+    radar_utils.NW_GRID_POINT_LNG_COLUMN: 260.,
+    radar_utils.LAT_SPACING_COLUMN: 0.01,
+    radar_utils.LNG_SPACING_COLUMN: 0.01,
+    radar_utils.NUM_LAT_COLUMN: NUM_TRACKING_GRID_ROWS,
+    radar_utils.NUM_LNG_COLUMN: NUM_TRACKING_GRID_COLUMNS
+}
+
+# Each storm is a Gaussian blob of echo tops, moving to the east.
+STORM_FIRST_CENTER_ROWS = numpy.array([20, 40], dtype=int)
+STORM_FIRST_CENTER_COLUMNS = numpy.array([15, 55], dtype=int)
+STORM_COLUMN_MOTIONS_PER_TIME = numpy.array([3, 2], dtype=int)
+STORM_MAX_ECHO_TOP_METRES = 8000.
+STORM_E_FOLDING_RADIUS_PIXELS = 4.
+STORM_MIN_ECHO_TOP_METRES = 1000.
+
+
+def _write_tracking_input_files(top_radar_dir_name):
+    """Writes echo-top files for run_tracking.
+
+    :param top_radar_dir_name: Name of top-level directory for radar files.
+    """
+
+    row_matrix, column_matrix = numpy.meshgrid(
+        numpy.linspace(
+            0, NUM_TRACKING_GRID_ROWS - 1, num=NUM_TRACKING_GRID_ROWS),
+        numpy.linspace(
+            0, NUM_TRACKING_GRID_COLUMNS - 1, num=NUM_TRACKING_GRID_COLUMNS),
+        indexing='ij')
+
+    for i in range(len(TRACKING_TIMES_UNIX_SEC)):
+        this_echo_top_matrix_metres = numpy.full(
+            (NUM_TRACKING_GRID_ROWS, NUM_TRACKING_GRID_COLUMNS), numpy.nan)
+
+        for j in range(len(STORM_FIRST_CENTER_ROWS)):
+            this_center_column = (
+                STORM_FIRST_CENTER_COLUMNS[j] +
+                i * STORM_COLUMN_MOTIONS_PER_TIME[j])
+            these_squared_distances_px2 = (
+                (row_matrix - STORM_FIRST_CENTER_ROWS[j]) ** 2 +
+                (column_matrix - this_center_column) ** 2)
+
+            this_storm_matrix_metres = STORM_MAX_ECHO_TOP_METRES * numpy.exp(
+                -these_squared_distances_px2 /
+                (2 * STORM_E_FOLDING_RADIUS_PIXELS ** 2))
+            this_storm_matrix_metres[
+                this_storm_matrix_metres < STORM_MIN_ECHO_TOP_METRES
+            ] = numpy.nan
+
+            these_new_flags = numpy.invert(
+                numpy.isnan(this_storm_matrix_metres))
+            this_echo_top_matrix_metres[these_new_flags] = (
+                this_storm_matrix_metres[these_new_flags])
+
+        this_metadata_dict = copy.deepcopy(TRACKING_METADATA_DICT)
+        this_metadata_dict[radar_utils.UNIX_TIME_COLUMN] = (
+            TRACKING_TIMES_UNIX_SEC[i])
+
+        this_file_name = myrorss_and_mrms_io.find_raw_file(
+            unix_time_sec=TRACKING_TIMES_UNIX_SEC[i],
+            spc_date_string=TRACKING_SPC_DATE_STRING,
+            field_name=radar_utils.ECHO_TOP_40DBZ_NAME,
+            data_source=radar_utils.MYRORSS_SOURCE_ID,
+            top_directory_name=top_radar_dir_name,
+            raise_error_if_missing=False)
+        this_file_name = os.path.splitext(this_file_name)[0]
+
+        myrorss_and_mrms_io.write_field_to_myrorss_file(
+            field_matrix=this_echo_top_matrix_metres,
+            netcdf_file_name=this_file_name,
+            field_name=radar_utils.ECHO_TOP_40DBZ_NAME,
+            metadata_dict=this_metadata_dict)
+
+
+def _compare_storm_object_tables(first_table, second_table):
+    """Compares two tables with storm objects.
+
+    :param first_table: First table (created by
+        `storm_tracking_io.read_processed_file`).
+    :param second_table: Second table.
+    :return: are_tables_equal: Boolean flag.
+    """
+
+    if list(first_table) != list(second_table):
+        return False
+    if len(first_table.index) != len(second_table.index):
+        return False
+
+    polygon_columns = [
+        tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN,
+        tracking_utils.POLYGON_OBJECT_ROWCOL_COLUMN
+    ]
+
+    for this_column in list(first_table):
+        for this_first_value, this_second_value in zip(
+                first_table[this_column].values,
+                second_table[this_column].values):
+
+            if this_column == tracking_utils.STORM_ID_COLUMN:
+                if this_first_value != this_second_value:
+                    return False
+
+            elif this_column in polygon_columns:
+                if not this_first_value.equals(this_second_value):
+                    return False
+
+            else:
+                if not numpy.allclose(this_first_value, this_second_value,
+                                      atol=TOLERANCE, equal_nan=True):
+                    return False
+
+    return True
+
+
+class EchoTopTrackingTests(unit_test_utils.TestCaseWithTempDir):
     """Each method is a unit test for echo_top_tracking.py."""
 
     def test_find_local_maxima(self):
@@ -560,6 +701,43 @@ class EchoTopTrackingTests(unittest.TestCase):
         self.assertTrue(numpy.array_equal(
             these_current_to_prev_indices, CURRENT_TO_PREV_INDICES_OVERLAP))
 
+    def test_link_local_maxima_in_time_conflict_greedy(self):
+        """Ensures correct output from _link_local_maxima_in_time.
+
+        In this case, both current maxima are nearest to the same previous max
+        and global assignment is not used, so only the nearer current max is
+        linked.
+        """
+
+        these_current_to_prev_indices = (
+            echo_top_tracking._link_local_maxima_in_time(
+                current_local_max_dict=CURRENT_LOCAL_MAX_DICT_CONFLICT,
+                previous_local_max_dict=PREVIOUS_LOCAL_MAX_DICT_CONFLICT,
+                max_link_time_seconds=MAX_LINK_TIME_SECONDS,
+                max_link_distance_m_s01=MAX_LINK_DISTANCE_M_S01,
+                use_global_assignment=False))
+        self.assertTrue(numpy.array_equal(
+            these_current_to_prev_indices,
+            CURRENT_TO_PREV_INDICES_CONFLICT_GREEDY))
+
+    def test_link_local_maxima_in_time_conflict_global(self):
+        """Ensures correct output from _link_local_maxima_in_time.
+
+        In this case, both current maxima are nearest to the same previous max
+        but global assignment is used, so both current maxima are linked.
+        """
+
+        these_current_to_prev_indices = (
+            echo_top_tracking._link_local_maxima_in_time(
+                current_local_max_dict=CURRENT_LOCAL_MAX_DICT_CONFLICT,
+                previous_local_max_dict=PREVIOUS_LOCAL_MAX_DICT_CONFLICT,
+                max_link_time_seconds=MAX_LINK_TIME_SECONDS,
+                max_link_distance_m_s01=MAX_LINK_DISTANCE_M_S01,
+                use_global_assignment=True))
+        self.assertTrue(numpy.array_equal(
+            these_current_to_prev_indices,
+            CURRENT_TO_PREV_INDICES_CONFLICT_GLOBAL))
+
     def test_link_local_maxima_in_time_no_previous_dict(self):
         """Ensures correct output from _link_local_maxima_in_time.
 
@@ -946,6 +1124,51 @@ class EchoTopTrackingTests(unittest.TestCase):
         self.assertTrue(this_storm_object_table.equals(
             STORM_OBJECT_TABLE_AFTER_REANALYSIS))
 
+    def test_run_tracking_parallel(self):
+        """Ensures that run_tracking does not depend on the pool.
+
+        In this case, storm objects found serially and with two worker
+        processes should be the same.
+        """
+
+        this_radar_dir_name = os.path.join(self.temp_dir_name, 'radar')
+        _write_tracking_input_files(this_radar_dir_name)
+
+        this_serial_dir_name = os.path.join(self.temp_dir_name, 'serial')
+        echo_top_tracking.run_tracking(
+            top_radar_dir_name=this_radar_dir_name,
+            top_output_dir_name=this_serial_dir_name,
+            first_spc_date_string=TRACKING_SPC_DATE_STRING,
+            last_spc_date_string=TRACKING_SPC_DATE_STRING, num_processes=1)
+
+        this_parallel_dir_name = os.path.join(self.temp_dir_name, 'parallel')
+        echo_top_tracking.run_tracking(
+            top_radar_dir_name=this_radar_dir_name,
+            top_output_dir_name=this_parallel_dir_name,
+            first_spc_date_string=TRACKING_SPC_DATE_STRING,
+            last_spc_date_string=TRACKING_SPC_DATE_STRING, num_processes=2)
+
+        this_num_storm_objects = 0
+
+        for this_time_unix_sec in TRACKING_TIMES_UNIX_SEC:
+            these_tables = [
+                tracking_io.read_processed_file(
+                    tracking_io.find_processed_file(
+                        top_processed_dir_name=d,
+                        unix_time_sec=this_time_unix_sec,
+                        spc_date_string=TRACKING_SPC_DATE_STRING,
+                        tracking_scale_metres2=
+                        echo_top_tracking.DUMMY_TRACKING_SCALE_METRES2,
+                        data_source=tracking_utils.SEGMOTION_SOURCE_ID)
+                )
+                for d in [this_serial_dir_name, this_parallel_dir_name]
+            ]
+
+            self.assertTrue(_compare_storm_object_tables(*these_tables))
+            this_num_storm_objects += len(these_tables[0].index)
+
+        self.assertTrue(this_num_storm_objects > 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 """General helper methods (ones that don't belong in another "utils" module)."""
 
 import math
+import collections
 import numpy
 from gewittergefahr.gg_utils import error_checking
 
@@ -45,3 +46,101 @@ def split_array_by_nan(input_array):
     error_checking.assert_is_numpy_array(input_array, num_dimensions=1)
     return [input_array[i] for i in
             numpy.ma.clump_unmasked(numpy.ma.masked_invalid(input_array))]
+
+
+def imap_bounded(pool_object, worker_function, argument_iterable,
+                 max_num_pending):
+    """Applies function to each argument in a pool, with bounded look-ahead.
+
+    This is like `multiprocessing.Pool.imap`, except that a new task is
+    submitted only when the caller takes a result.  `Pool.imap` submits all
+    tasks at once, so if workers are faster than the caller, finished results
+    pile up in the calling process without limit.  With this method, at most
+    `max_num_pending` tasks are running or waiting to be consumed.
+
+    :param pool_object: Instance of `multiprocessing.Pool` or
+        `multiprocessing.pool.ThreadPool`.
+    :param worker_function: Function to apply.  Takes one argument.
+    :param argument_iterable: Iterable of arguments to `worker_function`.
+    :param max_num_pending: Max number of pending tasks.
+    :return: result: Output of `worker_function` for the next argument.
+        Results are yielded in the same order as arguments.  If the worker
+        raises an exception, it is re-raised here.
+    """
+
+    error_checking.assert_is_integer(max_num_pending)
+    error_checking.assert_is_greater(max_num_pending, 0)
+
+    argument_iterator = iter(argument_iterable)
+    pending_results = collections.deque()
+    found_last_argument = False
+
+    while True:
+        while not found_last_argument and (
+                len(pending_results) < max_num_pending):
+            try:
+                this_argument = next(argument_iterator)
+            except StopIteration:
+                found_last_argument = True
+                break
+
+            pending_results.append(pool_object.apply_async(
+                worker_function, args=(this_argument,)
+            ))
+
+        if len(pending_results) == 0:
+            return
+
+        yield pending_results.popleft().get()
+
+
+def get_from_lru_cache(cache_dict, cache_key, modification_time_unix_sec=None):
+    """Retrieves value from least-recently-used (LRU) cache.
+
+    The cache must be filled by `add_to_lru_cache`.
+
+    :param cache_dict: Cache (instance of `collections.OrderedDict`).
+    :param cache_key: Key to look up.
+    :param modification_time_unix_sec: If the value was computed from a file,
+        this should be the file's current modification time.  If it does not
+        match the time stored with the value, the value is stale, so it is
+        dropped from the cache.
+    :return: value: Cached value.  If the key is missing (or stale), this is
+        None.
+    """
+
+    if cache_key not in cache_dict:
+        return None
+
+    this_modification_time_unix_sec, value = cache_dict.pop(cache_key)
+    if this_modification_time_unix_sec != modification_time_unix_sec:
+        return None
+
+    cache_dict[cache_key] = (this_modification_time_unix_sec, value)
+    return value
+
+
+def add_to_lru_cache(cache_dict, cache_key, value, max_num_entries,
+                     modification_time_unix_sec=None):
+    """Adds value to least-recently-used (LRU) cache.
+
+    If the cache then holds more than `max_num_entries`, the least recently
+    used entries are dropped.
+
+    :param cache_dict: See doc for `get_from_lru_cache`.
+    :param cache_key: Key.
+    :param value: Value.
+    :param max_num_entries: Max number of entries in cache.
+    :param modification_time_unix_sec: See doc for `get_from_lru_cache`.  This
+        should be read *before* the file, so that a file modified during the
+        read is never matched to the old contents.
+    """
+
+    error_checking.assert_is_integer(max_num_entries)
+    error_checking.assert_is_greater(max_num_entries, 0)
+
+    cache_dict.pop(cache_key, None)
+    cache_dict[cache_key] = (modification_time_unix_sec, value)
+
+    while len(cache_dict) > max_num_entries:
+        cache_dict.popitem(last=False)
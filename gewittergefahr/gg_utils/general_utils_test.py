@@ -1,6 +1,8 @@
 """Unit tests for general_utils.py."""
 
 import unittest
+import collections
+from multiprocessing.pool import ThreadPool
 import numpy
 from gewittergefahr.gg_utils import general_utils
 
@@ -25,6 +27,34 @@ ARRAY_WITH_MANY_NANS_AS_LIST = [
     numpy.array([30, 50]), numpy.array([40]), numpy.array([70, 40, 10])]
 
 
+# The following constants are used to test imap_bounded.
+NUM_ARGUMENTS_FOR_IMAP = 20
+MAX_NUM_PENDING_FOR_IMAP = 3
+ARGUMENT_TO_RAISE_ERROR = -1
+ARGUMENTS_WITH_ERROR = [0, 1, 2, -1, 4, 5, 6, 7, 8]
+RESULTS_BEFORE_ERROR = [0, 1, 4]
+
+# The following constants are used to test get_from_lru_cache and
+# add_to_lru_cache.
+MAX_ENTRIES_IN_LRU_CACHE = 2
+FIRST_MODIFICATION_TIME_UNIX_SEC = 1000
+SECOND_MODIFICATION_TIME_UNIX_SEC = 2000
+
+
+def _square(input_value):
+    """Squares number (used to test imap_bounded).
+
+    :param input_value: Number.
+    :return: output_value: Square of number.
+    :raises: ValueError: if `input_value == ARGUMENT_TO_RAISE_ERROR`.
+    """
+
+    if input_value == ARGUMENT_TO_RAISE_ERROR:
+        raise ValueError('Bad argument.')
+
+    return input_value ** 2
+
+
 class GeneralUtilsTests(unittest.TestCase):
     """Each method is a unit test for general_utils.py."""
 
@@ -84,6 +114,99 @@ class GeneralUtilsTests(unittest.TestCase):
             self.assertTrue(numpy.allclose(
                 this_list_of_arrays[i], ARRAY_WITH_MANY_NANS_AS_LIST[i]))
 
+    def test_imap_bounded_order(self):
+        """Ensures correct output from imap_bounded.
+
+        In this case, results should be in the same order as arguments, and no
+        more than `MAX_NUM_PENDING_FOR_IMAP` arguments should be taken before
+        each result is consumed.
+        """
+
+        num_arguments_taken = [0]
+
+        def _argument_generator():
+            for i in range(NUM_ARGUMENTS_FOR_IMAP):
+                num_arguments_taken[0] += 1
+                yield i
+
+        pool_object = ThreadPool(processes=2)
+        these_results = []
+
+        try:
+            for this_result in general_utils.imap_bounded(
+                    pool_object=pool_object, worker_function=_square,
+                    argument_iterable=_argument_generator(),
+                    max_num_pending=MAX_NUM_PENDING_FOR_IMAP):
+                self.assertTrue(
+                    num_arguments_taken[0] <=
+                    len(these_results) + MAX_NUM_PENDING_FOR_IMAP)
+                these_results.append(this_result)
+        finally:
+            pool_object.terminate()
+
+        self.assertTrue(
+            these_results == [i ** 2 for i in range(NUM_ARGUMENTS_FOR_IMAP)])
+
+    def test_imap_bounded_error(self):
+        """Ensures that imap_bounded re-raises exception from worker."""
+
+        pool_object = ThreadPool(processes=2)
+        these_results = []
+
+        try:
+            with self.assertRaises(ValueError):
+                for this_result in general_utils.imap_bounded(
+                        pool_object=pool_object, worker_function=_square,
+                        argument_iterable=ARGUMENTS_WITH_ERROR,
+                        max_num_pending=MAX_NUM_PENDING_FOR_IMAP):
+                    these_results.append(this_result)
+        finally:
+            pool_object.terminate()
+
+        self.assertTrue(these_results == RESULTS_BEFORE_ERROR)
+
+    def test_lru_cache_evict(self):
+        """Ensures that LRU cache drops least recently used entry."""
+
+        cache_dict = collections.OrderedDict()
+        general_utils.add_to_lru_cache(
+            cache_dict=cache_dict, cache_key='a', value=1,
+            max_num_entries=MAX_ENTRIES_IN_LRU_CACHE)
+        general_utils.add_to_lru_cache(
+            cache_dict=cache_dict, cache_key='b', value=2,
+            max_num_entries=MAX_ENTRIES_IN_LRU_CACHE)
+
+        self.assertTrue(
+            general_utils.get_from_lru_cache(cache_dict=cache_dict,
+                                             cache_key='a') == 1)
+
+        general_utils.add_to_lru_cache(
+            cache_dict=cache_dict, cache_key='c', value=3,
+            max_num_entries=MAX_ENTRIES_IN_LRU_CACHE)
+
+        self.assertTrue(cache_dict.keys() == ['a', 'c'])
+        self.assertTrue(
+            general_utils.get_from_lru_cache(cache_dict=cache_dict,
+                                             cache_key='b') is None)
+
+    def test_lru_cache_modified(self):
+        """Ensures that LRU cache drops value from modified file."""
+
+        cache_dict = collections.OrderedDict()
+        general_utils.add_to_lru_cache(
+            cache_dict=cache_dict, cache_key='a', value=1,
+            max_num_entries=MAX_ENTRIES_IN_LRU_CACHE,
+            modification_time_unix_sec=FIRST_MODIFICATION_TIME_UNIX_SEC)
+
+        self.assertTrue(general_utils.get_from_lru_cache(
+            cache_dict=cache_dict, cache_key='a',
+            modification_time_unix_sec=FIRST_MODIFICATION_TIME_UNIX_SEC) == 1)
+        self.assertTrue(general_utils.get_from_lru_cache(
+            cache_dict=cache_dict, cache_key='a',
+            modification_time_unix_sec=SECOND_MODIFICATION_TIME_UNIX_SEC
+        ) is None)
+        self.assertTrue(len(cache_dict) == 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,8 +3,6 @@
 import os
 import numpy
 import srtm
-import geopy
-from geopy.distance import VincentyDistance
 from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
@@ -12,6 +10,14 @@ from gewittergefahr.gg_utils import error_checking
 RADIANS_TO_DEGREES = 180. / numpy.pi
 DEGREES_TO_RADIANS = numpy.pi / 180
 
+# Parameters of the WGS-84 ellipsoid, as used by `geopy.distance.vincenty`.
+SEMI_MAJOR_AXIS_METRES = 6378137.
+SEMI_MINOR_AXIS_METRES = 6356752.3142
+FLATTENING = 1. / 298.257223563
+
+VINCENTY_TOLERANCE_RADIANS = 1e-11
+VINCENTY_MAX_ITERATIONS = 100
+
 MIN_LATITUDE_DEG = -90.
 MAX_LATITUDE_DEG = 90.
 MIN_LONGITUDE_NEGATIVE_IN_WEST_DEG = -180.
@@ -131,6 +137,125 @@ def _get_elevation(
     return elevation_m_asl, srtm_data_object
 
 
+def _vincenty_forward(
+        start_latitudes_deg, start_longitudes_deg, scalar_displacements_metres,
+        geodetic_bearings_deg):
+    """Solves forward geodetic problem with Vincenty's formula.
+
+    This is a vectorized version of `geopy.distance.vincenty.destination`, using
+    the same ellipsoid (WGS-84).  Input arrays may have any shape, but they must
+    all have the same shape.
+
+    :param start_latitudes_deg: numpy array with latitudes (deg N) of start
+        points.
+    :param start_longitudes_deg: equivalent-size numpy array with longitudes
+        (deg E) of start points.
+    :param scalar_displacements_metres: equivalent-size numpy array of scalar
+        displacements.
+    :param geodetic_bearings_deg: equivalent-size numpy array of geodetic
+        bearings.
+    :return: end_latitudes_deg: equivalent-size numpy array with latitudes
+        (deg N) of endpoints.
+    :return: end_longitudes_deg: equivalent-size numpy array with longitudes
+        (deg E) of endpoints, in range -180...180.
+    """
+
+    start_latitudes_radians = DEGREES_TO_RADIANS * start_latitudes_deg
+    start_longitudes_radians = DEGREES_TO_RADIANS * start_longitudes_deg
+    bearings_radians = DEGREES_TO_RADIANS * geodetic_bearings_deg
+
+    tan_reduced_latitudes = (1 - FLATTENING) * numpy.tan(
+        start_latitudes_radians)
+    cos_reduced_latitudes = 1. / numpy.sqrt(1 + tan_reduced_latitudes ** 2)
+    sin_reduced_latitudes = tan_reduced_latitudes * cos_reduced_latitudes
+
+    sin_bearings = numpy.sin(bearings_radians)
+    cos_bearings = numpy.cos(bearings_radians)
+    first_sigmas = numpy.arctan2(tan_reduced_latitudes, cos_bearings)
+    sin_alphas = cos_reduced_latitudes * sin_bearings
+    cos_sq_alphas = 1 - sin_alphas ** 2
+    u_squared_values = cos_sq_alphas * (
+        (SEMI_MAJOR_AXIS_METRES ** 2 - SEMI_MINOR_AXIS_METRES ** 2) /
+        SEMI_MINOR_AXIS_METRES ** 2)
+
+    a_coeffs = 1 + u_squared_values / 16384 * (
+        4096 + u_squared_values * (
+            -768 + u_squared_values * (320 - 175 * u_squared_values)))
+    b_coeffs = u_squared_values / 1024 * (
+        256 + u_squared_values * (
+            -128 + u_squared_values * (74 - 47 * u_squared_values)))
+
+    first_guess_sigmas = scalar_displacements_metres / (
+        SEMI_MINOR_AXIS_METRES * a_coeffs)
+    sigmas = first_guess_sigmas + 0.
+    cos_2sigma_m_values = numpy.cos(2 * first_sigmas + sigmas)
+    converged_flags = numpy.full(sigmas.shape, False, dtype=bool)
+
+    # All points are iterated together, but each point is frozen once it has
+    # converged, so results match the scalar version.
+    for _ in range(VINCENTY_MAX_ITERATIONS):
+        these_cos_2sigma_m_values = numpy.cos(2 * first_sigmas + sigmas)
+        sin_sigmas = numpy.sin(sigmas)
+        cos_sigmas = numpy.cos(sigmas)
+
+        delta_sigmas = b_coeffs * sin_sigmas * (
+            these_cos_2sigma_m_values + b_coeffs / 4 * (
+                cos_sigmas * (-1 + 2 * these_cos_2sigma_m_values ** 2) -
+                b_coeffs / 6 * these_cos_2sigma_m_values *
+                (-3 + 4 * sin_sigmas ** 2) *
+                (-3 + 4 * these_cos_2sigma_m_values ** 2)
+            )
+        )
+        new_sigmas = first_guess_sigmas + delta_sigmas
+
+        active_flags = numpy.invert(converged_flags)
+        cos_2sigma_m_values = numpy.where(
+            active_flags, these_cos_2sigma_m_values, cos_2sigma_m_values)
+        converged_flags = numpy.logical_or(
+            converged_flags,
+            numpy.absolute(new_sigmas - sigmas) <= VINCENTY_TOLERANCE_RADIANS)
+        sigmas = numpy.where(active_flags, new_sigmas, sigmas)
+
+        if numpy.all(converged_flags):
+            break
+
+    sin_sigmas = numpy.sin(sigmas)
+    cos_sigmas = numpy.cos(sigmas)
+
+    end_latitudes_radians = numpy.arctan2(
+        sin_reduced_latitudes * cos_sigmas +
+        cos_reduced_latitudes * sin_sigmas * cos_bearings,
+        (1 - FLATTENING) * numpy.sqrt(
+            sin_alphas ** 2 +
+            (sin_reduced_latitudes * sin_sigmas -
+             cos_reduced_latitudes * cos_sigmas * cos_bearings) ** 2
+        )
+    )
+
+    lambda_values = numpy.arctan2(
+        sin_sigmas * sin_bearings,
+        cos_reduced_latitudes * cos_sigmas -
+        sin_reduced_latitudes * sin_sigmas * cos_bearings)
+
+    c_coeffs = FLATTENING / 16 * cos_sq_alphas * (
+        4 + FLATTENING * (4 - 3 * cos_sq_alphas))
+    longitude_diffs_radians = lambda_values - (
+        (1 - c_coeffs) * FLATTENING * sin_alphas * (
+            sigmas + c_coeffs * sin_sigmas * (
+                cos_2sigma_m_values + c_coeffs * cos_sigmas *
+                (-1 + 2 * cos_2sigma_m_values ** 2)
+            )
+        )
+    )
+
+    end_latitudes_deg = RADIANS_TO_DEGREES * end_latitudes_radians
+    end_longitudes_deg = RADIANS_TO_DEGREES * (
+        start_longitudes_radians + longitude_diffs_radians)
+    end_longitudes_deg = numpy.mod(end_longitudes_deg + 180., 360.) - 180.
+
+    return end_latitudes_deg, end_longitudes_deg
+
+
 def find_invalid_latitudes(latitudes_deg):
     """Returns array indices of invalid latitudes.
 
@@ -300,19 +425,11 @@ def start_points_and_displacements_to_endpoints(
         geodetic_bearings_deg,
         exact_dimensions=numpy.array(start_latitudes_deg.shape))
 
-    end_latitudes_deg = numpy.full(start_latitudes_deg.shape, numpy.nan)
-    end_longitudes_deg = numpy.full(start_latitudes_deg.shape, numpy.nan)
-    num_points = start_latitudes_deg.size
-
-    for i in range(num_points):
-        this_start_point_object = geopy.Point(
-            start_latitudes_deg.flat[i], start_longitudes_deg.flat[i])
-        this_end_point_object = VincentyDistance(
-            meters=scalar_displacements_metres.flat[i]).destination(
-                this_start_point_object, geodetic_bearings_deg.flat[i])
-
-        end_latitudes_deg.flat[i] = this_end_point_object.latitude
-        end_longitudes_deg.flat[i] = this_end_point_object.longitude
+    end_latitudes_deg, end_longitudes_deg = _vincenty_forward(
+        start_latitudes_deg=start_latitudes_deg,
+        start_longitudes_deg=start_longitudes_deg,
+        scalar_displacements_metres=scalar_displacements_metres,
+        geodetic_bearings_deg=geodetic_bearings_deg)
 
     end_longitudes_deg = lng_conversion.convert_lng_positive_in_west(
         end_longitudes_deg, allow_nan=False)
@@ -399,23 +516,15 @@ def rotate_displacement_vectors(
     error_checking.assert_is_less_than(ccw_rotation_angle_deg, 360.)
 
     ccw_rotation_angle_rad = DEGREES_TO_RADIANS * ccw_rotation_angle_deg
-    rotation_matrix = numpy.array([
-        [numpy.cos(ccw_rotation_angle_rad), -numpy.sin(ccw_rotation_angle_rad)],
-        [numpy.sin(ccw_rotation_angle_rad), numpy.cos(ccw_rotation_angle_rad)]
-    ])
-
-    x_prime_displacements_metres = numpy.full(
-        x_displacements_metres.shape, numpy.nan)
-    y_prime_displacements_metres = numpy.full(
-        x_displacements_metres.shape, numpy.nan)
-    num_points = x_prime_displacements_metres.size
-
-    for i in range(num_points):
-        this_vector = numpy.transpose(numpy.array(
-            [x_displacements_metres.flat[i], y_displacements_metres.flat[i]]))
-        this_vector = numpy.matmul(rotation_matrix, this_vector)
-        x_prime_displacements_metres.flat[i] = this_vector[0]
-        y_prime_displacements_metres.flat[i] = this_vector[1]
+    cos_rotation_angle = numpy.cos(ccw_rotation_angle_rad)
+    sin_rotation_angle = numpy.sin(ccw_rotation_angle_rad)
+
+    x_prime_displacements_metres = (
+        cos_rotation_angle * x_displacements_metres -
+        sin_rotation_angle * y_displacements_metres)
+    y_prime_displacements_metres = (
+        sin_rotation_angle * x_displacements_metres +
+        cos_rotation_angle * y_displacements_metres)
 
     return x_prime_displacements_metres, y_prime_displacements_metres
 
@@ -2,6 +2,8 @@
 
 import unittest
 import numpy
+import geopy
+from geopy.distance import VincentyDistance
 from gewittergefahr.gg_utils import geodetic_utils
 
 DEFAULT_TOLERANCE = 1e-6
@@ -53,6 +55,49 @@ END_LATITUDES_DEG = numpy.array([[53.5, 54.398440, 53.490503],
 END_LONGITUDES_DEG = numpy.array([[246.5, 246.5, 248.006729],
                                   [246.5, 244.993271, 245.450152]])
 
+# The following constants are used to test _vincenty_forward.
+VINCENTY_START_LATITUDES_DEG = numpy.array(
+    [0., 0., 35., 35., -45., 53.5, 70., 89.5, -89.5, 20.])
+VINCENTY_START_LONGITUDES_DEG = numpy.array(
+    [0., 179.9, 265., -95., 170., 246.5, 10., 45., 300., 359.99])
+VINCENTY_DISTANCES_METRES = numpy.array(
+    [1e6, 5e4, 0., 1e3, 3e6, 1e5, 2e5, 1e5, 5e5, 7e6])
+VINCENTY_BEARINGS_DEG = numpy.array(
+    [90., 90., 45., 360., 225., 270., 0., 180., 135., 60.])
+VINCENTY_TOLERANCE_DEG = 1e-9
+
+
+def _geopy_forward(start_latitudes_deg, start_longitudes_deg,
+                   scalar_displacements_metres, geodetic_bearings_deg):
+    """Solves forward geodetic problem with geopy, one point at a time.
+
+    :param start_latitudes_deg: See doc for
+        `geodetic_utils._vincenty_forward`.
+    :param start_longitudes_deg: Same.
+    :param scalar_displacements_metres: Same.
+    :param geodetic_bearings_deg: Same.
+    :return: end_latitudes_deg: Same.
+    :return: end_longitudes_deg: Same.
+    """
+
+    num_points = len(start_latitudes_deg)
+    end_latitudes_deg = numpy.full(num_points, numpy.nan)
+    end_longitudes_deg = numpy.full(num_points, numpy.nan)
+
+    for i in range(num_points):
+        this_end_point_object = VincentyDistance(
+            meters=scalar_displacements_metres[i]
+        ).destination(
+            geopy.Point(start_latitudes_deg[i], start_longitudes_deg[i]),
+            geodetic_bearings_deg[i]
+        )
+
+        end_latitudes_deg[i] = this_end_point_object.latitude
+        end_longitudes_deg[i] = this_end_point_object.longitude
+
+    return end_latitudes_deg, end_longitudes_deg
+
+
 # The following constants are used to test standard_to_geodetic_angles and
 # geodetic_to_standard_angles.
 STANDARD_BEARINGS_DEG = numpy.array([[90, 60, 45, 30, 0],
@@ -188,6 +233,69 @@ class GeodeticUtilsTests(unittest.TestCase):
             these_end_longitudes_deg, END_LONGITUDES_DEG,
             atol=LATLNG_TOLERANCE_DEG))
 
+    def test_vincenty_forward(self):
+        """Ensures correct output from _vincenty_forward.
+
+        In this case, output is compared with geopy.
+        """
+
+        (these_end_latitudes_deg, these_end_longitudes_deg
+        ) = geodetic_utils._vincenty_forward(
+            start_latitudes_deg=VINCENTY_START_LATITUDES_DEG,
+            start_longitudes_deg=VINCENTY_START_LONGITUDES_DEG,
+            scalar_displacements_metres=VINCENTY_DISTANCES_METRES,
+            geodetic_bearings_deg=VINCENTY_BEARINGS_DEG)
+
+        (expected_end_latitudes_deg, expected_end_longitudes_deg
+        ) = _geopy_forward(
+            start_latitudes_deg=VINCENTY_START_LATITUDES_DEG,
+            start_longitudes_deg=VINCENTY_START_LONGITUDES_DEG,
+            scalar_displacements_metres=VINCENTY_DISTANCES_METRES,
+            geodetic_bearings_deg=VINCENTY_BEARINGS_DEG)
+
+        these_longitude_diffs_deg = numpy.absolute(
+            these_end_longitudes_deg - expected_end_longitudes_deg)
+        these_longitude_diffs_deg = numpy.minimum(
+            these_longitude_diffs_deg, 360. - these_longitude_diffs_deg)
+
+        self.assertTrue(numpy.allclose(
+            these_end_latitudes_deg, expected_end_latitudes_deg,
+            atol=VINCENTY_TOLERANCE_DEG))
+        self.assertTrue(numpy.all(
+            these_longitude_diffs_deg < VINCENTY_TOLERANCE_DEG))
+
+    def test_vincenty_forward_2d(self):
+        """Ensures correct output from _vincenty_forward.
+
+        In this case, inputs are 2-D arrays and output must have the same shape.
+        """
+
+        these_dimensions = (2, 5)
+
+        (these_end_latitudes_deg, these_end_longitudes_deg
+        ) = geodetic_utils._vincenty_forward(
+            start_latitudes_deg=numpy.reshape(
+                VINCENTY_START_LATITUDES_DEG, these_dimensions),
+            start_longitudes_deg=numpy.reshape(
+                VINCENTY_START_LONGITUDES_DEG, these_dimensions),
+            scalar_displacements_metres=numpy.reshape(
+                VINCENTY_DISTANCES_METRES, these_dimensions),
+            geodetic_bearings_deg=numpy.reshape(
+                VINCENTY_BEARINGS_DEG, these_dimensions)
+        )
+
+        (expected_end_latitudes_deg, expected_end_longitudes_deg
+        ) = _geopy_forward(
+            start_latitudes_deg=VINCENTY_START_LATITUDES_DEG,
+            start_longitudes_deg=VINCENTY_START_LONGITUDES_DEG,
+            scalar_displacements_metres=VINCENTY_DISTANCES_METRES,
+            geodetic_bearings_deg=VINCENTY_BEARINGS_DEG)
+
+        self.assertTrue(these_end_latitudes_deg.shape == these_dimensions)
+        self.assertTrue(numpy.allclose(
+            numpy.ravel(these_end_latitudes_deg), expected_end_latitudes_deg,
+            atol=VINCENTY_TOLERANCE_DEG))
+
     def test_xy_to_scalar_displacements_and_bearings(self):
         """Ensures correctness of xy_to_scalar_displacements_and_bearings."""
 
@@ -7,7 +7,6 @@ import pandas
 import scipy.interpolate
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import nwp_model_io
-from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import nwp_model_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -54,6 +53,18 @@ OTHER_WIND_COMPONENT_INDICES_KEY = 'other_wind_component_indices'
 ROTATION_SINES_KEY = 'rotation_sine_by_query_point'
 ROTATION_COSINES_KEY = 'rotation_cosine_by_query_point'
 
+BILINEAR_LOWER_ROWS_KEY = 'lower_row_indices'
+BILINEAR_LOWER_COLUMNS_KEY = 'lower_column_indices'
+BILINEAR_ROW_WEIGHTS_KEY = 'row_weights'
+BILINEAR_COLUMN_WEIGHTS_KEY = 'column_weights'
+BILINEAR_OUTSIDE_GRID_FLAGS_KEY = 'outside_grid_flags'
+
+PLAN_METHOD_KEY = 'method_string'
+PLAN_NUM_ROWS_KEY = 'num_grid_rows'
+PLAN_NUM_COLUMNS_KEY = 'num_grid_columns'
+PLAN_GRID_INDICES_KEY = 'flat_grid_indices'
+PLAN_WEIGHTS_KEY = 'grid_point_weights'
+
 # TODO(thunderhoser): Allow this module to interpolate between different lead
 # times from the same model initialization, rather than just interpolating
 # between zero-hour analyses from the same initialization.
@@ -116,6 +127,37 @@ def _interp_to_next_time(
     return numpy.stack(list_of_interp_matrices, axis=-1)
 
 
+def _find_nearest_indices(sorted_input_values, test_values):
+    """Finds nearest value in array to each test value.
+
+    This is a vectorized version of `general_utils.find_nearest_value` (with
+    the same tie-breaking, i.e., ties go to the larger index).
+
+    :param sorted_input_values: 1-D numpy array.  Must be sorted in ascending
+        order.
+    :param test_values: numpy array (any shape) of test values.
+    :return: nearest_indices: numpy array (same shape as `test_values`) with
+        array index of nearest value in `sorted_input_values`.
+    """
+
+    num_input_values = len(sorted_input_values)
+    nearest_indices = numpy.searchsorted(
+        sorted_input_values, test_values, side='left')
+    past_end_flags = nearest_indices == num_input_values
+
+    nearest_indices = numpy.minimum(nearest_indices, num_input_values - 1)
+    previous_indices = numpy.maximum(nearest_indices - 1, 0)
+    previous_closer_flags = numpy.logical_and(
+        nearest_indices > 0,
+        numpy.absolute(test_values - sorted_input_values[previous_indices]) <
+        numpy.absolute(test_values - sorted_input_values[nearest_indices])
+    )
+
+    return numpy.where(
+        numpy.logical_and(previous_closer_flags, numpy.invert(past_end_flags)),
+        previous_indices, nearest_indices)
+
+
 def _nn_interp_from_xy_grid_to_points(
         input_matrix, sorted_grid_point_x_metres, sorted_grid_point_y_metres,
         query_x_coords_metres, query_y_coords_metres):
@@ -129,17 +171,63 @@ def _nn_interp_from_xy_grid_to_points(
     :return: interp_values: Same.
     """
 
-    num_query_points = len(query_x_coords_metres)
-    interp_values = numpy.full(num_query_points, numpy.nan)
+    rows = _find_nearest_indices(
+        sorted_grid_point_y_metres, query_y_coords_metres)
+    columns = _find_nearest_indices(
+        sorted_grid_point_x_metres, query_x_coords_metres)
+
+    return input_matrix[rows, columns].astype(float)
 
-    for i in range(num_query_points):
-        _, this_row = general_utils.find_nearest_value(
-            sorted_grid_point_y_metres, query_y_coords_metres[i])
-        _, this_column = general_utils.find_nearest_value(
-            sorted_grid_point_x_metres, query_x_coords_metres[i])
-        interp_values[i] = input_matrix[this_row, this_column]
 
-    return interp_values
+def _interp_with_plan(
+        input_matrix, interp_plan_dict_by_key, plan_key,
+        sorted_grid_point_x_metres, sorted_grid_point_y_metres,
+        query_x_coords_metres, query_y_coords_metres, method_string,
+        spline_degree):
+    """Interpolates from x-y grid to points, reusing plan where possible.
+
+    If the interpolation method is supported by `get_interp_plan`, the plan is
+    created on first use and stored in `interp_plan_dict_by_key`, so that later
+    fields with the same plan key need only `apply_interp_plan`.  Otherwise,
+    this method calls `interp_from_xy_grid_to_points`.
+
+    :param input_matrix: See doc for `interp_from_xy_grid_to_points`.
+    :param interp_plan_dict_by_key: Dictionary, where each key is a plan key
+        and each value is a dictionary created by `get_interp_plan`.  Will be
+        modified in place.
+    :param plan_key: Key for the given grid and query points.
+    :param sorted_grid_point_x_metres: See doc for
+        `interp_from_xy_grid_to_points`.
+    :param sorted_grid_point_y_metres: Same.
+    :param query_x_coords_metres: Same.
+    :param query_y_coords_metres: Same.
+    :param method_string: Same.
+    :param spline_degree: Same.
+    :return: interp_values: Same.
+    """
+
+    if not (method_string == NEAREST_NEIGHBOUR_METHOD_STRING or
+            spline_degree == 1):
+        return interp_from_xy_grid_to_points(
+            input_matrix=input_matrix,
+            sorted_grid_point_x_metres=sorted_grid_point_x_metres,
+            sorted_grid_point_y_metres=sorted_grid_point_y_metres,
+            query_x_coords_metres=query_x_coords_metres,
+            query_y_coords_metres=query_y_coords_metres,
+            method_string=method_string, spline_degree=spline_degree,
+            extrapolate=True)
+
+    if plan_key not in interp_plan_dict_by_key:
+        interp_plan_dict_by_key[plan_key] = get_interp_plan(
+            sorted_grid_point_x_metres=sorted_grid_point_x_metres,
+            sorted_grid_point_y_metres=sorted_grid_point_y_metres,
+            query_x_coords_metres=query_x_coords_metres,
+            query_y_coords_metres=query_y_coords_metres,
+            method_string=method_string, spline_degree=spline_degree)
+
+    return apply_interp_plan(
+        input_matrix=input_matrix,
+        interp_plan_dict=interp_plan_dict_by_key[plan_key])
 
 
 def _get_wind_rotation_metadata(field_names_grib1, model_name):
@@ -285,48 +373,174 @@ def _read_nwp_for_interp(
             list_of_model_grids_other_wind_component[i] = None
             continue
 
-        list_of_model_grids[i] = nwp_model_io.read_field_from_grib_file(
+        these_field_names_grib1 = [field_name_grib1]
+        if rotate_wind:
+            these_field_names_grib1.append(
+                field_name_other_wind_component_grib1)
+
+        this_field_matrix_dict = nwp_model_io.read_fields_from_grib_file(
             grib_file_name=this_grib_file_name,
-            field_name_grib1=field_name_grib1, model_name=model_name,
+            field_names_grib1=these_field_names_grib1, model_name=model_name,
             grid_id=grid_id, wgrib_exe_name=wgrib_exe_name,
             wgrib2_exe_name=wgrib2_exe_name,
-            raise_error_if_fails=raise_error_if_missing)
-
-        if list_of_model_grids[i] is None:
-            missing_data = True
-            list_of_model_grids_other_wind_component[i] = None
-            continue
+            raise_error_if_fails=raise_error_if_missing, use_cache=True)
 
+        list_of_model_grids[i] = this_field_matrix_dict[field_name_grib1]
         if rotate_wind:
             list_of_model_grids_other_wind_component[i] = (
-                nwp_model_io.read_field_from_grib_file(
-                    grib_file_name=this_grib_file_name,
-                    field_name_grib1=field_name_other_wind_component_grib1,
-                    model_name=model_name, grid_id=grid_id,
-                    wgrib_exe_name=wgrib_exe_name,
-                    wgrib2_exe_name=wgrib2_exe_name,
-                    raise_error_if_fails=raise_error_if_missing))
+                this_field_matrix_dict[field_name_other_wind_component_grib1]
+            )
 
-            if list_of_model_grids_other_wind_component[i] is None:
-                missing_data = True
-                list_of_model_grids[i] = None
-                continue
+        missing_this_file = list_of_model_grids[i] is None or (
+            rotate_wind and list_of_model_grids_other_wind_component[i] is None)
+
+        if missing_this_file:
+            missing_data = True
+            list_of_model_grids[i] = None
+            list_of_model_grids_other_wind_component[i] = None
 
     return (list_of_model_grids, list_of_model_grids_other_wind_component,
             missing_data)
 
 
-def _get_grids_for_model(model_name):
-    """Returns list of grids used to interpolate from the given model.
+def _get_fields_to_prefill(
+        field_names_grib1, field_names_other_wind_component_grib1):
+    """Returns unique fields to read into `nwp_model_io.GRID_CACHE`.
 
-    :param model_name: Model name (must be accepted by
-        `nwp_model_utils.check_model_name`).
-    :return: grid_ids: 1-D list of grid IDs (strings).
+    :param field_names_grib1: See doc for `_prefill_grid_cache`.
+    :param field_names_other_wind_component_grib1: Same.
+    :return: field_names_to_read_grib1: 1-D list of unique field names in grib1
+        format, including wind components needed for rotation.
     """
 
-    if model_name == nwp_model_utils.NARR_MODEL_NAME:
-        return [nwp_model_utils.ID_FOR_221GRID]
-    return [nwp_model_utils.ID_FOR_130GRID, nwp_model_utils.ID_FOR_252GRID]
+    field_names_to_read_grib1 = []
+    for this_field_name_grib1 in (
+            field_names_grib1 + field_names_other_wind_component_grib1):
+        if this_field_name_grib1 in ['', None]:
+            continue
+        if this_field_name_grib1 in field_names_to_read_grib1:
+            continue
+
+        field_names_to_read_grib1.append(this_field_name_grib1)
+
+    return field_names_to_read_grib1
+
+
+def _split_query_time_ranges(
+        query_to_model_times_table, num_bytes_per_init_time, max_bytes):
+    """Splits query-time ranges into chunks whose grids fit in the cache.
+
+    Each chunk is a run of consecutive query-time ranges, such that grids for
+    all model-initialization times needed by the chunk take up <= `max_bytes`.
+    Each chunk contains at least one range, even if grids for that one range do
+    not fit.
+
+    :param query_to_model_times_table: pandas DataFrame created by
+        `nwp_model_utils.get_times_needed_for_interp`.
+    :param num_bytes_per_init_time: Number of bytes in all grids read from one
+        initialization time.
+    :param max_bytes: Max number of bytes for one chunk.
+    :return: range_indices_by_chunk: 1-D list, where each element is a numpy
+        array with indices of query-time ranges (rows in
+        `query_to_model_times_table`) in one chunk.
+    """
+
+    init_time_needed_matrix = numpy.stack(
+        tuple(query_to_model_times_table[
+            nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN].values),
+        axis=0)
+
+    num_query_time_ranges = init_time_needed_matrix.shape[0]
+    range_indices_by_chunk = []
+    first_range_index = 0
+    init_time_needed_flags = init_time_needed_matrix[0, :]
+
+    for i in range(1, num_query_time_ranges):
+        these_flags = numpy.logical_or(
+            init_time_needed_flags, init_time_needed_matrix[i, :])
+        this_num_bytes = numpy.sum(these_flags) * num_bytes_per_init_time
+
+        if this_num_bytes <= max_bytes:
+            init_time_needed_flags = these_flags
+            continue
+
+        range_indices_by_chunk.append(
+            numpy.linspace(first_range_index, i - 1,
+                           num=i - first_range_index, dtype=int)
+        )
+        first_range_index = i
+        init_time_needed_flags = init_time_needed_matrix[i, :]
+
+    range_indices_by_chunk.append(
+        numpy.linspace(first_range_index, num_query_time_ranges - 1,
+                       num=num_query_time_ranges - first_range_index, dtype=int)
+    )
+
+    return range_indices_by_chunk
+
+
+def _prefill_grid_cache(
+        init_times_unix_sec, query_to_model_times_table, field_names_grib1,
+        field_names_other_wind_component_grib1, top_grib_directory_name,
+        model_name, wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT):
+    """Reads all fields needed for interpolation into `nwp_model_io.GRID_CACHE`.
+
+    Each grib file (one per model-initialization time) is inventoried and
+    extracted once, for all fields together, so that
+    `_read_nwp_for_interp_any_grid` finds each field in the cache.  Grids are
+    tried in the same order as in `_read_nwp_for_interp_any_grid`.
+
+    Missing files and fields are skipped here.  They will be handled (and
+    reported) by `_read_nwp_for_interp_any_grid`.
+
+    :param init_times_unix_sec: See doc for `_read_nwp_for_interp`.
+    :param query_to_model_times_table: pandas DataFrame created by
+        `nwp_model_utils.get_times_needed_for_interp`.
+    :param field_names_grib1: 1-D list of field names in grib1 format.
+    :param field_names_other_wind_component_grib1: 1-D list of field names
+        created by `_get_wind_rotation_metadata`.
+    :param top_grib_directory_name: See doc for `_read_nwp_for_interp`.
+    :param model_name: Same.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    """
+
+    field_names_to_read_grib1 = _get_fields_to_prefill(
+        field_names_grib1=field_names_grib1,
+        field_names_other_wind_component_grib1=
+        field_names_other_wind_component_grib1)
+
+    init_time_needed_flags = numpy.any(numpy.stack(
+        tuple(query_to_model_times_table[
+            nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN].values),
+        axis=0
+    ), axis=0)
+
+    grid_ids = get_grids_for_model(model_name)
+
+    for i in numpy.where(init_time_needed_flags)[0]:
+        for this_grid_id in grid_ids:
+            this_grib_file_name = nwp_model_io.find_grib_file(
+                top_directory_name=top_grib_directory_name,
+                init_time_unix_sec=init_times_unix_sec[i],
+                model_name=model_name, grid_id=this_grid_id,
+                lead_time_hours=FORECAST_LEAD_TIME_HOURS,
+                raise_error_if_missing=False)
+
+            if not os.path.isfile(this_grib_file_name):
+                continue
+
+            this_field_matrix_dict = nwp_model_io.read_fields_from_grib_file(
+                grib_file_name=this_grib_file_name,
+                field_names_grib1=field_names_to_read_grib1,
+                model_name=model_name, grid_id=this_grid_id,
+                wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+                raise_error_if_fails=False, use_cache=True)
+
+            if all([this_field_matrix_dict[f] is not None
+                    for f in field_names_to_read_grib1]):
+                break
 
 
 def _read_nwp_for_interp_any_grid(
@@ -357,7 +571,7 @@ def _read_nwp_for_interp_any_grid(
     :return: missing_data: Same.
     """
 
-    grid_ids = _get_grids_for_model(model_name)
+    grid_ids = get_grids_for_model(model_name)
 
     for i in range(len(grid_ids)):
         (list_of_model_grids, list_of_model_grids_other_wind_component,
@@ -578,6 +792,75 @@ def check_spatial_interp_method(interp_method_string):
         raise ValueError(error_string)
 
 
+def get_grids_for_model(model_name):
+    """Returns list of grids used to interpolate from the given model.
+
+    :param model_name: Model name (must be accepted by
+        `nwp_model_utils.check_model_name`).
+    :return: grid_ids: 1-D list of grid IDs (strings).
+    """
+
+    if model_name == nwp_model_utils.NARR_MODEL_NAME:
+        return [nwp_model_utils.ID_FOR_221GRID]
+    return [nwp_model_utils.ID_FOR_130GRID, nwp_model_utils.ID_FOR_252GRID]
+
+
+def get_query_time_ranges(
+        query_times_unix_sec, model_name, temporal_interp_method_string,
+        all_query_times_unix_sec=None):
+    """Assigns each query time to one range of query times.
+
+    Ranges (and the model-initialization times needed for each) are determined
+    by `nwp_model_utils.get_times_needed_for_interp`.  Each range except the
+    last includes its minimum but not its maximum time, and the last range
+    includes both.  Since the last range depends on the latest query time, a
+    query time may be assigned to a different range (and init time) when
+    interpolating to a subset of query times.
+
+    Q = number of query times
+
+    :param query_times_unix_sec: length-Q numpy array of query times.
+    :param model_name: See doc for `interp_nwp_from_xy_grid`.
+    :param temporal_interp_method_string: Same.
+    :param all_query_times_unix_sec: 1-D numpy array of query times used to
+        determine ranges.  If `query_times_unix_sec` is a subset of a larger
+        set, pass the larger set here, so that each query time is assigned to
+        the same range as in the larger set.  If None, this defaults to
+        `query_times_unix_sec`.
+    :return: init_times_unix_sec: 1-D numpy array of model-initialization times
+        needed.
+    :return: query_to_model_times_table: pandas DataFrame created by
+        `nwp_model_utils.get_times_needed_for_interp`, where each row is one
+        range of query times.
+    :return: range_indices: length-Q numpy array of range indices (rows in
+        `query_to_model_times_table`).
+    """
+
+    if all_query_times_unix_sec is None:
+        all_query_times_unix_sec = query_times_unix_sec
+
+    error_checking.assert_is_geq_numpy_array(
+        query_times_unix_sec, numpy.min(all_query_times_unix_sec))
+    error_checking.assert_is_leq_numpy_array(
+        query_times_unix_sec, numpy.max(all_query_times_unix_sec))
+
+    _, init_time_step_hours = nwp_model_utils.get_time_steps(model_name)
+    init_times_unix_sec, query_to_model_times_table = (
+        nwp_model_utils.get_times_needed_for_interp(
+            query_times_unix_sec=all_query_times_unix_sec,
+            model_time_step_hours=init_time_step_hours,
+            method_string=temporal_interp_method_string))
+
+    range_indices = numpy.searchsorted(
+        query_to_model_times_table[
+            nwp_model_utils.MIN_QUERY_TIME_COLUMN].values,
+        query_times_unix_sec, side='right') - 1
+    range_indices = numpy.clip(
+        range_indices, 0, len(query_to_model_times_table.index) - 1)
+
+    return init_times_unix_sec, query_to_model_times_table, range_indices
+
+
 def interp_in_time(
         input_matrix, sorted_input_times_unix_sec, query_times_unix_sec,
         method_string, extrapolate=False):
@@ -729,6 +1012,280 @@ def interp_from_xy_grid_to_points(
         query_y_coords_metres, query_x_coords_metres, grid=False)
 
 
+def get_bilinear_interp_weights(
+        sorted_grid_point_x_coords, sorted_grid_point_y_coords, query_x_coords,
+        query_y_coords):
+    """Computes bilinear-interpolation weights from x-y grid to query points.
+
+    The weights can be reused (by `interp_with_bilinear_weights`) for any
+    number of fields on the same grid, which is much faster than fitting a new
+    interpolator to each field.  Results are the same as
+    `interp_from_xy_grid_to_points` with method_string = "spline",
+    spline_degree = 1, and extrapolate = True (values at query points outside
+    the grid are taken from the nearest edge).
+
+    M = number of rows (unique y-coordinates at grid points)
+    N = number of columns (unique x-coordinates at grid points)
+
+    :param sorted_grid_point_x_coords: length-N numpy array with x-coordinates
+        of grid points.  Must be sorted in ascending order.  Units do not
+        matter, as long as they are the same for `query_x_coords`.
+    :param sorted_grid_point_y_coords: length-M numpy array with y-coordinates
+        of grid points.  Must be sorted in ascending order.
+    :param query_x_coords: numpy array (any shape) with x-coordinates of query
+        points.
+    :param query_y_coords: numpy array (same shape as `query_x_coords`) with
+        y-coordinates of query points.
+    :return: interp_weight_dict: Dictionary with the following keys.  Each
+        value is a numpy array with the same shape as `query_x_coords`.
+    interp_weight_dict['lower_row_indices']: Row index of grid points just
+        below query points.
+    interp_weight_dict['lower_column_indices']: Column index of grid points
+        just left of query points.
+    interp_weight_dict['row_weights']: Weights for row
+        `lower_row_indices + 1` (1 minus weights for `lower_row_indices`).
+    interp_weight_dict['column_weights']: Weights for column
+        `lower_column_indices + 1` (1 minus weights for `lower_column_indices`).
+    interp_weight_dict['outside_grid_flags']: Boolean flags, indicating which
+        query points are outside the grid.
+    """
+
+    error_checking.assert_is_numpy_array_without_nan(sorted_grid_point_x_coords)
+    error_checking.assert_is_numpy_array(
+        sorted_grid_point_x_coords, num_dimensions=1)
+    error_checking.assert_is_geq(len(sorted_grid_point_x_coords), 2)
+
+    error_checking.assert_is_numpy_array_without_nan(sorted_grid_point_y_coords)
+    error_checking.assert_is_numpy_array(
+        sorted_grid_point_y_coords, num_dimensions=1)
+    error_checking.assert_is_geq(len(sorted_grid_point_y_coords), 2)
+
+    error_checking.assert_is_numpy_array_without_nan(query_x_coords)
+    error_checking.assert_is_numpy_array_without_nan(query_y_coords)
+    error_checking.assert_is_numpy_array(
+        query_y_coords, exact_dimensions=numpy.array(query_x_coords.shape))
+
+    outside_grid_flags = numpy.logical_or.reduce((
+        query_x_coords < sorted_grid_point_x_coords[0],
+        query_x_coords > sorted_grid_point_x_coords[-1],
+        query_y_coords < sorted_grid_point_y_coords[0],
+        query_y_coords > sorted_grid_point_y_coords[-1]
+    ))
+
+    interp_weight_dict = {
+        BILINEAR_OUTSIDE_GRID_FLAGS_KEY: outside_grid_flags
+    }
+
+    for (these_grid_coords, these_query_coords, this_index_key,
+         this_weight_key) in [
+             (sorted_grid_point_x_coords, query_x_coords,
+              BILINEAR_LOWER_COLUMNS_KEY, BILINEAR_COLUMN_WEIGHTS_KEY),
+             (sorted_grid_point_y_coords, query_y_coords,
+              BILINEAR_LOWER_ROWS_KEY, BILINEAR_ROW_WEIGHTS_KEY)
+         ]:
+        these_query_coords = numpy.clip(
+            these_query_coords, these_grid_coords[0], these_grid_coords[-1])
+
+        these_lower_indices = numpy.searchsorted(
+            these_grid_coords, these_query_coords, side='right') - 1
+        these_lower_indices = numpy.clip(
+            these_lower_indices, 0, len(these_grid_coords) - 2)
+
+        these_lower_coords = these_grid_coords[these_lower_indices]
+        these_weights = (
+            (these_query_coords - these_lower_coords) /
+            (these_grid_coords[these_lower_indices + 1] - these_lower_coords)
+        )
+
+        interp_weight_dict[this_index_key] = these_lower_indices
+        interp_weight_dict[this_weight_key] = these_weights
+
+    return interp_weight_dict
+
+
+def interp_with_bilinear_weights(input_matrix, interp_weight_dict):
+    """Bilinear interpolation from x-y grid to points, using precomp weights.
+
+    M = number of rows (unique y-coordinates at grid points)
+    N = number of columns (unique x-coordinates at grid points)
+
+    :param input_matrix: M-by-N numpy array of gridded data.
+    :param interp_weight_dict: Dictionary created by
+        `get_bilinear_interp_weights` for the same grid.
+    :return: interp_values: numpy array of interpolated values, with the same
+        shape as query points used to create `interp_weight_dict`.
+    """
+
+    error_checking.assert_is_real_numpy_array(input_matrix)
+    error_checking.assert_is_numpy_array(input_matrix, num_dimensions=2)
+
+    lower_rows = interp_weight_dict[BILINEAR_LOWER_ROWS_KEY]
+    lower_columns = interp_weight_dict[BILINEAR_LOWER_COLUMNS_KEY]
+    row_weights = interp_weight_dict[BILINEAR_ROW_WEIGHTS_KEY]
+    column_weights = interp_weight_dict[BILINEAR_COLUMN_WEIGHTS_KEY]
+
+    lower_values = (
+        input_matrix[lower_rows, lower_columns] * (1. - column_weights) +
+        input_matrix[lower_rows, lower_columns + 1] * column_weights
+    )
+    upper_values = (
+        input_matrix[lower_rows + 1, lower_columns] * (1. - column_weights) +
+        input_matrix[lower_rows + 1, lower_columns + 1] * column_weights
+    )
+
+    return lower_values * (1. - row_weights) + upper_values * row_weights
+
+
+def get_interp_plan(
+        sorted_grid_point_x_metres, sorted_grid_point_y_metres,
+        query_x_coords_metres, query_y_coords_metres,
+        method_string=NEAREST_NEIGHBOUR_METHOD_STRING,
+        spline_degree=DEFAULT_SPLINE_DEGREE):
+    """Precomputes interpolation from x-y grid to scattered points.
+
+    The plan contains, for each query point, the grid points used and their
+    weights.  It can be applied (by `apply_interp_plan`) to any number of fields
+    on the same grid, which is much faster than calling
+    `interp_from_xy_grid_to_points` for each field.  Results are the same as
+    `interp_from_xy_grid_to_points` with extrapolate = True.
+
+    Only nearest-neighbour and linear (spline with degree 1) interpolation are
+    supported, because higher-degree splines depend on every grid point.
+
+    M = number of rows (unique y-coordinates at grid points)
+    N = number of columns (unique x-coordinates at grid points)
+    Q = number of query points
+    K = number of grid points used for each query point (1 for
+        nearest-neighbour, 4 for linear)
+
+    :param sorted_grid_point_x_metres: See doc for
+        `interp_from_xy_grid_to_points`.
+    :param sorted_grid_point_y_metres: Same.
+    :param query_x_coords_metres: Same.
+    :param query_y_coords_metres: Same.
+    :param method_string: Same.
+    :param spline_degree: Same.
+    :return: interp_plan_dict: Dictionary with the following keys.
+    interp_plan_dict['method_string']: Interpolation method.
+    interp_plan_dict['num_grid_rows']: Number of rows in grid (M).
+    interp_plan_dict['num_grid_columns']: Number of columns in grid (N).
+    interp_plan_dict['flat_grid_indices']: Q-by-K numpy array of grid points,
+        indexing the flattened M-by-N grid.
+    interp_plan_dict['grid_point_weights']: Q-by-K numpy array of weights.
+    :raises: ValueError: if interpolation method is not supported.
+    """
+
+    error_checking.assert_is_numpy_array_without_nan(sorted_grid_point_x_metres)
+    error_checking.assert_is_numpy_array(
+        sorted_grid_point_x_metres, num_dimensions=1)
+    num_grid_columns = len(sorted_grid_point_x_metres)
+
+    error_checking.assert_is_numpy_array_without_nan(sorted_grid_point_y_metres)
+    error_checking.assert_is_numpy_array(
+        sorted_grid_point_y_metres, num_dimensions=1)
+    num_grid_rows = len(sorted_grid_point_y_metres)
+
+    error_checking.assert_is_numpy_array_without_nan(query_x_coords_metres)
+    error_checking.assert_is_numpy_array(
+        query_x_coords_metres, num_dimensions=1)
+    num_query_points = len(query_x_coords_metres)
+
+    error_checking.assert_is_numpy_array_without_nan(query_y_coords_metres)
+    error_checking.assert_is_numpy_array(
+        query_y_coords_metres, exact_dimensions=numpy.array([num_query_points]))
+
+    check_spatial_interp_method(method_string)
+
+    if method_string == NEAREST_NEIGHBOUR_METHOD_STRING:
+        rows = _find_nearest_indices(
+            sorted_grid_point_y_metres, query_y_coords_metres)
+        columns = _find_nearest_indices(
+            sorted_grid_point_x_metres, query_x_coords_metres)
+
+        flat_grid_indices = numpy.reshape(
+            rows * num_grid_columns + columns, (num_query_points, 1))
+        grid_point_weights = numpy.full((num_query_points, 1), 1.)
+
+    elif spline_degree == 1:
+        interp_weight_dict = get_bilinear_interp_weights(
+            sorted_grid_point_x_coords=sorted_grid_point_x_metres,
+            sorted_grid_point_y_coords=sorted_grid_point_y_metres,
+            query_x_coords=query_x_coords_metres,
+            query_y_coords=query_y_coords_metres)
+
+        lower_rows = interp_weight_dict[BILINEAR_LOWER_ROWS_KEY]
+        lower_columns = interp_weight_dict[BILINEAR_LOWER_COLUMNS_KEY]
+        row_weights = interp_weight_dict[BILINEAR_ROW_WEIGHTS_KEY]
+        column_weights = interp_weight_dict[BILINEAR_COLUMN_WEIGHTS_KEY]
+        lower_flat_indices = lower_rows * num_grid_columns + lower_columns
+
+        flat_grid_indices = numpy.stack((
+            lower_flat_indices, lower_flat_indices + 1,
+            lower_flat_indices + num_grid_columns,
+            lower_flat_indices + num_grid_columns + 1
+        ), axis=-1)
+
+        grid_point_weights = numpy.stack((
+            (1. - row_weights) * (1. - column_weights),
+            (1. - row_weights) * column_weights,
+            row_weights * (1. - column_weights),
+            row_weights * column_weights
+        ), axis=-1)
+
+    else:
+        error_string = (
+            'Interpolation plans support only nearest-neighbour and linear '
+            '(spline degree 1) interpolation, not spline degree {0:d}.'
+        ).format(spline_degree)
+        raise ValueError(error_string)
+
+    return {
+        PLAN_METHOD_KEY: method_string,
+        PLAN_NUM_ROWS_KEY: num_grid_rows,
+        PLAN_NUM_COLUMNS_KEY: num_grid_columns,
+        PLAN_GRID_INDICES_KEY: flat_grid_indices,
+        PLAN_WEIGHTS_KEY: grid_point_weights
+    }
+
+
+def apply_interp_plan(input_matrix, interp_plan_dict):
+    """Interpolates from x-y grid to scattered points, using precomputed plan.
+
+    M = number of rows (unique y-coordinates at grid points)
+    N = number of columns (unique x-coordinates at grid points)
+    Q = number of query points
+
+    :param input_matrix: numpy array of gridded data, where the last two axes
+        are M and N.  Any number of fields (e.g., different variables or
+        pressure levels) may be stacked along the leading axes.
+    :param interp_plan_dict: Dictionary created by `get_interp_plan` for the
+        same grid.
+    :return: interp_matrix: numpy array of interpolated values, with the same
+        leading axes as `input_matrix` and Q as the last axis.
+    """
+
+    error_checking.assert_is_real_numpy_array(input_matrix)
+    error_checking.assert_is_geq(len(input_matrix.shape), 2)
+
+    expected_grid_dimensions = numpy.array([
+        interp_plan_dict[PLAN_NUM_ROWS_KEY],
+        interp_plan_dict[PLAN_NUM_COLUMNS_KEY]
+    ])
+    error_checking.assert_is_numpy_array(
+        input_matrix[(0,) * (len(input_matrix.shape) - 2)],
+        exact_dimensions=expected_grid_dimensions)
+
+    flat_input_matrix = numpy.reshape(
+        input_matrix, input_matrix.shape[:-2] + (-1,))
+
+    interp_matrix = numpy.sum(
+        flat_input_matrix[..., interp_plan_dict[PLAN_GRID_INDICES_KEY]] *
+        interp_plan_dict[PLAN_WEIGHTS_KEY],
+        axis=-1)
+
+    return interp_matrix.astype(float)
+
+
 def interp_nwp_from_xy_grid(
         query_point_table, field_names, field_names_grib1, model_name,
         top_grib_directory_name, use_all_grids=True, grid_id=None,
@@ -737,13 +1294,20 @@ def interp_nwp_from_xy_grid(
         spline_degree=DEFAULT_SPLINE_DEGREE,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, all_query_times_unix_sec=None):
     """Interpolates NWP data from x-y grid in both space and time.
 
     Each query point consists of (latitude, longitude, time).  Before
     interpolation, query points will be projected to the same x-y space as the
     model.
 
+    Model grids are read through `nwp_model_io.GRID_CACHE`, so a field read by
+    one call (or one query-time range) is not read again by the next.
+    Query-time ranges are processed in chunks, where grids for each chunk fit in
+    the cache (see `nwp_model_io.set_max_bytes_in_grid_cache`).  Before any
+    field in a chunk is interpolated, all fields (including wind components
+    needed for rotation) are read from each grib file at once.
+
     F = number of fields to interpolate
     Q = number of query points
 
@@ -771,6 +1335,7 @@ def interp_nwp_from_xy_grid(
     :param wgrib_exe_name: Path to wgrib executable.
     :param wgrib2_exe_name: Path to wgrib2 executable.
     :param raise_error_if_missing: See doc for `_read_nwp_for_interp`.
+    :param all_query_times_unix_sec: See doc for `get_query_time_ranges`.
     :return: interp_table: pandas DataFrame, where each column is one field and
         each row is one query point.  Column names are taken directly from the
         input list `field_names`.
@@ -780,7 +1345,7 @@ def interp_nwp_from_xy_grid(
     nwp_model_utils.check_model_name(model_name)
 
     if model_name == nwp_model_utils.NARR_MODEL_NAME or use_all_grids:
-        grid_ids = _get_grids_for_model(model_name)
+        grid_ids = get_grids_for_model(model_name)
     else:
         grid_ids = [grid_id]
 
@@ -807,97 +1372,104 @@ def interp_nwp_from_xy_grid(
     rotation_sine_by_query_point = metadata_dict[ROTATION_SINES_KEY]
     rotation_cosine_by_query_point = metadata_dict[ROTATION_COSINES_KEY]
 
-    _, init_time_step_hours = nwp_model_utils.get_time_steps(model_name)
-    init_times_unix_sec, query_to_model_times_table = (
-        nwp_model_utils.get_times_needed_for_interp(
-            query_times_unix_sec=query_point_table[QUERY_TIME_COLUMN].values,
-            model_time_step_hours=init_time_step_hours,
-            method_string=temporal_interp_method_string))
+    (init_times_unix_sec, query_to_model_times_table, range_index_by_query_point
+    ) = get_query_time_ranges(
+        query_times_unix_sec=query_point_table[QUERY_TIME_COLUMN].values,
+        model_name=model_name,
+        temporal_interp_method_string=temporal_interp_method_string,
+        all_query_times_unix_sec=all_query_times_unix_sec)
+
+    # Grids are read and interpolated one chunk of query-time ranges at a time,
+    # so that grids read into the cache for one chunk are not dropped (to make
+    # room for later chunks) before they are used.
+    max_grid_size = max([
+        numpy.prod(nwp_model_utils.get_grid_dimensions(
+            model_name=model_name, grid_id=g))
+        for g in get_grids_for_model(model_name)
+    ])
+    num_fields_to_read = len(_get_fields_to_prefill(
+        field_names_grib1=field_names_grib1,
+        field_names_other_wind_component_grib1=
+        field_names_other_wind_component_grib1))
+
+    range_indices_by_chunk = _split_query_time_ranges(
+        query_to_model_times_table=query_to_model_times_table,
+        num_bytes_per_init_time=(
+            num_fields_to_read * max_grid_size * numpy.dtype(float).itemsize),
+        max_bytes=nwp_model_io.GRID_CACHE_STATS[nwp_model_io.MAX_BYTES_KEY])
 
     num_init_times = len(init_times_unix_sec)
-    num_query_time_ranges = len(query_to_model_times_table.index)
     num_fields = len(field_names)
-    interp_done_by_field = numpy.full(num_fields, False, dtype=bool)
 
-    for j in range(num_fields):
-        if interp_done_by_field[j]:
-            continue
+    # Each key is (grid index, query-time range), and each value is a plan
+    # created by `get_interp_plan`.  Plans are shared by all fields.
+    interp_plan_dict_by_key = {}
 
-        list_of_2d_grids = [None] * num_init_times
-        list_of_2d_grids_other_wind_component = [None] * num_init_times
+    for these_range_indices in range_indices_by_chunk:
+        _prefill_grid_cache(
+            init_times_unix_sec=init_times_unix_sec,
+            query_to_model_times_table=query_to_model_times_table.iloc[
+                these_range_indices],
+            field_names_grib1=field_names_grib1,
+            field_names_other_wind_component_grib1=
+            field_names_other_wind_component_grib1,
+            top_grib_directory_name=top_grib_directory_name,
+            model_name=model_name, wgrib_exe_name=wgrib_exe_name,
+            wgrib2_exe_name=wgrib2_exe_name)
 
-        for i in range(num_query_time_ranges):
-            if i == num_query_time_ranges - 1:
-                query_indices_in_this_range = numpy.where(
-                    query_point_table[QUERY_TIME_COLUMN].values >=
-                    query_to_model_times_table[
-                        nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[-1]
-                )[0]
-            else:
-                query_indices_in_this_range = numpy.where(numpy.logical_and(
-                    query_point_table[QUERY_TIME_COLUMN].values >=
-                    query_to_model_times_table[
-                        nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[i],
-                    query_point_table[QUERY_TIME_COLUMN].values <
-                    query_to_model_times_table[
-                        nwp_model_utils.MAX_QUERY_TIME_COLUMN].values[i]
-                ))[0]
-
-            (list_of_2d_grids, list_of_2d_grids_other_wind_component,
-             missing_data
-            ) = _read_nwp_for_interp_any_grid(
-                init_times_unix_sec=init_times_unix_sec,
-                query_to_model_times_row=query_to_model_times_table.iloc[[i]],
-                field_name_grib1=field_names_grib1[j],
-                field_name_other_wind_component_grib1=
-                field_names_other_wind_component_grib1[j],
-                list_of_model_grids=list_of_2d_grids,
-                list_of_model_grids_other_wind_component=
-                list_of_2d_grids_other_wind_component, model_name=model_name,
-                top_grib_directory_name=top_grib_directory_name,
-                wgrib_exe_name=wgrib_exe_name,
-                wgrib2_exe_name=wgrib2_exe_name,
-                raise_error_if_missing=raise_error_if_missing)
-
-            if missing_data:
+        interp_done_by_field = numpy.full(num_fields, False, dtype=bool)
+
+        for j in range(num_fields):
+            if interp_done_by_field[j]:
                 continue
 
-            list_of_spatial_interp_arrays = [numpy.array([])] * num_init_times
-            list_of_sinterp_arrays_other_wind_component = (
-                [numpy.array([])] * num_init_times)
-
-            init_time_needed_indices = numpy.where(
-                query_to_model_times_table[
-                    nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN
-                ].values[i])[0]
-
-            for t in init_time_needed_indices:
-                this_grid_id = nwp_model_utils.dimensions_to_grid_id(
-                    numpy.array(list_of_2d_grids[t].shape))
-                this_grid_index = grid_ids.index(this_grid_id)
-
-                list_of_spatial_interp_arrays[
-                    t
-                ] = interp_from_xy_grid_to_points(
-                    input_matrix=list_of_2d_grids[t],
-                    sorted_grid_point_x_metres=x_points_by_grid_metres[
-                        this_grid_index],
-                    sorted_grid_point_y_metres=y_points_by_grid_metres[
-                        this_grid_index],
-                    query_x_coords_metres=query_point_table_by_grid[
-                        this_grid_index][QUERY_X_COLUMN].values[
-                            query_indices_in_this_range],
-                    query_y_coords_metres=query_point_table_by_grid[
-                        this_grid_index][QUERY_Y_COLUMN].values[
-                            query_indices_in_this_range],
-                    method_string=spatial_interp_method_string,
-                    spline_degree=spline_degree, extrapolate=True)
+            list_of_2d_grids = [None] * num_init_times
+            list_of_2d_grids_other_wind_component = [None] * num_init_times
 
-                if rotate_wind_flags[j]:
-                    list_of_sinterp_arrays_other_wind_component[
-                        t
-                    ] = interp_from_xy_grid_to_points(
-                        input_matrix=list_of_2d_grids_other_wind_component[t],
+            for i in these_range_indices:
+                query_indices_in_this_range = numpy.where(
+                    range_index_by_query_point == i)[0]
+
+                (list_of_2d_grids, list_of_2d_grids_other_wind_component,
+                 missing_data
+                ) = _read_nwp_for_interp_any_grid(
+                    init_times_unix_sec=init_times_unix_sec,
+                    query_to_model_times_row=
+                    query_to_model_times_table.iloc[[i]],
+                    field_name_grib1=field_names_grib1[j],
+                    field_name_other_wind_component_grib1=
+                    field_names_other_wind_component_grib1[j],
+                    list_of_model_grids=list_of_2d_grids,
+                    list_of_model_grids_other_wind_component=
+                    list_of_2d_grids_other_wind_component,
+                    model_name=model_name,
+                    top_grib_directory_name=top_grib_directory_name,
+                    wgrib_exe_name=wgrib_exe_name,
+                    wgrib2_exe_name=wgrib2_exe_name,
+                    raise_error_if_missing=raise_error_if_missing)
+
+                if missing_data:
+                    continue
+
+                list_of_spatial_interp_arrays = (
+                    [numpy.array([])] * num_init_times)
+                list_of_sinterp_arrays_other_wind_component = (
+                    [numpy.array([])] * num_init_times)
+
+                init_time_needed_indices = numpy.where(
+                    query_to_model_times_table[
+                        nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN
+                    ].values[i])[0]
+
+                for t in init_time_needed_indices:
+                    this_grid_id = nwp_model_utils.dimensions_to_grid_id(
+                        numpy.array(list_of_2d_grids[t].shape))
+                    this_grid_index = grid_ids.index(this_grid_id)
+
+                    list_of_spatial_interp_arrays[t] = _interp_with_plan(
+                        input_matrix=list_of_2d_grids[t],
+                        interp_plan_dict_by_key=interp_plan_dict_by_key,
+                        plan_key=(this_grid_index, i),
                         sorted_grid_point_x_metres=x_points_by_grid_metres[
                             this_grid_index],
                         sorted_grid_point_y_metres=y_points_by_grid_metres[
@@ -909,87 +1481,112 @@ def interp_nwp_from_xy_grid(
                             this_grid_index][QUERY_Y_COLUMN].values[
                                 query_indices_in_this_range],
                         method_string=spatial_interp_method_string,
-                        spline_degree=spline_degree, extrapolate=True)
-
-                    if grib_io.is_u_wind_field(field_names_grib1[j]):
-                        (list_of_spatial_interp_arrays[t],
-                         list_of_sinterp_arrays_other_wind_component[t]
-                        ) = nwp_model_utils.rotate_winds_to_earth_relative(
-                            u_winds_grid_relative_m_s01=
-                            list_of_spatial_interp_arrays[t],
-                            v_winds_grid_relative_m_s01=
-                            list_of_sinterp_arrays_other_wind_component[t],
-                            rotation_angle_cosines=
-                            rotation_cosine_by_query_point[
-                                query_indices_in_this_range],
-                            rotation_angle_sines=rotation_sine_by_query_point[
-                                query_indices_in_this_range])
-
-                    if grib_io.is_v_wind_field(field_names_grib1[j]):
-                        (list_of_sinterp_arrays_other_wind_component[t],
-                         list_of_spatial_interp_arrays[t]
-                        ) = nwp_model_utils.rotate_winds_to_earth_relative(
-                            u_winds_grid_relative_m_s01=
-                            list_of_sinterp_arrays_other_wind_component[t],
-                            v_winds_grid_relative_m_s01=
-                            list_of_spatial_interp_arrays[t],
-                            rotation_angle_cosines=
-                            rotation_cosine_by_query_point[
-                                query_indices_in_this_range],
-                            rotation_angle_sines=rotation_sine_by_query_point[
-                                query_indices_in_this_range])
-
-            spatial_interp_matrix_2d = _stack_1d_arrays_horizontally(
-                [list_of_spatial_interp_arrays[t] for
-                 t in init_time_needed_indices])
-
-            if rotate_wind_flags[j]:
-                sinterp_matrix_2d_other_wind_component = (
-                    _stack_1d_arrays_horizontally(
-                        [list_of_sinterp_arrays_other_wind_component[t] for
-                         t in init_time_needed_indices]))
-
-            (these_unique_query_times_unix_sec,
-             these_query_times_orig_to_unique
-            ) = numpy.unique(
-                query_point_table[QUERY_TIME_COLUMN].values[
-                    query_indices_in_this_range], return_inverse=True)
-
-            for k in range(len(these_unique_query_times_unix_sec)):
-                these_indices = numpy.where(
-                    these_query_times_orig_to_unique == k)[0]
-                query_indices_at_this_time = query_indices_in_this_range[
-                    these_indices]
-
-                these_interp_values = interp_in_time(
-                    input_matrix=spatial_interp_matrix_2d[these_indices, :],
-                    sorted_input_times_unix_sec=init_times_unix_sec[
-                        init_time_needed_indices],
-                    query_times_unix_sec=these_unique_query_times_unix_sec[[k]],
-                    method_string=temporal_interp_method_string,
-                    extrapolate=False)
-                interp_table[field_names[j]].values[
-                    query_indices_at_this_time] = these_interp_values[:, 0]
-
-                if other_wind_component_indices[j] != -1:
+                        spline_degree=spline_degree)
+
+                    if rotate_wind_flags[j]:
+                        list_of_sinterp_arrays_other_wind_component[
+                            t
+                        ] = _interp_with_plan(
+                            input_matrix=
+                            list_of_2d_grids_other_wind_component[t],
+                            interp_plan_dict_by_key=interp_plan_dict_by_key,
+                            plan_key=(this_grid_index, i),
+                            sorted_grid_point_x_metres=x_points_by_grid_metres[
+                                this_grid_index],
+                            sorted_grid_point_y_metres=y_points_by_grid_metres[
+                                this_grid_index],
+                            query_x_coords_metres=query_point_table_by_grid[
+                                this_grid_index][QUERY_X_COLUMN].values[
+                                    query_indices_in_this_range],
+                            query_y_coords_metres=query_point_table_by_grid[
+                                this_grid_index][QUERY_Y_COLUMN].values[
+                                    query_indices_in_this_range],
+                            method_string=spatial_interp_method_string,
+                            spline_degree=spline_degree)
+
+                        if grib_io.is_u_wind_field(field_names_grib1[j]):
+                            (list_of_spatial_interp_arrays[t],
+                             list_of_sinterp_arrays_other_wind_component[t]
+                            ) = nwp_model_utils.rotate_winds_to_earth_relative(
+                                u_winds_grid_relative_m_s01=
+                                list_of_spatial_interp_arrays[t],
+                                v_winds_grid_relative_m_s01=
+                                list_of_sinterp_arrays_other_wind_component[t],
+                                rotation_angle_cosines=
+                                rotation_cosine_by_query_point[
+                                    query_indices_in_this_range],
+                                rotation_angle_sines=
+                                rotation_sine_by_query_point[
+                                    query_indices_in_this_range])
+
+                        if grib_io.is_v_wind_field(field_names_grib1[j]):
+                            (list_of_sinterp_arrays_other_wind_component[t],
+                             list_of_spatial_interp_arrays[t]
+                            ) = nwp_model_utils.rotate_winds_to_earth_relative(
+                                u_winds_grid_relative_m_s01=
+                                list_of_sinterp_arrays_other_wind_component[t],
+                                v_winds_grid_relative_m_s01=
+                                list_of_spatial_interp_arrays[t],
+                                rotation_angle_cosines=
+                                rotation_cosine_by_query_point[
+                                    query_indices_in_this_range],
+                                rotation_angle_sines=
+                                rotation_sine_by_query_point[
+                                    query_indices_in_this_range])
+
+                spatial_interp_matrix_2d = _stack_1d_arrays_horizontally(
+                    [list_of_spatial_interp_arrays[t] for
+                     t in init_time_needed_indices])
+
+                if rotate_wind_flags[j]:
+                    sinterp_matrix_2d_other_wind_component = (
+                        _stack_1d_arrays_horizontally(
+                            [list_of_sinterp_arrays_other_wind_component[t] for
+                             t in init_time_needed_indices]))
+
+                (these_unique_query_times_unix_sec,
+                 these_query_times_orig_to_unique
+                ) = numpy.unique(
+                    query_point_table[QUERY_TIME_COLUMN].values[
+                        query_indices_in_this_range], return_inverse=True)
+
+                for k in range(len(these_unique_query_times_unix_sec)):
+                    these_indices = numpy.where(
+                        these_query_times_orig_to_unique == k)[0]
+                    query_indices_at_this_time = query_indices_in_this_range[
+                        these_indices]
+
                     these_interp_values = interp_in_time(
-                        input_matrix=sinterp_matrix_2d_other_wind_component[
-                            these_indices, :],
+                        input_matrix=spatial_interp_matrix_2d[these_indices, :],
                         sorted_input_times_unix_sec=init_times_unix_sec[
                             init_time_needed_indices],
                         query_times_unix_sec=
                         these_unique_query_times_unix_sec[[k]],
                         method_string=temporal_interp_method_string,
                         extrapolate=False)
-
-                    this_field_name = field_names[
-                        other_wind_component_indices[j]]
-                    interp_table[this_field_name].values[
+                    interp_table[field_names[j]].values[
                         query_indices_at_this_time] = these_interp_values[:, 0]
 
-        interp_done_by_field[j] = True
-        if other_wind_component_indices[j] != -1:
-            interp_done_by_field[other_wind_component_indices[j]] = True
+                    if other_wind_component_indices[j] != -1:
+                        these_interp_values = interp_in_time(
+                            input_matrix=sinterp_matrix_2d_other_wind_component[
+                                these_indices, :],
+                            sorted_input_times_unix_sec=init_times_unix_sec[
+                                init_time_needed_indices],
+                            query_times_unix_sec=
+                            these_unique_query_times_unix_sec[[k]],
+                            method_string=temporal_interp_method_string,
+                            extrapolate=False)
+
+                        this_field_name = field_names[
+                            other_wind_component_indices[j]]
+                        interp_table[this_field_name].values[
+                            query_indices_at_this_time
+                        ] = these_interp_values[:, 0]
+
+            interp_done_by_field[j] = True
+            if other_wind_component_indices[j] != -1:
+                interp_done_by_field[other_wind_component_indices[j]] = True
 
     return interp_table
 
@@ -1033,7 +1630,7 @@ def interp_temperature_surface_from_nwp(
     nwp_model_utils.check_model_name(model_name)
 
     if model_name == nwp_model_utils.NARR_MODEL_NAME or use_all_grids:
-        grid_ids = _get_grids_for_model(model_name)
+        grid_ids = get_grids_for_model(model_name)
     else:
         grid_ids = [grid_id]
 
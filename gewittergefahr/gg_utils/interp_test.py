@@ -46,6 +46,37 @@ WIND_ROTATION_METADATA_DICT_RAPRUC = {
 }
 
 
+# The following constants are used to test _split_query_time_ranges.
+_, QUERY_TO_MODEL_TIMES_TABLE = nwp_model_utils.get_times_needed_for_interp(
+    query_times_unix_sec=numpy.array([1800, 5400, 9000, 12600, 16200]),
+    model_time_step_hours=1, method_string=interp.LINEAR_METHOD_STRING)
+
+NUM_BYTES_PER_INIT_TIME = 8
+MAX_BYTES_FOR_ALL_RANGES = 48
+MAX_BYTES_FOR_3INIT_TIMES = 24
+MAX_BYTES_FOR_1INIT_TIME = 8
+
+RANGE_INDICES_BY_CHUNK_ALL = [numpy.array([0, 1, 2, 3, 4], dtype=int)]
+RANGE_INDICES_BY_CHUNK_3INIT_TIMES = [
+    numpy.array([0, 1], dtype=int), numpy.array([2, 3], dtype=int),
+    numpy.array([4], dtype=int)
+]
+RANGE_INDICES_BY_CHUNK_1INIT_TIME = [
+    numpy.array([k], dtype=int) for k in range(5)
+]
+
+# The following constants are used to test get_query_time_ranges.  The second
+# query time (3600) is at the end of the last range when only the subset is
+# used, and at the start of the last range when all query times are used.
+SUBSET_QUERY_TIMES_UNIX_SEC = numpy.array([1800, 3600], dtype=int)
+ALL_QUERY_TIMES_UNIX_SEC = numpy.array([1800, 3600, 5400], dtype=int)
+MODEL_NAME_FOR_RANGES = nwp_model_utils.RAP_MODEL_NAME
+
+INIT_TIMES_FOR_SUBSET_UNIX_SEC = numpy.array([0], dtype=int)
+RANGE_INDICES_FOR_SUBSET = numpy.array([0, 0], dtype=int)
+INIT_TIMES_FOR_ALL_UNIX_SEC = numpy.array([0, 3600], dtype=int)
+RANGE_INDICES_FOR_ALL = numpy.array([0, 1], dtype=int)
+
 # The following constants are used to test _stack_1d_arrays_horizontally.
 LIST_OF_1D_ARRAYS = [numpy.array([1., 2., 3]),
                      numpy.array([0., 5., 10.]),
@@ -142,6 +173,46 @@ QUERY_X_FOR_EXTRAP_METRES = numpy.array([-1., 4.])
 QUERY_Y_FOR_EXTRAP_METRES = numpy.array([-2., 10.])
 SPATIAL_EXTRAP_VALUES = numpy.array([17., 2.])
 
+# The following constants are used to test _find_nearest_indices.
+SORTED_VALUES_FOR_NEAREST = numpy.array([0., 1., 2., 3.])
+TEST_VALUES_FOR_NEAREST = numpy.array([-1., 0.5, 0.6, 1.4, 3., 5.])
+NEAREST_INDICES = numpy.array([0, 1, 1, 1, 3, 3], dtype=int)
+
+# The following constants are used to test get_interp_plan and
+# apply_interp_plan.
+STACKED_INPUT_MATRIX_FOR_SPATIAL_INTERP = numpy.stack(
+    (INPUT_MATRIX_FOR_SPATIAL_INTERP, 2 * INPUT_MATRIX_FOR_SPATIAL_INTERP),
+    axis=0)
+
+STACKED_INTERP_VALUES_SPLINE = numpy.stack(
+    (INTERP_VALUES_SPLINE, 2 * INTERP_VALUES_SPLINE), axis=0)
+STACKED_INTERP_VALUES_NEAREST_NEIGH = numpy.stack(
+    (INTERP_VALUES_NEAREST_NEIGH, 2 * INTERP_VALUES_NEAREST_NEIGH), axis=0)
+CUBIC_SPLINE_DEGREE = 3
+
+# The following constants are used to test get_bilinear_interp_weights and
+# interp_with_bilinear_weights.
+QUERY_X_MATRIX_FOR_BILINEAR_METRES = numpy.array([[0., 0.5, 1.5],
+                                                  [2.5, 3., -1.]])
+QUERY_Y_MATRIX_FOR_BILINEAR_METRES = numpy.array([[0., 2., 3.],
+                                                  [6., 7.5, -2.]])
+
+BILINEAR_WEIGHT_DICT = {
+    interp.BILINEAR_LOWER_ROWS_KEY: numpy.array([[0, 1, 1],
+                                                 [3, 3, 0]], dtype=int),
+    interp.BILINEAR_LOWER_COLUMNS_KEY: numpy.array([[0, 0, 1],
+                                                    [2, 2, 0]], dtype=int),
+    interp.BILINEAR_ROW_WEIGHTS_KEY: numpy.array([[0., 0., 0.5],
+                                                  [0., 0.75, 0.]]),
+    interp.BILINEAR_COLUMN_WEIGHTS_KEY: numpy.array([[0., 0.5, 0.5],
+                                                     [0.5, 1., 0.]]),
+    interp.BILINEAR_OUTSIDE_GRID_FLAGS_KEY: numpy.array(
+        [[0, 0, 0], [0, 0, 1]], dtype=bool)
+}
+
+INTERP_VALUES_BILINEAR = numpy.array([[17., 14., 7.75],
+                                      [20., 6.75, 17.]])
+
 
 def _compare_metadata_dicts(first_metadata_dict, second_metadata_dict):
     """Compares two dicts created by `interp._get_wind_rotation_metadata`.
@@ -211,6 +282,97 @@ class InterpTests(unittest.TestCase):
         self.assertTrue(_compare_metadata_dicts(
             this_metadata_dict, WIND_ROTATION_METADATA_DICT_RAPRUC))
 
+    def _check_split_query_time_ranges(
+            self, max_bytes, expected_range_indices_by_chunk):
+        """Ensures correct output from _split_query_time_ranges.
+
+        :param max_bytes: See doc for `interp._split_query_time_ranges`.
+        :param expected_range_indices_by_chunk: Expected output.
+        """
+
+        these_range_indices_by_chunk = interp._split_query_time_ranges(
+            query_to_model_times_table=QUERY_TO_MODEL_TIMES_TABLE,
+            num_bytes_per_init_time=NUM_BYTES_PER_INIT_TIME,
+            max_bytes=max_bytes)
+
+        self.assertTrue(len(these_range_indices_by_chunk) ==
+                        len(expected_range_indices_by_chunk))
+
+        for this_actual, this_expected in zip(
+                these_range_indices_by_chunk, expected_range_indices_by_chunk):
+            self.assertTrue(numpy.array_equal(this_actual, this_expected))
+
+    def test_split_query_time_ranges_all(self):
+        """Ensures correct output from _split_query_time_ranges.
+
+        In this case, grids for all query-time ranges fit in the cache.
+        """
+
+        self._check_split_query_time_ranges(
+            max_bytes=MAX_BYTES_FOR_ALL_RANGES,
+            expected_range_indices_by_chunk=RANGE_INDICES_BY_CHUNK_ALL)
+
+    def test_split_query_time_ranges_3init_times(self):
+        """Ensures correct output from _split_query_time_ranges.
+
+        In this case, the cache is smaller than grids for all query-time ranges
+        and holds grids from only 3 initialization times.
+        """
+
+        self._check_split_query_time_ranges(
+            max_bytes=MAX_BYTES_FOR_3INIT_TIMES,
+            expected_range_indices_by_chunk=RANGE_INDICES_BY_CHUNK_3INIT_TIMES)
+
+    def test_split_query_time_ranges_1init_time(self):
+        """Ensures correct output from _split_query_time_ranges.
+
+        In this case, the cache is smaller than grids for even one query-time
+        range, so each chunk contains one range.
+        """
+
+        self._check_split_query_time_ranges(
+            max_bytes=MAX_BYTES_FOR_1INIT_TIME,
+            expected_range_indices_by_chunk=RANGE_INDICES_BY_CHUNK_1INIT_TIME)
+
+    def test_get_query_time_ranges_subset(self):
+        """Ensures correct output from get_query_time_ranges.
+
+        In this case, ranges are determined from only the subset of query times.
+        """
+
+        these_init_times_unix_sec, _, these_range_indices = (
+            interp.get_query_time_ranges(
+                query_times_unix_sec=SUBSET_QUERY_TIMES_UNIX_SEC,
+                model_name=MODEL_NAME_FOR_RANGES,
+                temporal_interp_method_string=
+                interp.PREV_NEIGHBOUR_METHOD_STRING)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_init_times_unix_sec, INIT_TIMES_FOR_SUBSET_UNIX_SEC))
+        self.assertTrue(numpy.array_equal(
+            these_range_indices, RANGE_INDICES_FOR_SUBSET))
+
+    def test_get_query_time_ranges_all(self):
+        """Ensures correct output from get_query_time_ranges.
+
+        In this case, ranges are determined from all query times.
+        """
+
+        these_init_times_unix_sec, _, these_range_indices = (
+            interp.get_query_time_ranges(
+                query_times_unix_sec=SUBSET_QUERY_TIMES_UNIX_SEC,
+                model_name=MODEL_NAME_FOR_RANGES,
+                temporal_interp_method_string=
+                interp.PREV_NEIGHBOUR_METHOD_STRING,
+                all_query_times_unix_sec=ALL_QUERY_TIMES_UNIX_SEC)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_init_times_unix_sec, INIT_TIMES_FOR_ALL_UNIX_SEC))
+        self.assertTrue(numpy.array_equal(
+            these_range_indices, RANGE_INDICES_FOR_ALL))
+
     def test_stack_1d_arrays_horizontally_1array(self):
         """Ensures correct output from _stack_1d_arrays_horizontally.
 
@@ -435,6 +597,145 @@ class InterpTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_interp_values, SPATIAL_EXTRAP_VALUES, atol=TOLERANCE))
 
+    def test_find_nearest_indices(self):
+        """Ensures correct output from _find_nearest_indices."""
+
+        these_indices = interp._find_nearest_indices(
+            sorted_input_values=SORTED_VALUES_FOR_NEAREST,
+            test_values=TEST_VALUES_FOR_NEAREST)
+
+        self.assertTrue(numpy.array_equal(these_indices, NEAREST_INDICES))
+
+    def test_interp_plan_nearest(self):
+        """Ensures correct output from get_interp_plan and apply_interp_plan.
+
+        In this case, interpolation method is nearest-neighbour and two fields
+        are interpolated at once.
+        """
+
+        this_plan_dict = interp.get_interp_plan(
+            sorted_grid_point_x_metres=GRID_POINT_X_METRES,
+            sorted_grid_point_y_metres=GRID_POINT_Y_METRES,
+            query_x_coords_metres=QUERY_X_FOR_NEAREST_NEIGH_METRES,
+            query_y_coords_metres=QUERY_Y_FOR_NEAREST_NEIGH_METRES,
+            method_string=interp.NEAREST_NEIGHBOUR_METHOD_STRING)
+
+        this_interp_matrix = interp.apply_interp_plan(
+            input_matrix=STACKED_INPUT_MATRIX_FOR_SPATIAL_INTERP,
+            interp_plan_dict=this_plan_dict)
+
+        self.assertTrue(numpy.allclose(
+            this_interp_matrix, STACKED_INTERP_VALUES_NEAREST_NEIGH,
+            atol=TOLERANCE))
+
+    def test_interp_plan_nearest_extrap(self):
+        """Ensures correct output from get_interp_plan and apply_interp_plan.
+
+        In this case, interpolation method is nearest-neighbour and query
+        points are outside the grid.
+        """
+
+        this_plan_dict = interp.get_interp_plan(
+            sorted_grid_point_x_metres=GRID_POINT_X_METRES,
+            sorted_grid_point_y_metres=GRID_POINT_Y_METRES,
+            query_x_coords_metres=QUERY_X_FOR_EXTRAP_METRES,
+            query_y_coords_metres=QUERY_Y_FOR_EXTRAP_METRES,
+            method_string=interp.NEAREST_NEIGHBOUR_METHOD_STRING)
+
+        these_interp_values = interp.apply_interp_plan(
+            input_matrix=INPUT_MATRIX_FOR_SPATIAL_INTERP,
+            interp_plan_dict=this_plan_dict)
+
+        self.assertTrue(numpy.allclose(
+            these_interp_values, SPATIAL_EXTRAP_VALUES, atol=TOLERANCE))
+
+    def test_interp_plan_spline(self):
+        """Ensures correct output from get_interp_plan and apply_interp_plan.
+
+        In this case, interpolation method is linear spline and two fields are
+        interpolated at once.
+        """
+
+        this_plan_dict = interp.get_interp_plan(
+            sorted_grid_point_x_metres=GRID_POINT_X_METRES,
+            sorted_grid_point_y_metres=GRID_POINT_Y_METRES,
+            query_x_coords_metres=QUERY_X_FOR_SPLINE_METRES,
+            query_y_coords_metres=QUERY_Y_FOR_SPLINE_METRES,
+            method_string=interp.SPLINE_METHOD_STRING,
+            spline_degree=SPLINE_DEGREE)
+
+        this_interp_matrix = interp.apply_interp_plan(
+            input_matrix=STACKED_INPUT_MATRIX_FOR_SPATIAL_INTERP,
+            interp_plan_dict=this_plan_dict)
+
+        self.assertTrue(numpy.allclose(
+            this_interp_matrix, STACKED_INTERP_VALUES_SPLINE, atol=TOLERANCE))
+
+    def test_get_interp_plan_cubic(self):
+        """Ensures that get_interp_plan errors out for cubic spline."""
+
+        with self.assertRaises(ValueError):
+            interp.get_interp_plan(
+                sorted_grid_point_x_metres=GRID_POINT_X_METRES,
+                sorted_grid_point_y_metres=GRID_POINT_Y_METRES,
+                query_x_coords_metres=QUERY_X_FOR_SPLINE_METRES,
+                query_y_coords_metres=QUERY_Y_FOR_SPLINE_METRES,
+                method_string=interp.SPLINE_METHOD_STRING,
+                spline_degree=CUBIC_SPLINE_DEGREE)
+
+    def test_get_bilinear_interp_weights(self):
+        """Ensures correct output from get_bilinear_interp_weights."""
+
+        this_weight_dict = interp.get_bilinear_interp_weights(
+            sorted_grid_point_x_coords=GRID_POINT_X_METRES,
+            sorted_grid_point_y_coords=GRID_POINT_Y_METRES,
+            query_x_coords=QUERY_X_MATRIX_FOR_BILINEAR_METRES,
+            query_y_coords=QUERY_Y_MATRIX_FOR_BILINEAR_METRES)
+
+        self.assertTrue(set(this_weight_dict.keys()) ==
+                        set(BILINEAR_WEIGHT_DICT.keys()))
+
+        for this_key in BILINEAR_WEIGHT_DICT:
+            self.assertTrue(numpy.allclose(
+                this_weight_dict[this_key], BILINEAR_WEIGHT_DICT[this_key],
+                atol=TOLERANCE))
+
+    def test_interp_with_bilinear_weights(self):
+        """Ensures correct output from interp_with_bilinear_weights."""
+
+        these_interp_values = interp.interp_with_bilinear_weights(
+            input_matrix=INPUT_MATRIX_FOR_SPATIAL_INTERP,
+            interp_weight_dict=BILINEAR_WEIGHT_DICT)
+
+        self.assertTrue(numpy.allclose(
+            these_interp_values, INTERP_VALUES_BILINEAR, atol=TOLERANCE))
+
+    def test_bilinear_weights_vs_spline(self):
+        """Ensures that bilinear weights give same answer as linear spline."""
+
+        this_weight_dict = interp.get_bilinear_interp_weights(
+            sorted_grid_point_x_coords=GRID_POINT_X_METRES,
+            sorted_grid_point_y_coords=GRID_POINT_Y_METRES,
+            query_x_coords=QUERY_X_MATRIX_FOR_BILINEAR_METRES,
+            query_y_coords=QUERY_Y_MATRIX_FOR_BILINEAR_METRES)
+
+        these_interp_values = interp.interp_with_bilinear_weights(
+            input_matrix=INPUT_MATRIX_FOR_SPATIAL_INTERP,
+            interp_weight_dict=this_weight_dict)
+
+        these_expected_values = interp.interp_from_xy_grid_to_points(
+            input_matrix=INPUT_MATRIX_FOR_SPATIAL_INTERP,
+            sorted_grid_point_x_metres=GRID_POINT_X_METRES,
+            sorted_grid_point_y_metres=GRID_POINT_Y_METRES,
+            query_x_coords_metres=QUERY_X_MATRIX_FOR_BILINEAR_METRES.ravel(),
+            query_y_coords_metres=QUERY_Y_MATRIX_FOR_BILINEAR_METRES.ravel(),
+            method_string=interp.SPLINE_METHOD_STRING,
+            spline_degree=SPLINE_DEGREE, extrapolate=True)
+
+        self.assertTrue(numpy.allclose(
+            these_interp_values.ravel(), these_expected_values,
+            atol=TOLERANCE))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,8 +17,13 @@ import pickle
 import shutil
 import os.path
 import warnings
+import multiprocessing
 import numpy
 import pandas
+import netCDF4
+import scipy.io
+import scipy.spatial
+from gewittergefahr.gg_io import netcdf_io
 from gewittergefahr.gg_io import raw_wind_io
 from gewittergefahr.gg_io import tornado_io
 from gewittergefahr.gg_io import storm_tracking_io as tracking_io
@@ -36,6 +41,9 @@ YEAR_FORMAT = '%Y'
 TIME_FORMAT = '%Y-%m-%d-%H%M%S'
 SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
 
+PICKLE_FILE_EXTENSION = '.p'
+NETCDF_FILE_EXTENSION = '.nc'
+
 WIND_EVENT_STRING = 'wind'
 TORNADO_EVENT_STRING = 'tornado'
 VALID_EVENT_TYPE_STRINGS = [WIND_EVENT_STRING, TORNADO_EVENT_STRING]
@@ -47,6 +55,8 @@ DEFAULT_INTERP_TIME_RES_FOR_WIND_SEC = 10
 DEFAULT_INTERP_TIME_RES_FOR_TORNADO_SEC = 1
 DEFAULT_MAX_DISTANCE_FOR_WIND_METRES = 30000.
 DEFAULT_MAX_DISTANCE_FOR_TORNADO_METRES = 30000.
+KD_TREE_DISTANCE_PADDING_METRES = 1.
+DEFAULT_NUM_PROCESSES_FOR_LINKAGE = 4
 
 REQUIRED_STORM_COLUMNS = [
     tracking_utils.STORM_ID_COLUMN, tracking_utils.TIME_COLUMN,
@@ -88,6 +98,23 @@ LINKAGE_DISTANCE_COLUMN = 'linkage_distance_metres'
 STORM_VERTEX_X_COLUMN = 'vertex_x_metres'
 STORM_VERTEX_Y_COLUMN = 'vertex_y_metres'
 
+STORM_IDS_KEY = 'storm_ids'
+CELL_START_TIMES_KEY = 'cell_start_times_unix_sec'
+CELL_END_TIMES_KEY = 'cell_end_times_unix_sec'
+FIRST_OBJECT_INDICES_KEY = 'first_object_index_by_cell'
+NUM_OBJECTS_KEY = 'num_objects_by_cell'
+SEARCH_KEYS_KEY = 'search_keys'
+KEY_MULTIPLIER_KEY = 'key_multiplier'
+MIN_TIME_KEY = 'min_time_unix_sec'
+OBJECT_TIMES_KEY = 'object_times_unix_sec'
+OBJECT_ROW_INDICES_KEY = 'object_row_indices'
+CENTROIDS_X_KEY = 'centroids_x_metres'
+CENTROIDS_Y_KEY = 'centroids_y_metres'
+FIRST_VERTEX_INDICES_KEY = 'first_vertex_index_by_object'
+NUM_VERTICES_KEY = 'num_vertices_by_object'
+VERTICES_X_KEY = 'vertices_x_metres'
+VERTICES_Y_KEY = 'vertices_y_metres'
+
 LINKAGE_DISTANCES_COLUMN = 'linkage_distances_metres'
 RELATIVE_EVENT_TIMES_COLUMN = 'relative_event_times_sec'
 EVENT_LATITUDES_COLUMN = 'event_latitudes_deg'
@@ -109,6 +136,38 @@ REQUIRED_TORNADO_LINKAGE_COLUMNS = REQUIRED_STORM_COLUMNS + [
     EVENT_LATITUDES_COLUMN, EVENT_LONGITUDES_COLUMN, FUJITA_RATINGS_COLUMN
 ]
 
+STORM_OBJECT_DIMENSION_KEY = 'storm_object'
+EVENT_DIMENSION_KEY = 'event'
+POLYGON_VERTEX_DIMENSION_KEY = 'polygon_vertex'
+
+EVENT_TYPE_KEY = 'event_type_string'
+NUM_STORM_OBJECTS_KEY = 'num_storm_objects'
+NUM_EVENTS_KEY = 'num_events'
+NUM_POLYGON_VERTICES_KEY = 'num_polygon_vertices'
+FIRST_EVENT_INDICES_KEY = 'first_event_index_by_storm'
+NUM_EVENTS_BY_STORM_KEY = 'num_events_by_storm'
+FIRST_POLYGON_VERTEX_INDICES_KEY = 'first_polygon_vertex_index_by_storm'
+NUM_POLYGON_VERTICES_BY_STORM_KEY = 'num_polygon_vertices_by_storm'
+POLYGON_VERTEX_LATITUDES_KEY = 'polygon_vertex_latitudes_deg'
+POLYGON_VERTEX_LONGITUDES_KEY = 'polygon_vertex_longitudes_deg'
+
+COLUMNAR_STORM_INTEGER_COLUMNS = [
+    tracking_utils.TIME_COLUMN, tracking_utils.TRACKING_START_TIME_COLUMN,
+    tracking_utils.TRACKING_END_TIME_COLUMN,
+    tracking_utils.CELL_START_TIME_COLUMN, tracking_utils.CELL_END_TIME_COLUMN
+]
+COLUMNAR_STORM_FLOAT_COLUMNS = [
+    tracking_utils.CENTROID_LAT_COLUMN, tracking_utils.CENTROID_LNG_COLUMN
+]
+COLUMNAR_EVENT_INTEGER_COLUMNS = [RELATIVE_EVENT_TIMES_COLUMN]
+COLUMNAR_EVENT_FLOAT_COLUMNS = [
+    EVENT_LATITUDES_COLUMN, EVENT_LONGITUDES_COLUMN, LINKAGE_DISTANCES_COLUMN,
+    U_WINDS_COLUMN, V_WINDS_COLUMN
+]
+COLUMNAR_EVENT_STRING_COLUMNS = [
+    WIND_STATION_IDS_COLUMN, FUJITA_RATINGS_COLUMN
+]
+
 
 def _check_input_args(
         tracking_file_names, max_time_before_storm_start_sec,
@@ -429,10 +488,143 @@ def _interp_one_storm_in_time(storm_object_table_1cell, storm_id,
     return pandas.DataFrame.from_dict(this_dict)
 
 
+def _create_storm_motion_index(storm_object_table):
+    """Creates index used to interpolate storm cells in time.
+
+    The index contains everything needed by `_interp_storms_in_time`, stored in
+    flat numpy arrays, so that interpolating all storm cells to one time is a
+    vectorized operation.  Storm objects are sorted by cell (in the order
+    returned by `numpy.unique`) and then by time.
+
+    C = number of storm cells
+    P = number of storm objects
+    V = total number of vertices (over all storm objects)
+
+    :param storm_object_table: pandas DataFrame created by
+        `_project_storms_latlng_to_xy`.
+    :return: storm_motion_index_dict: Dictionary with the following keys.
+    storm_motion_index_dict['storm_ids']: length-C numpy array of storm IDs
+        (strings).
+    storm_motion_index_dict['cell_start_times_unix_sec']: length-C numpy array
+        of start times.
+    storm_motion_index_dict['cell_end_times_unix_sec']: length-C numpy array of
+        end times.
+    storm_motion_index_dict['first_object_index_by_cell']: length-C numpy array
+        with index of first storm object in each cell.
+    storm_motion_index_dict['num_objects_by_cell']: length-C numpy array with
+        number of storm objects in each cell.
+    storm_motion_index_dict['search_keys']: length-P numpy array of search
+        keys, encoding cell index and time, used to find bracketing storm
+        objects.
+    storm_motion_index_dict['key_multiplier']: Multiplier for cell index in
+        search keys.
+    storm_motion_index_dict['min_time_unix_sec']: Minimum time in search keys.
+    storm_motion_index_dict['object_times_unix_sec']: length-P numpy array of
+        valid times.
+    storm_motion_index_dict['object_row_indices']: length-P numpy array of row
+        indices in the original table (used to break ties in the same way as
+        `_interp_one_storm_in_time`).
+    storm_motion_index_dict['centroids_x_metres']: length-P numpy array with
+        x-coordinates of centroids.
+    storm_motion_index_dict['centroids_y_metres']: length-P numpy array with
+        y-coordinates of centroids.
+    storm_motion_index_dict['first_vertex_index_by_object']: length-P numpy
+        array with index of first vertex in each storm object.
+    storm_motion_index_dict['num_vertices_by_object']: length-P numpy array
+        with number of vertices in each storm object.
+    storm_motion_index_dict['vertices_x_metres']: length-V numpy array with
+        x-coordinates of vertices.
+    storm_motion_index_dict['vertices_y_metres']: length-V numpy array with
+        y-coordinates of vertices.
+    """
+
+    unique_storm_ids, object_to_cell_indices = numpy.unique(
+        numpy.array(storm_object_table[tracking_utils.STORM_ID_COLUMN].values),
+        return_inverse=True)
+
+    object_times_unix_sec = storm_object_table[
+        tracking_utils.TIME_COLUMN].values.astype(int)
+    sort_indices = numpy.lexsort(
+        (object_times_unix_sec, object_to_cell_indices))
+
+    object_to_cell_indices = object_to_cell_indices[sort_indices]
+    object_times_unix_sec = object_times_unix_sec[sort_indices]
+
+    num_objects_by_cell = numpy.bincount(
+        object_to_cell_indices, minlength=len(unique_storm_ids))
+    first_object_index_by_cell = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_objects_by_cell)[:-1]
+    ))
+
+    if len(object_times_unix_sec) == 0:
+        min_time_unix_sec = 0
+        key_multiplier = 2
+    else:
+        min_time_unix_sec = numpy.min(object_times_unix_sec)
+        key_multiplier = (
+            numpy.max(object_times_unix_sec) - min_time_unix_sec + 3)
+
+    search_keys = (
+        object_to_cell_indices.astype(numpy.int64) * key_multiplier +
+        (object_times_unix_sec - min_time_unix_sec + 1)
+    )
+
+    vertex_x_arrays = [
+        numpy.array(storm_object_table[STORM_VERTICES_X_COLUMN].values[k])
+        for k in sort_indices
+    ]
+    vertex_y_arrays = [
+        numpy.array(storm_object_table[STORM_VERTICES_Y_COLUMN].values[k])
+        for k in sort_indices
+    ]
+
+    num_vertices_by_object = numpy.array(
+        [len(v) for v in vertex_x_arrays], dtype=int)
+    first_vertex_index_by_object = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_vertices_by_object)[:-1]
+    ))
+
+    if len(vertex_x_arrays) == 0:
+        vertices_x_metres = numpy.array([], dtype=float)
+        vertices_y_metres = numpy.array([], dtype=float)
+    else:
+        vertices_x_metres = numpy.concatenate(vertex_x_arrays).astype(float)
+        vertices_y_metres = numpy.concatenate(vertex_y_arrays).astype(float)
+
+    return {
+        STORM_IDS_KEY: unique_storm_ids,
+        CELL_START_TIMES_KEY: storm_object_table[
+            tracking_utils.CELL_START_TIME_COLUMN
+        ].values[sort_indices][first_object_index_by_cell],
+        CELL_END_TIMES_KEY: storm_object_table[
+            tracking_utils.CELL_END_TIME_COLUMN
+        ].values[sort_indices][first_object_index_by_cell],
+        FIRST_OBJECT_INDICES_KEY: first_object_index_by_cell,
+        NUM_OBJECTS_KEY: num_objects_by_cell,
+        SEARCH_KEYS_KEY: search_keys,
+        KEY_MULTIPLIER_KEY: key_multiplier,
+        MIN_TIME_KEY: min_time_unix_sec,
+        OBJECT_TIMES_KEY: object_times_unix_sec,
+        OBJECT_ROW_INDICES_KEY: sort_indices,
+        CENTROIDS_X_KEY: storm_object_table[
+            STORM_CENTROID_X_COLUMN].values[sort_indices].astype(float),
+        CENTROIDS_Y_KEY: storm_object_table[
+            STORM_CENTROID_Y_COLUMN].values[sort_indices].astype(float),
+        FIRST_VERTEX_INDICES_KEY: first_vertex_index_by_object,
+        NUM_VERTICES_KEY: num_vertices_by_object,
+        VERTICES_X_KEY: vertices_x_metres,
+        VERTICES_Y_KEY: vertices_y_metres
+    }
+
+
 def _interp_storms_in_time(storm_object_table, target_time_unix_sec,
-                           max_time_before_start_sec, max_time_after_end_sec):
+                           max_time_before_start_sec, max_time_after_end_sec,
+                           storm_motion_index_dict=None):
     """Interpolates each storm cell in time.
 
+    Each storm cell is interpolated in the same way as in
+    `_interp_one_storm_in_time`, but all storm cells are handled at once.
+
     :param storm_object_table: pandas DataFrame created by
         `_project_storms_latlng_to_xy`.
     :param target_time_unix_sec: Target time.  Storm cells will be interpolated
@@ -441,6 +633,10 @@ def _interp_storms_in_time(storm_object_table, target_time_unix_sec,
         storm cell.
     :param max_time_after_end_sec: Max extrapolation time after end of storm
         cell.
+    :param storm_motion_index_dict: Dictionary created by
+        `_create_storm_motion_index` for `storm_object_table`.  If None, will be
+        created on the fly.  When interpolating to many times, create the index
+        once and pass it here.
     :return: interp_vertex_table: pandas DataFrame with the following columns.
         Each row is one vertex of one interpolated storm object.
     interp_vertex_table.storm_id: String ID for storm cell.
@@ -448,49 +644,130 @@ def _interp_storms_in_time(storm_object_table, target_time_unix_sec,
     interp_vertex_table.vertex_y_metres: y-coordinate of vertex.
     """
 
+    if storm_motion_index_dict is None:
+        storm_motion_index_dict = _create_storm_motion_index(storm_object_table)
+
     max_start_time_unix_sec = target_time_unix_sec + max_time_before_start_sec
     min_end_time_unix_sec = target_time_unix_sec - max_time_after_end_sec
 
-    filtered_storm_object_table = _filter_storms_by_time(
-        storm_object_table, max_start_time_unix_sec=max_start_time_unix_sec,
-        min_end_time_unix_sec=min_end_time_unix_sec)
-
-    unique_storm_ids = numpy.unique(numpy.array(
-        filtered_storm_object_table[tracking_utils.STORM_ID_COLUMN].values
-    ))
+    good_cell_flags = numpy.logical_and(
+        storm_motion_index_dict[CELL_START_TIMES_KEY] <=
+        max_start_time_unix_sec,
+        storm_motion_index_dict[CELL_END_TIMES_KEY] >= min_end_time_unix_sec
+    )
+    good_cell_flags = numpy.logical_and(
+        good_cell_flags, storm_motion_index_dict[NUM_OBJECTS_KEY] > 1)
+    good_cell_indices = numpy.where(good_cell_flags)[0]
 
-    list_of_vertex_tables = []
-    num_storm_cells = len(unique_storm_ids)
+    if len(good_cell_indices) == 0:
+        return pandas.DataFrame(
+            columns=[tracking_utils.STORM_ID_COLUMN, STORM_VERTEX_X_COLUMN,
+                     STORM_VERTEX_Y_COLUMN]
+        )
 
-    for j in range(num_storm_cells):
-        this_storm_object_table = filtered_storm_object_table.loc[
-            filtered_storm_object_table[tracking_utils.STORM_ID_COLUMN] ==
-            unique_storm_ids[j]
-        ]
+    # Find the two storm objects used for linear interpolation in each cell
+    # (same as `scipy.interpolate.interp1d` with extrapolation).
+    first_object_indices = storm_motion_index_dict[FIRST_OBJECT_INDICES_KEY][
+        good_cell_indices]
+    num_objects_by_cell = storm_motion_index_dict[NUM_OBJECTS_KEY][
+        good_cell_indices]
+
+    relative_target_time_sec = numpy.clip(
+        target_time_unix_sec - storm_motion_index_dict[MIN_TIME_KEY] + 1,
+        0, storm_motion_index_dict[KEY_MULTIPLIER_KEY] - 1)
+    query_keys = (
+        good_cell_indices.astype(numpy.int64) *
+        storm_motion_index_dict[KEY_MULTIPLIER_KEY] + relative_target_time_sec
+    )
 
-        if len(this_storm_object_table.index) == 1:
-            continue
+    num_earlier_objects_by_cell = numpy.searchsorted(
+        storm_motion_index_dict[SEARCH_KEYS_KEY], query_keys, side='left'
+    ) - first_object_indices
+    num_earlier_objects_by_cell = numpy.clip(
+        num_earlier_objects_by_cell, 1, num_objects_by_cell - 1)
+
+    low_indices = first_object_indices + num_earlier_objects_by_cell - 1
+    high_indices = low_indices + 1
+
+    low_times_unix_sec = storm_motion_index_dict[OBJECT_TIMES_KEY][low_indices]
+    high_times_unix_sec = storm_motion_index_dict[OBJECT_TIMES_KEY][
+        high_indices]
+    time_diffs_sec = (high_times_unix_sec - low_times_unix_sec).astype(float)
+    target_minus_low_sec = (
+        float(target_time_unix_sec) - low_times_unix_sec.astype(float)
+    )
 
-        list_of_vertex_tables.append(
-            _interp_one_storm_in_time(
-                storm_object_table_1cell=this_storm_object_table,
-                storm_id=unique_storm_ids[j],
-                target_time_unix_sec=target_time_unix_sec)
+    centroids_x_metres = storm_motion_index_dict[CENTROIDS_X_KEY]
+    centroids_y_metres = storm_motion_index_dict[CENTROIDS_Y_KEY]
+
+    interp_centroids_x_metres = (
+        (centroids_x_metres[high_indices] - centroids_x_metres[low_indices]) /
+        time_diffs_sec
+    ) * target_minus_low_sec + centroids_x_metres[low_indices]
+
+    interp_centroids_y_metres = (
+        (centroids_y_metres[high_indices] - centroids_y_metres[low_indices]) /
+        time_diffs_sec
+    ) * target_minus_low_sec + centroids_y_metres[low_indices]
+
+    # Find the storm object nearest to the target time in each cell.  Ties are
+    # broken in favour of the object that comes first in the original table.
+    low_absolute_diffs_sec = numpy.absolute(
+        low_times_unix_sec - target_time_unix_sec)
+    high_absolute_diffs_sec = numpy.absolute(
+        high_times_unix_sec - target_time_unix_sec)
+
+    object_row_indices = storm_motion_index_dict[OBJECT_ROW_INDICES_KEY]
+    use_high_flags = numpy.logical_or(
+        high_absolute_diffs_sec < low_absolute_diffs_sec,
+        numpy.logical_and(
+            high_absolute_diffs_sec == low_absolute_diffs_sec,
+            object_row_indices[high_indices] < object_row_indices[low_indices]
         )
+    )
+    nearest_indices = numpy.where(use_high_flags, high_indices, low_indices)
 
-        if len(list_of_vertex_tables) == 1:
-            continue
+    x_diffs_metres = (
+        interp_centroids_x_metres - centroids_x_metres[nearest_indices]
+    )
+    y_diffs_metres = (
+        interp_centroids_y_metres - centroids_y_metres[nearest_indices]
+    )
 
-        list_of_vertex_tables[-1], _ = list_of_vertex_tables[-1].align(
-            list_of_vertex_tables[0], axis=1)
+    # Gather vertices of nearest storm objects and advect them.
+    num_vertices_by_cell = storm_motion_index_dict[NUM_VERTICES_KEY][
+        nearest_indices]
+    first_vertex_indices = storm_motion_index_dict[FIRST_VERTEX_INDICES_KEY][
+        nearest_indices]
 
-    if len(list_of_vertex_tables) == 0:
-        return pandas.DataFrame(
-            columns=[tracking_utils.STORM_ID_COLUMN, STORM_VERTEX_X_COLUMN,
-                     STORM_VERTEX_Y_COLUMN]
-        )
+    num_vertices_total = numpy.sum(num_vertices_by_cell)
+    first_output_indices = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_vertices_by_cell)[:-1]
+    ))
+    vertex_indices = numpy.arange(num_vertices_total, dtype=int) + numpy.repeat(
+        first_vertex_indices - first_output_indices, num_vertices_by_cell)
+
+    interp_vertices_x_metres = (
+        numpy.repeat(x_diffs_metres, num_vertices_by_cell) +
+        storm_motion_index_dict[VERTICES_X_KEY][vertex_indices]
+    )
+    interp_vertices_y_metres = (
+        numpy.repeat(y_diffs_metres, num_vertices_by_cell) +
+        storm_motion_index_dict[VERTICES_Y_KEY][vertex_indices]
+    )
+
+    storm_ids = numpy.repeat(
+        storm_motion_index_dict[STORM_IDS_KEY][good_cell_indices],
+        num_vertices_by_cell
+    ).tolist()
 
-    return pandas.concat(list_of_vertex_tables, axis=0, ignore_index=True)
+    this_dict = {
+        tracking_utils.STORM_ID_COLUMN: storm_ids,
+        STORM_VERTEX_X_COLUMN: interp_vertices_x_metres,
+        STORM_VERTEX_Y_COLUMN: interp_vertices_y_metres
+    }
+
+    return pandas.DataFrame.from_dict(this_dict)
 
 
 def _find_nearest_storms_one_time(
@@ -498,7 +775,9 @@ def _find_nearest_storms_one_time(
         max_link_distance_metres):
     """Finds nearest storm to each event.
 
-    In this case all events are at the same time.
+    In this case all events are at the same time.  All events are handled with
+    one query to a KD-tree (built over all storm vertices), and the polygon for
+    each storm object is created at most once.
 
     N = number of events
 
@@ -523,61 +802,105 @@ def _find_nearest_storms_one_time(
     nearest_storm_ids = [None] * num_events
     linkage_distances_metres = numpy.full(num_events, numpy.nan)
 
-    for k in range(num_events):
-        these_x_diffs_metres = numpy.absolute(
-            event_x_coords_metres[k] -
-            interp_vertex_table[STORM_VERTEX_X_COLUMN].values
-        )
-
-        these_y_diffs_metres = numpy.absolute(
-            event_y_coords_metres[k] -
-            interp_vertex_table[STORM_VERTEX_Y_COLUMN].values
-        )
-
-        these_good_vertex_flags = numpy.logical_and(
-            these_x_diffs_metres <= max_link_distance_metres,
-            these_y_diffs_metres <= max_link_distance_metres
-        )
+    if num_events == 0 or len(interp_vertex_table.index) == 0:
+        return nearest_storm_ids, linkage_distances_metres
+
+    vertex_x_coords_metres = interp_vertex_table[STORM_VERTEX_X_COLUMN].values
+    vertex_y_coords_metres = interp_vertex_table[STORM_VERTEX_Y_COLUMN].values
+    unique_storm_ids, vertex_to_storm_indices = numpy.unique(
+        numpy.array(interp_vertex_table[tracking_utils.STORM_ID_COLUMN].values),
+        return_inverse=True)
+
+    # Group vertices by storm object, keeping the original order of vertices
+    # within each storm object.
+    sort_indices = numpy.argsort(vertex_to_storm_indices, kind='mergesort')
+    num_vertices_by_storm = numpy.bincount(vertex_to_storm_indices)
+    first_sorted_index_by_storm = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_vertices_by_storm)[:-1]
+    ))
 
-        if not numpy.any(these_good_vertex_flags):
-            continue
+    storm_min_x_coords_metres = numpy.minimum.reduceat(
+        vertex_x_coords_metres[sort_indices], first_sorted_index_by_storm)
+    storm_max_x_coords_metres = numpy.maximum.reduceat(
+        vertex_x_coords_metres[sort_indices], first_sorted_index_by_storm)
+    storm_min_y_coords_metres = numpy.minimum.reduceat(
+        vertex_y_coords_metres[sort_indices], first_sorted_index_by_storm)
+    storm_max_y_coords_metres = numpy.maximum.reduceat(
+        vertex_y_coords_metres[sort_indices], first_sorted_index_by_storm)
+
+    kd_tree_object = scipy.spatial.cKDTree(numpy.transpose(numpy.vstack((
+        vertex_x_coords_metres, vertex_y_coords_metres
+    ))))
+
+    # The KD-tree excludes neighbours exactly at the upper bound, so the bound
+    # is padded here and the exact criterion is applied afterwards.
+    min_distances_metres, nearest_vertex_indices = kd_tree_object.query(
+        numpy.transpose(numpy.vstack((
+            event_x_coords_metres, event_y_coords_metres
+        ))),
+        k=1,
+        distance_upper_bound=
+        max_link_distance_metres + KD_TREE_DISTANCE_PADDING_METRES)
+
+    linked_event_indices = numpy.where(
+        min_distances_metres <= max_link_distance_metres
+    )[0]
+    if len(linked_event_indices) == 0:
+        return nearest_storm_ids, linkage_distances_metres
 
-        these_good_vertex_indices = numpy.where(these_good_vertex_flags)[0]
-        these_distances_metres = numpy.sqrt(
-            these_x_diffs_metres[these_good_vertex_indices] ** 2 +
-            these_y_diffs_metres[these_good_vertex_indices] ** 2
+    linked_storm_indices = vertex_to_storm_indices[
+        nearest_vertex_indices[linked_event_indices]
+    ]
+    linkage_distances_metres[linked_event_indices] = min_distances_metres[
+        linked_event_indices]
+
+    for k, j in zip(linked_event_indices, linked_storm_indices):
+        nearest_storm_ids[k] = unique_storm_ids[j]
+
+    # An event can be inside its nearest storm only if it is inside the storm's
+    # bounding box, so the expensive polygon test is needed only for these
+    # events.
+    in_box_flags = numpy.logical_and(
+        numpy.logical_and(
+            event_x_coords_metres[linked_event_indices] >=
+            storm_min_x_coords_metres[linked_storm_indices],
+            event_x_coords_metres[linked_event_indices] <=
+            storm_max_x_coords_metres[linked_storm_indices]
+        ),
+        numpy.logical_and(
+            event_y_coords_metres[linked_event_indices] >=
+            storm_min_y_coords_metres[linked_storm_indices],
+            event_y_coords_metres[linked_event_indices] <=
+            storm_max_y_coords_metres[linked_storm_indices]
         )
+    )
 
-        if not numpy.any(these_distances_metres <= max_link_distance_metres):
-            continue
-
-        this_min_index = these_good_vertex_indices[
-            numpy.argmin(these_distances_metres)]
-        nearest_storm_ids[k] = interp_vertex_table[
-            tracking_utils.STORM_ID_COLUMN].values[this_min_index]
-
-        this_storm_flags = numpy.array([
-            s == nearest_storm_ids[k] for s in
-            interp_vertex_table[tracking_utils.STORM_ID_COLUMN].values
-        ])
-        this_storm_indices = numpy.where(this_storm_flags)[0]
-
-        this_polygon_object = polygons.vertex_arrays_to_polygon_object(
-            exterior_x_coords=interp_vertex_table[STORM_VERTEX_X_COLUMN].values[
-                this_storm_indices],
-            exterior_y_coords=interp_vertex_table[STORM_VERTEX_Y_COLUMN].values[
-                this_storm_indices]
-        )
+    polygon_object_by_storm = {}
+
+    for k, j in zip(linked_event_indices[in_box_flags],
+                    linked_storm_indices[in_box_flags]):
+        if j not in polygon_object_by_storm:
+            these_vertex_indices = sort_indices[
+                first_sorted_index_by_storm[j]:
+                (first_sorted_index_by_storm[j] + num_vertices_by_storm[j])
+            ]
+
+            polygon_object_by_storm[j] = (
+                polygons.vertex_arrays_to_polygon_object(
+                    exterior_x_coords=vertex_x_coords_metres[
+                        these_vertex_indices],
+                    exterior_y_coords=vertex_y_coords_metres[
+                        these_vertex_indices]
+                )
+            )
 
         this_event_in_polygon = polygons.point_in_or_on_polygon(
-            polygon_object=this_polygon_object,
+            polygon_object=polygon_object_by_storm[j],
             query_x_coordinate=event_x_coords_metres[k],
             query_y_coordinate=event_y_coords_metres[k])
 
         if this_event_in_polygon:
             linkage_distances_metres[k] = 0.
-        else:
-            linkage_distances_metres[k] = numpy.min(these_distances_metres)
 
     return nearest_storm_ids, linkage_distances_metres
 
@@ -624,6 +947,8 @@ def _find_nearest_storms(
     nearest_storm_ids = [None] * num_events
     linkage_distances_metres = numpy.full(num_events, numpy.nan)
 
+    storm_motion_index_dict = _create_storm_motion_index(storm_object_table)
+
     for i in range(num_unique_interp_times):
         print 'Linking events at ~{0:s} to storms...'.format(
             unique_interp_time_strings[i])
@@ -632,7 +957,8 @@ def _find_nearest_storms(
             storm_object_table=storm_object_table,
             target_time_unix_sec=unique_interp_times_unix_sec[i],
             max_time_before_start_sec=max_time_before_storm_start_sec,
-            max_time_after_end_sec=max_time_after_storm_end_sec)
+            max_time_after_end_sec=max_time_after_storm_end_sec,
+            storm_motion_index_dict=storm_motion_index_dict)
 
         these_event_rows = numpy.where(orig_to_unique_indices == i)[0]
 
@@ -1220,6 +1546,168 @@ def _share_linkages_between_periods(
     return early_storm_to_events_table, late_storm_to_events_table
 
 
+def _link_events_one_spc_date(argument_tuple):
+    """Links storms to events for one SPC date and writes the results.
+
+    This method is the unit of work for `link_events_many_spc_dates`, so it
+    takes a single argument (which can be passed through
+    `multiprocessing.Pool.map`).
+
+    :param argument_tuple: Tuple with the following elements.
+    argument_tuple[0]: event_type_string: See doc for
+        `link_events_many_spc_dates`.
+    argument_tuple[1]: tracking_file_names: 1-D list of paths to tracking files
+        for one SPC date.
+    argument_tuple[2]: top_event_dir_name: See doc for
+        `link_events_many_spc_dates`.
+    argument_tuple[3]: output_file_name: Path to output file (will be written
+        by `write_linkage_file`).
+    :return: output_file_name: Same as input.
+    """
+
+    (event_type_string, tracking_file_names, top_event_dir_name,
+     output_file_name) = argument_tuple
+
+    if event_type_string == WIND_EVENT_STRING:
+        storm_to_events_table = link_storms_to_winds(
+            tracking_file_names=tracking_file_names,
+            top_wind_directory_name=top_event_dir_name)
+    else:
+        storm_to_events_table = link_storms_to_tornadoes(
+            tracking_file_names=tracking_file_names,
+            tornado_directory_name=top_event_dir_name)
+
+    print 'Writing linkages to: "{0:s}"...'.format(output_file_name)
+    write_linkage_file(storm_to_events_table=storm_to_events_table,
+                       pickle_file_name=output_file_name)
+
+    return output_file_name
+
+
+def _char_matrix_to_strings(char_matrix):
+    """Converts matrix of characters to list of strings.
+
+    :param char_matrix: 2-D numpy array of characters (dtype "S1"), where each
+        row is one string.
+    :return: strings: 1-D list of strings.
+    """
+
+    num_strings = char_matrix.shape[0]
+    if num_strings == 0:
+        return []
+
+    char_matrix = numpy.ascontiguousarray(char_matrix, dtype='S1')
+    string_type = 'S{0:d}'.format(char_matrix.shape[1])
+    return [str(s) for s in char_matrix.view(string_type)[:, 0]]
+
+
+def _strings_to_char_matrix(strings):
+    """Converts list of strings to matrix of characters.
+
+    :param strings: 1-D list of strings.
+    :return: char_matrix: 2-D numpy array of characters (dtype "S1"), where each
+        row is one string.  The number of rows is max(1, number of strings), to
+        avoid zero-length NetCDF dimensions.
+    """
+
+    num_chars = 1
+    for this_string in strings:
+        num_chars = max([num_chars, len(this_string)])
+
+    string_type = 'S{0:d}'.format(num_chars)
+    if len(strings) == 0:
+        return numpy.full((1, num_chars), '', dtype='S1')
+
+    return netCDF4.stringtochar(numpy.array(strings, dtype=string_type))
+
+
+def _flatten_nested_column(storm_to_events_table, column_name):
+    """Flattens list-valued column of storm-to-events table.
+
+    :param storm_to_events_table: pandas DataFrame created by
+        `_reverse_wind_linkages` or `_reverse_tornado_linkages`.
+    :param column_name: Name of list-valued column.
+    :return: flat_values: 1-D numpy array with values for all storm objects,
+        concatenated in order of storm objects.
+    """
+
+    list_of_arrays = [
+        numpy.array(v) for v in storm_to_events_table[column_name].values
+    ]
+    list_of_arrays = [a for a in list_of_arrays if a.size > 0]
+
+    if len(list_of_arrays) == 0:
+        return numpy.array([])
+
+    return numpy.concatenate(list_of_arrays)
+
+
+def _write_linkage_variable(netcdf_dataset, variable_name, values, datatype,
+                            dimension_key):
+    """Writes one variable to columnar linkage file.
+
+    If `values` is shorter than the dimension (which happens only when the
+    dimension has been padded to length 1), the rest is filled with zeros.
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, open for writing.
+    :param variable_name: Variable name.
+    :param values: 1-D numpy array of values.
+    :param datatype: Data type.
+    :param dimension_key: Name of dimension.
+    """
+
+    netcdf_dataset.createVariable(
+        variable_name, datatype=datatype, dimensions=dimension_key)
+
+    num_values = len(values)
+    if num_values > 0:
+        netcdf_dataset.variables[variable_name][:num_values] = values
+    if num_values < len(netcdf_dataset.dimensions[dimension_key]):
+        netcdf_dataset.variables[variable_name][num_values:] = 0
+
+
+def _write_linkage_strings(netcdf_dataset, variable_name, strings,
+                           dimension_key):
+    """Writes list of strings to columnar linkage file.
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, open for writing.
+    :param variable_name: Variable name.
+    :param strings: 1-D list of strings.
+    :param dimension_key: Name of dimension.
+    """
+
+    char_matrix = _strings_to_char_matrix(strings)
+    char_dimension_key = '{0:s}_char'.format(variable_name)
+
+    netcdf_dataset.createDimension(char_dimension_key, char_matrix.shape[1])
+    netcdf_dataset.createVariable(
+        variable_name, datatype='S1',
+        dimensions=(dimension_key, char_dimension_key))
+    netcdf_dataset.variables[variable_name][:char_matrix.shape[0], :] = (
+        char_matrix)
+
+
+def _read_linkage_variable(netcdf_dataset, variable_name, num_values,
+                           memory_map):
+    """Reads one variable from columnar linkage file.
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset` or
+        `scipy.io.netcdf_file`.
+    :param variable_name: Variable name.
+    :param num_values: Number of values to read (from the beginning).
+    :param memory_map: Boolean flag.  If True, `netcdf_dataset` is a
+        memory-mapped `scipy.io.netcdf_file`, and this method will return a view
+        into the memory-mapped array (rather than a copy).
+    :return: values: numpy array of values.
+    """
+
+    values = netcdf_dataset.variables[variable_name][:num_values]
+    if memory_map:
+        return values
+
+    return numpy.array(values)
+
+
 def check_event_type(event_type_string):
     """Error-checks event type.
 
@@ -1505,9 +1993,105 @@ def share_linkages_across_spc_dates(
             print SEPARATOR_STRING
 
 
+def link_events_many_spc_dates(
+        event_type_string, spc_date_strings, tracking_file_names_by_date,
+        top_event_dir_name, top_output_dir_name,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_LINKAGE,
+        top_shared_output_dir_name=None):
+    """Links storms to events for many SPC dates, in parallel.
+
+    Each SPC date is handled by one process, which reads the tracking files
+    for that date (once), runs `link_storms_to_winds` or
+    `link_storms_to_tornadoes`, and writes a linkage file.  This is the same
+    work done by `scripts/link_winds_to_storms.py` or
+    `scripts/link_tornadoes_to_storms.py` for one date, so output files are the
+    same as if the dates were done serially.
+
+    If `top_shared_output_dir_name` is specified, linkages will then be shared
+    across SPC dates (by `share_linkages_across_spc_dates`), as a final step
+    done by the parent process.
+
+    T = number of SPC dates
+
+    :param event_type_string: Event type (must be accepted by
+        `check_event_type`).
+    :param spc_date_strings: length-T list of SPC dates (format "yyyymmdd").
+        These must be consecutive if `top_shared_output_dir_name` is specified.
+    :param tracking_file_names_by_date: length-T list, where the [i]th element
+        is a 1-D list of paths to tracking files for the [i]th date (readable by
+        `storm_tracking_io.read_processed_file`).
+    :param top_event_dir_name: Name of top-level directory with event data
+        (wind observations or tornado reports).  See doc for
+        `link_storms_to_winds` or `link_storms_to_tornadoes`.
+    :param top_output_dir_name: Name of top-level directory for linkage files
+        (before sharing across SPC dates).  Files will be written by
+        `write_linkage_file`, to locations therein determined by
+        `find_linkage_file`.
+    :param num_processes: Number of worker processes.  If 1, SPC dates will be
+        done serially in the current process.
+    :param top_shared_output_dir_name: Name of top-level directory for linkage
+        files after sharing across SPC dates.  If None, linkages will not be
+        shared across SPC dates.
+    :return: linkage_file_names: length-T list of paths to linkage files
+        (before sharing across SPC dates).
+    """
+
+    check_event_type(event_type_string)
+    error_checking.assert_is_string_list(spc_date_strings)
+    error_checking.assert_is_numpy_array(
+        numpy.array(spc_date_strings), num_dimensions=1)
+
+    num_spc_dates = len(spc_date_strings)
+    error_checking.assert_is_list(tracking_file_names_by_date)
+    error_checking.assert_equals(
+        len(tracking_file_names_by_date), num_spc_dates)
+
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+
+    argument_tuples = [
+        (event_type_string, tracking_file_names_by_date[i], top_event_dir_name,
+         find_linkage_file(
+             top_directory_name=top_output_dir_name,
+             event_type_string=event_type_string,
+             spc_date_string=spc_date_strings[i],
+             raise_error_if_missing=False)
+        )
+        for i in range(num_spc_dates)
+    ]
+
+    num_processes = min([num_processes, num_spc_dates])
+
+    if num_processes <= 1:
+        linkage_file_names = [
+            _link_events_one_spc_date(t) for t in argument_tuples
+        ]
+    else:
+        pool_object = multiprocessing.Pool(processes=num_processes)
+
+        try:
+            linkage_file_names = pool_object.map(
+                _link_events_one_spc_date, argument_tuples, chunksize=1)
+        finally:
+            pool_object.close()
+            pool_object.join()
+
+    if top_shared_output_dir_name is not None:
+        print SEPARATOR_STRING
+
+        share_linkages_across_spc_dates(
+            top_input_dir_name=top_output_dir_name,
+            first_spc_date_string=spc_date_strings[0],
+            last_spc_date_string=spc_date_strings[-1],
+            top_output_dir_name=top_shared_output_dir_name,
+            event_type_string=event_type_string)
+
+    return linkage_file_names
+
+
 def find_linkage_file(
         top_directory_name, event_type_string, spc_date_string,
-        raise_error_if_missing=True, unix_time_sec=None):
+        raise_error_if_missing=True, unix_time_sec=None, columnar=False):
     """Finds linkage file for either one time or one SPC date.
 
     :param top_directory_name: Name of top-level directory with linkage files.
@@ -1517,6 +2101,9 @@ def find_linkage_file(
     :param raise_error_if_missing: Boolean flag.  If file is missing and
         `raise_error_if_missing = True`, this method will error out.
     :param unix_time_sec: Valid time.
+    :param columnar: Boolean flag.  If True, will look for columnar NetCDF file
+        (readable by `read_linkage_file_columnar`).  If False, will look for
+        Pickle file (readable by `read_linkage_file`).
     :return: linkage_file_name: Path to linkage file.  If file is missing and
         `raise_error_if_missing = False`, this will be the *expected* path.
     :raises: ValueError: if file is missing and `raise_error_if_missing = True`.
@@ -1525,16 +2112,25 @@ def find_linkage_file(
     error_checking.assert_is_string(top_directory_name)
     check_event_type(event_type_string)
     error_checking.assert_is_boolean(raise_error_if_missing)
+    error_checking.assert_is_boolean(columnar)
+
+    if columnar:
+        file_extension = NETCDF_FILE_EXTENSION
+    else:
+        file_extension = PICKLE_FILE_EXTENSION
 
     if unix_time_sec is None:
         time_conversion.spc_date_string_to_unix_sec(spc_date_string)
 
         if event_type_string == WIND_EVENT_STRING:
-            linkage_file_name = '{0:s}/{1:s}/storm_to_winds_{2:s}.p'.format(
-                top_directory_name, spc_date_string[:4], spc_date_string)
+            linkage_file_name = '{0:s}/{1:s}/storm_to_winds_{2:s}{3:s}'.format(
+                top_directory_name, spc_date_string[:4], spc_date_string,
+                file_extension)
         else:
-            linkage_file_name = '{0:s}/{1:s}/storm_to_tornadoes_{2:s}.p'.format(
-                top_directory_name, spc_date_string[:4], spc_date_string)
+            linkage_file_name = (
+                '{0:s}/{1:s}/storm_to_tornadoes_{2:s}{3:s}'
+            ).format(top_directory_name, spc_date_string[:4], spc_date_string,
+                     file_extension)
     else:
         spc_date_string = time_conversion.time_to_spc_date_string(unix_time_sec)
         valid_time_string = time_conversion.unix_sec_to_string(
@@ -1542,14 +2138,14 @@ def find_linkage_file(
 
         if event_type_string == WIND_EVENT_STRING:
             linkage_file_name = (
-                '{0:s}/{1:s}/{2:s}/storm_to_winds_{3:s}.p'
+                '{0:s}/{1:s}/{2:s}/storm_to_winds_{3:s}{4:s}'
             ).format(top_directory_name, spc_date_string[:4], spc_date_string,
-                     valid_time_string)
+                     valid_time_string, file_extension)
         else:
             linkage_file_name = (
-                '{0:s}/{1:s}/{2:s}/storm_to_tornadoes_{3:s}.p'
+                '{0:s}/{1:s}/{2:s}/storm_to_tornadoes_{3:s}{4:s}'
             ).format(top_directory_name, spc_date_string[:4], spc_date_string,
-                     valid_time_string)
+                     valid_time_string, file_extension)
 
     if raise_error_if_missing and not os.path.isfile(linkage_file_name):
         error_string = 'Cannot find file.  Expected at: "{0:s}"'.format(
@@ -1601,3 +2197,325 @@ def read_linkage_file(pickle_file_name):
             storm_to_events_table, REQUIRED_TORNADO_LINKAGE_COLUMNS)
 
     return storm_to_events_table
+
+
+def write_linkage_file_columnar(storm_to_events_table, netcdf_file_name):
+    """Writes linkages to columnar NetCDF file.
+
+    Unlike the Pickle file written by `write_linkage_file`, this file contains
+    flat (1-D) arrays of events for all storm objects, along with the index of
+    the first event and number of events for each storm object.  Thus, the file
+    can be read by `read_linkage_file_columnar` with a subset of columns and,
+    optionally, memory-mapping.
+
+    Only the columns in `REQUIRED_WIND_LINKAGE_COLUMNS` or
+    `REQUIRED_TORNADO_LINKAGE_COLUMNS` are written.  For each storm outline,
+    only the exterior is written (storm outlines created by tracking have no
+    holes).
+
+    :param storm_to_events_table: pandas DataFrame created by
+        `_reverse_wind_linkages` or `_reverse_tornado_linkages`.
+    :param netcdf_file_name: Path to output file.
+    """
+
+    try:
+        error_checking.assert_columns_in_dataframe(
+            storm_to_events_table, REQUIRED_WIND_LINKAGE_COLUMNS)
+        event_type_string = WIND_EVENT_STRING
+    except:
+        error_checking.assert_columns_in_dataframe(
+            storm_to_events_table, REQUIRED_TORNADO_LINKAGE_COLUMNS)
+        event_type_string = TORNADO_EVENT_STRING
+
+    # Find first event and number of events for each storm object.
+    num_events_by_storm = numpy.array([
+        len(v) for v in storm_to_events_table[LINKAGE_DISTANCES_COLUMN].values
+    ], dtype=int)
+    first_event_index_by_storm = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_events_by_storm)[:-1]
+    ))
+
+    # Find first vertex and number of vertices for each storm outline.
+    polygon_objects_latlng = storm_to_events_table[
+        tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN].values
+
+    vertex_latitude_arrays = [
+        numpy.array(p.exterior.xy[1]) for p in polygon_objects_latlng
+    ]
+    vertex_longitude_arrays = [
+        numpy.array(p.exterior.xy[0]) for p in polygon_objects_latlng
+    ]
+
+    num_vertices_by_storm = numpy.array(
+        [len(v) for v in vertex_latitude_arrays], dtype=int)
+    first_vertex_index_by_storm = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_vertices_by_storm)[:-1]
+    ))
+
+    num_storm_objects = len(storm_to_events_table.index)
+    num_events = numpy.sum(num_events_by_storm)
+    num_vertices = numpy.sum(num_vertices_by_storm)
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=netcdf_file_name)
+    netcdf_dataset = netCDF4.Dataset(
+        netcdf_file_name, 'w', format='NETCDF3_64BIT_OFFSET')
+
+    # NetCDF3 treats zero-length dimensions as unlimited, so each dimension has
+    # length >= 1 and the true lengths are stored as attributes.
+    netcdf_dataset.setncattr(EVENT_TYPE_KEY, event_type_string)
+    netcdf_dataset.setncattr(NUM_STORM_OBJECTS_KEY, num_storm_objects)
+    netcdf_dataset.setncattr(NUM_EVENTS_KEY, num_events)
+    netcdf_dataset.setncattr(NUM_POLYGON_VERTICES_KEY, num_vertices)
+
+    netcdf_dataset.createDimension(
+        STORM_OBJECT_DIMENSION_KEY, max([num_storm_objects, 1]))
+    netcdf_dataset.createDimension(EVENT_DIMENSION_KEY, max([num_events, 1]))
+    netcdf_dataset.createDimension(
+        POLYGON_VERTEX_DIMENSION_KEY, max([num_vertices, 1]))
+
+    _write_linkage_strings(
+        netcdf_dataset=netcdf_dataset,
+        variable_name=tracking_utils.STORM_ID_COLUMN,
+        strings=storm_to_events_table[tracking_utils.STORM_ID_COLUMN].values,
+        dimension_key=STORM_OBJECT_DIMENSION_KEY)
+
+    for this_column in COLUMNAR_STORM_INTEGER_COLUMNS:
+        _write_linkage_variable(
+            netcdf_dataset=netcdf_dataset,
+            variable_name=this_column,
+            values=storm_to_events_table[this_column].values,
+            datatype=numpy.int32, dimension_key=STORM_OBJECT_DIMENSION_KEY)
+
+    for this_column in COLUMNAR_STORM_FLOAT_COLUMNS:
+        _write_linkage_variable(
+            netcdf_dataset=netcdf_dataset,
+            variable_name=this_column,
+            values=storm_to_events_table[this_column].values,
+            datatype=numpy.float64, dimension_key=STORM_OBJECT_DIMENSION_KEY)
+
+    _write_linkage_variable(
+        netcdf_dataset=netcdf_dataset,
+        variable_name=FIRST_EVENT_INDICES_KEY,
+        values=first_event_index_by_storm, datatype=numpy.int32,
+        dimension_key=STORM_OBJECT_DIMENSION_KEY)
+    _write_linkage_variable(
+        netcdf_dataset=netcdf_dataset,
+        variable_name=NUM_EVENTS_BY_STORM_KEY, values=num_events_by_storm,
+        datatype=numpy.int32, dimension_key=STORM_OBJECT_DIMENSION_KEY)
+    _write_linkage_variable(
+        netcdf_dataset=netcdf_dataset,
+        variable_name=FIRST_POLYGON_VERTEX_INDICES_KEY,
+        values=first_vertex_index_by_storm, datatype=numpy.int32,
+        dimension_key=STORM_OBJECT_DIMENSION_KEY)
+    _write_linkage_variable(
+        netcdf_dataset=netcdf_dataset,
+        variable_name=NUM_POLYGON_VERTICES_BY_STORM_KEY,
+        values=num_vertices_by_storm, datatype=numpy.int32,
+        dimension_key=STORM_OBJECT_DIMENSION_KEY)
+
+    if num_storm_objects == 0:
+        these_latitudes_deg = numpy.array([])
+        these_longitudes_deg = numpy.array([])
+    else:
+        these_latitudes_deg = numpy.concatenate(vertex_latitude_arrays)
+        these_longitudes_deg = numpy.concatenate(vertex_longitude_arrays)
+
+    _write_linkage_variable(
+        netcdf_dataset=netcdf_dataset,
+        variable_name=POLYGON_VERTEX_LATITUDES_KEY, values=these_latitudes_deg,
+        datatype=numpy.float64, dimension_key=POLYGON_VERTEX_DIMENSION_KEY)
+    _write_linkage_variable(
+        netcdf_dataset=netcdf_dataset,
+        variable_name=POLYGON_VERTEX_LONGITUDES_KEY,
+        values=these_longitudes_deg, datatype=numpy.float64,
+        dimension_key=POLYGON_VERTEX_DIMENSION_KEY)
+
+    for this_column in COLUMNAR_EVENT_INTEGER_COLUMNS:
+        if this_column not in storm_to_events_table:
+            continue
+
+        _write_linkage_variable(
+            netcdf_dataset=netcdf_dataset,
+            variable_name=this_column,
+            values=_flatten_nested_column(storm_to_events_table, this_column),
+            datatype=numpy.int32, dimension_key=EVENT_DIMENSION_KEY)
+
+    for this_column in COLUMNAR_EVENT_FLOAT_COLUMNS:
+        if this_column not in storm_to_events_table:
+            continue
+
+        _write_linkage_variable(
+            netcdf_dataset=netcdf_dataset,
+            variable_name=this_column,
+            values=_flatten_nested_column(storm_to_events_table, this_column),
+            datatype=numpy.float64, dimension_key=EVENT_DIMENSION_KEY)
+
+    for this_column in COLUMNAR_EVENT_STRING_COLUMNS:
+        if this_column not in storm_to_events_table:
+            continue
+
+        _write_linkage_strings(
+            netcdf_dataset=netcdf_dataset,
+            variable_name=this_column,
+            strings=_flatten_nested_column(
+                storm_to_events_table, this_column
+            ).tolist(),
+            dimension_key=EVENT_DIMENSION_KEY)
+
+    netcdf_dataset.close()
+
+
+def read_linkage_file_columnar(netcdf_file_name, column_names=None,
+                               memory_map=False):
+    """Reads linkages from columnar NetCDF file.
+
+    If `memory_map = True`, the file will be memory-mapped, so data are read
+    from disk only when accessed.  In this case, each list-valued column in the
+    output table contains views into one memory-mapped array (no copies).
+
+    :param netcdf_file_name: Path to input file (created by
+        `write_linkage_file_columnar`).
+    :param column_names: 1-D list of columns to read.  Storm IDs and valid times
+        are always read.  If None, will read all columns.
+    :param memory_map: Boolean flag.  If True, will memory-map the file.
+    :return: storm_to_events_table: pandas DataFrame with columns in
+        `column_names`.  See doc for `read_linkage_file`.
+    """
+
+    error_checking.assert_is_boolean(memory_map)
+
+    if memory_map:
+        netcdf_dataset = scipy.io.netcdf_file(
+            netcdf_file_name, 'r', mmap=True, maskandscale=False)
+    else:
+        netcdf_dataset = netcdf_io.open_netcdf(
+            netcdf_file_name=netcdf_file_name, raise_error_if_fails=True)
+
+    event_type_string = str(getattr(netcdf_dataset, EVENT_TYPE_KEY))
+    num_storm_objects = int(getattr(netcdf_dataset, NUM_STORM_OBJECTS_KEY))
+
+    if event_type_string == WIND_EVENT_STRING:
+        all_column_names = REQUIRED_WIND_LINKAGE_COLUMNS
+    else:
+        all_column_names = REQUIRED_TORNADO_LINKAGE_COLUMNS
+
+    if column_names is None:
+        column_names = all_column_names
+    else:
+        error_checking.assert_is_string_list(column_names)
+        for this_column in column_names:
+            if this_column in all_column_names:
+                continue
+
+            error_string = (
+                'Column "{0:s}" is not in file "{1:s}".'
+            ).format(this_column, netcdf_file_name)
+            raise ValueError(error_string)
+
+    column_names = [
+        c for c in all_column_names if c in
+        [tracking_utils.STORM_ID_COLUMN, tracking_utils.TIME_COLUMN] +
+        column_names
+    ]
+
+    storm_to_events_dict = {}
+    first_event_index_by_storm = None
+    num_events_by_storm = None
+
+    for this_column in column_names:
+        if this_column == tracking_utils.STORM_ID_COLUMN:
+            storm_to_events_dict[this_column] = _char_matrix_to_strings(
+                _read_linkage_variable(
+                    netcdf_dataset=netcdf_dataset, variable_name=this_column,
+                    num_values=num_storm_objects, memory_map=memory_map)
+            )
+            continue
+
+        if this_column == tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN:
+            first_vertex_index_by_storm = _read_linkage_variable(
+                netcdf_dataset=netcdf_dataset,
+                variable_name=FIRST_POLYGON_VERTEX_INDICES_KEY,
+                num_values=num_storm_objects, memory_map=memory_map)
+            num_vertices_by_storm = _read_linkage_variable(
+                netcdf_dataset=netcdf_dataset,
+                variable_name=NUM_POLYGON_VERTICES_BY_STORM_KEY,
+                num_values=num_storm_objects, memory_map=memory_map)
+
+            num_vertices = numpy.sum(num_vertices_by_storm)
+            vertex_latitudes_deg = _read_linkage_variable(
+                netcdf_dataset=netcdf_dataset,
+                variable_name=POLYGON_VERTEX_LATITUDES_KEY,
+                num_values=num_vertices, memory_map=memory_map)
+            vertex_longitudes_deg = _read_linkage_variable(
+                netcdf_dataset=netcdf_dataset,
+                variable_name=POLYGON_VERTEX_LONGITUDES_KEY,
+                num_values=num_vertices, memory_map=memory_map)
+
+            storm_to_events_dict[this_column] = [
+                polygons.vertex_arrays_to_polygon_object(
+                    exterior_x_coords=vertex_longitudes_deg[i:(i + n)],
+                    exterior_y_coords=vertex_latitudes_deg[i:(i + n)]
+                )
+                for i, n in zip(first_vertex_index_by_storm,
+                                num_vertices_by_storm)
+            ]
+            continue
+
+        if (this_column in COLUMNAR_STORM_INTEGER_COLUMNS or
+                this_column in COLUMNAR_STORM_FLOAT_COLUMNS):
+            these_values = _read_linkage_variable(
+                netcdf_dataset=netcdf_dataset, variable_name=this_column,
+                num_values=num_storm_objects, memory_map=memory_map)
+
+            if this_column in COLUMNAR_STORM_INTEGER_COLUMNS:
+                storm_to_events_dict[this_column] = these_values.astype(int)
+            else:
+                storm_to_events_dict[this_column] = these_values.astype(float)
+
+            continue
+
+        if first_event_index_by_storm is None:
+            first_event_index_by_storm = _read_linkage_variable(
+                netcdf_dataset=netcdf_dataset,
+                variable_name=FIRST_EVENT_INDICES_KEY,
+                num_values=num_storm_objects, memory_map=memory_map)
+            num_events_by_storm = _read_linkage_variable(
+                netcdf_dataset=netcdf_dataset,
+                variable_name=NUM_EVENTS_BY_STORM_KEY,
+                num_values=num_storm_objects, memory_map=memory_map)
+
+        these_values = _read_linkage_variable(
+            netcdf_dataset=netcdf_dataset, variable_name=this_column,
+            num_values=numpy.sum(num_events_by_storm), memory_map=memory_map)
+
+        if this_column in COLUMNAR_EVENT_STRING_COLUMNS:
+            these_values = _char_matrix_to_strings(these_values)
+
+        storm_to_events_dict[this_column] = [
+            these_values[i:(i + n)]
+            for i, n in zip(first_event_index_by_storm, num_events_by_storm)
+        ]
+
+    if memory_map:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            netcdf_dataset.close()
+    else:
+        netcdf_dataset.close()
+
+    storm_to_events_table = pandas.DataFrame.from_dict(storm_to_events_dict)
+    return storm_to_events_table[column_names]
+
+
+def convert_linkage_file_to_columnar(pickle_file_name, netcdf_file_name):
+    """Converts linkage file from Pickle to columnar NetCDF format.
+
+    :param pickle_file_name: Path to input file (readable by
+        `read_linkage_file`).
+    :param netcdf_file_name: Path to output file (will be written by
+        `write_linkage_file_columnar`).
+    """
+
+    write_linkage_file_columnar(
+        storm_to_events_table=read_linkage_file(pickle_file_name),
+        netcdf_file_name=netcdf_file_name)
@@ -1,12 +1,18 @@
 """Unit tests for linkage.py."""
 
 import copy
+import os.path
 import unittest
 import numpy
 import pandas
 from gewittergefahr.gg_io import raw_wind_io
+from gewittergefahr.gg_io import storm_tracking_io as tracking_io
+from gewittergefahr.gg_io import tornado_io
 from gewittergefahr.gg_utils import linkage
+from gewittergefahr.gg_utils import polygons
+from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
+from gewittergefahr.gg_utils import unit_test_utils
 
 TOLERANCE = 1e-6
 
@@ -664,6 +670,221 @@ LINKAGE_FILE_NAME_TORNADO_ONE_TIME = (
     'linkage/2018/20180201/storm_to_tornadoes_2018-02-01-222631.p')
 LINKAGE_FILE_NAME_TORNADO_ONE_DATE = (
     'linkage/2018/storm_to_tornadoes_20180201.p')
+LINKAGE_FILE_NAME_WIND_ONE_DATE_COLUMNAR = (
+    'linkage/2018/storm_to_winds_20180201.nc')
+
+# The following constants are used to test _strings_to_char_matrix,
+# _char_matrix_to_strings, and _flatten_nested_column.
+STRINGS_FOR_CHAR_MATRIX = ['a', 'bcd', '', 'ef']
+CHAR_MATRIX = numpy.array([
+    ['a', '', ''],
+    ['b', 'c', 'd'],
+    ['', '', ''],
+    ['e', 'f', '']
+], dtype='S1')
+
+THIS_DICT = {
+    linkage.LINKAGE_DISTANCES_COLUMN: [
+        numpy.array([1, 2], dtype=float), numpy.array([], dtype=float),
+        numpy.array([3], dtype=float)
+    ]
+}
+TABLE_WITH_NESTED_COLUMN = pandas.DataFrame.from_dict(THIS_DICT)
+FLAT_LINKAGE_DISTANCES_METRES = numpy.array([1, 2, 3], dtype=float)
+
+# The following constants are used to test write_linkage_file_columnar and
+# read_linkage_file_columnar.
+THESE_POLYGON_OBJECTS = [
+    polygons.vertex_arrays_to_polygon_object(
+        exterior_x_coords=numpy.array([260, 261, 261, 260, 260], dtype=float),
+        exterior_y_coords=numpy.array([35, 35, 36, 36, 35], dtype=float)),
+    polygons.vertex_arrays_to_polygon_object(
+        exterior_x_coords=numpy.array([262, 263, 262, 262], dtype=float),
+        exterior_y_coords=numpy.array([40, 40, 41, 40], dtype=float)),
+    polygons.vertex_arrays_to_polygon_object(
+        exterior_x_coords=numpy.array([250, 251, 251, 250, 250], dtype=float),
+        exterior_y_coords=numpy.array([50, 50, 52, 52, 50], dtype=float))
+]
+
+THIS_DICT = {
+    tracking_utils.STORM_ID_COLUMN: ['foo', 'bar', 'moo'],
+    tracking_utils.TIME_COLUMN: numpy.array([0, 300, 600], dtype=int),
+    tracking_utils.TRACKING_START_TIME_COLUMN:
+        numpy.array([0, 0, 0], dtype=int),
+    tracking_utils.TRACKING_END_TIME_COLUMN:
+        numpy.array([900, 900, 900], dtype=int),
+    tracking_utils.CELL_START_TIME_COLUMN: numpy.array([0, 0, 300], dtype=int),
+    tracking_utils.CELL_END_TIME_COLUMN:
+        numpy.array([300, 600, 900], dtype=int),
+    tracking_utils.CENTROID_LAT_COLUMN: numpy.array([35.5, 40.3, 51.]),
+    tracking_utils.CENTROID_LNG_COLUMN: numpy.array([260.5, 262.3, 250.5]),
+    tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN: THESE_POLYGON_OBJECTS,
+    linkage.LINKAGE_DISTANCES_COLUMN: [
+        numpy.array([0, 1000.5]), numpy.array([]), numpy.array([2500.])
+    ],
+    linkage.RELATIVE_EVENT_TIMES_COLUMN: [
+        numpy.array([-60, 120], dtype=int), numpy.array([], dtype=int),
+        numpy.array([0], dtype=int)
+    ],
+    linkage.EVENT_LATITUDES_COLUMN: [
+        numpy.array([35.6, 35.7]), numpy.array([]), numpy.array([51.1])
+    ],
+    linkage.EVENT_LONGITUDES_COLUMN: [
+        numpy.array([260.6, 260.7]), numpy.array([]), numpy.array([250.6])
+    ]
+}
+
+COLUMNAR_STORM_TO_TORNADOES_TABLE = pandas.DataFrame.from_dict(
+    copy.deepcopy(THIS_DICT))
+THIS_DICT.update({
+    linkage.WIND_STATION_IDS_COLUMN: [
+        ['KOUN', 'OKC_mesonet'], [], ['x']
+    ],
+    linkage.U_WINDS_COLUMN: [
+        numpy.array([25.5, -30.]), numpy.array([]), numpy.array([0.])
+    ],
+    linkage.V_WINDS_COLUMN: [
+        numpy.array([10., 5.]), numpy.array([]), numpy.array([-26.])
+    ]
+})
+
+COLUMNAR_STORM_TO_WINDS_TABLE = pandas.DataFrame.from_dict(THIS_DICT)
+COLUMNAR_STORM_TO_TORNADOES_TABLE = COLUMNAR_STORM_TO_TORNADOES_TABLE.assign(**{
+    linkage.FUJITA_RATINGS_COLUMN: [
+        ['EF1', 'F3'], [], ['EF0']
+    ]
+})
+
+COLUMNS_TO_READ = [
+    linkage.EVENT_LATITUDES_COLUMN, linkage.WIND_STATION_IDS_COLUMN,
+    tracking_utils.CENTROID_LNG_COLUMN
+]
+COLUMNS_IN_SUBSET_TABLE = [
+    tracking_utils.STORM_ID_COLUMN, tracking_utils.TIME_COLUMN,
+    tracking_utils.CENTROID_LNG_COLUMN, linkage.EVENT_LATITUDES_COLUMN,
+    linkage.WIND_STATION_IDS_COLUMN
+]
+
+# The following constants are used to test link_events_many_spc_dates.
+DRIVER_SPC_DATE_STRINGS = ['20110427', '20110428']
+DRIVER_TIMES_AFTER_DATE_START_SEC = numpy.array([43200, 43500], dtype=int)
+DRIVER_STORM_LATITUDES_DEG = numpy.array([35, 36], dtype=float)
+DRIVER_STORM_LONGITUDES_DEG = numpy.array([262, 263], dtype=float)
+DRIVER_VERTEX_LNG_OFFSETS_DEG = numpy.array([-0.05, 0.05, 0.05, -0.05, -0.05])
+DRIVER_VERTEX_LAT_OFFSETS_DEG = numpy.array([-0.05, -0.05, 0.05, 0.05, -0.05])
+
+THIS_START_TIME_UNIX_SEC = time_conversion.get_start_of_spc_date(
+    DRIVER_SPC_DATE_STRINGS[0])
+THIS_DICT = {
+    tornado_io.START_TIME_COLUMN: numpy.array(
+        [THIS_START_TIME_UNIX_SEC + 43300], dtype=int),
+    tornado_io.END_TIME_COLUMN: numpy.array(
+        [THIS_START_TIME_UNIX_SEC + 43400], dtype=int),
+    tornado_io.START_LAT_COLUMN: numpy.array([35.]),
+    tornado_io.END_LAT_COLUMN: numpy.array([35.]),
+    tornado_io.START_LNG_COLUMN: numpy.array([262.]),
+    tornado_io.END_LNG_COLUMN: numpy.array([262.01]),
+    tornado_io.FUJITA_RATING_COLUMN: ['EF1'],
+    tornado_io.WIDTH_COLUMN: numpy.array([50.])
+}
+DRIVER_TORNADO_TABLE = pandas.DataFrame.from_dict(THIS_DICT)
+
+
+def _write_driver_input_files(top_directory_name):
+    """Writes tracking files and tornado reports for link_events_many_spc_dates.
+
+    There are two storm cells on each SPC date, each tracked at two times.  The
+    only tornado touches the first cell on the first date.
+
+    :param top_directory_name: Name of top-level directory for input files.
+    :return: tracking_file_names_by_date: 1-D list, where the [i]th element is a
+        1-D list of tracking files for the [i]th SPC date.
+    :return: top_tornado_dir_name: Name of top-level directory with tornado
+        reports.
+    """
+
+    num_storms = len(DRIVER_STORM_LATITUDES_DEG)
+    tracking_file_names_by_date = []
+
+    for this_spc_date_string in DRIVER_SPC_DATE_STRINGS:
+        this_date_start_time_unix_sec = time_conversion.get_start_of_spc_date(
+            this_spc_date_string)
+        these_times_unix_sec = (
+            this_date_start_time_unix_sec + DRIVER_TIMES_AFTER_DATE_START_SEC)
+        these_file_names = []
+
+        for this_time_unix_sec in these_times_unix_sec:
+            these_polygon_objects = [
+                polygons.vertex_arrays_to_polygon_object(
+                    exterior_x_coords=(
+                        DRIVER_STORM_LONGITUDES_DEG[j] +
+                        DRIVER_VERTEX_LNG_OFFSETS_DEG),
+                    exterior_y_coords=(
+                        DRIVER_STORM_LATITUDES_DEG[j] +
+                        DRIVER_VERTEX_LAT_OFFSETS_DEG)
+                )
+                for j in range(num_storms)
+            ]
+
+            this_dict = {
+                tracking_utils.STORM_ID_COLUMN: [
+                    '{0:s}_{1:d}'.format(this_spc_date_string, j)
+                    for j in range(num_storms)
+                ],
+                tracking_utils.TIME_COLUMN:
+                    numpy.full(num_storms, this_time_unix_sec, dtype=int),
+                tracking_utils.SPC_DATE_COLUMN: numpy.full(
+                    num_storms, this_date_start_time_unix_sec, dtype=int),
+                tracking_utils.EAST_VELOCITY_COLUMN:
+                    numpy.full(num_storms, 10.),
+                tracking_utils.NORTH_VELOCITY_COLUMN:
+                    numpy.full(num_storms, 0.),
+                tracking_utils.AGE_COLUMN: numpy.full(
+                    num_storms, this_time_unix_sec - these_times_unix_sec[0],
+                    dtype=int),
+                tracking_utils.CENTROID_LAT_COLUMN: DRIVER_STORM_LATITUDES_DEG,
+                tracking_utils.CENTROID_LNG_COLUMN: DRIVER_STORM_LONGITUDES_DEG,
+                tracking_utils.TRACKING_START_TIME_COLUMN: numpy.full(
+                    num_storms, these_times_unix_sec[0], dtype=int),
+                tracking_utils.TRACKING_END_TIME_COLUMN: numpy.full(
+                    num_storms, these_times_unix_sec[-1], dtype=int),
+                tracking_utils.CELL_START_TIME_COLUMN: numpy.full(
+                    num_storms, these_times_unix_sec[0], dtype=int),
+                tracking_utils.CELL_END_TIME_COLUMN: numpy.full(
+                    num_storms, these_times_unix_sec[-1], dtype=int),
+                tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN:
+                    these_polygon_objects,
+                tracking_utils.POLYGON_OBJECT_ROWCOL_COLUMN:
+                    these_polygon_objects
+            }
+
+            for this_column in [
+                    tracking_utils.GRID_POINT_LAT_COLUMN,
+                    tracking_utils.GRID_POINT_LNG_COLUMN,
+                    tracking_utils.GRID_POINT_ROW_COLUMN,
+                    tracking_utils.GRID_POINT_COLUMN_COLUMN]:
+                this_dict[this_column] = [numpy.array([0.])] * num_storms
+
+            this_file_name = os.path.join(
+                top_directory_name, 'tracking', '{0:d}.p'.format(
+                    this_time_unix_sec))
+            tracking_io.write_processed_file(
+                storm_object_table=pandas.DataFrame.from_dict(this_dict),
+                pickle_file_name=this_file_name)
+            these_file_names.append(this_file_name)
+
+        tracking_file_names_by_date.append(these_file_names)
+
+    top_tornado_dir_name = os.path.join(top_directory_name, 'tornadoes')
+    tornado_io.write_processed_file(
+        tornado_table=DRIVER_TORNADO_TABLE,
+        csv_file_name=tornado_io.find_processed_file(
+            directory_name=top_tornado_dir_name,
+            year=int(DRIVER_SPC_DATE_STRINGS[0][:4]),
+            raise_error_if_missing=False)
+    )
+
+    return tracking_file_names_by_date, top_tornado_dir_name
 
 
 def _compare_storm_to_events_tables(first_table, second_table):
@@ -711,7 +932,33 @@ def _compare_storm_to_events_tables(first_table, second_table):
     return True
 
 
-class LinkageTests(unittest.TestCase):
+def _compare_polygon_columns(first_table, second_table):
+    """Compares storm outlines in two tables with storm-to-event linkages.
+
+    :param first_table: First table.
+    :param second_table: Second table.
+    :return: are_outlines_equal: Boolean flag.
+    """
+
+    first_polygon_objects = first_table[
+        tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN].values
+    second_polygon_objects = second_table[
+        tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN].values
+
+    if len(first_polygon_objects) != len(second_polygon_objects):
+        return False
+
+    for this_first_object, this_second_object in zip(
+            first_polygon_objects, second_polygon_objects):
+        if not numpy.allclose(
+                numpy.array(this_first_object.exterior.xy),
+                numpy.array(this_second_object.exterior.xy), atol=TOLERANCE):
+            return False
+
+    return True
+
+
+class LinkageTests(unit_test_utils.TestCaseWithTempDir):
     """Each method is a unit test for linkage.py."""
 
     def test_filter_storms_by_time_early_start_early_end(self):
@@ -836,6 +1083,25 @@ class LinkageTests(unittest.TestCase):
 
         self.assertTrue(this_vertex_table.equals(INTERP_VERTEX_TABLE_2OBJECTS))
 
+    def test_interp_storms_in_time_precomputed_index(self):
+        """Ensures correct output from _interp_storms_in_time.
+
+        In this case the storm-motion index is created beforehand by
+        _create_storm_motion_index.
+        """
+
+        this_index_dict = linkage._create_storm_motion_index(
+            STORM_OBJECT_TABLE_2CELLS)
+
+        this_vertex_table = linkage._interp_storms_in_time(
+            storm_object_table=STORM_OBJECT_TABLE_2CELLS,
+            target_time_unix_sec=INTERP_TIME_2CELLS_UNIX_SEC,
+            max_time_before_start_sec=MAX_TIME_BEFORE_STORM_START_SEC,
+            max_time_after_end_sec=MAX_TIME_AFTER_STORM_END_SEC,
+            storm_motion_index_dict=this_index_dict)
+
+        self.assertTrue(this_vertex_table.equals(INTERP_VERTEX_TABLE_2OBJECTS))
+
     def test_find_nearest_storms_one_time(self):
         """Ensures correct output from _find_nearest_storms_one_time."""
 
@@ -949,6 +1215,189 @@ class LinkageTests(unittest.TestCase):
 
         self.assertTrue(this_file_name == LINKAGE_FILE_NAME_TORNADO_ONE_DATE)
 
+    def test_find_linkage_file_wind_one_spc_date_columnar(self):
+        """Ensures correct output from find_linkage_file.
+
+        In this case, file contains wind linkages for one SPC date, in columnar
+        format.
+        """
+
+        this_file_name = linkage.find_linkage_file(
+            top_directory_name=TOP_DIRECTORY_NAME,
+            event_type_string=linkage.WIND_EVENT_STRING,
+            raise_error_if_missing=False, unix_time_sec=None,
+            spc_date_string=FILE_SPC_DATE_STRING, columnar=True)
+
+        self.assertTrue(
+            this_file_name == LINKAGE_FILE_NAME_WIND_ONE_DATE_COLUMNAR)
+
+    def test_strings_to_char_matrix(self):
+        """Ensures correct output from _strings_to_char_matrix."""
+
+        this_char_matrix = linkage._strings_to_char_matrix(
+            STRINGS_FOR_CHAR_MATRIX)
+        self.assertTrue(numpy.array_equal(this_char_matrix, CHAR_MATRIX))
+
+    def test_char_matrix_to_strings(self):
+        """Ensures correct output from _char_matrix_to_strings."""
+
+        these_strings = linkage._char_matrix_to_strings(CHAR_MATRIX)
+        self.assertTrue(these_strings == STRINGS_FOR_CHAR_MATRIX)
+
+    def test_flatten_nested_column(self):
+        """Ensures correct output from _flatten_nested_column."""
+
+        these_distances_metres = linkage._flatten_nested_column(
+            storm_to_events_table=TABLE_WITH_NESTED_COLUMN,
+            column_name=linkage.LINKAGE_DISTANCES_COLUMN)
+
+        self.assertTrue(numpy.allclose(
+            these_distances_metres, FLAT_LINKAGE_DISTANCES_METRES,
+            atol=TOLERANCE))
+
+    def test_write_read_columnar_winds(self):
+        """Ensures that read_linkage_file_columnar inverts the writer.
+
+        In this case, the file contains wind linkages and all columns are read.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'winds.nc')
+        linkage.write_linkage_file_columnar(
+            storm_to_events_table=COLUMNAR_STORM_TO_WINDS_TABLE,
+            netcdf_file_name=this_file_name)
+        this_table = linkage.read_linkage_file_columnar(this_file_name)
+
+        self.assertTrue(
+            list(this_table) == linkage.REQUIRED_WIND_LINKAGE_COLUMNS)
+        self.assertTrue(_compare_polygon_columns(
+            this_table, COLUMNAR_STORM_TO_WINDS_TABLE))
+
+        these_columns = [
+            c for c in linkage.REQUIRED_WIND_LINKAGE_COLUMNS
+            if c != tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN
+        ]
+        self.assertTrue(_compare_storm_to_events_tables(
+            this_table[these_columns],
+            COLUMNAR_STORM_TO_WINDS_TABLE[these_columns]
+        ))
+
+    def test_write_read_columnar_tornadoes(self):
+        """Ensures that read_linkage_file_columnar inverts the writer.
+
+        In this case, the file contains tornado linkages and all columns are
+        read.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'tornadoes.nc')
+        linkage.write_linkage_file_columnar(
+            storm_to_events_table=COLUMNAR_STORM_TO_TORNADOES_TABLE,
+            netcdf_file_name=this_file_name)
+        this_table = linkage.read_linkage_file_columnar(this_file_name)
+
+        self.assertTrue(
+            list(this_table) == linkage.REQUIRED_TORNADO_LINKAGE_COLUMNS)
+        self.assertTrue(_compare_polygon_columns(
+            this_table, COLUMNAR_STORM_TO_TORNADOES_TABLE))
+
+        these_columns = [
+            c for c in linkage.REQUIRED_TORNADO_LINKAGE_COLUMNS
+            if c != tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN
+        ]
+        self.assertTrue(_compare_storm_to_events_tables(
+            this_table[these_columns],
+            COLUMNAR_STORM_TO_TORNADOES_TABLE[these_columns]
+        ))
+
+    def test_write_read_columnar_subset(self):
+        """Ensures that read_linkage_file_columnar inverts the writer.
+
+        In this case, the file contains wind linkages and only some columns are
+        read, with memory-mapping.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'winds.nc')
+        linkage.write_linkage_file_columnar(
+            storm_to_events_table=COLUMNAR_STORM_TO_WINDS_TABLE,
+            netcdf_file_name=this_file_name)
+        this_table = linkage.read_linkage_file_columnar(
+            this_file_name, column_names=COLUMNS_TO_READ, memory_map=True)
+
+        self.assertTrue(list(this_table) == COLUMNS_IN_SUBSET_TABLE)
+        self.assertTrue(_compare_storm_to_events_tables(
+            this_table, COLUMNAR_STORM_TO_WINDS_TABLE[COLUMNS_IN_SUBSET_TABLE]))
+
+    def test_read_columnar_bad_column(self):
+        """Ensures that read_linkage_file_columnar errors out.
+
+        In this case, one of the desired columns is not in the file.
+        """
+
+        this_file_name = os.path.join(self.temp_dir_name, 'tornadoes.nc')
+        linkage.write_linkage_file_columnar(
+            storm_to_events_table=COLUMNAR_STORM_TO_TORNADOES_TABLE,
+            netcdf_file_name=this_file_name)
+
+        with self.assertRaises(ValueError):
+            linkage.read_linkage_file_columnar(
+                this_file_name, column_names=[linkage.U_WINDS_COLUMN])
+
+    def test_link_events_many_spc_dates(self):
+        """Ensures that link_events_many_spc_dates does not depend on the pool.
+
+        In this case, linkage files created serially and with two worker
+        processes should contain the same storm-to-tornado linkages.
+        """
+
+        these_tracking_file_names_by_date, this_tornado_dir_name = (
+            _write_driver_input_files(self.temp_dir_name))
+
+        these_file_names_serial = linkage.link_events_many_spc_dates(
+            event_type_string=linkage.TORNADO_EVENT_STRING,
+            spc_date_strings=DRIVER_SPC_DATE_STRINGS,
+            tracking_file_names_by_date=these_tracking_file_names_by_date,
+            top_event_dir_name=this_tornado_dir_name,
+            top_output_dir_name=os.path.join(self.temp_dir_name, 'serial'),
+            num_processes=1)
+
+        these_file_names_parallel = linkage.link_events_many_spc_dates(
+            event_type_string=linkage.TORNADO_EVENT_STRING,
+            spc_date_strings=DRIVER_SPC_DATE_STRINGS,
+            tracking_file_names_by_date=these_tracking_file_names_by_date,
+            top_event_dir_name=this_tornado_dir_name,
+            top_output_dir_name=os.path.join(self.temp_dir_name, 'parallel'),
+            num_processes=2)
+
+        self.assertTrue(
+            len(these_file_names_serial) == len(DRIVER_SPC_DATE_STRINGS))
+        self.assertTrue(
+            len(these_file_names_parallel) == len(DRIVER_SPC_DATE_STRINGS))
+
+        these_columns = [
+            c for c in linkage.REQUIRED_TORNADO_LINKAGE_COLUMNS
+            if c != tracking_utils.POLYGON_OBJECT_LATLNG_COLUMN
+        ]
+        this_num_linked_objects = 0
+
+        for this_serial_file_name, this_parallel_file_name in zip(
+                these_file_names_serial, these_file_names_parallel):
+            this_serial_table = linkage.read_linkage_file(this_serial_file_name)
+            this_parallel_table = linkage.read_linkage_file(
+                this_parallel_file_name)
+
+            self.assertTrue(_compare_polygon_columns(
+                this_serial_table, this_parallel_table))
+            self.assertTrue(_compare_storm_to_events_tables(
+                this_serial_table[these_columns],
+                this_parallel_table[these_columns]
+            ))
+
+            this_num_linked_objects += numpy.sum(numpy.array([
+                len(t) for t in
+                this_serial_table[linkage.EVENT_LATITUDES_COLUMN].values
+            ]) > 0)
+
+        self.assertTrue(this_num_linked_objects > 0)
+
 
 if __name__ == '__main__':
     unittest.main()
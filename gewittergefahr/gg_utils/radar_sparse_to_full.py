@@ -8,6 +8,7 @@ import numpy
 from gewittergefahr.gg_io import myrorss_and_mrms_io
 from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import error_checking
 
 MIN_CENTER_LAT_COLUMN = 'min_center_lat_deg'
 MAX_CENTER_LAT_COLUMN = 'max_center_lat_deg'
@@ -16,7 +17,7 @@ MAX_CENTER_LNG_COLUMN = 'max_center_lng_deg'
 
 
 def _convert(sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
-             ignore_if_below=None):
+             ignore_if_below=None, use_float32=False, output_matrix=None):
     """Converts data from sparse to full grid.
 
     M = number of rows (unique grid-point latitudes)
@@ -30,9 +31,31 @@ def _convert(sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
     :param num_grid_columns: Number of columns in grid.
     :param ignore_if_below: This method will ignore values of `field_name` <
         `ignore_if_below`.  If None, this method will consider all values.
-    :return: full_matrix: M-by-N numpy array of radar values.
+    :param use_float32: Boolean flag.  If True, output will be 32-bit floats.
+        If False, output will be 64-bit floats.  Ignored if `output_matrix` is
+        specified.
+    :param output_matrix: M-by-N numpy array of floats, into which output will
+        be written (this saves allocating a new array for every conversion).
+        Existing values will be overwritten.  If None, a new array will be
+        allocated.
+    :return: full_matrix: M-by-N numpy array of radar values.  If
+        `output_matrix` is specified, this is the same object.
     """
 
+    if output_matrix is None:
+        error_checking.assert_is_boolean(use_float32)
+        output_matrix = numpy.full(
+            (num_grid_rows, num_grid_columns), numpy.nan,
+            dtype=numpy.float32 if use_float32 else float)
+    else:
+        error_checking.assert_is_float_numpy_array(output_matrix)
+        error_checking.assert_is_numpy_array(
+            output_matrix,
+            exact_dimensions=numpy.array(
+                [num_grid_rows, num_grid_columns], dtype=int)
+        )
+        output_matrix.fill(numpy.nan)
+
     if ignore_if_below is None:
         num_sparse_values = len(sparse_grid_table.index)
         sparse_indices_to_consider = numpy.linspace(
@@ -41,42 +64,37 @@ def _convert(sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
         sparse_indices_to_consider = numpy.where(
             sparse_grid_table[field_name].values >= ignore_if_below)[0]
 
-    new_sparse_grid_table = sparse_grid_table.iloc[sparse_indices_to_consider]
     data_start_indices = numpy.ravel_multi_index(
-        (new_sparse_grid_table[myrorss_and_mrms_io.GRID_ROW_COLUMN].values,
-         new_sparse_grid_table[myrorss_and_mrms_io.GRID_COLUMN_COLUMN].values),
+        (sparse_grid_table[myrorss_and_mrms_io.GRID_ROW_COLUMN].values[
+            sparse_indices_to_consider],
+         sparse_grid_table[myrorss_and_mrms_io.GRID_COLUMN_COLUMN].values[
+             sparse_indices_to_consider]),
         (num_grid_rows, num_grid_columns))
-    data_end_indices = (data_start_indices + new_sparse_grid_table[
-        myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN].values - 1)
-
-    num_data_runs = len(data_start_indices)
-    num_data_values = numpy.sum(
-        new_sparse_grid_table[
-            myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN].values).astype(int)
-
-    data_indices = numpy.full(num_data_values, numpy.nan, dtype=int)
-    data_values = numpy.full(num_data_values, numpy.nan)
-    num_values_added = 0
-
-    for i in range(num_data_runs):
-        these_data_indices = range(
-            data_start_indices[i], data_end_indices[i] + 1)
-        this_num_values = len(these_data_indices)
-
-        these_array_indices = range(
-            num_values_added, num_values_added + this_num_values)
-        num_values_added += this_num_values
-
-        data_indices[these_array_indices] = these_data_indices
-        data_values[these_array_indices] = new_sparse_grid_table[
-            field_name].values[i]
-
-    full_matrix = numpy.full(num_grid_rows * num_grid_columns, numpy.nan)
-    full_matrix[data_indices] = data_values
-    return numpy.reshape(full_matrix, (num_grid_rows, num_grid_columns))
-
-
-def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None):
+    run_lengths = numpy.round(
+        sparse_grid_table[myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN].values[
+            sparse_indices_to_consider]
+    ).astype(int)
+
+    # Each run is expanded without a loop.  The [j]th value in the [i]th run
+    # goes to flattened index data_start_indices[i] + j, which is (global
+    # position of the value) + (start of the [i]th run) - (number of values in
+    # runs before the [i]th).
+    num_values_before_run = numpy.cumsum(run_lengths) - run_lengths
+    num_data_values = numpy.sum(run_lengths)
+
+    data_indices = numpy.repeat(
+        data_start_indices - num_values_before_run, run_lengths
+    ) + numpy.linspace(0, num_data_values - 1, num=num_data_values, dtype=int)
+    data_values = numpy.repeat(
+        sparse_grid_table[field_name].values[sparse_indices_to_consider],
+        run_lengths)
+
+    numpy.put(output_matrix, data_indices, data_values)
+    return output_matrix
+
+
+def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None,
+                        use_float32=False, output_matrix=None):
     """Converts data from sparse to full grid (public wrapper for _convert).
 
     M = number of rows (unique grid-point latitudes)
@@ -88,6 +106,8 @@ def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None):
         `myrorss_and_mrms_io.read_metadata_from_raw_file`.
     :param ignore_if_below: This method will ignore radar values <
         `ignore_if_below`.  If None, this method will consider all values.
+    :param use_float32: See doc for `_convert`.
+    :param output_matrix: Same.
     :return: full_matrix: M-by-N numpy array of radar values.  Latitude
         decreases down each column, and longitude increases to the right along
         each row.
@@ -116,7 +136,8 @@ def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None):
         field_name=metadata_dict[radar_utils.FIELD_NAME_COLUMN],
         num_grid_rows=metadata_dict[radar_utils.NUM_LAT_COLUMN],
         num_grid_columns=metadata_dict[radar_utils.NUM_LNG_COLUMN],
-        ignore_if_below=ignore_if_below)
+        ignore_if_below=ignore_if_below, use_float32=use_float32,
+        output_matrix=output_matrix)
 
     return (
         full_matrix, unique_grid_point_lat_deg[::-1], unique_grid_point_lng_deg)
@@ -71,6 +71,41 @@ class RadarSparseToFullTests(unittest.TestCase):
             this_full_matrix, FULL_MATRIX_LESS_THAN_51_IGNORED, atol=TOLERANCE,
             equal_nan=True))
 
+    def test_convert_float32(self):
+        """Ensures correct output from _convert.
+
+        In this case, output should be 32-bit floats.
+        """
+
+        this_full_matrix = radar_s2f._convert(
+            SPARSE_GRID_TABLE, field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            ignore_if_below=None, use_float32=True)
+
+        self.assertTrue(this_full_matrix.dtype == numpy.float32)
+        self.assertTrue(numpy.allclose(
+            this_full_matrix, FULL_MATRIX_NO_VALUES_IGNORED, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_convert_preallocated(self):
+        """Ensures correct output from _convert.
+
+        In this case, output is written into a preallocated array, which already
+        contains values.
+        """
+
+        this_output_matrix = numpy.full(
+            (NUM_GRID_ROWS, NUM_GRID_COLUMNS), 100.)
+        this_full_matrix = radar_s2f._convert(
+            SPARSE_GRID_TABLE, field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            ignore_if_below=51., output_matrix=this_output_matrix)
+
+        self.assertTrue(this_full_matrix is this_output_matrix)
+        self.assertTrue(numpy.allclose(
+            this_full_matrix, FULL_MATRIX_LESS_THAN_51_IGNORED, atol=TOLERANCE,
+            equal_nan=True))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,7 @@ import netCDF4
 from scipy.interpolate import interp1d as scipy_interp1d
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import netcdf_io
+from gewittergefahr.gg_io import nwp_model_io
 from gewittergefahr.gg_utils import geodetic_utils
 from gewittergefahr.gg_utils import nwp_model_utils
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
@@ -36,6 +37,7 @@ TIME_FORMAT_IN_FILE_NAMES = '%Y-%m-%d-%H%M%S'
 MB_TO_PASCALS = 100
 PASCALS_TO_MB = 0.01
 PERCENT_TO_UNITLESS = 0.01
+BYTES_TO_MEGABYTES = 1. / (1024 ** 2)
 ELEVATION_DIR_NAME = '/condo/swatwork/ralager/elevation'
 
 PRESSURE_LEVEL_KEY = 'pressure_level_mb'
@@ -335,7 +337,7 @@ def _create_target_points_for_interp(storm_object_table, lead_times_seconds):
 def _interp_soundings_from_nwp(
         target_point_table, top_grib_directory_name, include_surface,
         model_name, use_all_grids, grid_id, wgrib_exe_name, wgrib2_exe_name,
-        raise_error_if_missing):
+        raise_error_if_missing, all_query_times_unix_sec=None):
     """Interpolates soundings from NWP model to target points.
 
     Each target point consists of (latitude, longitude, time).
@@ -351,6 +353,7 @@ def _interp_soundings_from_nwp(
     :param wgrib_exe_name: Same.
     :param wgrib2_exe_name: Same.
     :param raise_error_if_missing: Same.
+    :param all_query_times_unix_sec: Same.
     :return: interp_table: pandas DataFrame, where each column is one field and
         each row is one target point.  Column names are from the list
     """
@@ -368,7 +371,84 @@ def _interp_soundings_from_nwp(
         temporal_interp_method_string=interp.PREV_NEIGHBOUR_METHOD_STRING,
         spatial_interp_method_string=interp.NEAREST_NEIGHBOUR_METHOD_STRING,
         wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_missing=raise_error_if_missing)
+        raise_error_if_missing=raise_error_if_missing,
+        all_query_times_unix_sec=all_query_times_unix_sec)
+
+
+def _find_unique_target_points(
+        target_point_table, model_name, use_all_grids, grid_id):
+    """Finds target points with the same sounding.
+
+    Soundings are interpolated from the nearest grid point at the previous
+    model-initialization time (see `_interp_soundings_from_nwp`).  Thus, target
+    points with the same nearest grid point (on every grid that may be used)
+    and the same previous init time have the same sounding in pressure
+    coordinates.
+
+    Init times are found from all target points, so the unique target points
+    must be interpolated with `all_query_times_unix_sec` set to the times of
+    all target points (see `interp.get_query_time_ranges`).
+
+    N = number of target points
+    U = number of unique target points
+
+    :param target_point_table: N-row pandas DataFrame created by
+        `_create_target_points_for_interp`, with columns renamed to those
+        expected by `interp.interp_nwp_from_xy_grid`.
+    :param model_name: See doc for `interp.interp_nwp_from_xy_grid`.
+    :param use_all_grids: Same.
+    :param grid_id: Same.
+    :return: unique_indices: length-U numpy array with one target point (index
+        into rows of `target_point_table`) for each unique sounding.
+    :return: orig_to_unique_indices: length-N numpy array.  If
+        orig_to_unique_indices[i] = j, the [i]th target point has the same
+        sounding as the [unique_indices[j]]th target point.
+    """
+
+    if model_name == nwp_model_utils.NARR_MODEL_NAME or use_all_grids:
+        grid_ids = interp.get_grids_for_model(model_name)
+    else:
+        grid_ids = [grid_id]
+
+    _, query_to_model_times_table, range_indices = (
+        interp.get_query_time_ranges(
+            query_times_unix_sec=target_point_table[
+                interp.QUERY_TIME_COLUMN].values,
+            model_name=model_name,
+            temporal_interp_method_string=interp.PREV_NEIGHBOUR_METHOD_STRING)
+    )
+
+    init_time_by_range_unix_sec = numpy.array([
+        t[0] for t in
+        query_to_model_times_table[nwp_model_utils.MODEL_TIMES_COLUMN].values
+    ], dtype=int)
+    list_of_key_arrays = [init_time_by_range_unix_sec[range_indices]]
+
+    for this_grid_id in grid_ids:
+        these_grid_point_x_metres, these_grid_point_y_metres = (
+            nwp_model_utils.get_xy_grid_points(
+                model_name=model_name, grid_id=this_grid_id))
+
+        these_x_metres, these_y_metres = nwp_model_utils.project_latlng_to_xy(
+            latitudes_deg=target_point_table[interp.QUERY_LAT_COLUMN].values,
+            longitudes_deg=target_point_table[interp.QUERY_LNG_COLUMN].values,
+            model_name=model_name, grid_id=this_grid_id)
+
+        this_interp_plan_dict = interp.get_interp_plan(
+            sorted_grid_point_x_metres=these_grid_point_x_metres,
+            sorted_grid_point_y_metres=these_grid_point_y_metres,
+            query_x_coords_metres=these_x_metres,
+            query_y_coords_metres=these_y_metres,
+            method_string=interp.NEAREST_NEIGHBOUR_METHOD_STRING)
+
+        list_of_key_arrays.append(
+            this_interp_plan_dict[interp.PLAN_GRID_INDICES_KEY][:, 0])
+
+    _, unique_indices, orig_to_unique_indices = numpy.unique(
+        numpy.stack(list_of_key_arrays, axis=-1), axis=0, return_index=True,
+        return_inverse=True)
+
+    return unique_indices, orig_to_unique_indices
 
 
 def _convert_interp_table_to_soundings(
@@ -765,6 +845,210 @@ def _convert_fields_and_units(sounding_dict_pressure_coords):
         dewpoint_matrix_kelvins=dewpoint_matrix_kelvins)
 
 
+def _scatter_unique_soundings(
+        unique_sounding_dict, target_point_table, unique_indices,
+        orig_to_unique_indices, model_name):
+    """Scatters unique soundings back to all target points.
+
+    The unique soundings contain Earth-relative winds, rotated with the angle at
+    the unique target point.  For models with grid-relative winds, this method
+    re-rotates winds with the angle at each target point, so that results are
+    the same as interpolating a sounding to each target point.
+
+    N = number of target points
+
+    :param unique_sounding_dict: Dictionary created by
+        `_convert_fields_and_units` for target points in
+        `target_point_table.iloc[unique_indices]`.  Some of these soundings may
+        have been thrown out.
+    :param target_point_table: N-row pandas DataFrame created by
+        `_create_target_points_for_interp`, with columns renamed to those
+        expected by `interp.interp_nwp_from_xy_grid`.
+    :param unique_indices: See doc for `_find_unique_target_points`.
+    :param orig_to_unique_indices: Same.
+    :param model_name: Model name (must be accepted by
+        `nwp_model_utils.check_model_name`).
+    :return: sounding_dict_pressure_coords: Same as input, except with one
+        sounding for each target point.  Target points whose unique sounding was
+        thrown out are also thrown out.
+    """
+
+    storm_ids = target_point_table[tracking_utils.STORM_ID_COLUMN].values
+    init_times_unix_sec = target_point_table[INITIAL_TIME_COLUMN].values
+    lead_times_seconds = target_point_table[LEAD_TIME_KEY].values
+
+    unique_point_keys = zip(
+        storm_ids[unique_indices], init_times_unix_sec[unique_indices],
+        lead_times_seconds[unique_indices])
+    unique_key_to_index_dict = dict(
+        zip(unique_point_keys, range(len(unique_indices))))
+
+    unique_to_sounding_indices = numpy.full(len(unique_indices), -1, dtype=int)
+    for i, this_key in enumerate(zip(
+            unique_sounding_dict[STORM_IDS_KEY],
+            unique_sounding_dict[INITIAL_TIMES_KEY],
+            unique_sounding_dict[LEAD_TIMES_KEY])):
+        unique_to_sounding_indices[unique_key_to_index_dict[this_key]] = i
+
+    sounding_indices = unique_to_sounding_indices[orig_to_unique_indices]
+    keep_indices = numpy.where(sounding_indices >= 0)[0]
+    sounding_indices = sounding_indices[keep_indices]
+
+    if unique_sounding_dict[SURFACE_PRESSURES_KEY] is None:
+        surface_pressures_mb = None
+    else:
+        surface_pressures_mb = unique_sounding_dict[SURFACE_PRESSURES_KEY][
+            sounding_indices]
+
+    field_names = unique_sounding_dict[FIELD_NAMES_KEY]
+    sounding_matrix = unique_sounding_dict[SOUNDING_MATRIX_KEY][
+        sounding_indices, ...]
+
+    if not nwp_model_utils.is_wind_earth_relative(model_name):
+        latitudes_deg = target_point_table[interp.QUERY_LAT_COLUMN].values
+        longitudes_deg = target_point_table[interp.QUERY_LNG_COLUMN].values
+        unique_point_indices = unique_indices[
+            orig_to_unique_indices[keep_indices]]
+
+        num_pressure_levels = sounding_matrix.shape[1]
+        u_wind_index = field_names.index(U_WIND_NAME)
+        v_wind_index = field_names.index(V_WIND_NAME)
+
+        these_cosines, these_sines = nwp_model_utils.get_wind_rotation_angles(
+            latitudes_deg=latitudes_deg[unique_point_indices],
+            longitudes_deg=longitudes_deg[unique_point_indices],
+            model_name=model_name)
+
+        (sounding_matrix[..., u_wind_index], sounding_matrix[..., v_wind_index]
+        ) = nwp_model_utils.rotate_winds_to_grid_relative(
+            u_winds_earth_relative_m_s01=sounding_matrix[..., u_wind_index],
+            v_winds_earth_relative_m_s01=sounding_matrix[..., v_wind_index],
+            rotation_angle_cosines=numpy.tile(
+                numpy.reshape(these_cosines, (-1, 1)),
+                (1, num_pressure_levels)),
+            rotation_angle_sines=numpy.tile(
+                numpy.reshape(these_sines, (-1, 1)), (1, num_pressure_levels))
+        )
+
+        these_cosines, these_sines = nwp_model_utils.get_wind_rotation_angles(
+            latitudes_deg=latitudes_deg[keep_indices],
+            longitudes_deg=longitudes_deg[keep_indices], model_name=model_name)
+
+        (sounding_matrix[..., u_wind_index], sounding_matrix[..., v_wind_index]
+        ) = nwp_model_utils.rotate_winds_to_earth_relative(
+            u_winds_grid_relative_m_s01=sounding_matrix[..., u_wind_index],
+            v_winds_grid_relative_m_s01=sounding_matrix[..., v_wind_index],
+            rotation_angle_cosines=numpy.tile(
+                numpy.reshape(these_cosines, (-1, 1)),
+                (1, num_pressure_levels)),
+            rotation_angle_sines=numpy.tile(
+                numpy.reshape(these_sines, (-1, 1)), (1, num_pressure_levels))
+        )
+
+    return {
+        STORM_IDS_KEY: storm_ids[keep_indices].tolist(),
+        INITIAL_TIMES_KEY: init_times_unix_sec[keep_indices],
+        LEAD_TIMES_KEY: lead_times_seconds[keep_indices],
+        SOUNDING_MATRIX_KEY: sounding_matrix,
+        SURFACE_PRESSURES_KEY: surface_pressures_mb,
+        PRESSURE_LEVELS_WITH_SFC_KEY:
+            unique_sounding_dict[PRESSURE_LEVELS_WITH_SFC_KEY],
+        FIELD_NAMES_KEY: field_names
+    }
+
+
+def _interp_linear_by_sounding(x_matrix, y_matrix, new_x_matrix):
+    """Linear interpolation (with extrapolation) in each sounding.
+
+    This method does the same as calling `scipy.interpolate.interp1d` (with
+    kind = "linear" and fill_value = "extrapolate") for each sounding, but for
+    all soundings at once.  The rows of `x_matrix` are shifted into disjoint
+    intervals and concatenated, so that one call to `numpy.searchsorted`
+    handles all soundings.
+
+    N = number of soundings
+    P = number of input levels per sounding
+    H = number of output levels per sounding
+
+    :param x_matrix: N-by-P numpy array of input coordinates (need not be
+        sorted).
+    :param y_matrix: numpy array of input values, where the first two axes are
+        N and P.  Any number of fields may be stacked along the remaining axes.
+    :param new_x_matrix: N-by-H numpy array of output coordinates.
+    :return: new_y_matrix: numpy array of interpolated values, with first two
+        axes N and H and remaining axes the same as in `y_matrix`.  For each
+        sounding with a non-finite value in `x_matrix` or `new_x_matrix`, all
+        values are NaN.
+    """
+
+    num_output_levels = new_x_matrix.shape[1]
+    new_y_matrix = numpy.full(
+        (x_matrix.shape[0], num_output_levels) + y_matrix.shape[2:], numpy.nan)
+
+    # Soundings with non-finite coords are left out, since they would make the
+    # intervals (below) non-finite for all soundings.
+    good_sounding_indices = numpy.where(numpy.logical_and(
+        numpy.all(numpy.isfinite(x_matrix), axis=1),
+        numpy.all(numpy.isfinite(new_x_matrix), axis=1)
+    ))[0]
+
+    if len(good_sounding_indices) == 0:
+        return new_y_matrix
+
+    x_matrix = x_matrix[good_sounding_indices, ...]
+    y_matrix = y_matrix[good_sounding_indices, ...]
+    new_x_matrix = new_x_matrix[good_sounding_indices, ...]
+
+    num_soundings = x_matrix.shape[0]
+    num_input_levels = x_matrix.shape[1]
+    sounding_indices = numpy.reshape(
+        numpy.linspace(0, num_soundings - 1, num=num_soundings, dtype=int),
+        (num_soundings, 1))
+
+    sort_indices = numpy.argsort(x_matrix, axis=1, kind='mergesort')
+    sorted_x_matrix = x_matrix[sounding_indices, sort_indices]
+    sorted_y_matrix = y_matrix[sounding_indices, sort_indices, ...]
+
+    # Output coords outside the range of input coords are clipped before the
+    # search (so they do not fall into the interval of another sounding).  This
+    # does not change the result, because indices are clipped later anyway.
+    min_x_values = sorted_x_matrix[:, [0]]
+    max_x_values = sorted_x_matrix[:, [-1]]
+    x_span = numpy.max(max_x_values - min_x_values) + 1.
+    x_offsets = sounding_indices * x_span - min_x_values
+
+    clipped_new_x_matrix = numpy.minimum(
+        numpy.maximum(new_x_matrix, min_x_values), max_x_values)
+    upper_indices = numpy.searchsorted(
+        numpy.ravel(sorted_x_matrix + x_offsets),
+        numpy.ravel(clipped_new_x_matrix + x_offsets), side='left')
+
+    upper_indices = numpy.reshape(
+        upper_indices, (num_soundings, num_output_levels)
+    ) - sounding_indices * num_input_levels
+    upper_indices = numpy.clip(upper_indices, 1, num_input_levels - 1)
+    lower_indices = upper_indices - 1
+
+    lower_x_matrix = sorted_x_matrix[sounding_indices, lower_indices]
+    upper_x_matrix = sorted_x_matrix[sounding_indices, upper_indices]
+    lower_y_matrix = sorted_y_matrix[sounding_indices, lower_indices, ...]
+    upper_y_matrix = sorted_y_matrix[sounding_indices, upper_indices, ...]
+
+    num_extra_axes = len(y_matrix.shape) - 2
+    extra_axes_shape = (1,) * num_extra_axes
+    slope_matrix = (upper_y_matrix - lower_y_matrix) / numpy.reshape(
+        upper_x_matrix - lower_x_matrix,
+        (num_soundings, num_output_levels) + extra_axes_shape)
+
+    new_y_matrix[good_sounding_indices, ...] = (
+        lower_y_matrix + slope_matrix * numpy.reshape(
+            new_x_matrix - lower_x_matrix,
+            (num_soundings, num_output_levels) + extra_axes_shape)
+    )
+
+    return new_y_matrix
+
+
 def _pressure_to_height_coords(
         sounding_dict_pressure_coords, height_levels_m_agl):
     """Converts soundings from pressure coords to ground-relative height coords.
@@ -821,8 +1105,7 @@ def _pressure_to_height_coords(
     orig_sounding_matrix[..., height_index] = pressure_matrix_pascals + 0.
 
     field_names_to_interp = [
-        PRESSURE_NAME, SPECIFIC_HUMIDITY_NAME, TEMPERATURE_NAME, U_WIND_NAME,
-        V_WIND_NAME
+        SPECIFIC_HUMIDITY_NAME, TEMPERATURE_NAME, U_WIND_NAME, V_WIND_NAME
     ]
 
     num_soundings = orig_sounding_matrix.shape[0]
@@ -831,34 +1114,30 @@ def _pressure_to_height_coords(
     new_sounding_matrix = numpy.full(
         (num_soundings, num_height_levels, num_fields), numpy.nan)
 
+    # Interpolate log-pressure to new heights, then all other fields to new
+    # pressures.  Each step handles all soundings at once.
     pressure_index = field_names.index(PRESSURE_NAME)
+    new_height_matrix_m_asl = (
+        numpy.reshape(storm_elevations_m_asl, (num_soundings, 1)) +
+        numpy.reshape(height_levels_m_agl, (1, num_height_levels))
+    )
 
-    for j in range(len(field_names_to_interp)):
-        this_field_index = field_names.index(field_names_to_interp[j])
-
-        for i in range(num_soundings):
-            if field_names_to_interp[j] == PRESSURE_NAME:
-                this_interp_object = scipy_interp1d(
-                    x=orig_height_matrix_m_asl[i, ...],
-                    y=numpy.log(orig_sounding_matrix[i, ..., this_field_index]),
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
+    new_sounding_matrix[..., pressure_index] = numpy.exp(
+        _interp_linear_by_sounding(
+            x_matrix=orig_height_matrix_m_asl,
+            y_matrix=numpy.log(orig_sounding_matrix[..., pressure_index]),
+            new_x_matrix=new_height_matrix_m_asl)
+    )
 
-                new_sounding_matrix[i, ..., this_field_index] = numpy.exp(
-                    this_interp_object(
-                        storm_elevations_m_asl[i] + height_levels_m_agl)
-                )
-            else:
-                this_interp_object = scipy_interp1d(
-                    x=orig_sounding_matrix[i, ..., pressure_index],
-                    y=orig_sounding_matrix[i, ..., this_field_index],
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
+    field_indices_to_interp = numpy.array(
+        [field_names.index(f) for f in field_names_to_interp], dtype=int)
 
-                new_sounding_matrix[i, ..., this_field_index] = (
-                    this_interp_object(
-                        new_sounding_matrix[i, ..., pressure_index])
-                )
+    new_sounding_matrix[..., field_indices_to_interp] = (
+        _interp_linear_by_sounding(
+            x_matrix=orig_sounding_matrix[..., pressure_index],
+            y_matrix=orig_sounding_matrix[..., field_indices_to_interp],
+            new_x_matrix=new_sounding_matrix[..., pressure_index])
+    )
 
     sounding_dict_height_coords[FIELD_NAMES_KEY] = field_names
     sounding_dict_height_coords[SOUNDING_MATRIX_KEY] = new_sounding_matrix
@@ -988,28 +1267,59 @@ def interp_soundings_to_storm_objects(
         VALID_TIME_COLUMN: interp.QUERY_TIME_COLUMN}
     target_point_table.rename(columns=column_dict_old_to_new, inplace=True)
 
+    unique_indices, orig_to_unique_indices = _find_unique_target_points(
+        target_point_table=target_point_table, model_name=model_name,
+        use_all_grids=use_all_grids, grid_id=grid_id)
+
+    num_target_points = len(target_point_table.index)
+    num_unique_points = len(unique_indices)
+    print (
+        '{0:d} target points have {1:d} unique soundings (grid cell and '
+        'init time) ... dedup ratio = {2:.2f}'
+    ).format(num_target_points, num_unique_points,
+             float(num_target_points) / max([num_unique_points, 1]))
+
+    unique_target_point_table = target_point_table.iloc[unique_indices]
+
     print SEPARATOR_STRING
     interp_table = _interp_soundings_from_nwp(
-        target_point_table=target_point_table,
+        target_point_table=unique_target_point_table,
         top_grib_directory_name=top_grib_directory_name, include_surface=False,
         model_name=model_name, use_all_grids=use_all_grids, grid_id=grid_id,
         wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_missing=raise_error_if_missing)
+        raise_error_if_missing=raise_error_if_missing,
+        all_query_times_unix_sec=target_point_table[
+            interp.QUERY_TIME_COLUMN].values)
     print SEPARATOR_STRING
 
+    cache_stats_dict = nwp_model_io.get_grid_cache_stats()
+    print (
+        'NWP grid cache: {0:d} hits, {1:d} misses, {2:d} grids ({3:.1f} of '
+        '{4:.1f} MB) in memory.'
+    ).format(cache_stats_dict[nwp_model_io.NUM_HITS_KEY],
+             cache_stats_dict[nwp_model_io.NUM_MISSES_KEY],
+             cache_stats_dict[nwp_model_io.NUM_GRIDS_KEY],
+             BYTES_TO_MEGABYTES * cache_stats_dict[nwp_model_io.NUM_BYTES_KEY],
+             BYTES_TO_MEGABYTES * cache_stats_dict[nwp_model_io.MAX_BYTES_KEY])
+
     print 'Converting interpolated values to soundings...'
     sounding_dict_pressure_coords = _convert_interp_table_to_soundings(
-        interp_table=interp_table, target_point_table=target_point_table,
+        interp_table=interp_table, target_point_table=unique_target_point_table,
         model_name=model_name, include_surface=False)
 
     print 'Converting fields and units in each sounding...'
-    orig_num_soundings = len(sounding_dict_pressure_coords[STORM_IDS_KEY])
     sounding_dict_pressure_coords = _convert_fields_and_units(
         sounding_dict_pressure_coords)
+
+    print 'Scattering unique soundings back to target points...'
+    sounding_dict_pressure_coords = _scatter_unique_soundings(
+        unique_sounding_dict=sounding_dict_pressure_coords,
+        target_point_table=target_point_table, unique_indices=unique_indices,
+        orig_to_unique_indices=orig_to_unique_indices, model_name=model_name)
     num_soundings = len(sounding_dict_pressure_coords[STORM_IDS_KEY])
 
     print 'Removed {0:d} of {1:d} soundings (too many NaN''s).'.format(
-        orig_num_soundings - num_soundings, orig_num_soundings)
+        num_target_points - num_soundings, num_target_points)
 
     print 'Finding elevation of each storm object...'
     storm_elevations_m_asl = geodetic_utils.get_elevations(
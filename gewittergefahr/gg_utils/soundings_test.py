@@ -5,6 +5,7 @@ import unittest
 import numpy
 import pandas
 from gewittergefahr.gg_utils import soundings
+from gewittergefahr.gg_utils import interp
 from gewittergefahr.gg_utils import nwp_model_utils
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
 from gewittergefahr.gg_utils import temperature_conversions
@@ -172,6 +173,37 @@ THIS_DICT = {
 }
 DUMMY_TARGET_POINT_TABLE = pandas.DataFrame.from_dict(THIS_DICT)
 
+# The following constants are used to test _find_unique_target_points.
+THIS_DICT = {
+    interp.QUERY_LAT_COLUMN: numpy.array([35, 35.001, 35, 40]),
+    interp.QUERY_LNG_COLUMN: numpy.array([263, 262.999, 263, 270]),
+    interp.QUERY_TIME_COLUMN: numpy.array([0, 1800, 3600, 0], dtype=int)
+}
+TARGET_POINT_TABLE_FOR_DEDUP = pandas.DataFrame.from_dict(THIS_DICT)
+
+GRID_ID_FOR_DEDUP = nwp_model_utils.ID_FOR_130GRID
+
+# The third query time (3600) is at the end of the only query-time range, so
+# `interp.interp_nwp_from_xy_grid` uses the init time of 0, as for the first
+# two target points.
+UNIQUE_TARGET_INDICES = numpy.array([0, 3], dtype=int)
+ORIG_TO_UNIQUE_INDICES = numpy.array([0, 0, 0, 1], dtype=int)
+
+# The second and third target points are in the same grid cell, and both use
+# the init time of 3600.  The second target point (3600) represents both, and
+# it is at the end of the last query-time range for the unique target points
+# alone.
+THIS_DICT = {
+    interp.QUERY_LAT_COLUMN: numpy.array([35., 40., 40.]),
+    interp.QUERY_LNG_COLUMN: numpy.array([263., 270., 270.]),
+    interp.QUERY_TIME_COLUMN: numpy.array([1800, 3600, 5400], dtype=int)
+}
+TARGET_POINT_TABLE_RANGE_EDGE = pandas.DataFrame.from_dict(THIS_DICT)
+
+UNIQUE_INDICES_RANGE_EDGE = numpy.array([0, 1], dtype=int)
+ORIG_TO_UNIQUE_INDICES_RANGE_EDGE = numpy.array([0, 1, 1], dtype=int)
+UNIQUE_INIT_TIMES_RANGE_EDGE_UNIX_SEC = numpy.array([0, 3600], dtype=int)
+
 # The following constants are used to test _convert_interp_table_to_soundings.
 THIS_MATRIX = numpy.array(
     [[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14],
@@ -468,6 +500,84 @@ SOUNDING_DICT_P_COORDS_NO_NANS = {
     soundings.SURFACE_PRESSURES_KEY: THESE_SURFACE_PRESSURES_MB
 }
 
+# The following constants are used to test _scatter_unique_soundings.
+THIS_DICT = {
+    tracking_utils.STORM_ID_COLUMN: ['a', 'b', 'c', 'd'],
+    soundings.INITIAL_TIME_COLUMN: numpy.array([0, 0, 0, 0], dtype=int),
+    soundings.LEAD_TIME_KEY: numpy.array([0, 0, 0, 0], dtype=int),
+    interp.QUERY_LAT_COLUMN: numpy.array([50, 50, 55, 60], dtype=float),
+    interp.QUERY_LNG_COLUMN: numpy.array([250, 250, 260, 270], dtype=float)
+}
+TARGET_POINT_TABLE_FOR_SCATTER = pandas.DataFrame.from_dict(THIS_DICT)
+
+UNIQUE_INDICES_FOR_SCATTER = numpy.array([0, 2, 3], dtype=int)
+ORIG_TO_UNIQUE_INDICES_FOR_SCATTER = numpy.array([0, 0, 1, 2], dtype=int)
+
+THESE_PRESSURE_LEVELS_MB = numpy.array([500, 1000], dtype=float)
+THESE_FIELD_NAMES = [soundings.TEMPERATURE_NAME]
+THIS_FIRST_MATRIX = numpy.array([[250], [290]], dtype=float)
+THIS_SECOND_MATRIX = numpy.array([[260], [300]], dtype=float)
+
+UNIQUE_SOUNDING_DICT = {
+    soundings.STORM_IDS_KEY: ['a', 'd'],
+    soundings.INITIAL_TIMES_KEY: numpy.array([0, 0], dtype=int),
+    soundings.LEAD_TIMES_KEY: numpy.array([0, 0], dtype=int),
+    soundings.SOUNDING_MATRIX_KEY: numpy.stack(
+        (THIS_FIRST_MATRIX, THIS_SECOND_MATRIX), axis=0),
+    soundings.SURFACE_PRESSURES_KEY: None,
+    soundings.PRESSURE_LEVELS_WITH_SFC_KEY: THESE_PRESSURE_LEVELS_MB,
+    soundings.FIELD_NAMES_KEY: THESE_FIELD_NAMES
+}
+
+SCATTERED_SOUNDING_DICT = {
+    soundings.STORM_IDS_KEY: ['a', 'b', 'd'],
+    soundings.INITIAL_TIMES_KEY: numpy.array([0, 0, 0], dtype=int),
+    soundings.LEAD_TIMES_KEY: numpy.array([0, 0, 0], dtype=int),
+    soundings.SOUNDING_MATRIX_KEY: numpy.stack(
+        (THIS_FIRST_MATRIX, THIS_FIRST_MATRIX, THIS_SECOND_MATRIX), axis=0),
+    soundings.SURFACE_PRESSURES_KEY: None,
+    soundings.PRESSURE_LEVELS_WITH_SFC_KEY: THESE_PRESSURE_LEVELS_MB,
+    soundings.FIELD_NAMES_KEY: THESE_FIELD_NAMES
+}
+
+# The following constants are used to test _interp_linear_by_sounding.
+X_MATRIX_FOR_LINEAR_INTERP = numpy.array([[0., 2., 1.],
+                                          [10., 20., 30.]])
+THIS_Y_MATRIX = numpy.array([[0., 4., 1.],
+                             [1., 1., 2.]])
+Y_MATRIX_FOR_LINEAR_INTERP = numpy.stack(
+    (THIS_Y_MATRIX, 2 * THIS_Y_MATRIX), axis=-1)
+
+NEW_X_MATRIX_FOR_LINEAR_INTERP = numpy.array([[-1., 0.5, 3.],
+                                              [25., 40., 10.]])
+THIS_NEW_Y_MATRIX = numpy.array([[-1., 0.5, 7.],
+                                 [1.5, 3., 1.]])
+NEW_Y_MATRIX_FOR_LINEAR_INTERP = numpy.stack(
+    (THIS_NEW_Y_MATRIX, 2 * THIS_NEW_Y_MATRIX), axis=-1)
+
+# The second sounding has NaN in the input coords, and the fourth has NaN in the
+# output coords.  The others are the same as above.
+X_MATRIX_WITH_NAN = numpy.array([[0., 2., 1.],
+                                 [0., numpy.nan, 1.],
+                                 [10., 20., 30.],
+                                 [0., 1., 2.]])
+THIS_Y_MATRIX = numpy.array([[0., 4., 1.],
+                             [0., 4., 1.],
+                             [1., 1., 2.],
+                             [0., 4., 1.]])
+Y_MATRIX_WITH_NAN = numpy.stack((THIS_Y_MATRIX, 2 * THIS_Y_MATRIX), axis=-1)
+
+NEW_X_MATRIX_WITH_NAN = numpy.array([[-1., 0.5, 3.],
+                                     [-1., 0.5, 3.],
+                                     [25., 40., 10.],
+                                     [-1., numpy.nan, 3.]])
+THIS_NEW_Y_MATRIX = numpy.array([[-1., 0.5, 7.],
+                                 [numpy.nan, numpy.nan, numpy.nan],
+                                 [1.5, 3., 1.],
+                                 [numpy.nan, numpy.nan, numpy.nan]])
+NEW_Y_MATRIX_WITH_NAN = numpy.stack(
+    (THIS_NEW_Y_MATRIX, 2 * THIS_NEW_Y_MATRIX), axis=-1)
+
 # The following constants are used to test _pressure_to_height_coords.
 THESE_STORM_ELEVATIONS_M_ASL = numpy.array([385])
 SOUNDING_DICT_PRESSURE_COORDS = copy.deepcopy(SOUNDING_DICT_P_COORDS_NO_NANS)
@@ -709,6 +819,57 @@ class SoundingsTests(unittest.TestCase):
         self.assertTrue(_compare_target_point_tables(
             this_target_point_table, DUMMY_TARGET_POINT_TABLE))
 
+    def test_find_unique_target_points(self):
+        """Ensures correct output from _find_unique_target_points."""
+
+        these_unique_indices, these_orig_to_unique_indices = (
+            soundings._find_unique_target_points(
+                target_point_table=TARGET_POINT_TABLE_FOR_DEDUP,
+                model_name=nwp_model_utils.RAP_MODEL_NAME,
+                use_all_grids=False, grid_id=GRID_ID_FOR_DEDUP)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_unique_indices, UNIQUE_TARGET_INDICES))
+        self.assertTrue(numpy.array_equal(
+            these_orig_to_unique_indices, ORIG_TO_UNIQUE_INDICES))
+
+    def test_find_unique_target_points_range_edge(self):
+        """Ensures correct output from _find_unique_target_points.
+
+        In this case, one unique target point is at the end of the last query-
+        time range for the unique target points alone.  This method ensures that
+        unique target points, interpolated with all query times (as in
+        `get_soundings`), use the same init times as in the deduplication.
+        """
+
+        these_unique_indices, these_orig_to_unique_indices = (
+            soundings._find_unique_target_points(
+                target_point_table=TARGET_POINT_TABLE_RANGE_EDGE,
+                model_name=nwp_model_utils.RAP_MODEL_NAME,
+                use_all_grids=False, grid_id=GRID_ID_FOR_DEDUP)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_unique_indices, UNIQUE_INDICES_RANGE_EDGE))
+        self.assertTrue(numpy.array_equal(
+            these_orig_to_unique_indices, ORIG_TO_UNIQUE_INDICES_RANGE_EDGE))
+
+        these_init_times_unix_sec, _, these_range_indices = (
+            interp.get_query_time_ranges(
+                query_times_unix_sec=TARGET_POINT_TABLE_RANGE_EDGE[
+                    interp.QUERY_TIME_COLUMN].values[these_unique_indices],
+                model_name=nwp_model_utils.RAP_MODEL_NAME,
+                temporal_interp_method_string=
+                interp.PREV_NEIGHBOUR_METHOD_STRING,
+                all_query_times_unix_sec=TARGET_POINT_TABLE_RANGE_EDGE[
+                    interp.QUERY_TIME_COLUMN].values)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_init_times_unix_sec[these_range_indices],
+            UNIQUE_INIT_TIMES_RANGE_EDGE_UNIX_SEC))
+
     def test_convert_interp_table_to_soundings_no_surface(self):
         """Ensures correct output from _convert_interp_table_to_soundings.
 
@@ -814,6 +975,44 @@ class SoundingsTests(unittest.TestCase):
         self.assertTrue(_compare_sounding_dictionaries(
             this_sounding_dict, SOUNDING_DICT_P_COORDS_NO_NANS))
 
+    def test_scatter_unique_soundings(self):
+        """Ensures correct output from _scatter_unique_soundings."""
+
+        this_sounding_dict = soundings._scatter_unique_soundings(
+            unique_sounding_dict=copy.deepcopy(UNIQUE_SOUNDING_DICT),
+            target_point_table=TARGET_POINT_TABLE_FOR_SCATTER,
+            unique_indices=UNIQUE_INDICES_FOR_SCATTER,
+            orig_to_unique_indices=ORIG_TO_UNIQUE_INDICES_FOR_SCATTER,
+            model_name=nwp_model_utils.NARR_MODEL_NAME)
+
+        self.assertTrue(_compare_sounding_dictionaries(
+            this_sounding_dict, SCATTERED_SOUNDING_DICT))
+
+    def test_interp_linear_by_sounding(self):
+        """Ensures correct output from _interp_linear_by_sounding."""
+
+        this_new_y_matrix = soundings._interp_linear_by_sounding(
+            x_matrix=X_MATRIX_FOR_LINEAR_INTERP,
+            y_matrix=Y_MATRIX_FOR_LINEAR_INTERP,
+            new_x_matrix=NEW_X_MATRIX_FOR_LINEAR_INTERP)
+
+        self.assertTrue(numpy.allclose(
+            this_new_y_matrix, NEW_Y_MATRIX_FOR_LINEAR_INTERP, atol=TOLERANCE))
+
+    def test_interp_linear_by_sounding_nan(self):
+        """Ensures correct output from _interp_linear_by_sounding.
+
+        In this case some soundings have NaN coordinates.
+        """
+
+        this_new_y_matrix = soundings._interp_linear_by_sounding(
+            x_matrix=X_MATRIX_WITH_NAN, y_matrix=Y_MATRIX_WITH_NAN,
+            new_x_matrix=NEW_X_MATRIX_WITH_NAN)
+
+        self.assertTrue(numpy.allclose(
+            this_new_y_matrix, NEW_Y_MATRIX_WITH_NAN, atol=TOLERANCE,
+            equal_nan=True))
+
     def test_pressure_to_height_coords(self):
         """Ensures correct output from _pressure_to_height_coords."""
 
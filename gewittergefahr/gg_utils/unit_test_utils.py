@@ -0,0 +1,23 @@
+"""Helper methods for unit tests."""
+
+import shutil
+import tempfile
+import unittest
+
+
+class TestCaseWithTempDir(unittest.TestCase):
+    """Test case with a temporary directory for output files.
+
+    The directory (`self.temp_dir_name`) is created before each test method and
+    deleted, with everything in it, after each test method.
+    """
+
+    def setUp(self):
+        """Creates temporary directory for output files."""
+
+        self.temp_dir_name = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Deletes temporary directory."""
+
+        shutil.rmtree(self.temp_dir_name)
@@ -0,0 +1,267 @@
+"""Measures memory (RSS) used by the training generator for each batch.
+
+Synthetic example files, with 3-D GridRad-like radar images and soundings, are
+written to `example_dir_name` (only if they do not already exist).  Batches are
+drawn from these files by `training_validation_io.generator_2d_or_3d`, with one
+noising and one x-flip for each example, and current and peak resident set size
+are reported after each batch.
+
+To compare two versions of the code, run this script once against each
+version (with PYTHONPATH pointing to the version), using the same
+`example_dir_name`, so that both runs read exactly the same files.
+
+Current RSS is read from /proc, so this script works only on Linux.
+"""
+
+import os.path
+import resource
+import argparse
+import numpy
+import pandas
+from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import soundings
+from gewittergefahr.deep_learning import input_examples
+from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
+from gewittergefahr.deep_learning import training_validation_io as trainval_io
+
+KB_TO_MB = 1. / 1024
+NUM_GRID_ROWS = 32
+NUM_GRID_COLUMNS = 32
+RADAR_HEIGHTS_M_AGL = numpy.linspace(1000, 12000, num=12, dtype=int)
+TARGET_NAME = 'tornado_lead-time=0000-3600sec_distance=00000-10000m'
+NUM_CLASSES = 2
+
+RADAR_FIELD_NAMES = [
+    radar_utils.REFL_NAME, radar_utils.SPECTRUM_WIDTH_NAME,
+    radar_utils.VORTICITY_NAME, radar_utils.DIVERGENCE_NAME
+]
+
+SOUNDING_FIELD_NAMES = [
+    soundings.TEMPERATURE_NAME, soundings.RELATIVE_HUMIDITY_NAME,
+    soundings.U_WIND_NAME, soundings.V_WIND_NAME
+]
+SOUNDING_HEIGHTS_M_AGL = numpy.linspace(0, 12000, num=25, dtype=int)
+
+NORMALIZATION_FILE_NAME = 'normalization_params.p'
+EXAMPLE_FILE_NAME_FORMAT = 'input_examples_batch{0:07d}.nc'
+
+EXAMPLE_DIR_ARG_NAME = 'example_dir_name'
+NUM_FILES_ARG_NAME = 'num_example_files'
+EXAMPLES_PER_FILE_ARG_NAME = 'num_examples_per_file'
+BATCH_SIZE_ARG_NAME = 'num_examples_per_batch'
+NUM_BATCHES_ARG_NAME = 'num_batches'
+RANDOM_SEED_ARG_NAME = 'random_seed'
+
+EXAMPLE_DIR_HELP_STRING = (
+    'Name of directory with synthetic example files.  If the files do not '
+    'exist, they will be created here.')
+NUM_FILES_HELP_STRING = 'Number of example files.'
+EXAMPLES_PER_FILE_HELP_STRING = 'Number of examples in each file.'
+BATCH_SIZE_HELP_STRING = 'Number of examples per batch (before augmentation).'
+NUM_BATCHES_HELP_STRING = 'Number of batches to create.'
+RANDOM_SEED_HELP_STRING = 'Seed for random-number generator.'
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + EXAMPLE_DIR_ARG_NAME, type=str, required=True,
+    help=EXAMPLE_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_FILES_ARG_NAME, type=int, required=False, default=8,
+    help=NUM_FILES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + EXAMPLES_PER_FILE_ARG_NAME, type=int, required=False, default=256,
+    help=EXAMPLES_PER_FILE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + BATCH_SIZE_ARG_NAME, type=int, required=False, default=512,
+    help=BATCH_SIZE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_BATCHES_ARG_NAME, type=int, required=False, default=10,
+    help=NUM_BATCHES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + RANDOM_SEED_ARG_NAME, type=int, required=False, default=6695,
+    help=RANDOM_SEED_HELP_STRING)
+
+
+def _write_normalization_file(pickle_file_name):
+    """Writes normalization params for synthetic radar and sounding fields.
+
+    :param pickle_file_name: Path to output file.
+    """
+
+    field_names = RADAR_FIELD_NAMES + SOUNDING_FIELD_NAMES
+    num_fields = len(field_names)
+
+    normalization_dict = {
+        dl_utils.MEAN_VALUE_COLUMN: numpy.full(num_fields, 30.),
+        dl_utils.STANDARD_DEVIATION_COLUMN: numpy.full(num_fields, 15.),
+        dl_utils.MIN_VALUE_COLUMN: numpy.full(num_fields, 0.),
+        dl_utils.MAX_VALUE_COLUMN: numpy.full(num_fields, 60.)
+    }
+    normalization_table = pandas.DataFrame(
+        normalization_dict, index=field_names)
+
+    dl_utils.write_normalization_params(
+        pickle_file_name=pickle_file_name,
+        radar_table_no_height=normalization_table,
+        radar_table_with_height=normalization_table,
+        sounding_table_no_height=normalization_table,
+        sounding_table_with_height=normalization_table)
+
+
+def _write_example_files(example_file_names, num_examples_per_file):
+    """Writes synthetic example files.
+
+    :param example_file_names: 1-D list of paths to output files.
+    :param num_examples_per_file: Number of examples in each file.
+    """
+
+    these_radar_dimensions = (
+        num_examples_per_file, NUM_GRID_ROWS, NUM_GRID_COLUMNS,
+        len(RADAR_HEIGHTS_M_AGL), len(RADAR_FIELD_NAMES)
+    )
+    these_sounding_dimensions = (
+        num_examples_per_file, len(SOUNDING_HEIGHTS_M_AGL),
+        len(SOUNDING_FIELD_NAMES)
+    )
+
+    for k in range(len(example_file_names)):
+        this_example_dict = {
+            input_examples.STORM_IDS_KEY: [
+                'file{0:d}_storm{1:d}'.format(k, i)
+                for i in range(num_examples_per_file)
+            ],
+            input_examples.STORM_TIMES_KEY:
+                numpy.full(num_examples_per_file, 0, dtype=int),
+            input_examples.RADAR_FIELDS_KEY: RADAR_FIELD_NAMES,
+            input_examples.RADAR_HEIGHTS_KEY: RADAR_HEIGHTS_M_AGL,
+            input_examples.ROTATED_GRIDS_KEY: False,
+            input_examples.ROTATED_GRID_SPACING_KEY: None,
+            input_examples.RADAR_IMAGE_MATRIX_KEY: numpy.random.uniform(
+                low=0., high=60., size=these_radar_dimensions
+            ).astype(numpy.float32),
+            input_examples.SOUNDING_FIELDS_KEY: SOUNDING_FIELD_NAMES,
+            input_examples.SOUNDING_HEIGHTS_KEY: SOUNDING_HEIGHTS_M_AGL,
+            input_examples.SOUNDING_MATRIX_KEY: numpy.random.uniform(
+                low=0., high=60., size=these_sounding_dimensions
+            ).astype(numpy.float32),
+            input_examples.TARGET_NAME_KEY: TARGET_NAME,
+            input_examples.TARGET_VALUES_KEY: numpy.random.random_integers(
+                low=0, high=NUM_CLASSES - 1, size=num_examples_per_file)
+        }
+
+        print 'Writing synthetic examples to: "{0:s}"...'.format(
+            example_file_names[k])
+        input_examples.write_example_file(
+            netcdf_file_name=example_file_names[k],
+            example_dict=this_example_dict)
+
+
+def _get_current_rss_mb():
+    """Returns current resident set size of this process.
+
+    :return: current_rss_mb: Current RSS (megabytes).
+    """
+
+    with open('/proc/self/status') as status_file_handle:
+        for this_line in status_file_handle:
+            if this_line.startswith('VmRSS:'):
+                return KB_TO_MB * float(this_line.split()[1])
+
+    return numpy.nan
+
+
+def _get_peak_rss_mb():
+    """Returns peak resident set size of this process.
+
+    :return: peak_rss_mb: Peak RSS (megabytes).
+    """
+
+    return KB_TO_MB * resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run(example_dir_name, num_example_files, num_examples_per_file,
+         num_examples_per_batch, num_batches, random_seed):
+    """Measures memory (RSS) used by the training generator for each batch.
+
+    This is effectively the main method.
+
+    :param example_dir_name: See documentation at top of file.
+    :param num_example_files: Same.
+    :param num_examples_per_file: Same.
+    :param num_examples_per_batch: Same.
+    :param num_batches: Same.
+    :param random_seed: Same.
+    """
+
+    numpy.random.seed(random_seed)
+
+    normalization_file_name = '{0:s}/{1:s}'.format(
+        example_dir_name, NORMALIZATION_FILE_NAME)
+    example_file_names = [
+        '{0:s}/{1:s}'.format(
+            example_dir_name, EXAMPLE_FILE_NAME_FORMAT.format(k))
+        for k in range(num_example_files)
+    ]
+
+    if not os.path.isfile(normalization_file_name):
+        _write_normalization_file(normalization_file_name)
+    if not all([os.path.isfile(f) for f in example_file_names]):
+        _write_example_files(
+            example_file_names=example_file_names,
+            num_examples_per_file=num_examples_per_file)
+
+    option_dict = {
+        trainval_io.EXAMPLE_FILES_KEY: example_file_names,
+        trainval_io.NUM_EXAMPLES_PER_BATCH_KEY: num_examples_per_batch,
+        trainval_io.RADAR_FIELDS_KEY: RADAR_FIELD_NAMES,
+        trainval_io.RADAR_HEIGHTS_KEY: RADAR_HEIGHTS_M_AGL,
+        trainval_io.SOUNDING_FIELDS_KEY: SOUNDING_FIELD_NAMES,
+        trainval_io.SOUNDING_HEIGHTS_KEY: SOUNDING_HEIGHTS_M_AGL,
+        trainval_io.FIRST_STORM_TIME_KEY: 0,
+        trainval_io.LAST_STORM_TIME_KEY: 0,
+        trainval_io.NUM_ROWS_KEY: NUM_GRID_ROWS,
+        trainval_io.NUM_COLUMNS_KEY: NUM_GRID_COLUMNS,
+        trainval_io.NORMALIZATION_TYPE_KEY:
+            dl_utils.Z_NORMALIZATION_TYPE_STRING,
+        trainval_io.NORMALIZATION_FILE_KEY: normalization_file_name,
+        trainval_io.NOISE_STDEV_KEY: 0.05,
+        trainval_io.NUM_NOISINGS_KEY: 1,
+        trainval_io.FLIP_X_KEY: True
+    }
+
+    print 'RSS before first batch = {0:.1f} MB (peak = {1:.1f} MB)'.format(
+        _get_current_rss_mb(), _get_peak_rss_mb())
+
+    generator_object = trainval_io.generator_2d_or_3d(option_dict)
+
+    for i in range(num_batches):
+        these_predictor_matrices, _ = next(generator_object)
+        this_radar_matrix = these_predictor_matrices[0]
+
+        print (
+            'Batch {0:d} of {1:d} ... shape = {2:s} ... dtype = {3:s} ... '
+            'RSS = {4:.1f} MB (peak = {5:.1f} MB)'
+        ).format(i + 1, num_batches, str(this_radar_matrix.shape),
+                 str(this_radar_matrix.dtype), _get_current_rss_mb(),
+                 _get_peak_rss_mb())
+
+        del these_predictor_matrices, this_radar_matrix
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        example_dir_name=getattr(INPUT_ARG_OBJECT, EXAMPLE_DIR_ARG_NAME),
+        num_example_files=getattr(INPUT_ARG_OBJECT, NUM_FILES_ARG_NAME),
+        num_examples_per_file=getattr(
+            INPUT_ARG_OBJECT, EXAMPLES_PER_FILE_ARG_NAME),
+        num_examples_per_batch=getattr(INPUT_ARG_OBJECT, BATCH_SIZE_ARG_NAME),
+        num_batches=getattr(INPUT_ARG_OBJECT, NUM_BATCHES_ARG_NAME),
+        random_seed=getattr(INPUT_ARG_OBJECT, RANDOM_SEED_ARG_NAME)
+    )
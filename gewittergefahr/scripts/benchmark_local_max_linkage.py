@@ -0,0 +1,128 @@
+"""Measures latency of `echo_top_tracking._link_local_maxima_in_time`.
+
+Local maxima are generated randomly over a CONUS-sized domain, then advected
+with random motion to create maxima at the next time step.  Latency per time
+step is reported for both nearest-neighbour and global-assignment linkage.
+"""
+
+import time
+import argparse
+import numpy
+from gewittergefahr.gg_utils import echo_top_tracking
+
+TIME_INTERVAL_SECONDS = 300
+DOMAIN_WIDTH_METRES = 4.5e6
+DOMAIN_HEIGHT_METRES = 2.5e6
+MOTION_STDEV_M_S01 = 15.
+
+NUM_MAXIMA_ARG_NAME = 'num_maxima'
+NUM_TRIALS_ARG_NAME = 'num_trials'
+RANDOM_SEED_ARG_NAME = 'random_seed'
+
+NUM_MAXIMA_HELP_STRING = 'Number of local maxima at each time step.'
+NUM_TRIALS_HELP_STRING = (
+    'Number of trials (pairs of time steps).  Latency will be averaged over '
+    'trials.')
+RANDOM_SEED_HELP_STRING = 'Seed for random-number generator.'
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_MAXIMA_ARG_NAME, type=int, required=False, default=500,
+    help=NUM_MAXIMA_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_TRIALS_ARG_NAME, type=int, required=False, default=20,
+    help=NUM_TRIALS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + RANDOM_SEED_ARG_NAME, type=int, required=False, default=6695,
+    help=RANDOM_SEED_HELP_STRING)
+
+
+def _create_local_max_dicts(num_maxima):
+    """Creates local maxima at two consecutive time steps.
+
+    :param num_maxima: Number of local maxima at each time step.
+    :return: previous_local_max_dict: Dictionary with keys listed in
+        `echo_top_tracking._link_local_maxima_in_time`.
+    :return: current_local_max_dict: Same.
+    """
+
+    previous_x_coords_metres = numpy.random.uniform(
+        low=0., high=DOMAIN_WIDTH_METRES, size=num_maxima)
+    previous_y_coords_metres = numpy.random.uniform(
+        low=0., high=DOMAIN_HEIGHT_METRES, size=num_maxima)
+
+    current_x_coords_metres = previous_x_coords_metres + (
+        TIME_INTERVAL_SECONDS *
+        numpy.random.normal(loc=0., scale=MOTION_STDEV_M_S01, size=num_maxima)
+    )
+    current_y_coords_metres = previous_y_coords_metres + (
+        TIME_INTERVAL_SECONDS *
+        numpy.random.normal(loc=0., scale=MOTION_STDEV_M_S01, size=num_maxima)
+    )
+
+    previous_local_max_dict = {
+        echo_top_tracking.X_COORDS_KEY: previous_x_coords_metres,
+        echo_top_tracking.Y_COORDS_KEY: previous_y_coords_metres,
+        echo_top_tracking.VALID_TIME_KEY: 0
+    }
+
+    current_local_max_dict = {
+        echo_top_tracking.X_COORDS_KEY: current_x_coords_metres,
+        echo_top_tracking.Y_COORDS_KEY: current_y_coords_metres,
+        echo_top_tracking.VALID_TIME_KEY: TIME_INTERVAL_SECONDS
+    }
+
+    return previous_local_max_dict, current_local_max_dict
+
+
+def _run(num_maxima, num_trials, random_seed):
+    """Measures latency of `echo_top_tracking._link_local_maxima_in_time`.
+
+    This is effectively the main method.
+
+    :param num_maxima: See documentation at top of file.
+    :param num_trials: Same.
+    :param random_seed: Same.
+    """
+
+    numpy.random.seed(random_seed)
+
+    for use_global_assignment in [False, True]:
+        these_times_seconds = numpy.full(num_trials, numpy.nan)
+        these_num_links = numpy.full(num_trials, -1, dtype=int)
+
+        for k in range(num_trials):
+            this_previous_dict, this_current_dict = _create_local_max_dicts(
+                num_maxima)
+
+            this_start_time_seconds = time.time()
+            these_current_to_prev_indices = (
+                echo_top_tracking._link_local_maxima_in_time(
+                    current_local_max_dict=this_current_dict,
+                    previous_local_max_dict=this_previous_dict,
+                    use_global_assignment=use_global_assignment)
+            )
+
+            these_times_seconds[k] = time.time() - this_start_time_seconds
+            these_num_links[k] = numpy.sum(these_current_to_prev_indices >= 0)
+
+        print (
+            'use_global_assignment = {0:d} ... {1:d} maxima per step ... mean '
+            'latency = {2:.2f} ms (max {3:.2f} ms) ... mean number of links = '
+            '{4:.1f}'
+        ).format(int(use_global_assignment), num_maxima,
+                 1000 * numpy.mean(these_times_seconds),
+                 1000 * numpy.max(these_times_seconds),
+                 numpy.mean(these_num_links))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        num_maxima=getattr(INPUT_ARG_OBJECT, NUM_MAXIMA_ARG_NAME),
+        num_trials=getattr(INPUT_ARG_OBJECT, NUM_TRIALS_ARG_NAME),
+        random_seed=getattr(INPUT_ARG_OBJECT, RANDOM_SEED_ARG_NAME)
+    )
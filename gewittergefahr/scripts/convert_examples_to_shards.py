@@ -0,0 +1,134 @@
+"""Converts input examples to shards (with manifest) for training."""
+
+import argparse
+import numpy
+from gewittergefahr.deep_learning import input_examples
+from gewittergefahr.deep_learning import example_shards
+
+INPUT_DIR_ARG_NAME = 'input_example_dir_name'
+FIRST_DATE_ARG_NAME = 'first_spc_date_string'
+LAST_DATE_ARG_NAME = 'last_spc_date_string'
+OUTPUT_DIR_ARG_NAME = 'output_shard_dir_name'
+RADAR_FIELDS_ARG_NAME = 'radar_field_names'
+NUM_EXAMPLES_PER_SHARD_ARG_NAME = 'num_examples_per_shard'
+MAX_OPEN_SHARDS_ARG_NAME = 'max_open_shards'
+RANDOM_SEED_ARG_NAME = 'random_seed'
+
+INPUT_DIR_HELP_STRING = (
+    'Name of top-level directory with input files (containing unshuffled '
+    'examples).  Files therein will be found by '
+    '`input_examples.find_example_file` and read by '
+    '`input_examples.read_example_file`.')
+
+SPC_DATE_HELP_STRING = (
+    'SPC date (format "yyyymmdd").  This script will convert examples from the '
+    'time period `{0:s}`...`{1:s}`.'
+).format(FIRST_DATE_ARG_NAME, LAST_DATE_ARG_NAME)
+
+OUTPUT_DIR_HELP_STRING = (
+    'Name of top-level directory for shards.  Shards will be written to '
+    'locations determined by `example_shards.find_shard_file` and the manifest '
+    'to the location determined by `example_shards.find_manifest_file`.')
+
+RADAR_FIELDS_HELP_STRING = (
+    'List of radar fields to output.  Each field must be accepted by '
+    '`radar_utils.check_field_name`.  If you leave this argument, all radar '
+    'fields will be output.')
+
+NUM_EXAMPLES_PER_SHARD_HELP_STRING = (
+    'Number of examples per shard (the last shard may have fewer).')
+
+MAX_OPEN_SHARDS_HELP_STRING = (
+    'Max number of shards open at once.  If there are more shards, input files '
+    'will be read once for each group of `{0:s}` shards.'
+).format(MAX_OPEN_SHARDS_ARG_NAME)
+
+RANDOM_SEED_HELP_STRING = (
+    'Seed for random-number generator (used to assign examples to shards).  If '
+    'negative, no seed will be set.')
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + INPUT_DIR_ARG_NAME, type=str, required=True,
+    help=INPUT_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_DATE_ARG_NAME, type=str, required=True,
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_DATE_ARG_NAME, type=str, required=True,
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
+    help=OUTPUT_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + RADAR_FIELDS_ARG_NAME, type=str, nargs='+', required=False,
+    default=[''], help=RADAR_FIELDS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_SHARD_ARG_NAME, type=int, required=False,
+    default=example_shards.DEFAULT_NUM_EXAMPLES_PER_SHARD,
+    help=NUM_EXAMPLES_PER_SHARD_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + MAX_OPEN_SHARDS_ARG_NAME, type=int, required=False,
+    default=example_shards.DEFAULT_MAX_OPEN_SHARDS,
+    help=MAX_OPEN_SHARDS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + RANDOM_SEED_ARG_NAME, type=int, required=False, default=-1,
+    help=RANDOM_SEED_HELP_STRING)
+
+
+def _run(top_input_dir_name, first_spc_date_string, last_spc_date_string,
+         top_output_dir_name, radar_field_names, num_examples_per_shard,
+         max_open_shards, random_seed):
+    """Converts input examples to shards (with manifest) for training.
+
+    This is effectively the main method.
+
+    :param top_input_dir_name: See documentation at top of file.
+    :param first_spc_date_string: Same.
+    :param last_spc_date_string: Same.
+    :param top_output_dir_name: Same.
+    :param radar_field_names: Same.
+    :param num_examples_per_shard: Same.
+    :param max_open_shards: Same.
+    :param random_seed: Same.
+    """
+
+    if radar_field_names[0] in ['', 'None']:
+        radar_field_names = None
+    if random_seed >= 0:
+        numpy.random.seed(random_seed)
+
+    input_example_file_names = input_examples.find_many_example_files(
+        top_directory_name=top_input_dir_name, shuffled=False,
+        first_spc_date_string=first_spc_date_string,
+        last_spc_date_string=last_spc_date_string,
+        raise_error_if_any_missing=False)
+
+    example_shards.convert_examples_to_shards(
+        input_example_file_names=input_example_file_names,
+        top_output_dir_name=top_output_dir_name,
+        num_examples_per_shard=num_examples_per_shard,
+        radar_field_names=radar_field_names, max_open_shards=max_open_shards)
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        top_input_dir_name=getattr(INPUT_ARG_OBJECT, INPUT_DIR_ARG_NAME),
+        first_spc_date_string=getattr(INPUT_ARG_OBJECT, FIRST_DATE_ARG_NAME),
+        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_DATE_ARG_NAME),
+        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME),
+        radar_field_names=getattr(INPUT_ARG_OBJECT, RADAR_FIELDS_ARG_NAME),
+        num_examples_per_shard=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_SHARD_ARG_NAME),
+        max_open_shards=getattr(INPUT_ARG_OBJECT, MAX_OPEN_SHARDS_ARG_NAME),
+        random_seed=getattr(INPUT_ARG_OBJECT, RANDOM_SEED_ARG_NAME)
+    )
@@ -0,0 +1,99 @@
+"""Converts linkage files from Pickle to columnar NetCDF format."""
+
+import argparse
+from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import linkage
+
+FIRST_DATE_ARG_NAME = 'first_spc_date_string'
+LAST_DATE_ARG_NAME = 'last_spc_date_string'
+EVENT_TYPE_ARG_NAME = 'event_type_string'
+INPUT_DIR_ARG_NAME = 'input_dir_name'
+OUTPUT_DIR_ARG_NAME = 'output_dir_name'
+
+SPC_DATE_HELP_STRING = (
+    'SPC date (format "yyyymmdd").  Linkage files will be converted for all '
+    'dates from `{0:s}`...`{1:s}`.'
+).format(FIRST_DATE_ARG_NAME, LAST_DATE_ARG_NAME)
+
+EVENT_TYPE_HELP_STRING = (
+    'Event type (must be accepted by `linkage.check_event_type`).')
+
+INPUT_DIR_HELP_STRING = (
+    'Name of top-level input directory.  Files therein will be found by '
+    '`linkage.find_linkage_file` and read by `linkage.read_linkage_file`.')
+
+OUTPUT_DIR_HELP_STRING = (
+    'Name of top-level output directory (may be the same as `{0:s}`).  Files '
+    'will be written by `linkage.write_linkage_file_columnar` to locations '
+    'therein, determined by `linkage.find_linkage_file`.'
+).format(INPUT_DIR_ARG_NAME)
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_DATE_ARG_NAME, type=str, required=True,
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_DATE_ARG_NAME, type=str, required=True,
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + EVENT_TYPE_ARG_NAME, type=str, required=True,
+    help=EVENT_TYPE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + INPUT_DIR_ARG_NAME, type=str, required=True,
+    help=INPUT_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
+    help=OUTPUT_DIR_HELP_STRING)
+
+
+def _run(first_spc_date_string, last_spc_date_string, event_type_string,
+         top_input_dir_name, top_output_dir_name):
+    """Converts linkage files from Pickle to columnar NetCDF format.
+
+    This is effectively the main method.
+
+    :param first_spc_date_string: See documentation at top of file.
+    :param last_spc_date_string: Same.
+    :param event_type_string: Same.
+    :param top_input_dir_name: Same.
+    :param top_output_dir_name: Same.
+    """
+
+    spc_date_strings = time_conversion.get_spc_dates_in_range(
+        first_spc_date_string=first_spc_date_string,
+        last_spc_date_string=last_spc_date_string)
+
+    for this_spc_date_string in spc_date_strings:
+        this_input_file_name = linkage.find_linkage_file(
+            top_directory_name=top_input_dir_name,
+            event_type_string=event_type_string,
+            spc_date_string=this_spc_date_string, raise_error_if_missing=True)
+
+        this_output_file_name = linkage.find_linkage_file(
+            top_directory_name=top_output_dir_name,
+            event_type_string=event_type_string,
+            spc_date_string=this_spc_date_string, raise_error_if_missing=False,
+            columnar=True)
+
+        print 'Converting "{0:s}" to "{1:s}"...'.format(
+            this_input_file_name, this_output_file_name)
+
+        linkage.convert_linkage_file_to_columnar(
+            pickle_file_name=this_input_file_name,
+            netcdf_file_name=this_output_file_name)
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        first_spc_date_string=getattr(INPUT_ARG_OBJECT, FIRST_DATE_ARG_NAME),
+        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_DATE_ARG_NAME),
+        event_type_string=getattr(INPUT_ARG_OBJECT, EVENT_TYPE_ARG_NAME),
+        top_input_dir_name=getattr(INPUT_ARG_OBJECT, INPUT_DIR_ARG_NAME),
+        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
+    )
@@ -26,6 +26,7 @@ TARGET_NAME_ARG_NAME = 'target_name'
 SOUNDING_DIR_ARG_NAME = 'input_sounding_dir_name'
 LAG_TIME_ARG_NAME = 'sounding_lag_time_sec'
 NUM_EXAMPLES_PER_IN_FILE_ARG_NAME = 'num_examples_per_in_file'
+MAX_EXAMPLES_PER_BLOCK_ARG_NAME = 'max_examples_per_block'
 OUTPUT_DIR_ARG_NAME = 'output_dir_name'
 CLASS_FRACTION_KEYS_ARG_NAME = 'class_fraction_keys'
 CLASS_FRACTION_VALUES_ARG_NAME = 'class_fraction_values'
@@ -92,6 +93,11 @@ NUM_EXAMPLES_PER_IN_FILE_HELP_STRING = (
     'Number of examples to read from each input file.'
 )
 
+MAX_EXAMPLES_PER_BLOCK_HELP_STRING = (
+    'Max number of examples created and written at once.  Use this to bound '
+    'memory usage.'
+)
+
 OUTPUT_DIR_HELP_STRING = (
     'Name of top-level directory.  Files will be written here by '
     '`input_examples.write_example_file`, to locations determined by '
@@ -178,6 +184,11 @@ INPUT_ARG_PARSER.add_argument(
     default=DEFAULT_NUM_EXAMPLES_PER_IN_FILE,
     help=NUM_EXAMPLES_PER_IN_FILE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + MAX_EXAMPLES_PER_BLOCK_ARG_NAME, type=int, required=False,
+    default=input_examples.DEFAULT_MAX_EXAMPLES_PER_BLOCK,
+    help=MAX_EXAMPLES_PER_BLOCK_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
     help=OUTPUT_DIR_HELP_STRING)
@@ -195,7 +206,8 @@ def _run(top_storm_image_dir_name, radar_source, num_radar_dimensions,
          radar_field_names, radar_heights_m_agl, first_spc_date_string,
          last_spc_date_string, top_target_dir_name, target_name,
          top_sounding_dir_name, sounding_lag_time_sec, num_examples_per_in_file,
-         top_output_dir_name, class_fraction_keys, class_fraction_values):
+         max_examples_per_block, top_output_dir_name, class_fraction_keys,
+         class_fraction_values):
     """Runs `input_examples.shuffle_and_write_examples`.
 
     This is effectively the main method.
@@ -212,6 +224,7 @@ def _run(top_storm_image_dir_name, radar_source, num_radar_dimensions,
     :param top_sounding_dir_name: Same.
     :param sounding_lag_time_sec: Same.
     :param num_examples_per_in_file: Same.
+    :param max_examples_per_block: Same.
     :param top_output_dir_name: Same.
     :param class_fraction_keys: Same.
     :param class_fraction_values: Same.
@@ -275,6 +288,7 @@ def _run(top_storm_image_dir_name, radar_source, num_radar_dimensions,
     input_examples.create_examples(
         target_file_names=target_file_names, target_name=target_name,
         num_examples_per_in_file=num_examples_per_in_file,
+        max_examples_per_block=max_examples_per_block,
         top_output_dir_name=top_output_dir_name,
         radar_file_name_matrix=radar_file_name_matrix,
         reflectivity_file_name_matrix=reflectivity_file_name_matrix,
@@ -302,6 +316,8 @@ if __name__ == '__main__':
         sounding_lag_time_sec=getattr(INPUT_ARG_OBJECT, LAG_TIME_ARG_NAME),
         num_examples_per_in_file=getattr(
             INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_IN_FILE_ARG_NAME),
+        max_examples_per_block=getattr(
+            INPUT_ARG_OBJECT, MAX_EXAMPLES_PER_BLOCK_ARG_NAME),
         top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME),
         class_fraction_keys=numpy.array(
             getattr(INPUT_ARG_OBJECT, CLASS_FRACTION_KEYS_ARG_NAME), dtype=int),
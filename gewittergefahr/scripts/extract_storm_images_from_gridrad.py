@@ -22,6 +22,9 @@ TRACKING_DIR_ARG_NAME = 'input_tracking_dir_name'
 TRACKING_SCALE_ARG_NAME = 'tracking_scale_metres2'
 TARGET_NAME_ARG_NAME = 'target_name'
 TARGET_DIR_ARG_NAME = 'input_target_dir_name'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
+MAX_MEMORY_ARG_NAME = 'max_memory_gb'
+MULTI_FIELD_ARG_NAME = 'multi_field_output'
 OUTPUT_DIR_ARG_NAME = 'output_dir_name'
 
 NUM_ROWS_HELP_STRING = (
@@ -82,6 +85,21 @@ TARGET_DIR_HELP_STRING = (
     ' `target_val_utils.read_target_values`.'
 ).format(TARGET_NAME_ARG_NAME)
 
+NUM_PROCESSES_HELP_STRING = (
+    'Number of worker processes.  Each process extracts images for one valid '
+    'time at once.  Output files are the same for any number of processes.')
+
+MAX_MEMORY_HELP_STRING = (
+    'Max memory (gigabytes) for all worker processes together.  If necessary, '
+    '`{0:s}` will be reduced to stay under this cap.  If you do not want a cap,'
+    ' leave this argument alone.'
+).format(NUM_PROCESSES_ARG_NAME)
+
+MULTI_FIELD_HELP_STRING = (
+    'Boolean flag.  If 1, will write one file per time step, containing all '
+    'fields and heights (see `storm_images.write_storm_images_multi_field`).  '
+    'If 0, will write one file per time step and field/height pair.')
+
 OUTPUT_DIR_HELP_STRING = (
     'Name of top-level directory for storm-centered radar images.')
 
@@ -142,6 +160,19 @@ INPUT_ARG_PARSER.add_argument(
     '--' + TARGET_DIR_ARG_NAME, type=str, required=False, default='',
     help=TARGET_DIR_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False,
+    default=storm_images.DEFAULT_NUM_PROCESSES_FOR_EXTRACTION,
+    help=NUM_PROCESSES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + MAX_MEMORY_ARG_NAME, type=float, required=False, default=-1.,
+    help=MAX_MEMORY_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + MULTI_FIELD_ARG_NAME, type=int, required=False, default=0,
+    help=MULTI_FIELD_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
     help=OUTPUT_DIR_HELP_STRING)
@@ -152,6 +183,7 @@ def _extract_storm_images(
         rotated_grid_spacing_metres, radar_field_names, radar_heights_m_agl,
         spc_date_string, top_radar_dir_name, top_tracking_dir_name,
         tracking_scale_metres2, target_name, top_target_dir_name,
+        num_processes, max_memory_gb, multi_field_output,
         top_output_dir_name):
     """Extracts storm-centered radar images from GridRad data.
 
@@ -167,11 +199,16 @@ def _extract_storm_images(
     :param tracking_scale_metres2: Same.
     :param target_name: Same.
     :param top_target_dir_name: Same.
+    :param num_processes: Same.
+    :param max_memory_gb: Same.
+    :param multi_field_output: Same.
     :param top_output_dir_name: Same.
     """
 
     if target_name in ['', 'None']:
         target_name = None
+    if max_memory_gb <= 0:
+        max_memory_gb = None
 
     if target_name is not None:
         target_param_dict = target_val_utils.target_name_to_params(target_name)
@@ -231,7 +268,8 @@ def _extract_storm_images(
         num_storm_image_columns=num_image_columns, rotate_grids=rotate_grids,
         rotated_grid_spacing_metres=rotated_grid_spacing_metres,
         radar_field_names=radar_field_names,
-        radar_heights_m_agl=radar_heights_m_agl)
+        radar_heights_m_agl=radar_heights_m_agl, num_processes=num_processes,
+        max_memory_gb=max_memory_gb, multi_field_output=multi_field_output)
 
 
 if __name__ == '__main__':
@@ -253,5 +291,9 @@ if __name__ == '__main__':
             INPUT_ARG_OBJECT, TRACKING_SCALE_ARG_NAME),
         target_name=getattr(INPUT_ARG_OBJECT, TARGET_NAME_ARG_NAME),
         top_target_dir_name=getattr(INPUT_ARG_OBJECT, TARGET_DIR_ARG_NAME),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME),
+        max_memory_gb=getattr(INPUT_ARG_OBJECT, MAX_MEMORY_ARG_NAME),
+        multi_field_output=bool(
+            getattr(INPUT_ARG_OBJECT, MULTI_FIELD_ARG_NAME)),
         top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
     )
@@ -0,0 +1,171 @@
+"""Runs `linkage.link_events_many_spc_dates`."""
+
+import argparse
+import numpy
+from gewittergefahr.gg_io import storm_tracking_io as tracking_io
+from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
+from gewittergefahr.gg_utils import echo_top_tracking
+from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import linkage
+
+FIRST_DATE_ARG_NAME = 'first_spc_date_string'
+LAST_DATE_ARG_NAME = 'last_spc_date_string'
+EVENT_TYPE_ARG_NAME = 'event_type_string'
+EVENT_DIR_ARG_NAME = 'input_event_dir_name'
+TRACKING_DIR_ARG_NAME = 'input_tracking_dir_name'
+TRACKING_SCALE_ARG_NAME = 'tracking_scale_metres2'
+DATA_SOURCE_ARG_NAME = 'data_source'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
+OUTPUT_DIR_ARG_NAME = 'output_dir_name'
+SHARED_OUTPUT_DIR_ARG_NAME = 'shared_output_dir_name'
+
+SPC_DATE_HELP_STRING = (
+    'SPC date (format "yyyymmdd").  Storm cells will be linked to events for '
+    'all dates from `{0:s}`...`{1:s}`.'
+).format(FIRST_DATE_ARG_NAME, LAST_DATE_ARG_NAME)
+
+EVENT_TYPE_HELP_STRING = (
+    'Event type (must be accepted by `linkage.check_event_type`).')
+
+EVENT_DIR_HELP_STRING = (
+    'Name of top-level directory with events (wind observations or tornado '
+    'reports).  See doc for `linkage.link_storms_to_winds` or '
+    '`linkage.link_storms_to_tornadoes`.')
+
+TRACKING_DIR_HELP_STRING = (
+    'Name of top-level tracking directory.  Files therein will be found by '
+    '`storm_tracking_io.find_processed_files_one_spc_date` and read by '
+    '`storm_tracking_io.read_processed_file`.')
+
+TRACKING_SCALE_HELP_STRING = (
+    'Tracking scale (minimum object area).  Used to find files in `{0:s}`.'
+).format(TRACKING_DIR_ARG_NAME)
+
+DATA_SOURCE_HELP_STRING = (
+    'Data source for storm tracks.  Must be a string in the following list.  '
+    'Used to find files in `{0:s}`.\n{1:s}'
+).format(TRACKING_DIR_ARG_NAME, str(tracking_utils.DATA_SOURCE_IDS))
+
+NUM_PROCESSES_HELP_STRING = (
+    'Number of worker processes.  Each process handles one SPC date at a '
+    'time.')
+
+OUTPUT_DIR_HELP_STRING = (
+    'Name of top-level directory for linkage files (before sharing across SPC '
+    'dates).  Files will be written by `linkage.write_linkage_file`, to '
+    'locations therein determined by `linkage.find_linkage_file`.')
+
+SHARED_OUTPUT_DIR_HELP_STRING = (
+    'Name of top-level directory for linkage files after sharing across SPC '
+    'dates (by `linkage.share_linkages_across_spc_dates`).  If you do not want '
+    'to share linkages across SPC dates, leave this argument alone.')
+
+DEFAULT_TRACKING_SCALE_METRES2 = int(numpy.round(
+    echo_top_tracking.DUMMY_TRACKING_SCALE_METRES2))
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_DATE_ARG_NAME, type=str, required=True,
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_DATE_ARG_NAME, type=str, required=True,
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + EVENT_TYPE_ARG_NAME, type=str, required=True,
+    help=EVENT_TYPE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + EVENT_DIR_ARG_NAME, type=str, required=True,
+    help=EVENT_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + TRACKING_DIR_ARG_NAME, type=str, required=True,
+    help=TRACKING_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + TRACKING_SCALE_ARG_NAME, type=int, required=False,
+    default=DEFAULT_TRACKING_SCALE_METRES2, help=TRACKING_SCALE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + DATA_SOURCE_ARG_NAME, type=str, required=False,
+    default=tracking_utils.SEGMOTION_SOURCE_ID, help=DATA_SOURCE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False,
+    default=linkage.DEFAULT_NUM_PROCESSES_FOR_LINKAGE,
+    help=NUM_PROCESSES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
+    help=OUTPUT_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + SHARED_OUTPUT_DIR_ARG_NAME, type=str, required=False, default='',
+    help=SHARED_OUTPUT_DIR_HELP_STRING)
+
+
+def _run(first_spc_date_string, last_spc_date_string, event_type_string,
+         top_event_dir_name, top_tracking_dir_name, tracking_scale_metres2,
+         data_source, num_processes, top_output_dir_name,
+         top_shared_output_dir_name):
+    """Runs `linkage.link_events_many_spc_dates`.
+
+    This is effectively the main method.
+
+    :param first_spc_date_string: See documentation at top of file.
+    :param last_spc_date_string: Same.
+    :param event_type_string: Same.
+    :param top_event_dir_name: Same.
+    :param top_tracking_dir_name: Same.
+    :param tracking_scale_metres2: Same.
+    :param data_source: Same.
+    :param num_processes: Same.
+    :param top_output_dir_name: Same.
+    :param top_shared_output_dir_name: Same.
+    """
+
+    if top_shared_output_dir_name in ['', 'None']:
+        top_shared_output_dir_name = None
+
+    spc_date_strings = time_conversion.get_spc_dates_in_range(
+        first_spc_date_string=first_spc_date_string,
+        last_spc_date_string=last_spc_date_string)
+
+    tracking_file_names_by_date = [
+        tracking_io.find_processed_files_one_spc_date(
+            spc_date_string=d,
+            data_source=data_source,
+            top_processed_dir_name=top_tracking_dir_name,
+            tracking_scale_metres2=tracking_scale_metres2,
+            raise_error_if_missing=True)[0]
+        for d in spc_date_strings
+    ]
+
+    linkage.link_events_many_spc_dates(
+        event_type_string=event_type_string,
+        spc_date_strings=spc_date_strings,
+        tracking_file_names_by_date=tracking_file_names_by_date,
+        top_event_dir_name=top_event_dir_name,
+        top_output_dir_name=top_output_dir_name, num_processes=num_processes,
+        top_shared_output_dir_name=top_shared_output_dir_name)
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        first_spc_date_string=getattr(INPUT_ARG_OBJECT, FIRST_DATE_ARG_NAME),
+        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_DATE_ARG_NAME),
+        event_type_string=getattr(INPUT_ARG_OBJECT, EVENT_TYPE_ARG_NAME),
+        top_event_dir_name=getattr(INPUT_ARG_OBJECT, EVENT_DIR_ARG_NAME),
+        top_tracking_dir_name=getattr(INPUT_ARG_OBJECT, TRACKING_DIR_ARG_NAME),
+        tracking_scale_metres2=getattr(
+            INPUT_ARG_OBJECT, TRACKING_SCALE_ARG_NAME),
+        data_source=getattr(INPUT_ARG_OBJECT, DATA_SOURCE_ARG_NAME),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME),
+        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME),
+        top_shared_output_dir_name=getattr(
+            INPUT_ARG_OBJECT, SHARED_OUTPUT_DIR_ARG_NAME)
+    )
@@ -21,6 +21,8 @@ MIN_GRID_CELLS_ARG_NAME = 'min_grid_cells_in_polygon'
 OUTPUT_DIR_ARG_NAME = 'output_tracking_dir_name'
 FIRST_SPC_DATE_ARG_NAME = 'first_spc_date_string'
 LAST_SPC_DATE_ARG_NAME = 'last_spc_date_string'
+GLOBAL_ASSIGNMENT_ARG_NAME = 'use_global_assignment'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
 
 ECHO_TOP_FIELD_HELP_STRING = (
     'Tracking will be based on this field.  Must be in the following list.'
@@ -64,6 +66,18 @@ SPC_DATE_HELP_STRING = (
     ' `{0:s}`...`{1:s}`.'
 ).format(FIRST_SPC_DATE_ARG_NAME, LAST_SPC_DATE_ARG_NAME)
 
+GLOBAL_ASSIGNMENT_HELP_STRING = (
+    'Boolean flag.  If 1, local maxima will be linked between successive times '
+    'by global optimal assignment.  If 0, each local max will be linked to the '
+    'nearest one at the previous time.  See '
+    '`echo_top_tracking._link_local_maxima_in_time` for details.')
+
+NUM_PROCESSES_HELP_STRING = (
+    'Number of worker processes.  Workers read radar files and find local '
+    'maxima (with polygons) ahead of the main process, which links maxima '
+    'between successive times.  If 1, all work will be done in the main '
+    'process.')
+
 DEFAULT_TARRED_RADAR_DIR_NAME = '/condo/swatcommon/common/myrorss'
 
 INPUT_ARG_PARSER = argparse.ArgumentParser()
@@ -103,11 +117,19 @@ INPUT_ARG_PARSER.add_argument(
     '--' + LAST_SPC_DATE_ARG_NAME, type=str, required=True,
     help=SPC_DATE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + GLOBAL_ASSIGNMENT_ARG_NAME, type=int, required=False, default=0,
+    help=GLOBAL_ASSIGNMENT_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_PROCESSES_HELP_STRING)
+
 
 def _run(echo_top_field_name, top_radar_dir_name_tarred, top_radar_dir_name,
          top_echo_classifn_dir_name, min_echo_top_km_asl,
          min_grid_cells_in_polygon, top_output_dir_name, first_spc_date_string,
-         last_spc_date_string):
+         last_spc_date_string, use_global_assignment, num_processes):
     """Runs echo-top-based storm-tracking.
 
     This is effectively the main method.
@@ -121,6 +143,8 @@ def _run(echo_top_field_name, top_radar_dir_name_tarred, top_radar_dir_name,
     :param top_output_dir_name: Same.
     :param first_spc_date_string: Same.
     :param last_spc_date_string: Same.
+    :param use_global_assignment: Same.
+    :param num_processes: Same.
     """
 
     if echo_top_field_name in NATIVE_ECHO_TOP_FIELD_NAMES:
@@ -151,7 +175,9 @@ def _run(echo_top_field_name, top_radar_dir_name_tarred, top_radar_dir_name,
         echo_top_field_name=echo_top_field_name,
         top_echo_classifn_dir_name=top_echo_classifn_dir_name,
         min_echo_top_height_km_asl=min_echo_top_km_asl,
-        min_grid_cells_in_polygon=min_grid_cells_in_polygon)
+        min_grid_cells_in_polygon=min_grid_cells_in_polygon,
+        use_global_assignment=use_global_assignment,
+        num_processes=num_processes)
     print SEPARATOR_STRING
 
     if echo_top_field_name in NATIVE_ECHO_TOP_FIELD_NAMES:
@@ -179,5 +205,8 @@ if __name__ == '__main__':
         top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME),
         first_spc_date_string=getattr(
             INPUT_ARG_OBJECT, FIRST_SPC_DATE_ARG_NAME),
-        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_SPC_DATE_ARG_NAME)
+        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_SPC_DATE_ARG_NAME),
+        use_global_assignment=bool(
+            getattr(INPUT_ARG_OBJECT, GLOBAL_ASSIGNMENT_ARG_NAME)),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME)
     )